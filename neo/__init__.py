@@ -10,6 +10,21 @@ logging_handler = logging.StreamHandler()
 
 from neo.core import *
 # ~ import neo.rawio
-from neo.io import *
+# IO classes are imported lazily, see neo.io.registry
+from neo.io import get_io, get_io_candidates
+from neo.io.registry import make_lazy as _make_lazy
+import neo.io as _io
 
 from neo.version import version as __version__
+
+__all__ = [name for name in list(globals().keys()) if not name.startswith('_')]
+__all__ += [name for name in _io.__all__ if name not in __all__]
+
+
+def _lazy_getattr(name):
+    if name in _io.__all__:
+        return getattr(_io, name)
+    raise AttributeError("module 'neo' has no attribute '{}'".format(name))
+
+
+_make_lazy(__name__)
@@ -229,6 +229,30 @@ class AnalogSignal(BaseSignal):
                                         self.channel_index,
                                         self.segment)
 
+    def __reduce_ex__(self, protocol):
+        '''
+        Support for pickle protocol 5 and higher: the data are passed as
+        a view rather than a copy, so that they can be transferred
+        out-of-band (see :class:`pickle.PickleBuffer`), and are not copied
+        again when unpickling.
+        '''
+        if protocol < 5:
+            return self.__reduce__()
+        return _new_AnalogSignalArray, (self.__class__,
+                                        self.view(np.ndarray),
+                                        self.units,
+                                        self.dtype,
+                                        False,
+                                        self.t_start,
+                                        self.sampling_rate,
+                                        self.sampling_period,
+                                        self.name,
+                                        self.file_origin,
+                                        self.description,
+                                        self.annotations,
+                                        self.channel_index,
+                                        self.segment)
+
     def _array_finalize_spec(self, obj):
         '''
         Set default values for attributes specific to :class:`AnalogSignal`.
@@ -525,3 +549,101 @@ class AnalogSignal(BaseSignal):
         else:
             self[i:j, :] = signal
             return self
+
+    def concatenate(self, *signals, **kwargs):
+        """
+        Concatenate this signal with one or more other signals along the time
+        axis, e.g. to stitch back together a recording that a reader split
+        into several :class:`Segment` objects at gaps.
+
+        The signals must have the same sampling rate and number of channels,
+        and must follow each other in time without overlapping. They are
+        rescaled to the units of this signal.
+
+        The output array is allocated once and each signal is copied
+        directly into its place in it.
+
+        Keyword arguments:
+            :padding: what to do if there is a gap between two consecutive
+                signals. If False (the default), a :class:`MergeError` is
+                raised. If True, the gap is filled with NaN. If a
+                :class:`Quantity` (or a number, in the units of this
+                signal), the gap is filled with that value.
+            :out: a preallocated array of shape (number of samples of the
+                output, number of channels), e.g. a :class:`numpy.memmap`,
+                into which the signals are written instead of a new array.
+                The returned signal is a view onto `out`, so a long recording
+                can be stitched together straight into its final storage.
+        """
+        padding = kwargs.pop('padding', False)
+        out = kwargs.pop('out', None)
+        if kwargs:
+            raise TypeError("Unexpected keyword argument(s): %s" %
+                            ", ".join(kwargs))
+
+        for other in signals:
+            if other.sampling_rate != self.sampling_rate:
+                raise MergeError("Cannot concatenate signals with different "
+                                 "sampling rates.")
+            if other.shape[1] != self.shape[1]:
+                raise MergeError("Cannot concatenate signals with different "
+                                 "numbers of channels.")
+        signals = (self,) + tuple(other if other.units == self.units
+                                  else other.rescale(self.units)
+                                  for other in signals)
+
+        # first pass: compute the position of each signal in the output
+        period = self.sampling_period.simplified.magnitude
+        offsets = []
+        n_samples = 0
+        has_gap = False
+        t_expected = self.t_start.simplified.magnitude
+        for sig in signals:
+            gap = (sig.t_start.simplified.magnitude - t_expected) / period
+            gap = int(np.rint(gap))
+            if gap < 0:
+                raise MergeError("Cannot concatenate overlapping signals.")
+            if gap > 0 and padding is False:
+                raise MergeError("Cannot concatenate signals separated by a "
+                                 "gap, use the `padding` argument to fill it.")
+            has_gap = has_gap or gap > 0
+            n_samples += gap
+            offsets.append(n_samples)
+            n_samples += sig.shape[0]
+            t_expected += (gap + sig.shape[0]) * period
+
+        dtype = self.dtype
+        if padding is True:
+            fill_value = np.nan
+            if has_gap:
+                # NaN can only be stored in a floating point array
+                dtype = np.promote_types(dtype, np.float32)
+        elif padding is not False:
+            if hasattr(padding, 'units'):
+                padding = padding.rescale(self.units).magnitude
+            fill_value = padding
+
+        # second pass: fill the preallocated output
+        if out is None:
+            stack = np.empty((n_samples, self.shape[1]), dtype=dtype)
+        else:
+            stack = np.asarray(out)
+            if stack.shape != (n_samples, self.shape[1]):
+                raise ValueError("out has shape %s, but the concatenated "
+                                 "signal has shape %s" %
+                                 (stack.shape, (n_samples, self.shape[1])))
+            dtype = stack.dtype
+        end = 0
+        for offset, sig in zip(offsets, signals):
+            if offset > end:
+                stack[end:offset] = fill_value
+            end = offset + sig.shape[0]
+            np.copyto(stack[offset:end], np.asarray(sig), casting='unsafe')
+
+        kwargs = self._merge_attributes(signals[1:])
+        new_signal = self.__class__(stack, units=self.units, dtype=dtype,
+                                    copy=False, t_start=self.t_start,
+                                    sampling_rate=self.sampling_rate,
+                                    **kwargs)
+        new_signal.channel_index = self.channel_index
+        return new_signal
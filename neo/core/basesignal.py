@@ -240,66 +240,99 @@ class BaseSignal(BaseNeo, pq.Quantity):
         """
         return self.view(pq.Quantity)
 
-    def merge(self, other):
+    def merge(self, *others):
         '''
-        Merge another signal into this one.
+        Merge one or more other signals into this one.
 
         The signal objects are concatenated horizontally
-        (column-wise, :func:`np.hstack`).
+        (column-wise, :func:`np.hstack`). All signals are copied
+        into the result in a single pass, so merging many signals
+        at once (e.g. all channels of a probe) is linear in the total
+        size of the data.
 
-        If the attributes of the two signal are not
+        If the attributes of the signals are not
         compatible, an Exception is raised.
 
         Required attributes of the signal are used.
         '''
+        for other in others:
+            for attr in self._necessary_attrs:
+                if 'signal' != attr[0]:
+                    if getattr(self, attr[0], None) != getattr(other, attr[0], None):
+                        raise MergeError("Cannot merge these two signals as the %s differ." %
+                                         attr[0])
+        others = self._check_mergeable(others)
+
+        stack = np.concatenate([np.asarray(sig) for sig in (self,) + others],
+                               axis=1)
+        kwargs = self._merge_attributes(others)
+        signal = self.__class__(stack, units=self.units, dtype=self.dtype,
+                                copy=False, t_start=self.t_start,
+                                sampling_rate=self.sampling_rate,
+                                **kwargs)
+        self._finalize_merge(signal, others)
+        return signal
 
-        for attr in self._necessary_attrs:
-            if 'signal' != attr[0]:
-                if getattr(self, attr[0], None) != getattr(other, attr[0], None):
-                    raise MergeError("Cannot merge these two signals as the %s differ." % attr[0])
-
-        if self.segment != other.segment:
-            raise MergeError(
-                "Cannot merge these two signals as they belong to different segments.")
-        if hasattr(self, "lazy_shape"):
-            if hasattr(other, "lazy_shape"):
-                if self.lazy_shape[0] != other.lazy_shape[0]:
-                    raise MergeError("Cannot merge signals of different length.")
-                merged_lazy_shape = (self.lazy_shape[0], self.lazy_shape[1] + other.lazy_shape[1])
-            else:
-                raise MergeError("Cannot merge a lazy object with a real object.")
-        if other.units != self.units:
-            other = other.rescale(self.units)
-        stack = np.hstack(map(np.array, (self, other)))
+    def _check_mergeable(self, others):
+        '''
+        Check the parent segment and lazy status of the signals to be merged
+        with this one, and return them rescaled to the units of this signal.
+        '''
+        rescaled = []
+        for other in others:
+            if self.segment != other.segment:
+                raise MergeError(
+                    "Cannot merge these two signals as they belong to different segments.")
+            if hasattr(self, "lazy_shape"):
+                if hasattr(other, "lazy_shape"):
+                    if self.lazy_shape[0] != other.lazy_shape[0]:
+                        raise MergeError("Cannot merge signals of different length.")
+                else:
+                    raise MergeError("Cannot merge a lazy object with a real object.")
+            if other.units != self.units:
+                other = other.rescale(self.units)
+            rescaled.append(other)
+        return tuple(rescaled)
+
+    def _merge_attributes(self, others):
+        '''
+        Return the recommended attributes and annotations of the signal
+        resulting from merging this signal with `others`.
+        '''
+        signals = (self,) + tuple(others)
         kwargs = {}
         for name in ("name", "description", "file_origin"):
-            attr_self = getattr(self, name)
-            attr_other = getattr(other, name)
-            if attr_self == attr_other:
-                kwargs[name] = attr_self
+            attrs = [getattr(sig, name) for sig in signals]
+            if all(attr == attrs[0] for attr in attrs):
+                kwargs[name] = attrs[0]
             else:
-                kwargs[name] = "merge(%s, %s)" % (attr_self, attr_other)
-        merged_annotations = merge_annotations(self.annotations,
-                                               other.annotations)
+                kwargs[name] = "merge(%s)" % ", ".join(str(attr) for attr in attrs)
+        merged_annotations = self.annotations
+        for other in others:
+            merged_annotations = merge_annotations(merged_annotations,
+                                                   other.annotations)
         kwargs.update(merged_annotations)
-        signal = self.__class__(stack, units=self.units, dtype=self.dtype,
-                                copy=False, t_start=self.t_start,
-                                sampling_rate=self.sampling_rate,
-                                **kwargs)
+        return kwargs
+
+    def _finalize_merge(self, signal, others):
+        '''
+        Set the parent segment, lazy shape and channel index of the
+        `signal` resulting from merging this signal with `others`.
+        '''
+        signals = (self,) + tuple(others)
         signal.segment = self.segment
 
         if hasattr(self, "lazy_shape"):
-            signal.lazy_shape = merged_lazy_shape
+            signal.lazy_shape = (self.lazy_shape[0],
+                                 sum(sig.lazy_shape[1] for sig in signals))
 
         # merge channel_index (move to ChannelIndex.merge()?)
-        if self.channel_index and other.channel_index:
+        if all(sig.channel_index for sig in signals):
             signal.channel_index = ChannelIndex(
                 index=np.arange(signal.shape[1]),
-                channel_ids=np.hstack([self.channel_index.channel_ids,
-                                       other.channel_index.channel_ids]),
-                channel_names=np.hstack([self.channel_index.channel_names,
-                                         other.channel_index.channel_names]))
+                channel_ids=np.hstack([sig.channel_index.channel_ids
+                                       for sig in signals]),
+                channel_names=np.hstack([sig.channel_index.channel_names
+                                         for sig in signals]))
         else:
             signal.channel_index = ChannelIndex(index=np.arange(signal.shape[1]))
-
-        return signal
@@ -66,6 +66,12 @@ class Block(Container):
             because a common analysis case is analyzing all neurons that
             you recorded in a session.
 
+    *Methods available on this object*:
+        :concatenate_analogsignals: stitches the :class:`AnalogSignal`
+            objects of consecutive segments together along the time axis.
+        :concatenate_irregularlysampledsignals: same, for
+            :class:`IrregularlySampledSignal` objects.
+
     Note: Any other additional arguments are assumed to be user-specific
     metadata and stored in :attr:`annotations`.
 
@@ -130,3 +136,32 @@ class Block(Container):
         Return a list of all :class:`Unit` objects in the :class:`Block`.
         '''
         return self.list_children_by_class('unit')
+
+    def concatenate_analogsignals(self, padding=False):
+        '''
+        Concatenate the :class:`AnalogSignal` objects of all segments along
+        the time axis, for instance to recover a continuous recording that
+        a reader split at gaps.
+
+        The i-th signal of each :class:`Segment` is concatenated with the
+        i-th signal of the others, in the order of :attr:`segments`.
+        Return a list of :class:`AnalogSignal`. See
+        :meth:`AnalogSignal.concatenate` for the meaning of `padding`.
+        '''
+        if not self.segments:
+            return []
+        return self.segments[0].concatenate_analogsignals(*self.segments[1:],
+                                                          padding=padding)
+
+    def concatenate_irregularlysampledsignals(self):
+        '''
+        Concatenate the :class:`IrregularlySampledSignal` objects of all
+        segments along the time axis.
+
+        The i-th signal of each :class:`Segment` is concatenated with the
+        i-th signal of the others, in the order of :attr:`segments`.
+        Return a list of :class:`IrregularlySampledSignal`.
+        '''
+        if not self.segments:
+            return []
+        return self.segments[0].concatenate_irregularlysampledsignals(*self.segments[1:])
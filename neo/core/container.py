@@ -10,6 +10,7 @@ object inherit from.  It provides shared methods for all container types.
 from __future__ import absolute_import, division, print_function
 
 from neo.core.baseneo import BaseNeo, _reference_name, _container_name
+from neo.core.spiketrain import bin_spiketrains
 
 
 def unique_objs(objs):
@@ -440,6 +441,21 @@ class Container(BaseNeo):
             objs.extend(getattr(child, container_name, []))
         return objs
 
+    def bin_spiketrains(self, bin_size, t_start=None, t_stop=None,
+                        sparse=False):
+        """
+        Count the spikes of all the :class:`SpikeTrain` objects of this
+        container (recursively) in bins of width `bin_size`.
+
+        Return a (spiketrains x bins) matrix, as a dense array or, if
+        `sparse` is True, a :class:`scipy.sparse.csr_matrix`. The rows follow
+        the order of :meth:`list_children_by_class`. See
+        :func:`neo.core.spiketrain.bin_spiketrains` for details.
+        """
+        return bin_spiketrains(self.list_children_by_class('SpikeTrain'),
+                               bin_size, t_start=t_start, t_stop=t_stop,
+                               sparse=sparse)
+
     def create_many_to_one_relationship(self, force=False, recursive=True):
         """
         For each child of the current object that can only have a single
@@ -21,13 +21,26 @@ PY_VER = sys.version_info[0]
 
 
 def _new_epoch(cls, times=None, durations=None, labels=None, units=None,
-               name=None, description=None, file_origin=None, annotations=None, segment=None):
+               name=None, description=None, file_origin=None, annotations=None, segment=None,
+               durations_units=None, copy=True):
     '''
     A function to map epoch.__new__ to function that
     does not do the unit checking. This is needed for pickle to work.
+
+    With pickle protocol 5, durations is a plain array and durations_units
+    its units, and the arrays are not copied (copy=False).
     '''
-    e = Epoch(times=times, durations=durations, labels=labels, units=units, name=name,
-              file_origin=file_origin, description=description, **annotations)
+    if durations_units is not None:
+        durations = pq.Quantity(durations, durations_units, copy=False)
+    if copy:
+        e = Epoch(times=times, durations=durations, labels=labels, units=units, name=name,
+                  file_origin=file_origin, description=description, **annotations)
+    else:
+        e = pq.Quantity.__new__(cls, times, units=units, copy=False)
+        e.durations = durations
+        e.labels = labels
+        e.__init__(name=name, file_origin=file_origin, description=description,
+                   **annotations)
     e.segment = segment
     return e
 
@@ -124,9 +137,26 @@ class Epoch(BaseNeo, pq.Quantity):
         works
         '''
         return _new_epoch, (self.__class__, self.times, self.durations, self.labels, self.units,
-                            self.name, self.file_origin, self.description,
+                            self.name, self.description, self.file_origin,
                             self.annotations, self.segment)
 
+    def __reduce_ex__(self, protocol):
+        '''
+        Support for pickle protocol 5 and higher: the times and the durations
+        are passed as views rather than copies, so that they can be
+        transferred out-of-band (see :class:`pickle.PickleBuffer`), and are
+        not copied again when unpickling.
+        '''
+        if protocol < 5:
+            return self.__reduce__()
+        durations, durations_units = self.durations, None
+        if isinstance(durations, pq.Quantity):
+            durations, durations_units = durations.view(np.ndarray), durations.units
+        return _new_epoch, (self.__class__, self.view(np.ndarray), durations,
+                            self.labels, self.units,
+                            self.name, self.description, self.file_origin,
+                            self.annotations, self.segment, durations_units, False)
+
     def __array_finalize__(self, obj):
         super(Epoch, self).__array_finalize__(obj)
         self.durations = getattr(obj, 'durations', None)
@@ -22,13 +22,21 @@ PY_VER = sys.version_info[0]
 
 def _new_event(cls, times=None, labels=None, units=None, name=None,
                file_origin=None, description=None,
-               annotations=None, segment=None):
+               annotations=None, segment=None, copy=True):
     '''
     A function to map Event.__new__ to function that
     does not do the unit checking. This is needed for pickle to work.
+
+    With pickle protocol 5, the times are not copied (copy=False).
     '''
-    e = Event(times=times, labels=labels, units=units, name=name, file_origin=file_origin,
-              description=description, **annotations)
+    if copy:
+        e = Event(times=times, labels=labels, units=units, name=name, file_origin=file_origin,
+                  description=description, **annotations)
+    else:
+        e = pq.Quantity.__new__(cls, times, units=units, copy=False)
+        e.labels = labels
+        e.__init__(name=name, file_origin=file_origin, description=description,
+                   **annotations)
     e.segment = segment
     return e
 
@@ -120,6 +128,19 @@ class Event(BaseNeo, pq.Quantity):
                             self.name, self.file_origin, self.description,
                             self.annotations, self.segment)
 
+    def __reduce_ex__(self, protocol):
+        '''
+        Support for pickle protocol 5 and higher: the data are passed as
+        a view rather than a copy, so that they can be transferred
+        out-of-band (see :class:`pickle.PickleBuffer`), and are not copied
+        again when unpickling.
+        '''
+        if protocol < 5:
+            return self.__reduce__()
+        return _new_event, (self.__class__, self.view(np.ndarray), self.labels, self.units,
+                            self.name, self.file_origin, self.description,
+                            self.annotations, self.segment, False)
+
     def __array_finalize__(self, obj):
         super(Event, self).__array_finalize__(obj)
         self.labels = getattr(obj, 'labels', None)
@@ -27,9 +27,8 @@ from copy import deepcopy
 import numpy as np
 import quantities as pq
 
-from neo.core.baseneo import BaseNeo, MergeError, merge_annotations
+from neo.core.baseneo import BaseNeo, MergeError
 from neo.core.basesignal import BaseSignal
-from neo.core.channelindex import ChannelIndex
 
 
 def _new_IrregularlySampledSignal(cls, times, signal, units=None, time_units=None, dtype=None,
@@ -183,6 +182,29 @@ class IrregularlySampledSignal(BaseSignal):
                                                self.segment,
                                                self.channel_index)
 
+    def __reduce_ex__(self, protocol):
+        '''
+        Support for pickle protocol 5 and higher: the data are passed as
+        a view rather than a copy, so that they can be transferred
+        out-of-band (see :class:`pickle.PickleBuffer`), and are not copied
+        again when unpickling.
+        '''
+        if protocol < 5:
+            return self.__reduce__()
+        return _new_IrregularlySampledSignal, (self.__class__,
+                                               self.times.view(np.ndarray),
+                                               self.view(np.ndarray),
+                                               self.units,
+                                               self.times.units,
+                                               self.dtype,
+                                               False,
+                                               self.name,
+                                               self.file_origin,
+                                               self.description,
+                                               self.annotations,
+                                               self.segment,
+                                               self.channel_index)
+
     def _array_finalize_spec(self, obj):
         '''
         Set default values for attributes specific to :class:`IrregularlySampledSignal`.
@@ -404,62 +426,87 @@ class IrregularlySampledSignal(BaseSignal):
 
         return new_st
 
-    def merge(self, other):
+    def merge(self, *others):
         '''
-        Merge another signal into this one.
+        Merge one or more other signals into this one.
 
         The signal objects are concatenated horizontally
-        (column-wise, :func:`np.hstack`).
+        (column-wise, :func:`np.hstack`) in a single pass.
 
-        If the attributes of the two signals are not
+        If the attributes of the signals are not
         compatible, an Exception is raised.
 
         Required attributes of the signal are used.
         '''
+        for other in others:
+            if not np.array_equal(self.times, other.times):
+                raise MergeError("Cannot merge these two signals as the sample times differ.")
+        others = self._check_mergeable(others)
 
-        if not np.array_equal(self.times, other.times):
-            raise MergeError("Cannot merge these two signals as the sample times differ.")
-
-        if self.segment != other.segment:
-            raise MergeError(
-                "Cannot merge these two signals as they belong to different segments.")
-        if hasattr(self, "lazy_shape"):
-            if hasattr(other, "lazy_shape"):
-                if self.lazy_shape[0] != other.lazy_shape[0]:
-                    raise MergeError("Cannot merge signals of different length.")
-                merged_lazy_shape = (self.lazy_shape[0], self.lazy_shape[1] + other.lazy_shape[1])
-            else:
-                raise MergeError("Cannot merge a lazy object with a real object.")
-        if other.units != self.units:
-            other = other.rescale(self.units)
-        stack = np.hstack(map(np.array, (self, other)))
-        kwargs = {}
-        for name in ("name", "description", "file_origin"):
-            attr_self = getattr(self, name)
-            attr_other = getattr(other, name)
-            if attr_self == attr_other:
-                kwargs[name] = attr_self
-            else:
-                kwargs[name] = "merge(%s, %s)" % (attr_self, attr_other)
-        merged_annotations = merge_annotations(self.annotations,
-                                               other.annotations)
-        kwargs.update(merged_annotations)
+        stack = np.concatenate([np.asarray(sig) for sig in (self,) + others],
+                               axis=1)
+        kwargs = self._merge_attributes(others)
         signal = self.__class__(self.times, stack, units=self.units, dtype=self.dtype,
                                 copy=False, **kwargs)
-        signal.segment = self.segment
-
-        if hasattr(self, "lazy_shape"):
-            signal.lazy_shape = merged_lazy_shape
-
-        # merge channel_index (move to ChannelIndex.merge()?)
-        if self.channel_index and other.channel_index:
-            signal.channel_index = ChannelIndex(
-                index=np.arange(signal.shape[1]),
-                channel_ids=np.hstack([self.channel_index.channel_ids,
-                                       other.channel_index.channel_ids]),
-                channel_names=np.hstack([self.channel_index.channel_names,
-                                         other.channel_index.channel_names]))
-        else:
-            signal.channel_index = ChannelIndex(index=np.arange(signal.shape[1]))
-
+        self._finalize_merge(signal, others)
         return signal
+
+    def concatenate(self, *signals, **kwargs):
+        '''
+        Concatenate this signal with one or more other signals along the time
+        axis.
+
+        The signals must have the same number of channels and must follow
+        each other in time without overlapping. They are rescaled to the
+        units and time units of this signal.
+
+        The output arrays are allocated once and the samples and sample times
+        of each signal are copied directly into their place in them.
+
+        Keyword arguments:
+            :out: a preallocated array of shape (number of samples of the
+                output, number of channels) into which the samples are
+                written, as for :meth:`AnalogSignal.concatenate`.
+        '''
+        out = kwargs.pop('out', None)
+        if kwargs:
+            raise TypeError("Unexpected keyword argument(s): %s" %
+                            ", ".join(kwargs))
+
+        for other in signals:
+            if other.shape[1] != self.shape[1]:
+                raise MergeError("Cannot concatenate signals with different "
+                                 "numbers of channels.")
+        signals = (self,) + tuple(other if other.units == self.units
+                                  else other.rescale(self.units)
+                                  for other in signals)
+
+        time_units = self.times.units
+        n_samples = sum(sig.shape[0] for sig in signals)
+        times = np.empty(n_samples, dtype=self.times.dtype)
+        if out is None:
+            stack = np.empty((n_samples, self.shape[1]), dtype=self.dtype)
+        else:
+            stack = np.asarray(out)
+            if stack.shape != (n_samples, self.shape[1]):
+                raise ValueError("out has shape %s, but the concatenated "
+                                 "signal has shape %s" %
+                                 (stack.shape, (n_samples, self.shape[1])))
+        start = 0
+        for sig in signals:
+            end = start + sig.shape[0]
+            sig_times = sig.times
+            if sig_times.units != time_units:
+                sig_times = sig_times.rescale(time_units)
+            times[start:end] = sig_times.magnitude
+            if start > 0 and end > start and times[start] <= times[start - 1]:
+                raise MergeError("Cannot concatenate overlapping signals.")
+            stack[start:end] = np.asarray(sig)
+            start = end
+
+        kwargs = self._merge_attributes(signals[1:])
+        new_signal = self.__class__(times, stack, units=self.units,
+                                    time_units=time_units, dtype=stack.dtype,
+                                    copy=False, **kwargs)
+        new_signal.channel_index = self.channel_index
+        return new_signal
@@ -14,6 +14,7 @@ from datetime import datetime
 
 import numpy as np
 
+from neo.core.baseneo import MergeError
 from neo.core.container import Container
 
 
@@ -65,6 +66,13 @@ class Segment(Container):
     *Properties available on this object*:
         :all_data: (list) A list of all child objects in the :class:`Segment`.
 
+    *Methods available on this object*:
+        :concatenate_analogsignals: stitches the :class:`AnalogSignal`
+            objects of this segment and of the following segments together
+            along the time axis.
+        :concatenate_irregularlysampledsignals: same, for
+            :class:`IrregularlySampledSignal` objects.
+
     *Container of*:
         :class:`Epoch`
         :class:`Event`
@@ -131,6 +139,42 @@ class Segment(Container):
         t_stop = max(t_stops)
         return t_stop
 
+    def _concatenate_signals(self, container, segments, **kwargs):
+        '''
+        Concatenate the signals stored in `container` in this segment and
+        in `segments`.
+        '''
+        signal_lists = [getattr(seg, container) for seg in (self,) + segments]
+        if any(len(signals) != len(signal_lists[0]) for signals in signal_lists):
+            raise MergeError("Cannot concatenate signals as the segments do "
+                             "not contain the same number of %s." % container)
+        return [signals[0].concatenate(*signals[1:], **kwargs)
+                for signals in zip(*signal_lists)]
+
+    def concatenate_analogsignals(self, *segments, **kwargs):
+        '''
+        Concatenate the :class:`AnalogSignal` objects of this segment with
+        those of the following `segments` along the time axis, for instance
+        to recover a continuous recording that a reader split at gaps.
+
+        The i-th signal of this :class:`Segment` is concatenated with the
+        i-th signal of each of the others, in the order they are given.
+        Return a list of :class:`AnalogSignal`. The keyword arguments (e.g.
+        `padding`) are passed to :meth:`AnalogSignal.concatenate`.
+        '''
+        return self._concatenate_signals('analogsignals', segments, **kwargs)
+
+    def concatenate_irregularlysampledsignals(self, *segments):
+        '''
+        Concatenate the :class:`IrregularlySampledSignal` objects of this
+        segment with those of the following `segments` along the time axis.
+
+        The i-th signal of this :class:`Segment` is concatenated with the
+        i-th signal of each of the others, in the order they are given.
+        Return a list of :class:`IrregularlySampledSignal`.
+        '''
+        return self._concatenate_signals('irregularlysampledsignals', segments)
+
     def take_spiketrains_by_unit(self, unit_list=None):
         '''
         Return :class:`SpikeTrains` in the :class:`Segment` that are also in a
@@ -93,17 +93,84 @@ def _check_waveform_dimensions(spiketrain):
                                                      waveforms.shape[0]))
 
 
+def bin_spiketrains(spiketrains, bin_size, t_start=None, t_stop=None,
+                    sparse=False):
+    '''
+    Count the spikes of each :class:`SpikeTrain` in `spiketrains` in bins of
+    width `bin_size`, and return a (spiketrains x bins) matrix of counts.
+
+    The bins start at `t_start` (by default, the earliest :attr:`t_start` of
+    the spike trains) and cover the interval up to `t_stop` (by default, the
+    latest :attr:`t_stop`). The bin edges are therefore
+    ``t_start + np.arange(n_bins + 1) * bin_size``, the last bin being
+    truncated at `t_stop` if the duration is not a multiple of `bin_size`.
+    Spikes outside [t_start, t_stop) are ignored.
+
+    All spike times are binned at once from their magnitudes, without any
+    per-train arithmetic on quantities.
+
+    If `sparse` is True, a :class:`scipy.sparse.csr_matrix` is returned,
+    otherwise a dense :class:`numpy.ndarray`.
+    '''
+    if not hasattr(bin_size, 'units'):
+        raise ValueError("bin_size must have units")
+    units = bin_size.units
+    if t_start is None:
+        t_start = min(st.t_start.rescale(units) for st in spiketrains)
+    if t_stop is None:
+        t_stop = max(st.t_stop.rescale(units) for st in spiketrains)
+    t_start = float(pq.Quantity(t_start, units).rescale(units).magnitude)
+    t_stop = float(pq.Quantity(t_stop, units).rescale(units).magnitude)
+    width = float(bin_size.magnitude)
+    n_trains = len(spiketrains)
+    n_bins = max(int(np.ceil((t_stop - t_start) / width)), 0)
+
+    # magnitudes of all the spike times, in units of bin_size
+    lengths = np.array([len(st) for st in spiketrains], dtype=np.intp)
+    factors = [float(st.units.rescale(units).magnitude) for st in spiketrains]
+    times = np.empty(lengths.sum(), dtype=np.float64)
+    end = 0
+    for st, factor, length in zip(spiketrains, factors, lengths):
+        np.multiply(st.magnitude, factor, out=times[end:end + length])
+        end += length
+
+    rows = np.repeat(np.arange(n_trains, dtype=np.intp), lengths)
+    bins = np.floor((times - t_start) / width).astype(np.intp)
+    valid = (times >= t_start) & (times < t_stop)
+    flat = rows[valid] * n_bins + bins[valid]
+
+    if not sparse:
+        counts = np.bincount(flat, minlength=n_trains * n_bins)
+        return counts.reshape((n_trains, n_bins))
+
+    import scipy.sparse
+    # spike trains are usually sorted, so this is mostly already in order
+    flat.sort(kind='mergesort')
+    starts = np.flatnonzero(np.diff(flat)) + 1
+    starts = np.concatenate(([0], starts)) if flat.size else starts
+    keys = flat[starts]
+    data = np.diff(np.append(starts, flat.size))
+    indptr = np.searchsorted(keys, np.arange(n_trains + 1) * n_bins)
+    return scipy.sparse.csr_matrix((data, keys % max(n_bins, 1), indptr),
+                                   shape=(n_trains, n_bins))
+
+
 def _new_spiketrain(cls, signal, t_stop, units=None, dtype=None,
                     copy=True, sampling_rate=1.0 * pq.Hz,
                     t_start=0.0 * pq.s, waveforms=None, left_sweep=None,
                     name=None, file_origin=None, description=None,
-                    annotations=None, segment=None, unit=None):
+                    annotations=None, segment=None, unit=None, waveforms_units=None):
     '''
     A function to map :meth:`BaseAnalogSignal.__new__` to function that
     does not do the unit checking. This is needed for :module:`pickle` to work.
+
+    With pickle protocol 5, waveforms is a plain array and waveforms_units its
+    units.
     '''
     if annotations is None:
         annotations = {}
+    if waveforms_units is not None:
+        waveforms = pq.Quantity(waveforms, waveforms_units, copy=False)
     obj = SpikeTrain(signal, t_stop, units, dtype, copy, sampling_rate,
                      t_start, waveforms, left_sweep, name, file_origin,
                      description, **annotations)
@@ -361,6 +428,26 @@ class SpikeTrain(BaseNeo, pq.Quantity):
                                  self.name, self.file_origin, self.description,
                                  self.annotations, self.segment, self.unit)
 
+    def __reduce_ex__(self, protocol):
+        '''
+        Support for pickle protocol 5 and higher: the data and the waveforms
+        are passed as views rather than copies, so that they can be
+        transferred out-of-band (see :class:`pickle.PickleBuffer`), and are
+        not copied again when unpickling.
+        '''
+        if protocol < 5:
+            return self.__reduce__()
+        waveforms, waveforms_units = self.waveforms, None
+        if isinstance(waveforms, pq.Quantity):
+            waveforms, waveforms_units = waveforms.view(np.ndarray), waveforms.units
+        return _new_spiketrain, (self.__class__, self.view(np.ndarray),
+                                 self.t_stop, self.units, self.dtype, False,
+                                 self.sampling_rate, self.t_start,
+                                 waveforms, self.left_sweep,
+                                 self.name, self.file_origin, self.description,
+                                 self.annotations, self.segment, self.unit,
+                                 waveforms_units)
+
     def __array_finalize__(self, obj):
         '''
         This is called every time a new :class:`SpikeTrain` is created.
@@ -577,52 +664,65 @@ class SpikeTrain(BaseNeo, pq.Quantity):
 
         return new_st
 
-    def merge(self, other):
+    def merge(self, *others):
         '''
-        Merge another :class:`SpikeTrain` into this one.
+        Merge one or more other :class:`SpikeTrain` objects into this one.
 
-        The times of the :class:`SpikeTrain` objects combined in one array
-        and sorted.
+        The times of the :class:`SpikeTrain` objects are combined in one
+        array and sorted. The times are concatenated once and, as each
+        :class:`SpikeTrain` is usually already sorted, ordered with a stable
+        run-aware sort, so merging many trains at once (e.g. all units of a
+        tetrode) is much cheaper than merging them pairwise. Waveforms are
+        reordered with the same sorting indices.
 
-        If the attributes of the two :class:`SpikeTrain` are not
+        If the attributes of the :class:`SpikeTrain` objects are not
         compatible, an Exception is raised.
         '''
-        if self.sampling_rate != other.sampling_rate:
-            raise MergeError("Cannot merge, different sampling rates")
-        if self.t_start != other.t_start:
-            raise MergeError("Cannot merge, different t_start")
-        if self.t_stop != other.t_stop:
-            raise MemoryError("Cannot merge, different t_stop")
-        if self.left_sweep != other.left_sweep:
-            raise MemoryError("Cannot merge, different left_sweep")
-        if self.segment != other.segment:
-            raise MergeError("Cannot merge these two signals as they belong to"
-                             " different segments.")
-        if hasattr(self, "lazy_shape"):
-            if hasattr(other, "lazy_shape"):
-                merged_lazy_shape = (self.lazy_shape[0] + other.lazy_shape[0])
-            else:
+        rescaled = []
+        for other in others:
+            if self.sampling_rate != other.sampling_rate:
+                raise MergeError("Cannot merge, different sampling rates")
+            if self.t_start != other.t_start:
+                raise MergeError("Cannot merge, different t_start")
+            if self.t_stop != other.t_stop:
+                raise MergeError("Cannot merge, different t_stop")
+            if self.left_sweep != other.left_sweep:
+                raise MergeError("Cannot merge, different left_sweep")
+            if self.segment != other.segment:
+                raise MergeError("Cannot merge these two signals as they belong to"
+                                 " different segments.")
+            if hasattr(self, "lazy_shape") and not hasattr(other, "lazy_shape"):
                 raise MergeError("Cannot merge a lazy object with a real"
                                  " object.")
-        if other.units != self.units:
-            other = other.rescale(self.units)
-        wfs = [self.waveforms is not None, other.waveforms is not None]
+            if other.units != self.units:
+                other = other.rescale(self.units)
+            rescaled.append(other)
+        trains = [self] + rescaled
+
+        wfs = [train.waveforms is not None for train in trains]
         if any(wfs) and not all(wfs):
             raise MergeError("Cannot merge signal with waveform and signal "
                              "without waveform.")
-        stack = np.concatenate((np.asarray(self), np.asarray(other)))
-        sorting = np.argsort(stack)
-        stack = stack[sorting]
+
+        stack = np.concatenate([np.asarray(train) for train in trains])
+        sorting = None
+        if stack.size > 1 and np.any(stack[1:] < stack[:-1]):
+            # concatenated sorted runs are merged in O(n log k) by the
+            # stable (timsort-based) sorting algorithm
+            sorting = np.argsort(stack, kind='mergesort')
+            stack = stack[sorting]
+
         kwargs = {}
         for name in ("name", "description", "file_origin"):
-            attr_self = getattr(self, name)
-            attr_other = getattr(other, name)
-            if attr_self == attr_other:
-                kwargs[name] = attr_self
+            attrs = [getattr(train, name) for train in trains]
+            if all(attr == attrs[0] for attr in attrs):
+                kwargs[name] = attrs[0]
             else:
-                kwargs[name] = "merge(%s, %s)" % (attr_self, attr_other)
-        merged_annotations = merge_annotations(self.annotations,
-                                               other.annotations)
+                kwargs[name] = "merge(%s)" % ", ".join(str(attr) for attr in attrs)
+        merged_annotations = self.annotations
+        for other in rescaled:
+            merged_annotations = merge_annotations(merged_annotations,
+                                                   other.annotations)
         kwargs.update(merged_annotations)
         train = SpikeTrain(stack, units=self.units, dtype=self.dtype,
                            copy=False, t_start=self.t_start,
@@ -630,15 +730,25 @@ class SpikeTrain(BaseNeo, pq.Quantity):
                            sampling_rate=self.sampling_rate,
                            left_sweep=self.left_sweep, **kwargs)
         if all(wfs):
-            wfs_stack = np.vstack((self.waveforms, other.waveforms))
-            wfs_stack = wfs_stack[sorting]
+            wf_units = getattr(self.waveforms, 'units', None)
+            if wf_units is None:
+                wfs_stack = np.concatenate([train.waveforms for train in trains])
+            else:
+                wfs_stack = pq.Quantity(
+                    np.concatenate([np.asarray(train.waveforms)
+                                    if train.waveforms.units == wf_units
+                                    else train.waveforms.rescale(wf_units).magnitude
+                                    for train in trains]),
+                    units=wf_units, copy=False)
+            if sorting is not None:
+                wfs_stack = wfs_stack[sorting]
             train.waveforms = wfs_stack
         train.segment = self.segment
         if train.segment is not None:
             self.segment.spiketrains.append(train)
 
         if hasattr(self, "lazy_shape"):
-            train.lazy_shape = merged_lazy_shape
+            train.lazy_shape = sum(t.lazy_shape[0] for t in trains)
         return train
 
     @property
@@ -8,10 +8,20 @@ raise an error but a warning.
 
 :attr:`neo.io.iolist` provides a list of successfully imported io classes.
 
+IO modules are imported lazily: the module of an IO class is imported the
+first time the class is accessed (:attr:`neo.io.iolist` imports all of them).
+The list of IOs and their extensions is declared in :mod:`neo.io.registry`.
+
+:func:`neo.io.get_io` guesses the IO from the extension and the first bytes
+of the file (see :mod:`neo.rawio.sniffing`), :func:`neo.io.get_io_candidates`
+gives all the IOs that could read it, ranked by confidence.
+
 Functions:
 
 .. autofunction:: neo.io.get_io
 
+.. autofunction:: neo.io.get_io_candidates
+
 
 Classes:
 
@@ -86,108 +96,50 @@ Classes:
 """
 
 import os.path
+import sys
+
+from neo.io.registry import (io_registry, other_io_registry, io_names, all_io_names,
+                             import_io_class, make_lazy)
+from neo.rawio.sniffing import FormatIndex
+
+__all__ = all_io_names + ['iolist', 'get_io', 'get_io_candidates']
+
+_format_index = FormatIndex((name, extensions) for name, (_, _, extensions)
+                            in io_registry.items())
+
 
-# try to import the neuroshare library.
-# if it is present, use the neuroshareapiio to load neuroshare files
-# if it is not present, use the neurosharectypesio to load files
-try:
-    import neuroshare as ns
-except ImportError as err:
-    from neo.io.neurosharectypesio import NeurosharectypesIO as NeuroshareIO
-    # print("\n neuroshare library not found, loading data with ctypes" )
-    # print("\n to use the API be sure to install the library found at:")
-    # print("\n www.http://pythonhosted.org/neuroshare/")
-
-else:
-    from neo.io.neuroshareapiio import NeuroshareapiIO as NeuroshareIO
-    # print("neuroshare library successfully imported")
-    # print("\n loading with API...")
-
-from neo.io.alphaomegaio import AlphaOmegaIO
-from neo.io.asciisignalio import AsciiSignalIO
-from neo.io.asciispiketrainio import AsciiSpikeTrainIO
-from neo.io.axonio import AxonIO
-from neo.io.blackrockio import BlackrockIO
-from neo.io.blackrockio_v4 import BlackrockIO as OldBlackrockIO
-from neo.io.bci2000io import BCI2000IO
-from neo.io.brainvisionio import BrainVisionIO
-from neo.io.brainwaredamio import BrainwareDamIO
-from neo.io.brainwaref32io import BrainwareF32IO
-from neo.io.brainwaresrcio import BrainwareSrcIO
-from neo.io.elanio import ElanIO
-# from neo.io.elphyio import ElphyIO
-from neo.io.exampleio import ExampleIO
-from neo.io.igorproio import IgorIO
-from neo.io.klustakwikio import KlustaKwikIO
-from neo.io.kwikio import KwikIO
-from neo.io.micromedio import MicromedIO
-from neo.io.hdf5io import NeoHdf5IO
-from neo.io.neomatlabio import NeoMatlabIO
-from neo.io.nestio import NestIO
-from neo.io.neuralynxio import NeuralynxIO
-from neo.io.neuralynxio_v1 import NeuralynxIO as OldNeuralynxIO
-from neo.io.neuroexplorerio import NeuroExplorerIO
-from neo.io.neuroscopeio import NeuroScopeIO
-from neo.io.nixio import NixIO
-from neo.io.nsdfio import NSDFIO
-from neo.io.pickleio import PickleIO
-from neo.io.plexonio import PlexonIO
-from neo.io.pynnio import PyNNNumpyIO
-from neo.io.pynnio import PyNNTextIO
-from neo.io.rawbinarysignalio import RawBinarySignalIO
-from neo.io.spike2io import Spike2IO
-from neo.io.stimfitio import StimfitIO
-from neo.io.tdtio import TdtIO
-from neo.io.winedrio import WinEdrIO
-from neo.io.winwcpio import WinWcpIO
-
-iolist = [
-    AlphaOmegaIO,
-    AsciiSignalIO,
-    AsciiSpikeTrainIO,
-    AxonIO,
-    BCI2000IO,
-    BlackrockIO,
-    BrainVisionIO,
-    BrainwareDamIO,
-    BrainwareF32IO,
-    BrainwareSrcIO,
-    ElanIO,
-    # ElphyIO,
-    ExampleIO,
-    IgorIO,
-    KlustaKwikIO,
-    KwikIO,
-    MicromedIO,
-    NixIO,  # place NixIO before NeoHdf5IO to make it the default for .h5 files
-    NeoHdf5IO,
-    NeoMatlabIO,
-    NestIO,
-    NeuralynxIO,
-    NeuroExplorerIO,
-    NeuroScopeIO,
-    NeuroshareIO,
-    NSDFIO,
-    PickleIO,
-    PlexonIO,
-    PyNNNumpyIO,
-    PyNNTextIO,
-    RawBinarySignalIO,
-    Spike2IO,
-    StimfitIO,
-    TdtIO,
-    WinEdrIO,
-    WinWcpIO
-]
+def _lazy_getattr(name):
+    if name in io_registry or name in other_io_registry:
+        return import_io_class(name)
+    if name == 'iolist':
+        return [getattr(sys.modules[__name__], io_name) for io_name in io_names]
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def get_io_candidates(filename):
+    """
+    Return a list of (IO class, confidence) that could read `filename` (a
+    file or a directory), best first. The guess is based on the filename
+    suffix and on the first bytes of the file, see neo.rawio.sniffing.
+
+    Only the modules of the candidates are imported.
+    """
+    return [(getattr(sys.modules[__name__], name), confidence)
+            for name, confidence in _format_index.rank(filename)]
 
 
 def get_io(filename, *args, **kwargs):
     """
-    Return a Neo IO instance, guessing the type based on the filename suffix.
+    Return a Neo IO instance, guessing the type based on the filename suffix
+    and on the first bytes of the file.
     """
-    extension = os.path.splitext(filename)[1][1:]
-    for io in iolist:
-        if extension in io.extensions:
-            return io(filename, *args, **kwargs)
+    candidates = _format_index.rank(filename)
+    if len(candidates) == 0:
+        extension = os.path.splitext(filename)[1][1:]
+        raise IOError("File extension %s not registered" % extension)
+
+    io = getattr(sys.modules[__name__], candidates[0][0])
+    return io(filename, *args, **kwargs)
+
 
-    raise IOError("File extension %s not registered" % extension)
+make_lazy(__name__)
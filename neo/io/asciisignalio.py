@@ -11,14 +11,20 @@ Author: sgarcia
 """
 
 import csv
+import itertools
 import os
 
 import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.tools import parse_text_values
 from neo.core import AnalogSignal, Segment
 
+# number of lines parsed or written at once by the 'chunked' method and by
+# write_segment
+CHUNK_SIZE = 2 ** 16
+
 
 class AsciiSignalIO(BaseIO):
     """
@@ -56,13 +62,17 @@ class AsciiSignalIO(BaseIO):
             ('unit', {'value': 'V', }),
             ('sampling_rate', {'value': 1000., }),
             ('t_start', {'value': 0., }),
-            ('method', {'value': 'homemade', 'possible': ['genfromtxt', 'csv', 'homemade']}),
+            ('method', {'value': 'homemade',
+                        'possible': ['genfromtxt', 'csv', 'homemade', 'chunked']}),
+            ('chunksize', {'value': CHUNK_SIZE, 'type': int}),
+            ('memmap_filename', {'value': None}),
         ]
     }
     write_params = {
         Segment: [
             ('delimiter', {'value': '\t', 'possible': ['\t', ' ', ',', ';']}),
             ('writetimecolumn', {'value': True, }),
+            ('chunksize', {'value': CHUNK_SIZE, 'type': int}),
         ]
     }
 
@@ -96,7 +106,8 @@ class AsciiSignalIO(BaseIO):
                      unit=pq.V,
 
                      method='genfromtxt',
-
+                     chunksize=CHUNK_SIZE,
+                     memmap_filename=None,
                      ):
         """
         Arguments:
@@ -114,6 +125,14 @@ class AsciiSignalIO(BaseIO):
                         'genfromtxt' use numpy.genfromtxt
                         'csv' use cvs module
                         'homemade' use a intuitive more robust but slow method
+                        'chunked' parse the file by blocks of `chunksize` lines,
+                        keeping only the selected columns, so that the memory
+                        used does not depend on the number of columns not read
+            chunksize : number of lines parsed at once by the 'chunked' method
+            memmap_filename : with the 'chunked' method, the signals are
+                        stored in a numpy.memmap backed by this file instead
+                        of in memory, so that files larger than the memory
+                        can be read
 
         """
         assert not lazy, 'Do not support lazy'
@@ -156,34 +175,117 @@ class AsciiSignalIO(BaseIO):
                     l.remove('')
                 tab.append(l)
             sig = np.array(tab, dtype='f')
+        elif method == 'chunked':
+            columns = usecols
+            if columns is not None and timecolumn is not None:
+                columns = sorted(set(columns) | set([timecolumn]))
+            sig, columns = self._read_chunked(delimiter, columns, skiprows,
+                                              chunksize, memmap_filename)
+        if method != 'chunked':
+            columns = range(sig.shape[1])
 
         if timecolumn is not None:
-            sampling_rate = 1. / np.mean(np.diff(sig[:, timecolumn])) * pq.Hz
-            t_start = sig[0, timecolumn] * pq.s
+            # with the 'chunked' method, sig only holds the selected columns
+            tcol = list(columns).index(timecolumn)
+            sampling_rate = 1. / np.mean(np.diff(sig[:, tcol])) * pq.Hz
+            t_start = sig[0, tcol] * pq.s
 
-        for i in range(sig.shape[1]):
+        for k, i in enumerate(columns):
             if timecolumn == i:
                 continue
             if usecols is not None and i not in usecols:
                 continue
 
-            signal = sig[:, i] * unit
+            if method == 'chunked' and unit.magnitude == 1:
+                # keep a view on the parsed array (or memmap), do not copy
+                anaSig = AnalogSignal(sig[:, k:k + 1], units=unit.units,
+                                      copy=False,
+                                      sampling_rate=sampling_rate,
+                                      t_start=t_start, channel_index=i,
+                                      name='Column %d' % i)
+            else:
+                signal = sig[:, k] * unit
 
-            anaSig = AnalogSignal(signal, sampling_rate=sampling_rate,
-                                  t_start=t_start, channel_index=i,
-                                  name='Column %d' % i)
+                anaSig = AnalogSignal(signal, sampling_rate=sampling_rate,
+                                      t_start=t_start, channel_index=i,
+                                      name='Column %d' % i)
 
             seg.analogsignals.append(anaSig)
 
         seg.create_many_to_one_relationship()
         return seg
 
+    def _read_chunked(self, delimiter, columns, skiprows, chunksize,
+                      memmap_filename):
+        """
+        Parse the file by blocks of `chunksize` lines into a preallocated
+        float32 array (or a memmap) holding only the selected `columns`.
+
+        Returns the array and the list of the columns it contains.
+        """
+        # upper bound of the number of rows, without parsing the file
+        nrows = self._count_lines() - skiprows
+        with open(self.filename, 'r') as fid:
+            for l in range(skiprows):
+                fid.readline()
+            sig = None
+            n = 0
+            while True:
+                lines = list(itertools.islice(fid, chunksize))
+                if not lines:
+                    break
+                text = ''.join(lines)
+                if delimiter.strip():
+                    text = text.replace(delimiter, ' ')
+                if sig is None:
+                    first = [line for line in lines if line.strip()]
+                    if not first:
+                        continue
+                    ncols = len(first[0].replace(delimiter, ' ').split())
+                    if columns is None:
+                        columns = list(range(ncols))
+                    shape = (max(nrows, 0), len(columns))
+                    if memmap_filename is None:
+                        sig = np.empty(shape, dtype='f')
+                    else:
+                        sig = np.memmap(memmap_filename, dtype='f',
+                                        mode='w+', shape=shape)
+                values = parse_text_values(text, np.float64, self.filename)
+                if values.size % ncols:
+                    raise ValueError("Each line of %s should contain %d "
+                                     "values" % (self.filename, ncols))
+                values = values.reshape(-1, ncols)
+                sig[n:n + values.shape[0]] = values[:, columns]
+                n += values.shape[0]
+        if sig is None:
+            if columns is None:
+                columns = []
+            return np.empty((0, len(columns)), dtype='f'), columns
+        return sig[:n], columns
+
+    def _count_lines(self):
+        """
+        Number of lines in the file, counting a last line without end of line
+        """
+        count = 0
+        last = b'\n'
+        with open(self.filename, 'rb') as fid:
+            while True:
+                block = fid.read(2 ** 24)
+                if not block:
+                    break
+                count += block.count(b'\n')
+                last = block[-1:]
+        if last != b'\n':
+            count += 1
+        return count
+
     def write_segment(self, segment,
                       delimiter='\t',
 
                       skiprows=0,
                       writetimecolumn=True,
-
+                      chunksize=CHUNK_SIZE,
                       ):
         """
         Write a segment and AnalogSignal in a text file.
@@ -191,15 +293,27 @@ class AsciiSignalIO(BaseIO):
          **Arguments**
             delimiter  :  columns delimiter in file  '\t' or one space or two space or ',' or ';'
             writetimecolumn :  True or Flase write time vector as first column
+            chunksize : number of lines formatted and written at once, which
+                        bounds the memory used in addition to the signals
         """
         if skiprows:
             raise NotImplementedError('skiprows values other than 0 are not ' +
                                       'supported')
-        l = []
-        if writetimecolumn is not None:
-            l.append(segment.analogsignals[0].times[:, np.newaxis])
-        for anaSig in segment.analogsignals:
-            l.append(anaSig.magnitude[:, np.newaxis])
-        sigs = np.concatenate(l, axis=1)
-        # print sigs.shape
-        np.savetxt(self.filename, sigs, delimiter=delimiter)
+        if not segment.analogsignals:
+            open(self.filename, 'w').close()
+            return
+        sigs = [anaSig.magnitude.reshape(anaSig.shape[0], -1)
+                for anaSig in segment.analogsignals]
+        if writetimecolumn:
+            times = segment.analogsignals[0].times.rescale('s').magnitude
+            sigs.insert(0, times[:, np.newaxis])
+        nrows = sigs[0].shape[0]
+        if any(sig.shape[0] != nrows for sig in sigs):
+            raise ValueError("All the AnalogSignals of the segment must have "
+                             "the same length")
+        with open(self.filename, 'wb') as fid:
+            for start in range(0, nrows, chunksize):
+                stop = min(start + chunksize, nrows)
+                block = np.concatenate([sig[start:stop] for sig in sigs],
+                                       axis=1)
+                np.savetxt(fid, block, delimiter=delimiter)
@@ -14,6 +14,10 @@ you have one.
 The DAM file also does not divide up data into Blocks, so only a single
 Block is returned..
 
+The headers of the Segments are scanned once by
+:class:`neo.rawio.BrainwareDamRawIO`, so a single Segment can be read
+without reading the traces of the others.
+
 Brainware was developed by Dr. Jan Schnupp and is availabe from
 Tucker Davis Technologies, Inc.
 http://www.tdt.com/downloads.htm
@@ -44,6 +48,9 @@ from neo.core import (AnalogSignal, Block,
 # need to subclass BaseIO
 from neo.io.baseio import BaseIO
 
+# the file is scanned and read by the rawio
+from neo.rawio.brainwaredamrawio import BrainwareDamRawIO
+
 
 class BrainwareDamIO(BaseIO):
     """
@@ -53,6 +60,9 @@ class BrainwareDamIO(BaseIO):
     automatically close the file after reading.
     The read method is the same as read_block.
 
+    The read_segment method returns a single Segment, given its position in
+    the file (seg_index).
+
     Note:
 
     The file format does not contain a sampling rate.  The sampling rate
@@ -82,11 +92,12 @@ class BrainwareDamIO(BaseIO):
     supported_objects = [Block, ChannelIndex,
                          Segment, AnalogSignal]
 
-    readable_objects = [Block]
+    readable_objects = [Block, Segment]
     writeable_objects = []
 
     has_header = False
     is_streameable = False
+    support_lazy = True
 
     # This is for GUI stuff: a definition for parameters when reading.
     # This dict should be keyed by object (`Block`). Each entry is a list
@@ -95,7 +106,8 @@ class BrainwareDamIO(BaseIO):
     # and 'label' (for a descriptive name).
     # Note that if the highest-level object requires parameters,
     # common_io_test will be skipped.
-    read_params = {Block: []}
+    read_params = {Block: [],
+                   Segment: [('seg_index', {'value': 0})]}
 
     # do not support write so no GUI stuff
     write_params = None
@@ -112,29 +124,28 @@ class BrainwareDamIO(BaseIO):
         BaseIO.__init__(self)
         self._path = filename
         self._filename = os.path.basename(filename)
-        self._fsrc = None
+        self._rawio = None
 
     def read(self, lazy=False, **kargs):
         '''
         Reads raw data file "fname" generated with BrainWare
         '''
-        assert not lazy, 'Do not support lazy'
-        return self.read_block(lazy=lazy)
+        return self.read_block(lazy=lazy, **kargs)
 
     def read_block(self, lazy=False, **kargs):
         '''
         Reads a block from the raw data file "fname" generated
         with BrainWare
-        '''
-        assert not lazy, 'Do not support lazy'
 
+        If lazy is True, the AnalogSignals are empty and only their shape
+        (lazy_shape) is read.
+        '''
         # there are no keyargs implemented to so far.  If someone tries to pass
         # them they are expecting them to do something or making a mistake,
         # neither of which should pass silently
         if kargs:
             raise NotImplementedError('This method does not have any '
                                       'arguments implemented yet')
-        self._fsrc = None
 
         block = Block(file_origin=self._filename)
 
@@ -147,82 +158,32 @@ class BrainwareDamIO(BaseIO):
         # load objects into their containers
         block.channel_indexes.append(chx)
 
-        # open the file
-        with open(self._path, 'rb') as fobject:
-            # while the file is not done keep reading segments
-            while True:
-                seg = self._read_segment(fobject)
-                # if there are no more Segments, stop
-                if not seg:
-                    break
+        for seg_index in range(self._get_rawio().segment_count(0)):
+            seg = self.read_segment(lazy=lazy, seg_index=seg_index)
 
-                # store the segment and signals
-                seg.analogsignals[0].channel_index = chx
-                block.segments.append(seg)
-
-        # remove the file object
-        self._fsrc = None
+            # store the segment and signals
+            seg.analogsignals[0].channel_index = chx
+            block.segments.append(seg)
 
         block.create_many_to_one_relationship()
         return block
 
-    # -------------------------------------------------------------------------
-    # -------------------------------------------------------------------------
-    #   IMPORTANT!!!
-    #   These are private methods implementing the internal reading mechanism.
-    #   Due to the way BrainWare DAM files are structured, they CANNOT be used
-    #   on their own.  Calling these manually will almost certainly alter your
-    #   position in the file in an unrecoverable manner, whether they throw
-    #   an exception or not.
-    # -------------------------------------------------------------------------
-    # -------------------------------------------------------------------------
-
-    def _read_segment(self, fobject):
+    def read_segment(self, lazy=False, seg_index=0):
         '''
-        Read a single segment with a single analogsignal
+        Reads a single Segment, by its position in the file.
 
-        Returns the segment or None if there are no more segments
+        Only the trace of this Segment is read from the file.
         '''
-
-        try:
-            # float64 -- start time of the AnalogSignal
-            t_start = np.fromfile(fobject, dtype=np.float64, count=1)[0]
-        except IndexError:
-            # if there are no more Segments, return
-            return False
-
-        # int16 -- index of the stimulus parameters
-        seg_index = np.fromfile(fobject, dtype=np.int16, count=1)[0].tolist()
-
-        # int16 -- number of stimulus parameters
-        numelements = np.fromfile(fobject, dtype=np.int16, count=1)[0]
-
-        # read the name strings for the stimulus parameters
-        paramnames = []
-        for _ in range(numelements):
-            # unit8 -- the number of characters in the string
-            numchars = np.fromfile(fobject, dtype=np.uint8, count=1)[0]
-
-            # char * numchars -- a single name string
-            name = np.fromfile(fobject, dtype=np.uint8, count=numchars)
-
-            # exclude invalid characters
-            name = str(name[name >= 32].view('c').tostring())
-
-            # add the name to the list of names
-            paramnames.append(name)
-
-        # float32 * numelements -- the values for the stimulus parameters
-        paramvalues = np.fromfile(fobject, dtype=np.float32, count=numelements)
-
-        # combine parameter names and the parameters as a dict
-        params = dict(zip(paramnames, paramvalues))
-
-        # int32 -- the number elements in the AnalogSignal
-        numpts = np.fromfile(fobject, dtype=np.int32, count=1)[0]
+        rawio = self._get_rawio()
+        t_start = rawio._segments['t_start'][seg_index]
+        stim_index = rawio._segments['index'][seg_index].tolist()
+        params = rawio._params[seg_index]
 
         # int16 * numpts -- the AnalogSignal itself
-        signal = np.fromfile(fobject, dtype=np.int16, count=numpts)
+        if lazy:
+            signal = np.array([], dtype=np.int16)
+        else:
+            signal = rawio.get_segment_signal(seg_index)
 
         sig = AnalogSignal(signal.astype(np.float) * pq.mV,
                            t_start=t_start * pq.d,
@@ -230,11 +191,23 @@ class BrainwareDamIO(BaseIO):
                            sampling_period=1. * pq.s,
                            copy=False)
         # Note: setting the sampling_period to 1 s is arbitrary
+        if lazy:
+            sig.lazy_shape = (rawio.get_signal_size(0, seg_index), )
 
         # load the AnalogSignal and parameters into a new Segment
         seg = Segment(file_origin=self._filename,
-                      index=seg_index,
+                      index=stim_index,
                       **params)
         seg.analogsignals = [sig]
 
         return seg
+
+    def _get_rawio(self):
+        '''
+        Return the BrainwareDamRawIO of the file, which scans the headers of
+        all the Segments the first time it is called.
+        '''
+        if self._rawio is None:
+            self._rawio = BrainwareDamRawIO(filename=self._path)
+            self._rawio.parse_header()
+        return self._rawio
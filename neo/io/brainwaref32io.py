@@ -41,6 +41,9 @@ from neo.core import Block, ChannelIndex, Segment, SpikeTrain, Unit
 # need to subclass BaseIO
 from neo.io.baseio import BaseIO
 
+# the file is scanned and read by the rawio
+from neo.rawio.brainwaref32rawio import BrainwareF32RawIO
+
 
 class BrainwareF32IO(BaseIO):
     '''
@@ -50,17 +53,9 @@ class BrainwareF32IO(BaseIO):
     automatically close the file after reading.
     The read method is the same as read_block.
 
-    The read_all_blocks method automatically reads all Blocks.  It will
-    automatically close the file after reading.
-
-    The read_next_block method will return one Block each time it is called.
-    It will automatically close the file and reset to the first Block
-    after reading the last block.
-    Call the close method to close the file and reset this method
-    back to the first Block.
-
-    The isopen property tells whether the file is currently open and
-    reading or closed.
+    The read_segment method returns a single Segment, given its position in
+    the file (seg_index).  The file is scanned for the start of the Segments
+    the first time, by :class:`neo.rawio.BrainwareF32RawIO`.
 
     Note 1:
         There is always only one ChannelIndex.  BrainWare stores the
@@ -87,11 +82,12 @@ class BrainwareF32IO(BaseIO):
     supported_objects = [Block, ChannelIndex,
                          Segment, SpikeTrain, Unit]
 
-    readable_objects = [Block]
+    readable_objects = [Block, Segment]
     writeable_objects = []
 
     has_header = False
     is_streameable = False
+    support_lazy = True
 
     # This is for GUI stuff: a definition for parameters when reading.
     # This dict should be keyed by object (`Block`). Each entry is a list
@@ -100,7 +96,8 @@ class BrainwareF32IO(BaseIO):
     # and 'label' (for a descriptive name).
     # Note that if the highest-level object requires parameters,
     # common_io_test will be skipped.
-    read_params = {Block: []}
+    read_params = {Block: [],
+                   Segment: [('seg_index', {'value': 0})]}
 
     # does not support write so no GUI stuff
     write_params = None
@@ -117,16 +114,7 @@ class BrainwareF32IO(BaseIO):
         BaseIO.__init__(self)
         self._path = filename
         self._filename = path.basename(filename)
-
-        self._fsrc = None
-
-        self._blk = None
-        self.__unit = None
-
-        self.__t_stop = None
-        self.__params = None
-        self.__seg = None
-        self.__spiketimes = None
+        self._rawio = None
 
     def read(self, lazy=False, **kargs):
         '''
@@ -138,159 +126,65 @@ class BrainwareF32IO(BaseIO):
         '''
         Reads a block from the simple spike data file "fname" generated
         with BrainWare
-        '''
-        assert not lazy, 'Do not support lazy'
 
+        If lazy is True, the SpikeTrains are empty and only their shape
+        (lazy_shape) is read.
+        '''
         # there are no keyargs implemented to so far.  If someone tries to pass
         # them they are expecting them to do something or making a mistake,
         # neither of which should pass silently
         if kargs:
             raise NotImplementedError('This method does not have any '
                                       'argument implemented yet')
-        self._fsrc = None
 
-        self._blk = Block(file_origin=self._filename)
-        block = self._blk
+        block = Block(file_origin=self._filename)
 
         # create the objects to store other objects
         chx = ChannelIndex(file_origin=self._filename,
                            index=np.array([], dtype=np.int))
-        self.__unit = Unit(file_origin=self._filename)
+        unit = Unit(file_origin=self._filename)
 
         # load objects into their containers
         block.channel_indexes.append(chx)
-        chx.units.append(self.__unit)
+        chx.units.append(unit)
 
-        # initialize values
-        self.__t_stop = None
-        self.__params = None
-        self.__seg = None
-        self.__spiketimes = None
-
-        # open the file
-        with open(self._path, 'rb') as self._fsrc:
-            res = True
-            # while the file is not done keep reading segments
-            while res:
-                res = self.__read_id()
+        for seg_index in range(self._get_rawio().segment_count(0)):
+            seg = self.read_segment(lazy=lazy, seg_index=seg_index)
+            unit.spiketrains.append(seg.spiketrains[0])
+            block.segments.append(seg)
 
         block.create_many_to_one_relationship()
-
-        # cleanup attributes
-        self._fsrc = None
-
-        self._blk = None
-
-        self.__t_stop = None
-        self.__params = None
-        self.__seg = None
-        self.__spiketimes = None
-
         return block
 
-    # -------------------------------------------------------------------------
-    # -------------------------------------------------------------------------
-    #   IMPORTANT!!!
-    #   These are private methods implementing the internal reading mechanism.
-    #   Due to the way BrainWare DAM files are structured, they CANNOT be used
-    #   on their own.  Calling these manually will almost certainly alter your
-    #   position in the file in an unrecoverable manner, whether they throw
-    #   an exception or not.
-    # -------------------------------------------------------------------------
-    # -------------------------------------------------------------------------
-
-    def __read_id(self):
-        '''
-        Read the next ID number and do the appropriate task with it.
-
-        Returns nothing.
-        '''
-        try:
-            # float32 -- ID of the first data sequence
-            objid = np.fromfile(self._fsrc, dtype=np.float32, count=1)[0]
-        except IndexError:
-            # if we have a previous segment, save it
-            self.__save_segment()
-
-            # if there are no more Segments, return
-            return False
-
-        if objid == -2:
-            self.__read_condition()
-        elif objid == -1:
-            self.__read_segment()
-        else:
-            self.__spiketimes.append(objid)
-        return True
-
-    def __read_condition(self):
+    def read_segment(self, lazy=False, seg_index=0):
         '''
-        Read the parameter values for a single stimulus condition.
-
-        Returns nothing.
+        Reads a single Segment, by its position in the file.
         '''
-        # float32 -- SpikeTrain length in ms
-        self.__t_stop = np.fromfile(self._fsrc, dtype=np.float32, count=1)[0]
-
-        # float32 -- number of stimulus parameters
-        numelements = int(np.fromfile(self._fsrc, dtype=np.float32,
-                                      count=1)[0])
-
-        # [float32] * numelements -- stimulus parameter values
-        paramvals = np.fromfile(self._fsrc, dtype=np.float32,
-                                count=numelements).tolist()
+        rawio = self._get_rawio()
+        params = rawio._params[seg_index]
+        seg = Segment(file_origin=self._filename, **params)
 
-        # organize the parameers into a dictionary with arbitrary names
-        paramnames = ['Param%s' % i for i in range(len(paramvals))]
-        self.__params = dict(zip(paramnames, paramvals))
-
-    def __read_segment(self):
-        '''
-        Setup the next Segment.
-
-        Returns nothing.
-        '''
-        # if we have a previous segment, save it
-        self.__save_segment()
-
-        # create the segment
-        self.__seg = Segment(file_origin=self._filename,
-                             **self.__params)
-
-        # create an empy array to save the spike times
-        # this needs to be converted to a SpikeTrain before it can be used
-        self.__spiketimes = []
-
-    def __save_segment(self):
-        '''
-        Write the segment to the Block if it exists
-        '''
-        # if this is the beginning of the first condition, then we don't want
-        # to save, so exit
-        # but set __seg from None to False so we know next time to create a
-        # segment even if there are no spike in the condition
-        if self.__seg is None:
-            self.__seg = False
-            return
-
-        if not self.__seg:
-            # create dummy values if there are no SpikeTrains in this condition
-            self.__seg = Segment(file_origin=self._filename,
-                                 **self.__params)
-            self.__spiketimes = []
-
-        times = pq.Quantity(self.__spiketimes, dtype=np.float32,
-                            units=pq.ms)
+        if lazy:
+            times = np.array([], dtype=np.float32)
+        else:
+            times = rawio.get_spike_timestamps(0, seg_index, 0)
+        times = pq.Quantity(times, dtype=np.float32, units=pq.ms)
+        t_stop = rawio._t_stops[seg_index]
         train = SpikeTrain(times,
-                           t_start=0 * pq.ms, t_stop=self.__t_stop * pq.ms,
+                           t_start=0 * pq.ms, t_stop=t_stop * pq.ms,
                            file_origin=self._filename)
+        if lazy:
+            train.lazy_shape = (rawio.spike_count(0, seg_index, 0), )
 
-        self.__seg.spiketrains = [train]
-        self.__unit.spiketrains.append(train)
-        self._blk.segments.append(self.__seg)
+        seg.spiketrains = [train]
+        return seg
 
-        # set an empty segment
-        # from now on, we need to set __seg to False rather than None so
-        # that if there is a condition with no SpikeTrains we know
-        # to create an empty Segment
-        self.__seg = False
+    def _get_rawio(self):
+        '''
+        Return the BrainwareF32RawIO of the file, which locates the conditions
+        and Segments the first time it is called.
+        '''
+        if self._rawio is None:
+            self._rawio = BrainwareF32RawIO(filename=self._path)
+            self._rawio.parse_header()
+        return self._rawio
@@ -39,6 +39,7 @@ from datetime import datetime, timedelta
 from itertools import chain
 import logging
 import os.path
+import struct
 import sys
 
 # numpy and quantities are already required by neo
@@ -51,22 +52,45 @@ from neo.core import (Block, Event,
 
 # need to subclass BaseIO
 from neo.io.baseio import BaseIO
+from neo.io.tools import cached_array
 
 LOGHANDLER = logging.StreamHandler()
 
 PY_VER = sys.version_info[0]
 
+# kinds of objects in the index of a file (see BrainwareSrcIndexer)
+INDEX_BLOCK = 0
+INDEX_SEGMENT = 1
+INDEX_SPIKETRAIN = 2
+
+SRC_INDEX_DTYPE = [('kind', 'u1'),
+                   ('block', 'i4'),
+                   ('offset', 'i8'),
+                   ('damaged', '?'),
+                   ('timestamp', 'f8')]
+
+# size in bytes, without the ID code, of the spikes with a fixed length
+_FIXED_SPIKE_SIZES = {29079: 4 + 40 + 1,
+                      29081: 4 + 40}
+
 
 class BrainwareSrcIO(BaseIO):
     """
     Class for reading Brainware Spike ReCord files with the extension '.src'
 
-    The read_block method returns the first Block of the file.  It will
-    automatically close the file after reading.
+    The read_block method returns the first Block of the file, or the Block
+    with the given index.  It will automatically close the file after reading.
     The read method is the same as read_block.
 
-    The read_all_blocks method automatically reads all Blocks.  It will
-    automatically close the file after reading.
+    The read_all_blocks method automatically reads all Blocks, or only those
+    recorded during a given time range.  It will automatically close the file
+    after reading.
+
+    The read_index method returns the position in the file of each Block,
+    Segment and SpikeTrain (see BrainwareSrcIndexer).  It is used by
+    read_block and read_all_blocks to go directly to the Blocks they read.
+    If cache is True, the index is saved next to the file and reused as long
+    as it is newer than the file.
 
     The read_next_block method will return one Block each time it is called.
     It will automatically close the file and reset to the first Block
@@ -101,6 +125,7 @@ class BrainwareSrcIO(BaseIO):
         >>> blk1 = srcfile.read()
         >>> blk2 = srcfile.read_block()
         >>> blks = srcfile.read_all_blocks()
+        >>> blk3 = srcfile.read_block(index=2)
         >>> print blk1.segments
         >>> print blk1.segments[0].spiketrains
         >>> print blk1.units
@@ -140,10 +165,12 @@ class BrainwareSrcIO(BaseIO):
 
     mode = 'file'
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, cache=False):
         """
         Arguments:
             filename: the filename
+            cache: if True, the index of the file is saved in a .npy file
+                   next to it
         """
         BaseIO.__init__(self)
 
@@ -187,6 +214,11 @@ class BrainwareSrcIO(BaseIO):
         # this stores an empty SpikeTrain which is used in various places.
         self._default_spiketrain = None
 
+        self.cache = cache
+
+        # this stores the index of the file once it has been read
+        self._index = None
+
     @property
     def _isopen(self):
         """
@@ -231,11 +263,15 @@ class BrainwareSrcIO(BaseIO):
         """
         return self.read_block(lazy=lazy, **kargs)
 
-    def read_block(self, lazy=False, **kargs):
+    def read_block(self, lazy=False, index=0, **kargs):
         """
-        Reads the first Block from the Spike ReCording file "filename"
+        Reads a Block from the Spike ReCording file "filename"
         generated with BrainWare.
 
+        index is the position of the Block in the file, the first Block by
+        default.  Reading the first Block does not need the index of the
+        file.
+
         If you wish to read more than one Block, please use read_all_blocks.
         """
         assert not lazy, 'Do not support lazy'
@@ -247,6 +283,15 @@ class BrainwareSrcIO(BaseIO):
             raise NotImplementedError('This method does not have any '
                                       'arguments implemented yet')
 
+        self.close()
+        if index:
+            blocks = self._block_rows()
+            if index < 0:
+                index += len(blocks)
+            if not 0 <= index < len(blocks):
+                raise IndexError('Block index out of range')
+            self._seek_block(blocks[index])
+
         blockobj = self.read_next_block()
         self.close()
         return blockobj
@@ -323,11 +368,17 @@ class BrainwareSrcIO(BaseIO):
 
         return blockobj
 
-    def read_all_blocks(self, lazy=False, **kargs):
+    def read_all_blocks(self, lazy=False, timestamp_range=None, **kargs):
         """
         Reads all Blocks from the Spike ReCording file "filename"
         generated with BrainWare.
 
+        If timestamp_range is a (start, stop) tuple of datetime objects, only
+        the Blocks with at least one SpikeTrain recorded between start and
+        stop (inclusive) are read.  Their positions are taken from the index
+        of the file, so the other Blocks are not read at all.  start or stop
+        can be None.
+
         The progress in the file is reset and the file closed then opened again
         prior to reading.
 
@@ -344,6 +395,17 @@ class BrainwareSrcIO(BaseIO):
                                       'argument implemented yet')
 
         self.close()
+
+        if timestamp_range is not None:
+            blocks = []
+            for row in self._block_rows(timestamp_range):
+                self._seek_block(row)
+                try:
+                    blocks.append(self.read_next_block())
+                finally:
+                    self.close()
+            return blocks
+
         self._opensrc()
 
         # Read each Block.
@@ -359,6 +421,50 @@ class BrainwareSrcIO(BaseIO):
 
         return blocks
 
+    def read_index(self):
+        """
+        Return the index of the file: the positions of its Blocks, Segments
+        and SpikeTrains.  See BrainwareSrcIndexer for the fields of the index.
+
+        The index is built the first time it is needed, or loaded from the
+        cache if enabled.
+        """
+        if self._index is not None:
+            return self._index
+
+        self._index = cached_array(self._filename,
+                                   lambda: BrainwareSrcIndexer(self._filename).run(),
+                                   cache=self.cache,
+                                   cache_filename=self._filename + '.index.npy')
+        return self._index
+
+    def _block_rows(self, timestamp_range=None):
+        """
+        Return the rows of the index for all the Blocks, or for the Blocks
+        with SpikeTrains recorded during timestamp_range.
+        """
+        index = self.read_index()
+        blocks = index[index['kind'] == INDEX_BLOCK]
+        if timestamp_range is None:
+            return blocks
+
+        trains = index[index['kind'] == INDEX_SPIKETRAIN]
+        start, stop = timestamp_range
+        keep = np.ones(len(trains), dtype=bool)
+        if start is not None:
+            keep &= trains['timestamp'] >= convert_datetime_to_brainwaresrc(start)
+        if stop is not None:
+            keep &= trains['timestamp'] <= convert_datetime_to_brainwaresrc(stop)
+        return blocks[np.in1d(blocks['block'], trains['block'][keep])]
+
+    def _seek_block(self, row):
+        """
+        Open the file and go to the Block described by the index row.
+        """
+        self._opensrc()
+        self._fsrc.seek(row['offset'])
+        self._damaged = bool(row['damaged'])
+
     def _convert_timestamp(self, timestamp, start_date=datetime(1899, 12, 30)):
         """
         _convert_timestamp(timestamp, start_date) - convert a timestamp in
@@ -1525,6 +1631,269 @@ class BrainwareSrcIO(BaseIO):
                 }
 
 
+class BrainwareSrcIndexer(object):
+    """
+    Find the byte offsets of the Blocks, Segments and SpikeTrains of a
+    Brainware SRC file in one pass.
+
+    The data sequences are walked the same way BrainwareSrcIO reads them, but
+    their content is only skipped over, without creating any neo object.
+    Runs of spikes with a fixed length, which make up most of the file, are
+    skipped at once.
+
+    Usage:
+        >>> index = BrainwareSrcIndexer('multi_500ms_mulitrep_ch1.src').run()
+
+    The index is a structured array with one row per object and the fields:
+        kind: INDEX_BLOCK, INDEX_SEGMENT or INDEX_SPIKETRAIN
+        block: the index of the Block containing the object
+        offset: the position of the object in the file
+        damaged: True if lists of sequences have unreliable lengths at the
+                 position of the object (see BrainwareSrcIO.__read_list)
+        timestamp: the time stamp of SpikeTrains (days since 1899.12.30),
+                   NaN for other objects
+    """
+
+    def __init__(self, filename):
+        self._buf = np.memmap(filename, dtype=np.uint8, mode='r')
+        self._pos = 0
+        self._damaged = False
+        self._block = 0
+        self._rows = []
+
+    def run(self):
+        """
+        Index the file and return the index.
+        """
+        while True:
+            self._add_row(INDEX_BLOCK, self._pos)
+            # same stop condition as BrainwareSrcIO.read_next_block
+            result = []
+            while result is not None and result != 0:
+                result = self._skip_by_id()
+            if result is None:
+                break
+            self._block += 1
+        return np.array(self._rows, dtype=SRC_INDEX_DTYPE)
+
+    def _add_row(self, kind, offset, timestamp=np.nan):
+        self._rows.append((kind, self._block, offset, self._damaged, timestamp))
+
+    def _read(self, fmt):
+        """
+        Read one value of the struct format fmt at the current position.
+        """
+        fmt = '<' + fmt
+        try:
+            value, = struct.unpack_from(fmt, self._buf, self._pos)
+        except struct.error:
+            raise EOFError
+        self._pos += struct.calcsize(fmt)
+        return value
+
+    def _peek_id(self):
+        value = self._read('H')
+        self._pos -= 2
+        return value
+
+    def _skip(self, nbytes):
+        self._pos += nbytes
+
+    def _skip_count(self, itemsize, count):
+        # np.fromfile reads the whole file for negative counts
+        if count < 0:
+            self._pos = len(self._buf)
+        else:
+            self._pos += itemsize * count
+
+    def _skip_by_id(self):
+        """
+        Counterpart of BrainwareSrcIO._read_by_id: return None at the end of
+        the file, 0 at the end of a Block and a list otherwise.
+        """
+        start = self._pos
+        try:
+            seqid = self._read('H')
+        except EOFError:
+            return None
+
+        skipfunc = self._SKIP_DICT.get(seqid)
+        if skipfunc is None:
+            if seqid <= 0:
+                return 0
+            return []
+
+        try:
+            skipfunc(self, start)
+        except EOFError:
+            return None
+        return []
+
+    def _skip_annotations(self, start):
+        numelements = self._read('h')
+        if not numelements:
+            return
+        for _ in range(numelements):
+            self._skip(1)
+            self._skip(self._read('B'))
+        self._skip_count(4, numelements)
+
+    def _skip_annotations_old(self, start):
+        self._skip(2 * 14)
+
+    def _skip_comment(self):
+        self._skip(8)
+        self._skip(self._read('h'))
+        self._skip(self._read('h'))
+
+    def _skip_list(self, start=None):
+        numelements = self._read('h')
+        self._skip(4)
+
+        if numelements == 0:
+            return
+
+        if not self._damaged and numelements < 0:
+            self._damaged = True
+
+        if not self._damaged:
+            if not self._skip_spike_run(numelements):
+                for _ in range(numelements):
+                    self._skip_sequence()
+        else:
+            seqidinit = self._peek_id()
+            while self._peek_id() == seqidinit:
+                self._skip_sequence()
+
+    def _skip_sequence(self):
+        # inside a sequence, reaching the end of the file stops the indexing
+        if self._skip_by_id() is None:
+            raise EOFError
+
+    def _skip_spike_run(self, numelements):
+        """
+        Skip numelements spikes at once if they all are spikes with a fixed
+        length of the same version.
+        """
+        seqid = self._peek_id()
+        if seqid not in _FIXED_SPIKE_SIZES:
+            return False
+        stride = _FIXED_SPIKE_SIZES[seqid] + 2
+        stop = self._pos + stride * numelements
+        if stop > len(self._buf):
+            return False
+        heads = self._buf[self._pos:stop].reshape(numelements, stride)[:, :2]
+        seqids = heads[:, 0].astype(np.uint16) | (heads[:, 1].astype(np.uint16) << 8)
+        if np.any(seqids != seqid):
+            return False
+        self._pos = stop
+        return True
+
+    def _skip_segment(self, start):
+        self._add_row(INDEX_SEGMENT, start)
+        for _ in range(3):
+            self._skip_sequence()
+        self._skip(4)
+
+    def _skip_segment_list(self, start=None):
+        self._skip(1)
+        self._skip_list()
+        self._skip(1)
+        for _ in range(self._read('h')):
+            self._skip_comment()
+
+    def _skip_segment_list_v8(self, start=None):
+        self._skip_segment_list_var()
+        if self._peek_id() in self._SKIP_DICT:
+            self._skip_sequence()
+        else:
+            self._skip_unit_list()
+        self._skip(2)
+
+    def _skip_segment_list_v9(self, start):
+        self._skip_segment_list_v8()
+        self._skip(3)
+
+    def _skip_segment_list_var(self, start=None):
+        self._skip(4)
+        self._skip_segment_list()
+
+    def _skip_spike_fixed(self, start):
+        self._skip(_FIXED_SPIKE_SIZES[29079])
+
+    def _skip_spike_fixed_old(self, start):
+        self._skip(_FIXED_SPIKE_SIZES[29081])
+
+    def _skip_spike_var(self, start):
+        self._skip(4 + self._read('B') + 1)
+
+    def _skip_spiketrain_indexed(self, start):
+        self._skip(4)
+        self._skip_spiketrain_timestamped(start)
+
+    def _skip_spiketrain_timestamped(self, start):
+        self._add_row(INDEX_SPIKETRAIN, start, self._read('d'))
+        self._skip_list()
+
+    def _skip_unit(self, start):
+        self._skip_unit_unsorted(start)
+        self._skip(4 * 18 + 9)
+
+    def _skip_unit_list(self, start=None):
+        for _ in range(self._read('h')):
+            self._skip(2 + 8)
+            for _ in range(self._read('h')):
+                self._skip(2)
+                numelements3 = self._read('h')
+                self._skip_count(10, numelements3)
+                self._skip_count(4 * 20, numelements3)
+
+    def _skip_unit_list_timestamped(self, start):
+        self._skip(8)
+        self._skip_unit_list()
+
+    def _skip_unit_old(self, start):
+        self._skip_unit_unsorted(start)
+        self._skip(108 + 9)
+
+    def _skip_unit_unsorted(self, start):
+        self._skip(2)
+        self._skip(self._read('H'))
+        self._skip(4 * 5)
+        self._skip_sequence()
+
+    def _skip_information(self, start):
+        self._skip(34)
+
+    def _skip_information_old(self, start):
+        self._skip(4)
+
+    # same ID codes as BrainwareSrcIO._ID_DICT
+    _SKIP_DICT = {29079: _skip_spike_fixed,
+                  29081: _skip_spike_fixed_old,
+                  29082: _skip_list,
+                  29083: _skip_list,
+                  29084: _skip_unit_unsorted,
+                  29091: _skip_list,
+                  29093: _skip_list,
+                  29099: _skip_annotations_old,
+                  29100: _skip_information_old,
+                  29106: _skip_segment,
+                  29107: _skip_unit_old,
+                  29109: _skip_annotations,
+                  29110: _skip_spiketrain_timestamped,
+                  29112: _skip_segment_list,
+                  29113: _skip_information,
+                  29114: _skip_segment_list_var,
+                  29115: _skip_spike_var,
+                  29116: _skip_unit,
+                  29117: _skip_segment_list_v8,
+                  29119: _skip_unit_list_timestamped,
+                  29120: _skip_segment_list_v9,
+                  29121: _skip_spiketrain_indexed
+                  }
+
+
 def convert_brainwaresrc_timestamp(timestamp,
                                    start_date=datetime(1899, 12, 30)):
     """
@@ -1540,6 +1909,17 @@ def convert_brainwaresrc_timestamp(timestamp,
     return start_date + timedelta(days=timestamp)
 
 
+def convert_datetime_to_brainwaresrc(date,
+                                     start_date=datetime(1899, 12, 30)):
+    """
+    convert_datetime_to_brainwaresrc(date, start_date) - convert a python
+    datetime object to a timestamp in brainware src file units.
+
+    This is the inverse of convert_brainwaresrc_timestamp.
+    """
+    return (date - start_date).total_seconds() / 86400.
+
+
 if __name__ == '__main__':
     # run this when calling the file directly as a benchmark
     from neo.test.iotest.test_brainwaresrcio import FILES_TO_TEST
@@ -46,6 +46,17 @@ class NeoHdf5IO(BaseIO):
     Class for reading HDF5 format files created by Neo version 0.4 or earlier.
 
     Writing to HDF5 is not supported by this IO; we recommend using NixIO for this.
+
+    With ``lazy=True``, the data of the signals, spike trains, events and epochs
+    are not read. :meth:`load_lazy_object` then reads them, optionally only for
+    a time window and, for signals, a subset of the channels, using hyperslab
+    selections so that the rest of the file is not read::
+
+        >>> io = NeoHdf5IO('archive.h5')
+        >>> block = io.read_block(lazy=True)
+        >>> sig = io.load_lazy_object(block.segments[3].analogsignals[0],
+        ...                           t_start=2 * pq.s, t_stop=4 * pq.s,
+        ...                           channel_indexes=[5])
     """
     supported_objects = objectlist
     readable_objects = objectlist
@@ -54,6 +65,7 @@ class NeoHdf5IO(BaseIO):
     mode = 'file'
     is_readable = True
     is_writable = False
+    support_lazy = True
 
     def __init__(self, filename):
         if not HAVE_H5PY:
@@ -61,6 +73,7 @@ class NeoHdf5IO(BaseIO):
         BaseIO.__init__(self, filename=filename)
         self._data = h5py.File(filename, 'r')
         self.object_refs = {}
+        self._lazy = False
 
     def read_all_blocks(self, lazy=False, merge_singles=True, **kargs):
         """
@@ -71,9 +84,8 @@ class NeoHdf5IO(BaseIO):
          `AnalogSignal` objects into multichannel objects, and similarly for single `Epoch`,
          `Event` and `IrregularlySampledSignal` objects.
         """
-        assert not lazy, 'Do not support lazy'
-
         self.merge_singles = merge_singles
+        self._lazy = lazy
 
         blocks = []
         for name, node in self._data.items():
@@ -85,8 +97,7 @@ class NeoHdf5IO(BaseIO):
         """
         Load the first block in the file.
         """
-        assert not lazy, 'Do not support lazy'
-        return self.read_all_blocks(lazy=lazy)[0]
+        return self.read_all_blocks(lazy=lazy, **kargs)[0]
 
     def _read_block(self, node):
         attributes = self._get_standard_attributes(node)
@@ -177,63 +188,167 @@ class NeoHdf5IO(BaseIO):
         segment.block = parent
         return segment
 
-    def _read_analogsignalarray(self, node, parent):
+    def _read_analogsignalarray(self, node, parent, t_start=None, t_stop=None,
+                                channel_indexes=None):
         attributes = self._get_standard_attributes(node)
         # todo: handle channel_index
         sampling_rate = self._get_quantity(node["sampling_rate"])
-        t_start = self._get_quantity(node["t_start"])
-        signal = AnalogSignal(self._get_quantity(node["signal"]),
-                              sampling_rate=sampling_rate, t_start=t_start,
+        sig_t_start = self._get_quantity(node["t_start"])
+        if self._lazy:
+            data = self._get_lazy_quantity(node["signal"])
+        else:
+            n_samples = node["signal"].shape[0]
+            i, j = self._signal_window(n_samples, sig_t_start, sampling_rate,
+                                       t_start, t_stop)
+            data = self._get_quantity(node["signal"], slice(i, j), channel_indexes)
+            sig_t_start = sig_t_start + (i / sampling_rate).rescale(sig_t_start.units)
+        signal = AnalogSignal(data, sampling_rate=sampling_rate, t_start=sig_t_start,
                               **attributes)
         signal.segment = parent
+        if self._lazy:
+            self._set_lazy(signal, node, self._signal_shape(node["signal"]))
         self.object_refs[node.attrs["object_ref"]] = signal
         return signal
 
-    def _read_analogsignal(self, node, parent):
-        return self._read_analogsignalarray(node, parent)
+    def _read_analogsignal(self, node, parent, t_start=None, t_stop=None,
+                           channel_indexes=None):
+        return self._read_analogsignalarray(node, parent, t_start, t_stop, channel_indexes)
 
-    def _read_irregularlysampledsignal(self, node, parent):
+    def _read_irregularlysampledsignal(self, node, parent, t_start=None, t_stop=None,
+                                       channel_indexes=None):
         attributes = self._get_standard_attributes(node)
-        signal = IrregularlySampledSignal(times=self._get_quantity(node["times"]),
-                                          signal=self._get_quantity(node["signal"]),
-                                          **attributes)
+        if self._lazy:
+            times = self._get_lazy_quantity(node["times"])
+            data = self._get_lazy_quantity(node["signal"])
+        else:
+            window = self._times_window(node["times"], t_start, t_stop)
+            times = self._get_quantity(node["times"], window)
+            data = self._get_quantity(node["signal"], window, channel_indexes)
+        signal = IrregularlySampledSignal(times=times, signal=data, **attributes)
         signal.segment = parent
+        if self._lazy:
+            self._set_lazy(signal, node, self._signal_shape(node["signal"]))
         return signal
 
-    def _read_spiketrain(self, node, parent):
+    def _read_spiketrain(self, node, parent, t_start=None, t_stop=None):
         attributes = self._get_standard_attributes(node)
-        t_start = self._get_quantity(node["t_start"])
-        t_stop = self._get_quantity(node["t_stop"])
+        st_t_start = self._get_quantity(node["t_start"])
+        st_t_stop = self._get_quantity(node["t_stop"])
         # todo: handle sampling_rate, waveforms, left_sweep
-        spiketrain = SpikeTrain(self._get_quantity(node["times"]),
-                                t_start=t_start, t_stop=t_stop,
+        if self._lazy:
+            times = self._get_lazy_quantity(node["times"])
+        else:
+            times = self._get_quantity(node["times"],
+                                       self._times_window(node["times"], t_start, t_stop))
+        spiketrain = SpikeTrain(times, t_start=st_t_start, t_stop=st_t_stop,
                                 **attributes)
         spiketrain.segment = parent
+        if self._lazy:
+            self._set_lazy(spiketrain, node, node["times"].shape)
         self.object_refs[node.attrs["object_ref"]] = spiketrain
         return spiketrain
 
-    def _read_epocharray(self, node, parent):
+    def _read_epocharray(self, node, parent, t_start=None, t_stop=None):
         attributes = self._get_standard_attributes(node)
-        times = self._get_quantity(node["times"])
-        durations = self._get_quantity(node["durations"])
-        labels = node["labels"].value
+        if self._lazy:
+            times = self._get_lazy_quantity(node["times"])
+            durations = self._get_lazy_quantity(node["durations"])
+            labels = np.empty((0,), dtype=node["labels"].dtype)
+        else:
+            window = self._times_window(node["times"], t_start, t_stop)
+            times = self._get_quantity(node["times"], window)
+            durations = self._get_quantity(node["durations"], window)
+            labels = node["labels"][window]
         epoch = Epoch(times=times, durations=durations, labels=labels, **attributes)
         epoch.segment = parent
+        if self._lazy:
+            self._set_lazy(epoch, node, node["times"].shape)
         return epoch
 
-    def _read_epoch(self, node, parent):
-        return self._read_epocharray(node, parent)
+    def _read_epoch(self, node, parent, t_start=None, t_stop=None):
+        return self._read_epocharray(node, parent, t_start, t_stop)
 
-    def _read_eventarray(self, node, parent):
+    def _read_eventarray(self, node, parent, t_start=None, t_stop=None):
         attributes = self._get_standard_attributes(node)
-        times = self._get_quantity(node["times"])
-        labels = node["labels"].value
+        if self._lazy:
+            times = self._get_lazy_quantity(node["times"])
+            labels = np.empty((0,), dtype=node["labels"].dtype)
+        else:
+            window = self._times_window(node["times"], t_start, t_stop)
+            times = self._get_quantity(node["times"], window)
+            labels = node["labels"][window]
         event = Event(times=times, labels=labels, **attributes)
         event.segment = parent
+        if self._lazy:
+            self._set_lazy(event, node, node["times"].shape)
         return event
 
-    def _read_event(self, node, parent):
-        return self._read_eventarray(node, parent)
+    def _read_event(self, node, parent, t_start=None, t_stop=None):
+        return self._read_eventarray(node, parent, t_start, t_stop)
+
+    def load_lazy_object(self, obj, t_start=None, t_stop=None, channel_indexes=None):
+        """
+        Load the data of an object read with ``lazy=True`` and return a new,
+        fully loaded, object.
+
+        Only the data between `t_start` and `t_stop` and, for AnalogSignals and
+        IrregularlySampledSignals, the channels in `channel_indexes` are read
+        from the file.
+        """
+        if not hasattr(obj, '_hdf5_nodes'):
+            raise ValueError("%s was not read lazily by this IO" % obj.__class__.__name__)
+        is_signal = isinstance(obj, (AnalogSignal, IrregularlySampledSignal))
+        if channel_indexes is not None and not is_signal:
+            raise ValueError("Only signals have channels")
+        nodes = [self._data[name] for name in obj._hdf5_nodes]
+
+        selections = [(node, None) for node in nodes]
+        if channel_indexes is not None:
+            channel_indexes = np.asarray(channel_indexes, dtype=int)
+            counts = [self._signal_shape(node["signal"])[1] for node in nodes]
+            offsets = np.cumsum([0] + counts)
+            if np.any(channel_indexes < 0) or np.any(channel_indexes >= offsets[-1]):
+                raise IndexError("channel index out of range")
+            # the merged signal has the channels of each node in turn
+            node_indexes = np.searchsorted(offsets, channel_indexes, side='right') - 1
+            selections = []
+            loaded = []
+            for k, node in enumerate(nodes):
+                columns = np.unique(channel_indexes[node_indexes == k] - offsets[k])
+                if columns.size:
+                    selections.append((node, columns))
+                    loaded.append(columns + offsets[k])
+            order = np.searchsorted(np.concatenate(loaded), channel_indexes)
+
+        read = {AnalogSignal: self._read_analogsignalarray,
+                IrregularlySampledSignal: self._read_irregularlysampledsignal,
+                SpikeTrain: self._read_spiketrain,
+                Epoch: self._read_epocharray,
+                Event: self._read_eventarray}[obj.__class__]
+        lazy, object_refs = self._lazy, self.object_refs
+        self._lazy, self.object_refs = False, {}
+        try:
+            parts = []
+            for node, columns in selections:
+                if is_signal:
+                    parts.append(read(node, obj.segment, t_start, t_stop, columns))
+                else:
+                    parts.append(read(node, obj.segment, t_start, t_stop))
+        finally:
+            self._lazy, self.object_refs = lazy, object_refs
+
+        new_obj = parts[0]
+        for part in parts[1:]:
+            new_obj = new_obj.merge(part)
+        if channel_indexes is not None and np.any(order != np.arange(len(order))):
+            new_obj = new_obj[:, order]
+        for name in ('name', 'description', 'file_origin'):
+            setattr(new_obj, name, getattr(obj, name))
+        new_obj.annotations = dict(obj.annotations)
+        new_obj.segment = obj.segment
+        if hasattr(obj, 'channel_index'):
+            new_obj.channel_index = obj.channel_index
+        return new_obj
 
     def _read_recordingchannelgroup(self, node, parent):
         # todo: handle Units
@@ -298,7 +413,10 @@ class NeoHdf5IO(BaseIO):
                 obj = objects.pop(0)
                 try:
                     combined_obj_ref = merged_objects[-1].annotations['object_ref']
-                    merged_objects[-1] = merged_objects[-1].merge(obj)
+                    if self._lazy:
+                        merged_objects[-1] = self._merge_lazy(merged_objects[-1], obj)
+                    else:
+                        merged_objects[-1] = merged_objects[-1].merge(obj)
                     merged_objects[-1].annotations['object_ref'] = combined_obj_ref + \
                                                                    "-" + obj.annotations[
                                                                        'object_ref']
@@ -310,11 +428,81 @@ class NeoHdf5IO(BaseIO):
         else:
             return objects
 
-    def _get_quantity(self, node):
-        value = node.value
+    def _merge_lazy(self, obj, other):
+        """
+        Merge two lazy objects, checking what can be checked without reading the data
+        """
+        if isinstance(obj, (AnalogSignal, IrregularlySampledSignal)):
+            if obj.lazy_shape[0] != other.lazy_shape[0]:
+                raise MergeError("Cannot merge these two signals as their lengths differ.")
+            if isinstance(obj, IrregularlySampledSignal):
+                if not np.array_equal(self._data[obj._hdf5_nodes[0]]["times"].value,
+                                      self._data[other._hdf5_nodes[0]]["times"].value):
+                    raise MergeError("Cannot merge these two signals as the sample "
+                                     "times differ.")
+            lazy_shape = (obj.lazy_shape[0], obj.lazy_shape[1] + other.lazy_shape[1])
+        else:
+            lazy_shape = (obj.lazy_shape[0] + other.lazy_shape[0],)
+        merged = obj.merge(other)
+        merged.lazy_shape = lazy_shape
+        merged._hdf5_nodes = obj._hdf5_nodes + other._hdf5_nodes
+        return merged
+
+    def _set_lazy(self, obj, node, lazy_shape):
+        obj.lazy_shape = tuple(lazy_shape)
+        # nodes holding the data of the object, in the order they are merged
+        obj._hdf5_nodes = [node.name]
+
+    @staticmethod
+    def _signal_shape(dataset):
+        """Shape (samples, channels) of a signal dataset"""
+        if dataset.ndim == 1:
+            return (dataset.shape[0], 1)
+        return dataset.shape
+
+    @staticmethod
+    def _signal_window(n_samples, sig_t_start, sampling_rate, t_start, t_stop):
+        """Indexes of the first and last samples of a signal in [t_start, t_stop]"""
+        def index(t, default):
+            if t is None:
+                return default
+            i = np.rint(((t - sig_t_start) * sampling_rate).simplified.magnitude)
+            return int(min(max(i, 0), n_samples))
+        i = index(t_start, 0)
+        return i, max(index(t_stop, n_samples), i)
+
+    def _times_window(self, node, t_start, t_stop):
+        """Slice of the (sorted) times of `node` within [t_start, t_stop]"""
+        if t_start is None and t_stop is None:
+            return slice(None)
+        times = self._get_quantity(node)
+        i, j = 0, len(times)
+        if t_start is not None:
+            i = np.searchsorted(times, t_start.rescale(times.units), side='left')
+        if t_stop is not None:
+            j = np.searchsorted(times, t_stop.rescale(times.units), side='right')
+        return slice(int(i), int(max(i, j)))
+
+    def _get_units(self, node):
         unit_str = [x for x in node.attrs.keys() if "unit" in x][0].split("__")[1]
-        units = getattr(pq, unit_str)
-        return value * units
+        return getattr(pq, unit_str)
+
+    def _get_quantity(self, node, selection=None, channel_indexes=None):
+        """
+        Read a dataset, or the `selection` of its rows, as a quantity.
+        `channel_indexes` selects (sorted) columns of 2D datasets.
+        """
+        if selection is None:
+            value = node.value
+        elif channel_indexes is None or node.ndim == 1:
+            value = node[selection]
+        else:
+            value = node[selection, list(channel_indexes)]
+        return value * self._get_units(node)
+
+    def _get_lazy_quantity(self, node):
+        """An empty quantity with the dtype, units and trailing dimensions of a dataset"""
+        return np.empty((0,) + node.shape[1:], dtype=node.dtype) * self._get_units(node)
 
     def _get_standard_attributes(self, node):
         """Retrieve attributes"""
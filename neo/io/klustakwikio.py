@@ -22,17 +22,9 @@ import shutil
 # note neo.core need only numpy and quantitie
 import numpy as np
 
-try:
-    import matplotlib.mlab as mlab
-except ImportError as err:
-    HAVE_MLAB = False
-    MLAB_ERR = err
-else:
-    HAVE_MLAB = True
-    MLAB_ERR = None
-
 # I need to subclass BaseIO
 from neo.io.baseio import BaseIO
+from neo.io.tools import cached_array, parse_text_values
 
 from neo.core import Block, Segment, Unit, SpikeTrain
 
@@ -98,20 +90,22 @@ class KlustaKwikIO(BaseIO):
     # Operates on directories
     mode = 'file'
 
-    def __init__(self, filename, sampling_rate=30000.):
+    def __init__(self, filename, sampling_rate=30000., cache=False):
         """Create a new IO to operate on a directory
 
         filename : the directory to contain the files
         basename : string, basename of KlustaKwik format, or None
         sampling_rate : in Hz, necessary because the KlustaKwik files
             stores data in samples.
+        cache : if True, the content of each .fet and .clu file is saved
+            in a binary .npy file next to it once parsed, and read from
+            there as long as it is more recent than the text file.
         """
-        if not HAVE_MLAB:
-            raise MLAB_ERR
         BaseIO.__init__(self)
         # self.filename = os.path.normpath(filename)
         self.filename, self.basename = os.path.split(os.path.abspath(filename))
         self.sampling_rate = float(sampling_rate)
+        self.cache = cache
 
         # error check
         if not os.path.isdir(self.filename):
@@ -181,7 +175,7 @@ class KlustaKwikIO(BaseIO):
                 st.annotations['group'] = group
 
                 # put features in
-                if len(features) != 0:
+                if features.size != 0:
                     st.annotations['waveform_features'] = features
 
                 # Link
@@ -194,51 +188,64 @@ class KlustaKwikIO(BaseIO):
     # Helper hidden functions for reading
     def _load_spike_times(self, fetfilename):
         """Reads and returns the spike times and features"""
-        with open(fetfilename, mode='r') as f:
-            # Number of clustering features is integer on first line
-            nbFeatures = int(f.readline().strip())
+        data = self._load_cached(fetfilename, self._parse_fet)
 
-            # Each subsequent line consists of nbFeatures values, followed by
-            # the spike time in samples.
-            names = ['fet%d' % n for n in range(nbFeatures)]
-            names.append('spike_time')
+        # the last column is the spike time in samples, the others are
+        # the features
+        return data[:, -1], data[:, :-1]
 
-            # Load into recarray
-            data = mlab.csv2rec(f, names=names, skiprows=1, delimiter=' ')
+    def _load_unit_id(self, clufilename):
+        """Reads and return the cluster ids as int32"""
+        data = self._load_cached(clufilename, self._parse_clu)
 
-        # get features
-        features = np.array([data['fet%d' % n] for n in range(nbFeatures)])
+        # the first value is the number of clusters on this tetrode
+        nbClusters, cluster_ids = data[0], data[1:]
+        if len(np.unique(cluster_ids)) != nbClusters:
+            logging.warning("warning: I got %d clusters instead of %d in %s" % (
+                len(np.unique(cluster_ids)), nbClusters, clufilename))
 
-        # Return the spike_time column
-        return data['spike_time'], features.transpose()
+        return cluster_ids
 
-    def _load_unit_id(self, clufilename):
-        """Reads and return the cluster ids as int32"""
-        with open(clufilename, mode='r') as f:
-            # Number of clusters on this tetrode is integer on first line
-            nbClusters = int(f.readline().strip())
+    def _load_cached(self, filename, parse):
+        """Returns the array parsed from a text file by `parse`, using the
+        binary cache of the file if enabled"""
+        return cached_array(filename, lambda: parse(filename), cache=self.cache)
 
-            # Read each cluster name as a string
-            cluster_names = f.readlines()
+    @staticmethod
+    def _parse_fet(fetfilename):
+        """Parses a .fet file into a (spikes, features + 1) array"""
+        with open(fetfilename, mode='r') as f:
+            # Number of clustering features is integer on first line
+            nbFeatures = int(f.readline().strip())
 
-        # Convert names to integers
+            # Each subsequent line consists of nbFeatures values, followed by
+            # the spike time in samples.
+            values = parse_text_values(f.read(), np.float64, fetfilename)
+
+        if values.size % (nbFeatures + 1):
+            raise ValueError("Each line of %s should contain %d values" %
+                             (fetfilename, nbFeatures + 1))
+        # the spec requires integer values, but features are sometimes
+        # saved as floats
+        if np.all(np.mod(values, 1) == 0):
+            values = values.astype(np.int64)
+        return values.reshape(-1, nbFeatures + 1)
+
+    @staticmethod
+    def _parse_clu(clufilename):
+        """Parses a .clu file into an int32 array: the number of clusters
+        followed by the cluster id of each spike"""
         # I think the spec requires cluster names to be integers, but
         # this code could be modified to support string names which are
         # auto-numbered.
+        with open(clufilename, mode='r') as f:
+            text = f.read()
         try:
-            cluster_ids = [int(name) for name in cluster_names]
+            return parse_text_values(text, np.int32, clufilename)
         except ValueError:
             raise ValueError(
                 "Could not convert cluster name to integer in %s" % clufilename)
 
-        # convert to numpy array and error check
-        cluster_ids = np.array(cluster_ids, dtype=np.int32)
-        if len(np.unique(cluster_ids)) != nbClusters:
-            logging.warning("warning: I got %d clusters instead of %d in %s" % (
-                len(np.unique(cluster_ids)), nbClusters, clufilename))
-
-        return cluster_ids
-
     # writing functions
     def write_block(self, block):
         """Write spike times and unit ids to disk.
@@ -323,18 +330,16 @@ class KlustaKwikIO(BaseIO):
                                      "supposed to be %d but I got %d" %
                                      (n_features, all_features.shape[1]))
 
-                # Write features and time for each spike
-                for stt, features in zip(spike_times_in_samples, all_features):
-                    # first features
-                    for val in features:
-                        fetfilehandle.write(str(val))
-                        fetfilehandle.write(" ")
-
-                    # now time
-                    fetfilehandle.write("%d\n" % stt)
-
-                    # and cluster id
-                    clufilehandle.write("%d\n" % cluster)
+                # Write features and time for each spike, first features
+                # then time, and the cluster ids
+                fmt = ' '.join(['%s'] * n_features + ['%d'])
+                np.savetxt(fetfilehandle,
+                           np.column_stack([all_features,
+                                            spike_times_in_samples]),
+                           fmt=fmt)
+                np.savetxt(clufilehandle,
+                           np.full(len(spike_times_in_samples), cluster),
+                           fmt='%d')
 
         # We're done, so close the files
         self._close_all_files()
@@ -57,6 +57,7 @@ class KwikIO(BaseIO):
 
     is_readable = True  # This class can only read data
     is_writable = False  # write is not supported
+    support_lazy = True
 
     supported_objects = [Block, Segment, SpikeTrain, AnalogSignal,
                          ChannelIndex]
@@ -90,6 +91,9 @@ class KwikIO(BaseIO):
         model = kwik.KwikModel(self.filename)  # TODO this group is loaded twice
         self.models = [kwik.KwikModel(self.filename, channel_group=grp)
                        for grp in model.channel_groups]
+        # spike indexes grouped by cluster, built once per channel group
+        self._cluster_indexes = {}
+        self._read_options = {}
 
     def read_block(self,
                    lazy=False,
@@ -97,11 +101,15 @@ class KwikIO(BaseIO):
                    cluster_group=None,
                    raw_data_units='uV',
                    get_raw_data=False,
+                   waveforms_subsample=None,
                    ):
         """
         Reads a block with segments and channel_indexes
 
         Parameters:
+        lazy: bool, default = False
+            Do not load the spike times and the raw traces, use
+            :meth:`load_lazy_object` to load them
         get_waveforms: bool, default = False
             Wether or not to get the waveforms
         get_raw_data: bool, default = False
@@ -111,9 +119,13 @@ class KwikIO(BaseIO):
         cluster_group: str, default = None
             Which clusters to load, possibilities are "noise", "unsorted",
             "good", if None all is loaded.
+        waveforms_subsample: int, default = None
+            If not None, the waveforms are not read with the spike trains,
+            see :meth:`read_spiketrain`
         """
-        assert not lazy, 'Do not support lazy'
-
+        self._read_options = {'get_waveforms': get_waveforms,
+                              'raw_data_units': raw_data_units,
+                              'waveforms_subsample': waveforms_subsample}
         blk = Block()
         seg = Segment(file_origin=self.filename)
         blk.segments += [seg]
@@ -125,7 +137,6 @@ class KwikIO(BaseIO):
                                index=model.channels,
                                **group_meta)
             blk.channel_indexes.append(chx)
-            clusters = model.spike_clusters
             for cluster_id in model.cluster_ids:
                 meta = model.cluster_metadata[cluster_id]
                 if cluster_group is None:
@@ -134,8 +145,10 @@ class KwikIO(BaseIO):
                     continue
                 sptr = self.read_spiketrain(cluster_id=cluster_id,
                                             model=model,
+                                            lazy=lazy,
                                             get_waveforms=get_waveforms,
-                                            raw_data_units=raw_data_units)
+                                            raw_data_units=raw_data_units,
+                                            waveforms_subsample=waveforms_subsample)
                 sptr.annotations.update({'cluster_group': meta,
                                          'group_id': model.channel_group})
                 sptr.channel_index = chx
@@ -147,7 +160,8 @@ class KwikIO(BaseIO):
                 unit.channel_index = chx
                 seg.spiketrains.append(sptr)
             if get_raw_data:
-                ana = self.read_analogsignal(model, units=raw_data_units)
+                ana = self.read_analogsignal(model, units=raw_data_units,
+                                             lazy=lazy)
                 ana.channel_index = chx
                 seg.analogsignals.append(ana)
 
@@ -156,26 +170,62 @@ class KwikIO(BaseIO):
         blk.create_many_to_one_relationship()
         return blk
 
-    def read_analogsignal(self, model, units='uV', lazy=False):
+    def read_analogsignal(self, model, units='uV', lazy=False,
+                          i_start=None, i_stop=None, channel_indexes=None,
+                          dtype='float64'):
         """
         Reads analogsignals
 
+        Only the samples between `i_start` and `i_stop` and the channels in
+        `channel_indexes` are read from the memmap of the raw data and
+        scaled, so chunks of long recordings can be read one at a time.
+
         Parameters:
         units: str, default = "uV"
             SI units of the raw trace according to voltage_gain given to klusta
+        i_start, i_stop: int, default = None
+            First and last (excluded) samples to read, None for the start
+            and the end of the traces
+        channel_indexes: list of int, default = None
+            Channels to read, None for all
+        dtype: str, default = "float64"
+            Type of the scaled samples, "float32" halves the memory used
         """
-        assert not lazy, 'Do not support lazy'
+        traces = model.traces
+        n_samples, n_channels = traces.shape
+        i_start, i_stop, _ = slice(i_start, i_stop).indices(n_samples)
+        i_stop = max(i_start, i_stop)
+        sampling_rate = model.sample_rate * pq.Hz
+        t_start = (i_start / sampling_rate).rescale('s')
+        annotations = {'group_id': model.channel_group}
+        if lazy:
+            if channel_indexes is not None:
+                n_channels = len(channel_indexes)
+            ana = AnalogSignal(np.array([]), units=units, copy=False,
+                               sampling_rate=sampling_rate, t_start=t_start,
+                               file_origin=model.metadata['raw_data_files'],
+                               **annotations)
+            ana.lazy_shape = (i_stop - i_start, n_channels)
+            return ana
 
-        arr = model.traces[:] * model.metadata['voltage_gain']
-        ana = AnalogSignal(arr, sampling_rate=model.sample_rate * pq.Hz,
-                           units=units,
-                           file_origin=model.metadata['raw_data_files'])
+        arr = traces[i_start:i_stop]
+        if channel_indexes is not None:
+            arr = arr[:, channel_indexes]
+        # scale a copy of the chunk in place, the whole traces are never
+        # converted at once
+        arr = np.array(arr, dtype=dtype)
+        arr *= model.metadata['voltage_gain']
+        ana = AnalogSignal(arr, sampling_rate=sampling_rate,
+                           units=units, t_start=t_start, copy=False,
+                           file_origin=model.metadata['raw_data_files'],
+                           **annotations)
         return ana
 
     def read_spiketrain(self, cluster_id, model,
                         lazy=False,
                         get_waveforms=True,
-                        raw_data_units=None
+                        raw_data_units=None,
+                        waveforms_subsample=None,
                         ):
         """
         Reads sorted spiketrains
@@ -187,6 +237,10 @@ class KwikIO(BaseIO):
             Which cluster to load, according to cluster id from klusta
         model: klusta.kwik.KwikModel
             A KwikModel object obtained by klusta.kwik.KwikModel(fname)
+        waveforms_subsample: int, default = None
+            If not None, the waveforms are not read and the waveforms
+            attribute is left to None: use :meth:`read_waveforms` to read
+            the waveforms of at most this many spikes of the cluster
         """
         try:
             if ((not (cluster_id in model.cluster_ids))):
@@ -194,18 +248,129 @@ class KwikIO(BaseIO):
         except ValueError:
             print("Exception: cluster_id (%d) not found !! " % cluster_id)
             return
-        clusters = model.spike_clusters
-        idx = np.nonzero(clusters == cluster_id)
-        if get_waveforms:
-            w = model.all_waveforms[idx]
-            # klusta: num_spikes, samples_per_spike, num_chans = w.shape
-            w = w.swapaxes(1, 2)
-            w = pq.Quantity(w, raw_data_units)
-        else:
-            w = None
+        idx = self._get_cluster_spikes(model, cluster_id)
+        if lazy:
+            sptr = SpikeTrain(np.array([]), t_stop=model.duration, units='s',
+                              copy=False,
+                              sampling_rate=model.sample_rate * pq.Hz,
+                              file_origin=self.filename,
+                              **{'cluster_id': cluster_id})
+            sptr.lazy_shape = idx.shape
+            return sptr
+        w = None
+        if get_waveforms and waveforms_subsample is None:
+            w = self._read_waveforms(model, idx, raw_data_units)
         sptr = SpikeTrain(times=model.spike_times[idx],
                           t_stop=model.duration, waveforms=w, units='s',
                           sampling_rate=model.sample_rate * pq.Hz,
                           file_origin=self.filename,
                           **{'cluster_id': cluster_id})
         return sptr
+
+    def read_waveforms(self, cluster_id, model, subsample=None,
+                       raw_data_units='uV'):
+        """
+        Reads the waveforms of a cluster
+
+        Parameters:
+        cluster_id: int,
+            Which cluster to load, according to cluster id from klusta
+        model: klusta.kwik.KwikModel
+            A KwikModel object obtained by klusta.kwik.KwikModel(fname)
+        subsample: int, default = None
+            If the cluster has more spikes than this, only the waveforms of
+            this many spikes, evenly spaced in the cluster, are read
+        raw_data_units: str, default = "uV"
+            SI units of the raw trace according to voltage_gain given to klusta
+
+        Returns the waveforms, with shape (spikes, channels, samples) as the
+        waveforms attribute of a SpikeTrain, and the indexes of their spikes
+        in the spike train returned by :meth:`read_spiketrain`.
+        """
+        idx = self._get_cluster_spikes(model, cluster_id)
+        index = np.arange(idx.size)
+        if subsample is not None and idx.size > subsample:
+            index = np.unique(np.linspace(0, idx.size - 1, subsample)
+                              .round().astype(int))
+        return self._read_waveforms(model, idx[index], raw_data_units), index
+
+    def load_lazy_object(self, obj, t_start=None, t_stop=None,
+                         channel_indexes=None):
+        """
+        Load the data of an object read with ``lazy=True`` and return a new,
+        fully loaded, object.
+
+        For an AnalogSignal, only the samples between `t_start` and `t_stop`
+        and the channels in `channel_indexes` are read from the raw data.
+        SpikeTrains are read with the options given to :meth:`read_block`.
+        """
+        if not hasattr(obj, 'lazy_shape'):
+            raise ValueError("%s was not read lazily" % obj.__class__.__name__)
+        models = dict((model.channel_group, model) for model in self.models)
+        model = models[obj.annotations['group_id']]
+        if isinstance(obj, AnalogSignal):
+            sampling_rate = obj.sampling_rate
+            i_start = i_stop = None
+            if t_start is not None:
+                i_start = int(((t_start - obj.t_start) * sampling_rate)
+                              .simplified.magnitude.round())
+                i_start = max(i_start, 0)
+            if t_stop is not None:
+                i_stop = int(((t_stop - obj.t_start) * sampling_rate)
+                             .simplified.magnitude.round())
+                i_stop = max(i_stop, 0)
+            new_obj = self.read_analogsignal(
+                model, units=obj.units.dimensionality.string,
+                i_start=i_start, i_stop=i_stop,
+                channel_indexes=channel_indexes)
+        elif isinstance(obj, SpikeTrain):
+            if channel_indexes is not None:
+                raise ValueError("Only AnalogSignals have channels")
+            new_obj = self.read_spiketrain(obj.annotations['cluster_id'], model,
+                                           **self._read_options)
+            if t_start is not None or t_stop is not None:
+                new_obj = new_obj.time_slice(t_start, t_stop)
+        else:
+            raise ValueError("%s can not be loaded lazily" %
+                             obj.__class__.__name__)
+        for key, value in obj.annotations.items():
+            new_obj.annotations.setdefault(key, value)
+        new_obj.name = obj.name
+        new_obj.segment = obj.segment
+        new_obj.channel_index = obj.channel_index
+        if isinstance(obj, SpikeTrain):
+            new_obj.unit = obj.unit
+        return new_obj
+
+    def _get_cluster_spikes(self, model, cluster_id):
+        """
+        Return the (sorted) indexes of the spikes of a cluster.
+        """
+        group_id = model.channel_group
+        if group_id not in self._cluster_indexes:
+            self._cluster_indexes[group_id] = _cluster_index(model.spike_clusters)
+        order, offsets = self._cluster_indexes[group_id]
+        start, stop = offsets.get(cluster_id, (0, 0))
+        return order[start:stop]
+
+    def _read_waveforms(self, model, idx, raw_data_units):
+        w = model.all_waveforms[idx]
+        # klusta: num_spikes, samples_per_spike, num_chans = w.shape
+        w = w.swapaxes(1, 2)
+        return pq.Quantity(w, raw_data_units)
+
+
+def _cluster_index(spike_clusters):
+    """
+    Group the spikes by cluster with a single stable argsort.
+
+    Returns the spike indexes sorted by cluster, and a dict giving for each
+    cluster id the (start, stop) slice of its spikes in these indexes.
+    Within a cluster, the spikes keep their original (time) order.
+    """
+    spike_clusters = np.asarray(spike_clusters)
+    order = np.argsort(spike_clusters, kind='mergesort')
+    cluster_ids, starts = np.unique(spike_clusters[order], return_index=True)
+    stops = np.append(starts[1:], order.size)
+    offsets = dict(zip(cluster_ids.tolist(), zip(starts.tolist(), stops.tolist())))
+    return order, offsets
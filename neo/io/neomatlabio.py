@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
 Module for reading/writing Neo objects in MATLAB format (.mat) versions
-5 to 7.2.
+5 to 7.3.
 
 This module is a bridge for MATLAB users who want to adopt the Neo object
 representation. The nomenclature is the same but using Matlab structs and cell
@@ -16,6 +16,7 @@ Author: sgarcia, Robert Pröpper
 from datetime import datetime
 from distutils import version
 import re
+import time
 
 import numpy as np
 import quantities as pq
@@ -37,6 +38,16 @@ else:
         HAVE_SCIPY = True
         SCIPY_ERR = None
 
+# check h5py, needed for MATLAB 7.3 files
+try:
+    import h5py
+except ImportError as err:
+    HAVE_H5PY = False
+    H5PY_ERR = err
+else:
+    HAVE_H5PY = True
+    H5PY_ERR = None
+
 from neo.io.baseio import BaseIO
 from neo.core import (Block, Segment, AnalogSignal, Event, Epoch, SpikeTrain,
                       objectnames, class_by_name)
@@ -45,11 +56,20 @@ classname_lower_to_upper = {}
 for k in objectnames:
     classname_lower_to_upper[k.lower()] = k
 
+# maximum number of bytes of an array written at once in a 7.3 file
+WRITE_CHUNK_SIZE = 2 ** 24
+
+# MATLAB class of the numpy dtypes, in 7.3 files
+mat73_classes = {'f8': 'double', 'f4': 'single',
+                 'i1': 'int8', 'i2': 'int16', 'i4': 'int32', 'i8': 'int64',
+                 'u1': 'uint8', 'u2': 'uint16', 'u4': 'uint32',
+                 'u8': 'uint64', 'b1': 'logical'}
+
 
 class NeoMatlabIO(BaseIO):
     """
     Class for reading/writing Neo objects in MATLAB format (.mat) versions
-    5 to 7.2.
+    5 to 7.3.
 
     This module is a bridge for MATLAB users who want to adopt the Neo object
     representation.  The nomenclature is the same but using Matlab structs and
@@ -187,6 +207,25 @@ class NeoMatlabIO(BaseIO):
             blocks = r.read()
             w.write(blocks[0])
 
+    4 - **Scenario 4: large files (MATLAB 7.3)**
+
+        Files of versions 5 to 7.2 are limited to 2 GB and have to be
+        read and written at once. MATLAB 7.3 files are HDF5 files and do
+        not have these limits (this requires h5py). They are written with::
+
+            w = NeoMatlabIO(filename='myblock.mat')
+            w.write_block(bl, version='7.3')
+
+        and read back, or saved from MATLAB with ``save -v7.3``, in the same
+        struct layout. They are detected when reading. The signals of a
+        7.3 file can be read lazily and then loaded, in full or in part::
+
+            r = NeoMatlabIO(filename='myblock.mat')
+            bl = r.read_block(lazy=True)
+            anasig = bl.segments[0].analogsignals[0]
+            part = r.load_lazy_object(anasig, t_start=2 * pq.s,
+                                      t_stop=3 * pq.s, channel_indexes=[0])
+
     """
     is_readable = True
     is_writable = True
@@ -197,8 +236,13 @@ class NeoMatlabIO(BaseIO):
 
     has_header = False
     is_streameable = False
+    support_lazy = True
     read_params = {Block: []}
-    write_params = {Block: []}
+    write_params = {
+        Block: [
+            ('version', {'value': '5', 'possible': ['5', '7.3']}),
+        ]
+    }
 
     name = 'neomatlab'
     extensions = ['mat']
@@ -207,7 +251,7 @@ class NeoMatlabIO(BaseIO):
 
     def __init__(self, filename=None):
         """
-        This class read/write neo objects in matlab 5 to 7.2 format.
+        This class read/write neo objects in matlab 5 to 7.3 format.
 
         Arguments:
             filename : the filename to read
@@ -220,9 +264,20 @@ class NeoMatlabIO(BaseIO):
     def read_block(self, lazy=False):
         """
         Arguments:
-
+            lazy : do not load the data of the signals, spike trains, events
+                   and epochs, use :meth:`load_lazy_object` to load them.
+                   Only MATLAB 7.3 files are read lazily from the disk,
+                   older files are loaded in memory in any case.
         """
-        assert not lazy, 'Do not support lazy'
+        if self._is_mat73():
+            with h5py.File(self.filename, 'r') as f:
+                if 'block' not in f:
+                    self.logger.exception('No block in ' + self.filename)
+                    return None
+                bl = self.create_ob_from_struct(
+                    _Mat73Struct(f, f['block']), 'Block', lazy=lazy)
+            bl.create_many_to_one_relationship()
+            return bl
 
         d = scipy.io.loadmat(self.filename, struct_as_record=False,
                              squeeze_me=True, mat_dtype=True)
@@ -232,15 +287,19 @@ class NeoMatlabIO(BaseIO):
 
         bl_struct = d['block']
         bl = self.create_ob_from_struct(
-            bl_struct, 'Block')
+            bl_struct, 'Block', lazy=lazy)
         bl.create_many_to_one_relationship()
         return bl
 
-    def write_block(self, bl, **kargs):
+    def write_block(self, bl, version='5', **kargs):
         """
         Arguments:
             bl: the block to b saved
+            version: '5' to write a MATLAB 5 to 7.2 file, '7.3' to write
+                     a MATLAB 7.3 (HDF5) file, which requires h5py
         """
+        if version not in ('5', '7.3'):
+            raise ValueError("version must be '5' or '7.3'")
 
         bl_struct = self.create_struct_from_obj(bl)
 
@@ -264,7 +323,102 @@ class NeoMatlabIO(BaseIO):
                 sptr_struct = self.create_struct_from_obj(sptr)
                 seg_struct['spiketrains'].append(sptr_struct)
 
-        scipy.io.savemat(self.filename, {'block': bl_struct}, oned_as='row')
+        if version == '7.3':
+            if not HAVE_H5PY:
+                raise H5PY_ERR
+            _write_mat73(self.filename, {'block': bl_struct})
+        else:
+            scipy.io.savemat(self.filename, {'block': bl_struct},
+                             oned_as='row')
+
+    def load_lazy_object(self, obj, t_start=None, t_stop=None,
+                         channel_indexes=None):
+        """
+        Load the data of an object read with ``lazy=True``, and return a new,
+        fully loaded, object.
+
+        For an AnalogSignal, only the samples between ``t_start`` and
+        ``t_stop`` and the channels in ``channel_indexes`` are loaded. With
+        MATLAB 7.3 files, only these are read from the file.
+
+        Arguments:
+            obj : a lazy AnalogSignal, SpikeTrain, Event or Epoch, from
+                  the Block returned by read_block
+            t_start : start of the time window (None for the start)
+            t_stop : end of the time window (None for the end)
+            channel_indexes : indexes of the channels to read (None for all)
+        """
+        if not isinstance(obj, AnalogSignal) and not (
+                t_start is None and t_stop is None and
+                channel_indexes is None):
+            raise ValueError('Only AnalogSignals can be loaded in part')
+        classname = obj.__class__.__name__
+        container = classname.lower() + 's'
+        seg = getattr(obj, 'segment', None)
+        if seg is None or seg.block is None:
+            raise ValueError('%s is not part of a Block read by this IO' %
+                             classname)
+        seg_index = _index_of(seg, seg.block.segments)
+        ob_index = _index_of(obj, getattr(seg, container))
+
+        def load(bl_struct):
+            seg_struct = _cell_item(bl_struct.segments, seg_index)
+            struct = _cell_item(getattr(seg_struct, container), ob_index)
+            if isinstance(obj, AnalogSignal):
+                struct = self._slice_signal_struct(struct, t_start, t_stop,
+                                                   channel_indexes)
+            return self.create_ob_from_struct(struct, classname)
+
+        if self._is_mat73():
+            with h5py.File(self.filename, 'r') as f:
+                new_obj = load(_Mat73Struct(f, f['block']))
+        else:
+            d = scipy.io.loadmat(self.filename, struct_as_record=False,
+                                 squeeze_me=True, mat_dtype=True)
+            new_obj = load(d['block'])
+        new_obj.segment = seg
+        return new_obj
+
+    def _is_mat73(self):
+        return HAVE_H5PY and h5py.is_hdf5(self.filename)
+
+    def _slice_signal_struct(self, struct, t_start, t_stop, channel_indexes):
+        """
+        Return a struct of an AnalogSignal whose signal only holds the
+        samples between `t_start` and `t_stop` and the channels
+        `channel_indexes`. In 7.3 files, only these are read, with a
+        hyperslab selection.
+        """
+        if isinstance(struct, _Mat73Struct):
+            dataset = struct._group['signal']
+            n_samples = _mat73_signal_shape(dataset)[0]
+        else:
+            signal = np.asarray(struct.signal)
+            if signal.ndim < 2:
+                signal = signal.reshape((-1, 1))
+            n_samples = signal.shape[0]
+        sig_t_start = pq.Quantity(struct.t_start, str(struct.t_start_units))
+        sampling_rate = pq.Quantity(struct.sampling_rate,
+                                    str(struct.sampling_rate_units))
+
+        def index(t, default):
+            if t is None:
+                return default
+            i = np.rint(((t - sig_t_start) * sampling_rate).simplified)
+            return int(min(max(i, 0), n_samples))
+
+        i = index(t_start, 0)
+        j = max(index(t_stop, n_samples), i)
+        if isinstance(struct, _Mat73Struct):
+            signal = _read_mat73_signal(dataset, i, j, channel_indexes)
+        else:
+            signal = signal[i:j]
+            if channel_indexes is not None:
+                signal = signal[:, channel_indexes]
+        t_start = (sig_t_start + i / sampling_rate).rescale(
+            sig_t_start.units)
+        return _StructOverride(struct, {'signal': signal,
+                                        't_start': t_start.magnitude})
 
     def create_struct_from_obj(self, ob):
         struct = {}
@@ -308,7 +462,7 @@ class NeoMatlabIO(BaseIO):
 
         return struct
 
-    def create_ob_from_struct(self, struct, classname):
+    def create_ob_from_struct(self, struct, classname, lazy=False):
         cl = class_by_name[classname]
         # check if hinerits Quantity
         # ~ is_quantity = False
@@ -319,9 +473,14 @@ class NeoMatlabIO(BaseIO):
         # ~ is_quantiy = hasattr(cl, '_quantity_attr')
 
         # ~ if is_quantity:
+        lazy_shape = None
         if hasattr(cl, '_quantity_attr'):
             quantity_attr = cl._quantity_attr
-            arr = getattr(struct, quantity_attr)
+            if lazy:
+                lazy_shape = _lazy_shape(struct, quantity_attr, cl)
+                arr = np.empty((0,) + lazy_shape[1:])
+            else:
+                arr = getattr(struct, quantity_attr)
             # ~ data_complement = dict(units=str(struct.units))
             data_complement = dict(units=str(
                 getattr(struct, quantity_attr + '_units')))
@@ -346,6 +505,8 @@ class NeoMatlabIO(BaseIO):
                     data_complement["t_start"] = 0.0
 
             ob = cl(arr, **data_complement)
+            if lazy_shape is not None:
+                ob.lazy_shape = lazy_shape
         else:
             ob = cl()
 
@@ -360,13 +521,14 @@ class NeoMatlabIO(BaseIO):
                     # strange scipy.io behavior: if len is 1 there is no len()
                     child = self.create_ob_from_struct(
                         child_struct,
-                        classname_lower_to_upper[attrname[:-1]])
+                        classname_lower_to_upper[attrname[:-1]], lazy=lazy)
                     getattr(ob, attrname.lower()).append(child)
                 else:
                     for c in range(child_len):
                         child = self.create_ob_from_struct(
                             child_struct[c],
-                            classname_lower_to_upper[attrname[:-1]])
+                            classname_lower_to_upper[attrname[:-1]],
+                            lazy=lazy)
                         getattr(ob, attrname.lower()).append(child)
                 continue
 
@@ -378,10 +540,15 @@ class NeoMatlabIO(BaseIO):
                 cl._quantity_attr == attrname):
                 continue
 
-            item = getattr(struct, attrname)
-
             attributes = cl._necessary_attrs + cl._recommended_attrs
             dict_attributes = dict([(a[0], a[1:]) for a in attributes])
+            if (lazy and attrname in dict_attributes and
+                    dict_attributes[attrname][0] in (pq.Quantity, np.ndarray) and
+                    dict_attributes[attrname][1] >= 1):
+                # arrays (durations, labels, waveforms...) are not loaded
+                continue
+
+            item = getattr(struct, attrname)
             if attrname in dict_attributes:
                 attrtype = dict_attributes[attrname][0]
                 if attrtype == datetime:
@@ -393,7 +560,7 @@ class NeoMatlabIO(BaseIO):
                         item = None
                 elif attrtype == np.ndarray:
                     dt = dict_attributes[attrname][2]
-                    item = item.astype(dt)
+                    item = np.array(item, ndmin=1).astype(dt)
                 elif attrtype == pq.Quantity:
                     ndim = dict_attributes[attrname][1]
                     units = str(getattr(struct, attrname + '_units'))
@@ -407,3 +574,260 @@ class NeoMatlabIO(BaseIO):
             setattr(ob, attrname, item)
 
         return ob
+
+
+def _index_of(ob, container):
+    """
+    Index of `ob` in the list `container`, comparing identities
+    """
+    for i, child in enumerate(container):
+        if child is ob:
+            return i
+    raise ValueError('%s not found' % ob.__class__.__name__)
+
+
+def _cell_item(cell, i):
+    """
+    Item `i` of a cell array read by scipy.io.loadmat(squeeze_me=True),
+    which returns the item itself for cell arrays with a single item
+    """
+    if isinstance(cell, (list, np.ndarray)):
+        return cell[i]
+    return cell
+
+
+def _lazy_shape(struct, attrname, cl):
+    """
+    Shape of the object of class `cl` whose data are the field `attrname`
+    of `struct`, without reading them from 7.3 files
+    """
+    if isinstance(struct, _Mat73Struct):
+        dataset = struct._group[attrname]
+        if cl is AnalogSignal:
+            return _mat73_signal_shape(dataset)
+        return (_mat73_size(dataset),)
+    arr = np.asarray(getattr(struct, attrname))
+    if cl is AnalogSignal:
+        return arr.reshape((arr.shape[0] if arr.ndim else 1, -1)).shape
+    return (arr.size,)
+
+
+class _StructOverride(object):
+    """
+    A struct whose fields in `overrides` replace those of `struct`
+    """
+
+    def __init__(self, struct, overrides):
+        self._struct = struct
+        self._overrides = overrides
+        self._fieldnames = struct._fieldnames
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in self._overrides:
+            return self._overrides[name]
+        return getattr(self._struct, name)
+
+
+class _Mat73Struct(object):
+    """
+    A MATLAB struct of a 7.3 (HDF5) file, with the same interface as the
+    structs returned by scipy.io.loadmat(struct_as_record=False,
+    squeeze_me=True). Fields are read from the file when they are accessed.
+    """
+
+    def __init__(self, f, group):
+        self._file = f
+        self._group = group
+        if 'MATLAB_fields' in group.attrs:
+            self._fieldnames = [b''.join(field).decode('ascii')
+                                for field in group.attrs['MATLAB_fields']]
+        else:
+            self._fieldnames = list(group.keys())
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name not in self._group:
+            raise AttributeError(name)
+        return _read_mat73(self._file, self._group[name])
+
+
+def _mat73_class(node):
+    matlab_class = node.attrs.get('MATLAB_class', b'struct')
+    if isinstance(matlab_class, bytes):
+        matlab_class = matlab_class.decode('ascii')
+    return matlab_class
+
+
+def _read_mat73(f, node):
+    """
+    Read a MATLAB variable of a 7.3 file, squeezed like scipy.io.loadmat does
+    """
+    if isinstance(node, h5py.Group):
+        return _Mat73Struct(f, node)
+    matlab_class = _mat73_class(node)
+    if node.attrs.get('MATLAB_empty', 0):
+        if matlab_class == 'char':
+            return ''
+        if matlab_class == 'cell':
+            return []
+        return np.array([])
+    if matlab_class == 'cell':
+        return [_read_mat73(f, f[ref]) for ref in node[()].ravel()]
+    # MATLAB arrays are column-major: the dimensions are reversed in HDF5
+    arr = node[()].T
+    if matlab_class == 'char':
+        rows = [row.astype('<u2').tostring().decode('utf-16-le')
+                for row in np.atleast_2d(arr)]
+        if len(rows) == 1:
+            return rows[0]
+        return np.array([row.rstrip(' ') for row in rows])
+    if matlab_class == 'logical':
+        arr = arr.astype(bool)
+    arr = np.squeeze(arr)
+    if arr.ndim == 0:
+        return arr[()]
+    return arr
+
+
+def _mat73_size(dataset):
+    if dataset.attrs.get('MATLAB_empty', 0):
+        return 0
+    return dataset.size
+
+
+def _mat73_signal_shape(dataset):
+    """
+    Shape (samples, channels) of the signal of an AnalogSignal in a 7.3 file
+    """
+    if dataset.attrs.get('MATLAB_empty', 0):
+        return (0, 1)
+    if dataset.ndim == 2 and dataset.shape[1] == 1:
+        # a MATLAB row vector, read as a single channel
+        return (dataset.shape[0], 1)
+    return (dataset.shape[-1], int(np.prod(dataset.shape[:-1])))
+
+
+def _read_mat73_signal(dataset, i, j, channel_indexes=None):
+    """
+    Read the samples `i` to `j` of the channels `channel_indexes` of the
+    signal of an AnalogSignal in a 7.3 file, as a (samples, channels) array
+    """
+    n_samples, n_channels = _mat73_signal_shape(dataset)
+    if channel_indexes is None:
+        channel_indexes = np.arange(n_channels)
+    channel_indexes = np.asarray(channel_indexes, dtype=int)
+    if n_samples == 0 or i == j or channel_indexes.size == 0:
+        return np.empty((0, channel_indexes.size), dtype=dataset.dtype)
+    if dataset.ndim == 2 and dataset.shape[1] == 1:
+        if np.any(channel_indexes != 0):
+            raise IndexError('channel index out of range')
+        return dataset[i:j, :]
+    # h5py needs increasing indexes
+    unique, inverse = np.unique(channel_indexes, return_inverse=True)
+    if unique.size == n_channels:
+        data = dataset[:, i:j]
+    else:
+        data = dataset[list(unique), i:j]
+    return data.T[:, inverse]
+
+
+def _write_mat73(filename, variables):
+    """
+    Write a dict of variables (structs as dicts, cell arrays as lists) to a
+    MATLAB 7.3 file: an HDF5 file with a 512 bytes MATLAB header.
+    """
+    with h5py.File(filename, 'w', userblock_size=512) as f:
+        refs = f.create_group('#refs#')
+        for name, value in variables.items():
+            _write_mat73_value(f, refs, name, value)
+    header = ('MATLAB 7.3 MAT-file, Platform: neo, Created on: %s '
+              'HDF5 schema 1.00 .' % time.asctime()).encode('ascii')
+    with open(filename, 'r+b') as fid:
+        fid.write(header.ljust(116) + b'\x00' * 8 + b'\x00\x02IM')
+
+
+def _write_mat73_value(parent, refs, name, value):
+    """
+    Write `value` as the MATLAB variable or struct field `name` of the HDF5
+    group `parent`. The elements of cell arrays are written in `refs`.
+    """
+    if isinstance(value, dict):
+        group = parent.create_group(name)
+        group.attrs['MATLAB_class'] = np.bytes_('struct')
+        fields = [np.array(list(field), dtype='S1') for field in value]
+        group.attrs.create(
+            'MATLAB_fields', np.array(fields + [None], dtype=object)[:-1],
+            dtype=h5py.special_dtype(vlen=np.dtype('S1')))
+        for field, item in value.items():
+            _write_mat73_value(group, refs, field, item)
+        return
+
+    if isinstance(value, list):
+        if not value:
+            _write_mat73_empty(parent, name, 'cell')
+            return
+        cell = np.empty((len(value), 1), dtype=object)
+        for i, item in enumerate(value):
+            ref_name = str(len(refs))
+            _write_mat73_value(refs, refs, ref_name, item)
+            cell[i, 0] = refs[ref_name].ref
+        dataset = parent.create_dataset(
+            name, data=cell, dtype=h5py.special_dtype(ref=h5py.Reference))
+        dataset.attrs['MATLAB_class'] = np.bytes_('cell')
+        return
+
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    arr = np.asarray(value)
+    if arr.dtype.kind in 'SU':
+        rows = arr.astype(str).reshape(-1)
+        width = max([len(row) for row in rows] + [0])
+        if width == 0:
+            _write_mat73_empty(parent, name, 'char')
+            return
+        codes = np.array([np.frombuffer(row.ljust(width).encode('utf-16-le'),
+                                        dtype='<u2') for row in rows])
+        dataset = parent.create_dataset(name, data=codes.T)
+        dataset.attrs['MATLAB_class'] = np.bytes_('char')
+        dataset.attrs['MATLAB_int_decode'] = np.int32(2)
+        return
+
+    key = arr.dtype.kind + str(arr.dtype.itemsize)
+    if key not in mat73_classes:
+        arr = arr.astype(np.float64)
+        key = 'f8'
+    if arr.size == 0:
+        _write_mat73_empty(parent, name, mat73_classes[key])
+        return
+    if arr.ndim == 0:
+        arr = arr.reshape(1, 1)
+    elif arr.ndim == 1:
+        # one dimensional arrays are row vectors, as with oned_as='row'
+        arr = arr[np.newaxis, :]
+    dtype = np.uint8 if key == 'b1' else arr.dtype
+    dataset = parent.create_dataset(name, shape=arr.shape[::-1], dtype=dtype)
+    dataset.attrs['MATLAB_class'] = np.bytes_(mat73_classes[key])
+    if key == 'b1':
+        dataset.attrs['MATLAB_int_decode'] = np.int32(1)
+    if arr.ndim == 2:
+        # write the transposed array by blocks along its longest dimension,
+        # to bound the memory used by the copies
+        if arr.shape[0] >= arr.shape[1]:
+            step = max(WRITE_CHUNK_SIZE // arr[:1].nbytes, 1)
+            for i in range(0, arr.shape[0], step):
+                dataset[:, i:i + step] = arr[i:i + step].T
+        else:
+            step = max(WRITE_CHUNK_SIZE // arr[:, :1].nbytes, 1)
+            for i in range(0, arr.shape[1], step):
+                dataset[i:i + step, :] = arr[:, i:i + step].T
+    else:
+        dataset[()] = arr.T
+
+
+def _write_mat73_empty(parent, name, matlab_class):
+    dataset = parent.create_dataset(name, data=np.zeros(2, dtype=np.uint64))
+    dataset.attrs['MATLAB_class'] = np.bytes_(matlab_class)
+    dataset.attrs['MATLAB_empty'] = np.uint8(1)
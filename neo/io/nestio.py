@@ -18,10 +18,12 @@ from __future__ import absolute_import
 import os.path
 import warnings
 from datetime import datetime
+from multiprocessing import Pool
 import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.tools import cached_array, parse_text_values
 from neo.core import Block, Segment, SpikeTrain, AnalogSignal
 
 value_type_dict = {'V': pq.mV,
@@ -29,6 +31,9 @@ value_type_dict = {'V': pq.mV,
                    'g': pq.CompoundUnit("10^-9*S"),
                    'no type': pq.dimensionless}
 
+# approximate size (in bytes) of the pieces of text files parsed at once
+PARSE_CHUNK_SIZE = 2 ** 25
+
 
 class NestIO(BaseIO):
     """
@@ -63,12 +68,18 @@ class NestIO(BaseIO):
     extensions = ['gdf', 'dat']
     mode = 'file'
 
-    def __init__(self, filenames=None):
+    def __init__(self, filenames=None, cache=False, processes=1):
         """
         Parameters
         ----------
             filenames: string or list of strings, default=None
                 The filename or list of filenames to load.
+            cache: bool, default=False
+                If True, the parsed content of each file is saved in a binary
+                file next to it, which is used instead of the text file the
+                next time the file is loaded (see ColumnIO).
+            processes: int, default=1
+                Number of processes used to parse the text files.
         """
 
         if isinstance(filenames, str):
@@ -86,7 +97,8 @@ class NestIO(BaseIO):
                     raise ValueError('Received multiple files with "%s" '
                                      'extention. Can only load single file of '
                                      'this type.' % ext)
-                self.avail_IOs[ext] = ColumnIO(filename)
+                self.avail_IOs[ext] = ColumnIO(filename, cache=cache,
+                                               processes=processes)
             self.avail_formats[ext] = path
 
     def __read_analogsignals(self, gid_list, time_unit, t_start=None,
@@ -137,11 +149,9 @@ class NestIO(BaseIO):
                                                             t_start,
                                                             t_stop)
         # loading raw data columns
-        data = self.avail_IOs['dat'].get_columns(
-            column_ids=column_ids,
-            condition=condition,
-            condition_column=condition_column,
-            sorting_columns=sorting_column)
+        data = self._get_columns(self.avail_IOs['dat'], column_ids,
+                                 gid_list, id_column, time_column,
+                                 condition, condition_column, sorting_column)
 
         sampling_period = self._check_input_sampling_period(sampling_period,
                                                             time_column,
@@ -222,11 +232,9 @@ class NestIO(BaseIO):
             self._get_conditions_and_sorting(id_column, time_column,
                                              gdf_id_list, t_start, t_stop)
 
-        data = self.avail_IOs['gdf'].get_columns(
-            column_ids=column_ids,
-            condition=condition,
-            condition_column=condition_column,
-            sorting_columns=sorting_column)
+        data = self._get_columns(self.avail_IOs['gdf'], column_ids,
+                                 gdf_id_list, id_column, time_column,
+                                 condition, condition_column, sorting_column)
 
         # create a list of SpikeTrains for all neuron IDs in gdf_id_list
         # assign spike times to neuron IDs if id_column is given
@@ -415,6 +423,29 @@ class NestIO(BaseIO):
             sorting_column = sorting_column[::-1]
         return condition, condition_column, sorting_column
 
+    def _get_columns(self, column_io, column_ids, gid_list, id_column,
+                     time_column, condition, condition_column,
+                     sorting_column):
+        """
+        Loads the requested columns of the rows of the neurons in gid_list,
+        sorted by gid and then by time.
+
+        If the file contains neuron IDs, the rows are selected with the
+        group-by-gid index of the ColumnIO, which is computed only once.
+        Otherwise, the condition and sorting computed by
+        _get_conditions_and_sorting are applied.
+
+        Returns
+        numpy array containing the requested data.
+        """
+        if id_column is None:
+            return column_io.get_columns(column_ids=column_ids,
+                                         condition=condition,
+                                         condition_column=condition_column,
+                                         sorting_columns=sorting_column)
+        rows = column_io.get_gid_rows(gid_list, id_column, time_column)
+        return column_io.get_columns(column_ids=column_ids, rows=rows)
+
     def _get_selected_ids(self, gid, id_column, time_column, t_start, t_stop,
                           time_unit, data):
         """
@@ -657,33 +688,152 @@ class NestIO(BaseIO):
                                        **args)[0]
 
 
+def _parse_text_chunk(args):
+    """
+    Parses the part of an ASCII file between the byte offsets start and stop
+    into an array of values of the given dtype.
+    """
+    filename, start, stop, dtype = args
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        text = f.read(stop - start).decode('ascii')
+    try:
+        return parse_text_values(text, dtype, filename)
+    except ValueError:
+        if dtype == np.float64:
+            raise
+        # the dtype is guessed from the first line of the file, later lines
+        # can contain floats
+        return parse_text_values(text, np.float64, filename)
+
+
 class ColumnIO:
     '''
     Class for reading an ASCII file containing multiple columns of data.
+
+    The file is parsed in chunks of about PARSE_CHUNK_SIZE bytes, in parallel
+    if several processes are requested. With cache=True, the parsed data are
+    saved in a binary .npy file next to the ASCII file, and later loaded
+    from it (memory mapped) as long as it is more recent than the ASCII file.
     '''
 
-    def __init__(self, filename):
+    def __init__(self, filename, cache=False, processes=1):
         """
         filename: string, path to ASCII file to read.
+        cache: bool, if True, use (and create if needed) a binary cache of
+               the file content next to it.
+        processes: int, number of processes used to parse the file.
         """
 
         self.filename = filename
+        self.cache_filename = filename + '.npy'
+        # group-by-gid indexes, see get_gid_index()
+        self._gid_indexes = {}
+
+        def parse():
+            data = self._parse(processes)
+            if len(data.shape) == 1:
+                data = data[:, np.newaxis]
+            return data
+
+        self.data = cached_array(filename, parse, cache=cache,
+                                 cache_filename=self.cache_filename,
+                                 mmap_mode='r')
+
+    def _parse(self, processes):
+        """
+        Parses the ASCII file into a 2D array (rows x columns).
+        """
+        # read the first line to check the data type (int or float) of the
+        # data and the number of columns
+        with open(self.filename) as f:
+            line = f.readline()
+        dtype = np.int32 if '.' not in line else np.float64
+        n_columns = len(line.split())
+
+        # split the file in chunks of whole lines
+        size = os.path.getsize(self.filename)
+        bounds = [0]
+        with open(self.filename, 'rb') as f:
+            while bounds[-1] + PARSE_CHUNK_SIZE < size:
+                f.seek(bounds[-1] + PARSE_CHUNK_SIZE)
+                f.readline()
+                bounds.append(f.tell())
+        bounds.append(size)
+        chunks = [(self.filename, start, stop, dtype)
+                  for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        if processes > 1 and len(chunks) > 1:
+            pool = Pool(processes)
+            try:
+                values = pool.map(_parse_text_chunk, chunks)
+            finally:
+                pool.close()
+        else:
+            values = [_parse_text_chunk(chunk) for chunk in chunks]
+        values = np.concatenate(values)
+
+        if n_columns and values.size % n_columns:
+            raise ValueError('Wrong number of values in %s, all lines must '
+                             'contain %i columns' % (self.filename, n_columns))
+        if n_columns <= 1:
+            return values
+        return values.reshape(-1, n_columns)
+
+    def get_gid_index(self, id_column, time_column=None):
+        """
+        Returns the group-by-gid index of the data: the rows sorted by gid
+        (and then by time, if time_column is given), the sorted unique gids
+        and the offsets of the rows of each gid. The rows of gids[i] are
+        order[offsets[i]:offsets[i + 1]].
+
+        The index is computed once for each id_column and time_column.
+
+        id_column : int, id of the column containing the gids.
+        time_column : int or None, id of the column containing the times.
 
-        # read the first line to check the data type (int or float) of the data
-        f = open(self.filename)
-        line = f.readline()
+        Returns
+        -------
+        order, gids, offsets : numpy arrays
+        """
+        key = (id_column, time_column)
+        if key not in self._gid_indexes:
+            ids = self.data[:, id_column]
+            if time_column is None:
+                order = np.argsort(ids, kind='mergesort')
+            else:
+                order = np.lexsort((self.data[:, time_column], ids))
+            gids, offsets = np.unique(ids[order], return_index=True)
+            offsets = np.append(offsets, len(order))
+            self._gid_indexes[key] = (order, gids, offsets)
+        return self._gid_indexes[key]
 
-        additional_parameters = {}
-        if '.' not in line:
-            additional_parameters['dtype'] = np.int32
+    def get_gid_rows(self, gid_list, id_column, time_column=None):
+        """
+        Returns the indexes of the rows of the neurons in gid_list, sorted by
+        gid (and then by time, if time_column is given).
 
-        self.data = np.loadtxt(self.filename, **additional_parameters)
+        gid_list : list of int, gids to select, all gids if empty.
+        id_column : int, id of the column containing the gids.
+        time_column : int or None, id of the column containing the times.
 
-        if len(self.data.shape) == 1:
-            self.data = self.data[:, np.newaxis]
+        Returns
+        -------
+        numpy array of row indexes.
+        """
+        order, gids, offsets = self.get_gid_index(id_column, time_column)
+        if len(gid_list) == 0:
+            return order
+        positions = np.searchsorted(gids, np.unique(gid_list))
+        positions = positions[positions < len(gids)]
+        positions = positions[np.in1d(gids[positions], gid_list)]
+        if len(positions) == 0:
+            return order[:0]
+        return np.concatenate([order[offsets[pos]:offsets[pos + 1]]
+                               for pos in positions])
 
     def get_columns(self, column_ids='all', condition=None,
-                    condition_column=None, sorting_columns=None):
+                    condition_column=None, sorting_columns=None, rows=None):
         """
         column_ids : 'all' or list of int, the ids of columns to
                     extract.
@@ -695,6 +845,9 @@ class ColumnIO:
         sorting_columns : int or list of int, column ids to sort by.
                     List entries have to be ordered by increasing sorting
                     priority!
+        rows : None or array of int, indexes of the rows to extract, in the
+                    order in which they are returned. Applied before the
+                    condition and the sorting.
 
         Returns
         -------
@@ -724,6 +877,8 @@ class ColumnIO:
 
         # Starting with whole dataset being selected for return
         selected_data = self.data
+        if rows is not None:
+            selected_data = selected_data[rows]
 
         # Apply filter condition to rows
         if condition and (condition_column is None):
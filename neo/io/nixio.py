@@ -32,6 +32,7 @@ import quantities as pq
 import numpy as np
 
 from .baseio import BaseIO
+from .tools import BufferedSegmentWriter
 from ..core import (Block, Segment, ChannelIndex, AnalogSignal,
                     IrregularlySampledSignal, Epoch, Event, SpikeTrain, Unit)
 from ..version import version as neover
@@ -50,6 +51,9 @@ except NameError:
 
 EMPTYANNOTATION = "EMPTYLIST"
 
+# maximum number of bytes of signal data written to the file at once
+WRITE_CHUNK_SIZE = 2 ** 24
+
 
 def stringify(value):
     if value is None:
@@ -94,17 +98,29 @@ class NixIO(BaseIO):
     readable_objects = [Block]
     writeable_objects = [Block]
 
+    support_lazy = True
+
     name = "NIX"
     extensions = ["h5", "nix"]
     mode = "file"
 
     nix_version = nix.__version__ if HAVE_NIX else "NIX NOT FOUND"
 
-    def __init__(self, filename, mode="rw"):
+    def __init__(self, filename, mode="rw", signal_layout="channels",
+                 compression=None):
         """
         Initialise IO instance and NIX file.
 
         :param filename: Full path to the file
+        :param mode: 'ro' (ReadOnly), 'rw' (ReadWrite) or 'ow' (Overwrite)
+        :param signal_layout: How signals are written to the file:
+            'channels' stores each channel as a separate 1D DataArray,
+            'matrix' stores each signal as a single 2D (time x channel)
+            DataArray, which is much faster to write and read for signals
+            with many channels. Both layouts can be read back by NixIO.
+        :param compression: If True or None (the default), the data written
+            to the file (signals, waveforms, times, ...) are compressed, if
+            False nothing is compressed
         """
 
         if not HAVE_NIX:
@@ -124,7 +140,23 @@ class NixIO(BaseIO):
             raise ValueError("Invalid mode specified '{}'. "
                              "Valid modes: 'ro' (ReadOnly)', 'rw' (ReadWrite),"
                              " 'ow' (Overwrite).".format(mode))
-        self.nix_file = nix.File.open(self.filename, filemode, backend="h5py")
+        if signal_layout not in ("channels", "matrix"):
+            raise ValueError("Invalid signal layout specified '{}'. "
+                             "Valid layouts: 'channels', 'matrix'."
+                             "".format(signal_layout))
+        self.signal_layout = signal_layout
+        if compression is False:
+            # nix.Compression.No is a non-empty string, which the h5py
+            # backend of nixio takes as a request for compression
+            self._compression = False
+            file_compression = False
+        else:
+            self._compression = nix.Compression.DeflateNormal
+            file_compression = nix.Compression.Auto
+        # the file default applies to the DataArrays created without an
+        # explicit compression (times, labels, ...)
+        self.nix_file = nix.File.open(self.filename, filemode, backend="h5py",
+                                      compression=file_compression)
 
         if self.nix_file.mode == nix.FileMode.ReadOnly:
             self._file_version = '0.5.2'
@@ -157,9 +189,7 @@ class NixIO(BaseIO):
         self.close()
 
     def read_all_blocks(self, lazy=False):
-        if lazy:
-            raise Exception("Lazy loading is not supported for NixIO")
-        return list(self._nix_to_neo_block(blk)
+        return list(self._nix_to_neo_block(blk, lazy=lazy)
                     for blk in self.nix_file.blocks)
 
     def read_block(self, index=None, nixname=None, neoname=None, lazy=False):
@@ -187,10 +217,10 @@ class NixIO(BaseIO):
         :param index: The position of the Block to be loaded (creation order)
         :param nixname: The name of the Block in NIX
         :param neoname: The name of the original Neo Block
+        :param lazy: If True, the data objects are read without their data,
+                     which can be loaded later with
+                     :meth:`NixIO.load_lazy_object`
         """
-        if lazy:
-            raise Exception("Lazy loading is not supported for NixIO")
-
         nix_block = None
         if index is not None:
             nix_block = self.nix_file.blocks[index]
@@ -211,20 +241,19 @@ class NixIO(BaseIO):
             if index >= len(self.nix_file.blocks):
                 return None
             nix_block = self.nix_file.blocks[index]
+            self._block_read_counter += 1
 
-        nix_block = self.nix_file.blocks[self._block_read_counter]
-        self._block_read_counter += 1
-        return self._nix_to_neo_block(nix_block)
+        return self._nix_to_neo_block(nix_block, lazy=lazy)
 
-    def iter_blocks(self):
+    def iter_blocks(self, lazy=False):
         """
         Returns an iterator which can be used to consecutively load and convert
         all Blocks from the NIX File.
         """
         for blk in self.nix_file.blocks:
-            yield self._nix_to_neo_block(blk)
+            yield self._nix_to_neo_block(blk, lazy=lazy)
 
-    def _nix_to_neo_block(self, nix_block):
+    def _nix_to_neo_block(self, nix_block, lazy=False):
         neo_attrs = self._nix_attr_to_neo(nix_block)
         neo_block = Block(**neo_attrs)
         neo_block.rec_datetime = datetime.fromtimestamp(
@@ -233,7 +262,7 @@ class NixIO(BaseIO):
 
         # descend into Groups
         for grp in nix_block.groups:
-            newseg = self._nix_to_neo_segment(grp)
+            newseg = self._nix_to_neo_segment(grp, lazy=lazy)
             neo_block.segments.append(newseg)
             # parent reference
             newseg.block = neo_block
@@ -243,12 +272,13 @@ class NixIO(BaseIO):
         for name, das in blockdas.items():
             if name not in self._neo_map:
                 if das[0].type == "neo.analogsignal":
-                    self._nix_to_neo_analogsignal(das)
+                    self._nix_to_neo_analogsignal(das, lazy=lazy)
                 elif das[0].type == "neo.irregularlysampledsignal":
-                    self._nix_to_neo_irregularlysampledsignal(das)
+                    self._nix_to_neo_irregularlysampledsignal(das,
+                                                              lazy=lazy)
         for mt in nix_block.multi_tags:
             if mt.type == "neo.spiketrain" and mt.name not in self._neo_map:
-                self._nix_to_neo_spiketrain(mt)
+                self._nix_to_neo_spiketrain(mt, lazy=lazy)
 
         # descend into Sources
         for src in nix_block.sources:
@@ -264,7 +294,7 @@ class NixIO(BaseIO):
 
         return neo_block
 
-    def _nix_to_neo_segment(self, nix_group):
+    def _nix_to_neo_segment(self, nix_group, lazy=False):
         neo_attrs = self._nix_attr_to_neo(nix_group)
         neo_segment = Segment(**neo_attrs)
         neo_segment.rec_datetime = datetime.fromtimestamp(
@@ -284,12 +314,14 @@ class NixIO(BaseIO):
         # descend into DataArrays
         for name, das in dataarrays.items():
             if das[0].type == "neo.analogsignal":
-                newasig = self._nix_to_neo_analogsignal(das)
+                newasig = self._nix_to_neo_analogsignal(das, lazy=lazy)
                 neo_segment.analogsignals.append(newasig)
                 # parent reference
                 newasig.segment = neo_segment
             elif das[0].type == "neo.irregularlysampledsignal":
-                newisig = self._nix_to_neo_irregularlysampledsignal(das)
+                newisig = self._nix_to_neo_irregularlysampledsignal(
+                    das, lazy=lazy
+                )
                 neo_segment.irregularlysampledsignals.append(newisig)
                 # parent reference
                 newisig.segment = neo_segment
@@ -297,17 +329,17 @@ class NixIO(BaseIO):
         # descend into MultiTags
         for mtag in nix_group.multi_tags:
             if mtag.type == "neo.event":
-                newevent = self._nix_to_neo_event(mtag)
+                newevent = self._nix_to_neo_event(mtag, lazy=lazy)
                 neo_segment.events.append(newevent)
                 # parent reference
                 newevent.segment = neo_segment
             elif mtag.type == "neo.epoch":
-                newepoch = self._nix_to_neo_epoch(mtag)
+                newepoch = self._nix_to_neo_epoch(mtag, lazy=lazy)
                 neo_segment.epochs.append(newepoch)
                 # parent reference
                 newepoch.segment = neo_segment
             elif mtag.type == "neo.spiketrain":
-                newst = self._nix_to_neo_spiketrain(mtag)
+                newst = self._nix_to_neo_spiketrain(mtag, lazy=lazy)
                 neo_segment.spiketrains.append(newst)
                 # parent reference
                 newst.segment = neo_segment
@@ -365,13 +397,22 @@ class NixIO(BaseIO):
         neo_unit.spiketrains.extend(self._ref_map.get(nix_source.name, list()))
         return neo_unit
 
-    def _nix_to_neo_analogsignal(self, nix_da_group):
+    def _nix_to_neo_analogsignal(self, nix_da_group, lazy=False,
+                                 t_start=None, t_stop=None,
+                                 channel_indexes=None):
         """
         Convert a group of NIX DataArrays to a Neo AnalogSignal. This method
         expects a list of data arrays that all represent the same,
         multidimensional Neo AnalogSignal object.
 
+        Only the samples between ``t_start`` and ``t_stop`` and the channels
+        in ``channel_indexes`` are read from the file.
+
         :param nix_da_group: a list of NIX DataArray objects
+        :param lazy: if True, no data is read and the signal is empty
+        :param t_start: time of the first sample to read (None for the start)
+        :param t_stop: time of the end of the window (None for the end)
+        :param channel_indexes: indexes of the channels to read (None for all)
         :return: a Neo AnalogSignal object
         """
         neo_attrs = self._nix_attr_to_neo(nix_da_group[0])
@@ -379,8 +420,6 @@ class NixIO(BaseIO):
         neo_attrs["nix_name"] = metadata.name  # use the common base name
 
         unit = nix_da_group[0].unit
-        signaldata = np.array([d[:] for d in nix_da_group]).transpose()
-        signaldata = create_quantity(signaldata, unit)
         timedim = self._get_time_dimension(nix_da_group[0])
         sampling_period = create_quantity(timedim.sampling_interval,
                                           timedim.unit)
@@ -390,15 +429,36 @@ class NixIO(BaseIO):
         # wasn't necessary, such as when the timedim.offset and unit
         # did not require rescaling.
         if "t_start" in neo_attrs:
-            t_start = neo_attrs["t_start"]
+            sig_t_start = neo_attrs["t_start"]
             del neo_attrs["t_start"]
         else:
-            t_start = create_quantity(timedim.offset, timedim.unit)
+            sig_t_start = create_quantity(timedim.offset, timedim.unit)
+
+        nsamples = nix_da_group[0].shape[0]
+        i, j = 0, nsamples
+        if t_start is not None:
+            i = self._time_index(t_start, sig_t_start, sampling_period)
+        if t_stop is not None:
+            j = self._time_index(t_stop, sig_t_start, sampling_period)
+        if (i < 0) or (j > nsamples):
+            raise ValueError("t_start, t_stop have to be within the analog "
+                             "signal duration")
+        j = max(i, j)
+
+        if lazy:
+            signaldata = self._read_signal_data(nix_da_group, 0, 0,
+                                                channel_indexes)
+        else:
+            signaldata = self._read_signal_data(nix_da_group, i, j,
+                                                channel_indexes)
+        signaldata = create_quantity(signaldata, unit)
 
         neo_signal = AnalogSignal(
             signal=signaldata, sampling_period=sampling_period,
-            t_start=t_start, **neo_attrs
+            t_start=sig_t_start + i * sampling_period, **neo_attrs
         )
+        if lazy:
+            neo_signal.lazy_shape = (j - i, signaldata.shape[1])
         self._neo_map[neo_attrs["nix_name"]] = neo_signal
         # all DAs reference the same sources
         srcnames = list(src.name for src in nix_da_group[0].sources)
@@ -408,13 +468,22 @@ class NixIO(BaseIO):
             self._ref_map[n].append(neo_signal)
         return neo_signal
 
-    def _nix_to_neo_irregularlysampledsignal(self, nix_da_group):
+    def _nix_to_neo_irregularlysampledsignal(self, nix_da_group, lazy=False,
+                                             t_start=None, t_stop=None,
+                                             channel_indexes=None):
         """
         Convert a group of NIX DataArrays to a Neo IrregularlySampledSignal.
         This method expects a list of data arrays that all represent the same,
         multidimensional Neo IrregularlySampledSignal object.
 
+        Only the samples between ``t_start`` and ``t_stop`` (inclusive) and
+        the channels in ``channel_indexes`` are read from the file.
+
         :param nix_da_group: a list of NIX DataArray objects
+        :param lazy: if True, no data is read and the signal is empty
+        :param t_start: start of the time window (None for the start)
+        :param t_stop: end of the time window (None for the end)
+        :param channel_indexes: indexes of the channels to read (None for all)
         :return: a Neo IrregularlySampledSignal object
         """
         neo_attrs = self._nix_attr_to_neo(nix_da_group[0])
@@ -422,13 +491,25 @@ class NixIO(BaseIO):
         neo_attrs["nix_name"] = metadata.name  # use the common base name
 
         unit = nix_da_group[0].unit
-        signaldata = np.array([d[:] for d in nix_da_group]).transpose()
-        signaldata = create_quantity(signaldata, unit)
         timedim = self._get_time_dimension(nix_da_group[0])
         times = create_quantity(timedim.ticks, timedim.unit)
+        i, j = self._time_window(times, t_start, t_stop)
+        times = times[i:j]
+
+        if lazy:
+            signaldata = self._read_signal_data(nix_da_group, 0, 0,
+                                                channel_indexes)
+            lazy_shape = (j - i, signaldata.shape[1])
+            times = times[:0]
+        else:
+            signaldata = self._read_signal_data(nix_da_group, i, j,
+                                                channel_indexes)
+        signaldata = create_quantity(signaldata, unit)
         neo_signal = IrregularlySampledSignal(
             signal=signaldata, times=times, **neo_attrs
         )
+        if lazy:
+            neo_signal.lazy_shape = lazy_shape
         self._neo_map[neo_attrs["nix_name"]] = neo_signal
         # all DAs reference the same sources
         srcnames = list(src.name for src in nix_da_group[0].sources)
@@ -438,38 +519,97 @@ class NixIO(BaseIO):
             self._ref_map[n].append(neo_signal)
         return neo_signal
 
-    def _nix_to_neo_event(self, nix_mtag):
+    @staticmethod
+    def _read_signal_data(nix_da_group, i, j, channel_indexes=None):
+        """
+        Reads samples ``i`` to ``j`` of the channels ``channel_indexes`` of a
+        signal into a (time x channel) array. The signal is either stored as
+        one 1D DataArray per channel or as a single 2D DataArray.
+        """
+        if len(nix_da_group[0].shape) == 2:
+            # signal written with the 'matrix' layout
+            da = nix_da_group[0]
+            if i < j:
+                signaldata = da[i:j]
+            else:
+                signaldata = np.empty((0, da.shape[1]), dtype=da.dtype)
+            if channel_indexes is not None:
+                signaldata = signaldata[:, channel_indexes]
+            return signaldata
+        if channel_indexes is not None:
+            nix_da_group = [nix_da_group[idx] for idx in channel_indexes]
+        # read each channel straight into its column of the signal
+        signaldata = np.empty((j - i, len(nix_da_group)),
+                              dtype=nix_da_group[0].dtype)
+        for idx, da in enumerate(nix_da_group):
+            signaldata[:, idx] = da[i:j]
+        return signaldata
+
+    def _nix_to_neo_event(self, nix_mtag, lazy=False,
+                          t_start=None, t_stop=None):
         neo_attrs = self._nix_attr_to_neo(nix_mtag)
         time_unit = nix_mtag.positions.unit
-        times = create_quantity(nix_mtag.positions, time_unit)
-        labels = np.array(nix_mtag.positions.dimensions[0].labels,
-                          dtype="S")
+        if lazy:
+            times = create_quantity([], time_unit)
+            labels = np.array([], dtype="S")
+        else:
+            i, j = self._positions_window(nix_mtag.positions, t_start, t_stop)
+            times = create_quantity(nix_mtag.positions[i:j], time_unit)
+            labels = self._event_labels(nix_mtag, i, j)
         neo_event = Event(times=times, labels=labels, **neo_attrs)
+        if lazy:
+            neo_event.lazy_shape = nix_mtag.positions.shape
         self._neo_map[nix_mtag.name] = neo_event
         return neo_event
 
-    def _nix_to_neo_epoch(self, nix_mtag):
+    def _nix_to_neo_epoch(self, nix_mtag, lazy=False,
+                          t_start=None, t_stop=None):
         neo_attrs = self._nix_attr_to_neo(nix_mtag)
         time_unit = nix_mtag.positions.unit
-        times = create_quantity(nix_mtag.positions, time_unit)
-        durations = create_quantity(nix_mtag.extents,
-                                    nix_mtag.extents.unit)
-        labels = np.array(nix_mtag.positions.dimensions[0].labels,
-                          dtype="S")
+        if lazy:
+            times = create_quantity([], time_unit)
+            durations = create_quantity([], nix_mtag.extents.unit)
+            labels = np.array([], dtype="S")
+        else:
+            i, j = self._positions_window(nix_mtag.positions, t_start, t_stop)
+            times = create_quantity(nix_mtag.positions[i:j], time_unit)
+            durations = create_quantity(nix_mtag.extents[i:j],
+                                        nix_mtag.extents.unit)
+            # nixio only reads the labels of a dimension as a whole
+            labels = np.array(nix_mtag.positions.dimensions[0].labels,
+                              dtype="S")[i:j]
         neo_epoch = Epoch(times=times, durations=durations, labels=labels,
                           **neo_attrs)
+        if lazy:
+            neo_epoch.lazy_shape = nix_mtag.positions.shape
         self._neo_map[nix_mtag.name] = neo_epoch
         return neo_epoch
 
-    def _nix_to_neo_spiketrain(self, nix_mtag):
+    def _nix_to_neo_spiketrain(self, nix_mtag, lazy=False,
+                               t_start=None, t_stop=None):
         neo_attrs = self._nix_attr_to_neo(nix_mtag)
         time_unit = nix_mtag.positions.unit
-        times = create_quantity(nix_mtag.positions, time_unit)
+        if lazy:
+            times = create_quantity([], time_unit)
+        else:
+            i, j = self._positions_window(nix_mtag.positions, t_start, t_stop)
+            times = create_quantity(nix_mtag.positions[i:j], time_unit)
+            # the window also restricts the limits of the SpikeTrain
+            if t_start is not None:
+                neo_attrs["t_start"] = max(t_start, neo_attrs["t_start"])
+            if t_stop is not None:
+                neo_attrs["t_stop"] = min(t_stop, neo_attrs["t_stop"])
         neo_spiketrain = SpikeTrain(times=times, **neo_attrs)
         if nix_mtag.features:
             wfda = nix_mtag.features[0].data
             wftime = self._get_time_dimension(wfda)
-            neo_spiketrain.waveforms = create_quantity(wfda, wfda.unit)
+            if not lazy:
+                if t_start is not None or t_stop is not None:
+                    # only read the waveforms of the spikes in the window
+                    wfdata = wfda[i:j]
+                else:
+                    wfdata = wfda
+                neo_spiketrain.waveforms = create_quantity(wfdata, wfda.unit)
             interval_units = wftime.unit
             neo_spiketrain.sampling_period = create_quantity(
                 wftime.sampling_interval, interval_units
@@ -479,6 +619,8 @@ class NixIO(BaseIO):
                 neo_spiketrain.left_sweep = create_quantity(
                     wfda.metadata["left_sweep"], left_sweep_units
                 )
+        if lazy:
+            neo_spiketrain.lazy_shape = nix_mtag.positions.shape
         self._neo_map[nix_mtag.name] = neo_spiketrain
 
         srcnames = list(src.name for src in nix_mtag.sources)
@@ -488,6 +630,82 @@ class NixIO(BaseIO):
             self._ref_map[n].append(neo_spiketrain)
         return neo_spiketrain
 
+    def load_lazy_object(self, obj, t_start=None, t_stop=None,
+                         channel_indexes=None):
+        """
+        Loads the data of an object that was read with ``lazy=True`` and
+        returns a new, fully loaded, object.
+
+        Only the part of the data between ``t_start`` and ``t_stop`` is read
+        from the file, and for signals only the channels in
+        ``channel_indexes``. This makes it possible to load a window of a long
+        recording without reading the rest of it.
+
+        :param obj: A lazy AnalogSignal, IrregularlySampledSignal, Event,
+                    Epoch or SpikeTrain
+        :param t_start: Start of the time window (None for the start)
+        :param t_stop: End of the time window (None for the end)
+        :param channel_indexes: Indexes of the channels to load (None for all)
+        :return: The loaded Neo object
+        """
+        nix_obj = self._find_nix_object(obj)
+        if isinstance(obj, AnalogSignal):
+            neo_obj = self._nix_to_neo_analogsignal(
+                nix_obj, t_start=t_start, t_stop=t_stop,
+                channel_indexes=channel_indexes
+            )
+        elif isinstance(obj, IrregularlySampledSignal):
+            neo_obj = self._nix_to_neo_irregularlysampledsignal(
+                nix_obj, t_start=t_start, t_stop=t_stop,
+                channel_indexes=channel_indexes
+            )
+        elif isinstance(obj, Event):
+            neo_obj = self._nix_to_neo_event(nix_obj, t_start=t_start,
+                                             t_stop=t_stop)
+        elif isinstance(obj, Epoch):
+            neo_obj = self._nix_to_neo_epoch(nix_obj, t_start=t_start,
+                                             t_stop=t_stop)
+        else:
+            neo_obj = self._nix_to_neo_spiketrain(nix_obj, t_start=t_start,
+                                                  t_stop=t_stop)
+        neo_obj.segment = obj.segment
+        if hasattr(obj, "channel_index"):
+            neo_obj.channel_index = obj.channel_index
+        if isinstance(obj, SpikeTrain):
+            neo_obj.unit = obj.unit
+
+        # reset maps
+        self._neo_map = dict()
+        self._ref_map = dict()
+        self._signal_map = dict()
+
+        return neo_obj
+
+    def _find_nix_object(self, obj):
+        """
+        Finds the NIX object(s) from which a Neo object was read: the list of
+        DataArrays of a signal or the MultiTag of an Event, Epoch or
+        SpikeTrain.
+        """
+        nix_name = obj.annotations.get("nix_name")
+        if isinstance(obj, (AnalogSignal, IrregularlySampledSignal)):
+            for nix_block in self.nix_file.blocks:
+                nix_das = list()
+                while ("{}.{}".format(nix_name, len(nix_das))
+                       in nix_block.data_arrays):
+                    nix_das.append(nix_block.data_arrays[
+                        "{}.{}".format(nix_name, len(nix_das))
+                    ])
+                if nix_das:
+                    return nix_das
+        else:
+            for nix_block in self.nix_file.blocks:
+                if nix_name in nix_block.multi_tags:
+                    return nix_block.multi_tags[nix_name]
+        raise KeyError("{} with NIX name '{}' does not exist".format(
+            type(obj).__name__, nix_name
+        ))
+
     def write_all_blocks(self, neo_blocks):
         """
         Convert all ``neo_blocks`` to the NIX equivalent and write them to the
@@ -544,6 +762,37 @@ class NixIO(BaseIO):
 
         self._create_source_links(block, nixblock)
 
+    def open_segment(self, segment, block, flush_interval=None,
+                     flush_size=WRITE_CHUNK_SIZE):
+        """
+        Write ``segment`` to the file and return a :class:`NixSegmentWriter`
+        which appends data to it while they are being recorded.
+
+        ``block`` is written first if it is not in the file yet. If
+        ``segment`` does not belong to ``block``, it is added to the NIX
+        Block without modifying the Neo Block.
+
+        :param segment: The Neo Segment to write data to
+        :param block: The Neo Block which contains the Segment
+        :param flush_interval: Maximum time (in seconds) during which
+                               appended data are kept in memory
+        :param flush_size: Maximum size (in bytes) of the appended data
+                           kept in memory
+        :return: A :class:`NixSegmentWriter`
+        """
+        nix_name = block.annotations.get("nix_name")
+        if nix_name is None or nix_name not in self.nix_file.blocks:
+            self.write_block(block)
+        nixblock = self.nix_file.blocks[block.annotations["nix_name"]]
+
+        seg_name = segment.annotations.get("nix_name")
+        if seg_name is None or seg_name not in nixblock.groups:
+            self._write_segment(segment, nixblock)
+        nixgroup = nixblock.groups[segment.annotations["nix_name"]]
+        return NixSegmentWriter(self, nixblock, nixgroup,
+                                flush_interval=flush_interval,
+                                flush_size=flush_size)
+
     def _write_channelindex(self, chx, nixblock):
         """
         Convert the provided Neo ChannelIndex to a NIX Source and write it to
@@ -647,7 +896,8 @@ class NixIO(BaseIO):
         Convert the provided ``anasig`` (AnalogSignal) to a list of NIX
         DataArray objects and write them to the NIX file. All DataArray objects
         created from the same AnalogSignal have their metadata section point to
-        the same object.
+        the same object. With the 'matrix' signal layout, the list contains a
+        single 2D DataArray.
 
         :param anasig: The Neo AnalogSignal to be written
         :param nixblock: NIX Block where the DataArrays will be created
@@ -672,15 +922,13 @@ class NixIO(BaseIO):
             nixgroup.data_arrays.extend(dalist)
             return
 
-        data = np.transpose(anasig[:].magnitude)
         parentmd = nixgroup.metadata if nixgroup else nixblock.metadata
         metadata = parentmd.create_section(nix_name,
                                            "neo.analogsignal.metadata")
-        nixdas = list()
-        for idx, row in enumerate(data):
-            daname = "{}.{}".format(nix_name, idx)
-            da = nixblock.create_data_array(daname, "neo.analogsignal",
-                                            data=row)
+        nixdas = self._create_signal_data_arrays(
+            nix_name, "neo.analogsignal", anasig.magnitude, nixblock
+        )
+        for da in nixdas:
             da.metadata = metadata
             da.definition = anasig.description
             da.unit = units_to_string(anasig.units)
@@ -694,8 +942,9 @@ class NixIO(BaseIO):
             metadata.props["t_start"].unit = units_to_string(tstart.units)
             timedim.offset = tstart.rescale(timedim.unit).magnitude.item()
             timedim.label = "time"
+            if len(da.shape) == 2:
+                da.append_set_dimension()
 
-            nixdas.append(da)
             if nixgroup:
                 nixgroup.data_arrays.append(da)
 
@@ -739,17 +988,15 @@ class NixIO(BaseIO):
             nixgroup.data_arrays.extend(dalist)
             return
 
-        data = np.transpose(irsig[:].magnitude)
         parentmd = nixgroup.metadata if nixgroup else nixblock.metadata
         metadata = parentmd.create_section(
             nix_name, "neo.irregularlysampledsignal.metadata"
         )
-        nixdas = list()
-        for idx, row in enumerate(data):
-            daname = "{}.{}".format(nix_name, idx)
-            da = nixblock.create_data_array(
-                daname, "neo.irregularlysampledsignal", data=row
-            )
+        nixdas = self._create_signal_data_arrays(
+            nix_name, "neo.irregularlysampledsignal", irsig.magnitude,
+            nixblock
+        )
+        for da in nixdas:
             da.metadata = metadata
             da.definition = irsig.description
             da.unit = units_to_string(irsig.units)
@@ -757,8 +1004,9 @@ class NixIO(BaseIO):
             timedim = da.append_range_dimension(irsig.times.magnitude)
             timedim.unit = units_to_string(irsig.times.units)
             timedim.label = "time"
+            if len(da.shape) == 2:
+                da.append_set_dimension()
 
-            nixdas.append(da)
             if nixgroup:
                 nixgroup.data_arrays.append(da)
 
@@ -770,6 +1018,46 @@ class NixIO(BaseIO):
 
         self._signal_map[nix_name] = nixdas
 
+    def _create_signal_data_arrays(self, nix_name, nix_type, data, nixblock):
+        """
+        Creates the DataArrays which store the (time x channel) ``data`` of a
+        signal, according to the signal layout of the IO: one 1D DataArray
+        per channel, or a single 2D DataArray which is filled chunk by chunk.
+
+        :param nix_name: The base name of the DataArrays
+        :param nix_type: The NIX type of the DataArrays
+        :param data: The signal data, without units
+        :param nixblock: NIX Block where the DataArrays will be created
+        :return: The list of DataArrays
+        """
+        if self.signal_layout == "matrix":
+            # the single DataArray keeps the '.0' suffix, so that signals are
+            # grouped and looked up in the same way in both layouts
+            da = nixblock.create_data_array(
+                "{}.0".format(nix_name), nix_type, dtype=data.dtype,
+                shape=(0, data.shape[1]), compression=self._compression
+            )
+            for chunk in self._iter_chunks(data):
+                da.append(chunk)
+            return [da]
+        return list(
+            nixblock.create_data_array("{}.{}".format(nix_name, idx),
+                                       nix_type, data=row,
+                                       compression=self._compression)
+            for idx, row in enumerate(np.transpose(data))
+        )
+
+    @staticmethod
+    def _iter_chunks(data):
+        """
+        Iterates over consecutive blocks of rows of ``data`` of at most
+        WRITE_CHUNK_SIZE bytes (and at least one row).
+        """
+        rowsize = max(data[0:1].nbytes, 1)
+        nrows = max(WRITE_CHUNK_SIZE // rowsize, 1)
+        for start in range(0, len(data), nrows):
+            yield data[start:start + nrows]
+
     def _write_event(self, event, nixblock, nixgroup):
         """
         Convert the provided Neo Event to a NIX MultiTag and write it to the
@@ -935,32 +1223,50 @@ class NixIO(BaseIO):
             nixgroup.multi_tags.append(nixmt)
 
         if spiketrain.waveforms is not None:
-            wfdata = list(wf.magnitude for wf in
-                          list(wfgroup for wfgroup in
-                               spiketrain.waveforms))
-            wfunits = units_to_string(spiketrain.waveforms.units)
-            wfda = nixblock.create_data_array(
-                "{}.waveforms".format(nix_name), "neo.waveforms",
-                data=wfdata
-            )
-            wfda.unit = wfunits
-            wfda.metadata = nixmt.metadata.create_section(
-                wfda.name, "neo.waveforms.metadata"
-            )
-            nixmt.create_feature(wfda, nix.LinkType.Indexed)
-            # TODO: Move time dimension first for PR #457
-            # https://github.com/NeuralEnsemble/python-neo/pull/457
-            wfda.append_set_dimension()
-            wfda.append_set_dimension()
-            wftime = wfda.append_sampled_dimension(
-                spiketrain.sampling_period.magnitude.item()
-            )
-            wftime.unit = units_to_string(spiketrain.sampling_period.units)
-            wftime.label = "time"
+            self._write_waveforms(spiketrain.waveforms.magnitude, spiketrain,
+                                  nixmt, nixblock)
+
+    def _write_waveforms(self, wfdata, spiketrain, nixmt, nixblock):
+        """
+        Create the DataArray holding the waveforms of a SpikeTrain and attach
+        it to the SpikeTrain MultiTag as an indexed feature.
+
+        The (spike x channel x time) waveforms are written in chunks of at
+        most WRITE_CHUNK_SIZE bytes, straight from the ``wfdata`` array.
+
+        :param wfdata: The waveform data, without units
+        :param spiketrain: The Neo SpikeTrain the waveforms belong to
+        :param nixmt: The NIX MultiTag of the SpikeTrain
+        :param nixblock: NIX Block where the DataArray will be created
+        :return: The new DataArray
+        """
+        wfunits = units_to_string(spiketrain.waveforms.units)
+        wfda = nixblock.create_data_array(
+            "{}.waveforms".format(nixmt.name), "neo.waveforms",
+            dtype=wfdata.dtype, shape=(0,) + wfdata.shape[1:],
+            compression=self._compression
+        )
+        for chunk in self._iter_chunks(wfdata):
+            wfda.append(chunk)
+        wfda.unit = wfunits
+        wfda.metadata = nixmt.metadata.create_section(
+            wfda.name, "neo.waveforms.metadata"
+        )
+        nixmt.create_feature(wfda, nix.LinkType.Indexed)
+        # TODO: Move time dimension first for PR #457
+        # https://github.com/NeuralEnsemble/python-neo/pull/457
+        wfda.append_set_dimension()
+        wfda.append_set_dimension()
+        wftime = wfda.append_sampled_dimension(
+            spiketrain.sampling_period.magnitude.item()
+        )
+        wftime.unit = units_to_string(spiketrain.sampling_period.units)
+        wftime.label = "time"
 
         if spiketrain.left_sweep is not None:
             self._write_property(wfda.metadata, "left_sweep",
                                  spiketrain.left_sweep)
+        return wfda
 
     def _write_unit(self, neounit, nixchxsource):
         """
@@ -1161,6 +1467,31 @@ class NixIO(BaseIO):
 
         return groups
 
+    @staticmethod
+    def _event_labels_data_array(nix_mtag):
+        """
+        Returns the DataArray holding the labels of an Event that is being
+        written by a :class:`NixSegmentWriter`, None if there is none.
+        """
+        for feature in nix_mtag.features:
+            if feature.data.type == "neo.event.labels":
+                return feature.data
+        return None
+
+    @classmethod
+    def _event_labels(cls, nix_mtag, i=0, j=None):
+        """
+        Returns the labels ``i`` to ``j`` of an Event.
+        """
+        if j is None:
+            j = len(nix_mtag.positions)
+        labelsda = cls._event_labels_data_array(nix_mtag)
+        if labelsda is not None:
+            # the NixSegmentWriter was not closed
+            return np.array(labelsda[i:j], dtype="S")
+        # nixio only reads the labels of a dimension as a whole
+        return np.array(nix_mtag.positions.dimensions[0].labels, dtype="S")[i:j]
+
     @staticmethod
     def _get_time_dimension(obj):
         for dim in obj.dimensions:
@@ -1168,6 +1499,60 @@ class NixIO(BaseIO):
                 return dim
         return None
 
+    @staticmethod
+    def _time_index(t, t_start, sampling_period):
+        """
+        Returns the index of the sample of a regularly sampled signal that is
+        nearest to the time ``t``, as in :meth:`AnalogSignal.time_index`.
+        """
+        t = t.rescale(sampling_period.units)
+        i = (t - t_start.rescale(sampling_period.units)) / sampling_period
+        return int(np.rint(i.magnitude))
+
+    @staticmethod
+    def _time_window(times, t_start, t_stop):
+        """
+        Returns the range of indexes of the sorted ``times`` that lie between
+        ``t_start`` and ``t_stop`` (inclusive).
+        """
+        i, j = 0, len(times)
+        if t_start is not None:
+            t_start = t_start.rescale(times.units).magnitude
+            i = np.searchsorted(times.magnitude, t_start, side="left")
+        if t_stop is not None:
+            t_stop = t_stop.rescale(times.units).magnitude
+            j = np.searchsorted(times.magnitude, t_stop, side="right")
+        return int(i), int(max(i, j))
+
+    @staticmethod
+    def _positions_window(positions, t_start, t_stop):
+        """
+        Returns the range of indexes of the sorted ``positions`` DataArray
+        that lie between ``t_start`` and ``t_stop`` (inclusive), as
+        :meth:`_time_window` does. The bounds are found by a binary search
+        in the file, so only a few positions are read.
+        """
+        units = create_quantity(1, positions.unit).units
+
+        def search(t, right):
+            t = t.rescale(units).magnitude
+            lo, hi = 0, len(positions)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                value = positions[mid]
+                if value < t or (right and value == t):
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+
+        i, j = 0, len(positions)
+        if t_start is not None:
+            i = search(t_start, right=False)
+        if t_stop is not None:
+            j = search(t_stop, right=True)
+        return i, max(i, j)
+
     def close(self):
         """
         Closes the open nix file and resets maps.
@@ -1183,3 +1568,149 @@ class NixIO(BaseIO):
 
     def __del__(self):
         self.close()
+
+
+class NixSegmentWriter(BufferedSegmentWriter):
+    """
+    Writes the data of a Segment to a NIX file incrementally, for instance
+    while they are being acquired. Created with :meth:`NixIO.open_segment`.
+
+    AnalogSignals, SpikeTrains and Events are first added without data. They
+    act as templates which provide the metadata (units, sampling rate, names,
+    annotations...) of the objects in the file. Their data are then appended
+    in chunks::
+
+        >>> with NixIO("recording.nix", "ow") as io:
+        ...     writer = io.open_segment(Segment(name="trial"), Block())
+        ...     probe = writer.add_analogsignal(
+        ...         AnalogSignal(np.empty((0, 384)), units="uV",
+        ...                      sampling_rate=30 * pq.kHz))
+        ...     for chunk in acquisition:
+        ...         writer.append_analogsignal(probe, chunk)
+        ...     writer.close()
+
+    The appended data are buffered as described in
+    :class:`neo.io.tools.BufferedSegmentWriter`.
+
+    Events reference the signals that were added to the Segment before them,
+    so signals should be added first.
+    """
+
+    key_annotation = "nix_name"
+
+    def __init__(self, nixio, nixblock, nixgroup, flush_interval=None,
+                 flush_size=WRITE_CHUNK_SIZE):
+        BufferedSegmentWriter.__init__(self, flush_interval, flush_size)
+        self._io = nixio
+        self._nixblock = nixblock
+        self._nixgroup = nixgroup
+        self._events = list()
+
+    def add_analogsignal(self, anasig):
+        """
+        Add an AnalogSignal to the Segment. Its data, usually empty, are
+        written to the file, and more samples can then be appended with
+        :meth:`append_analogsignal`.
+        """
+        self._io._write_analogsignal(anasig, self._nixblock, self._nixgroup)
+        return self._register(anasig)
+
+    def add_spiketrain(self, spiketrain):
+        """
+        Add a SpikeTrain to the Segment. Spikes can then be appended with
+        :meth:`append_spiketrain`.
+        """
+        waveforms = spiketrain.waveforms
+        if waveforms is not None and not len(waveforms):
+            # the waveform DataArray is created when spikes are appended
+            spiketrain.waveforms = None
+        self._io._write_spiketrain(spiketrain, self._nixblock,
+                                   self._nixgroup)
+        spiketrain.waveforms = waveforms
+        return self._register(spiketrain)
+
+    def add_event(self, event):
+        """
+        Add an Event to the Segment. Events can then be appended with
+        :meth:`append_event`.
+        """
+        self._io._write_event(event, self._nixblock, self._nixgroup)
+        self._events.append(event.annotations["nix_name"])
+        return self._register(event)
+
+    def _write_chunks(self, nix_name, obj, arrays):
+        if isinstance(obj, AnalogSignal):
+            self._flush_analogsignal(nix_name, *arrays)
+        elif isinstance(obj, SpikeTrain):
+            self._flush_spiketrain(obj, *arrays)
+        else:
+            self._flush_event(nix_name, *arrays)
+
+    def _flush_file(self):
+        self._io.nix_file.flush()
+
+    def _flush_analogsignal(self, nix_name, data):
+        nixdas = list()
+        for idx in itertools.count():
+            daname = "{}.{}".format(nix_name, idx)
+            if daname not in self._nixblock.data_arrays:
+                break
+            nixdas.append(self._nixblock.data_arrays[daname])
+        if len(nixdas[0].shape) == 2:
+            nixdas[0].append(data)
+        else:
+            for idx, da in enumerate(nixdas):
+                da.append(data[:, idx])
+
+    def _flush_spiketrain(self, spiketrain, times, waveforms=None):
+        nixmt = self._nixblock.multi_tags[spiketrain.annotations["nix_name"]]
+        nixmt.positions.append(times)
+        if waveforms is not None:
+            if nixmt.features:
+                nixmt.features[0].data.append(waveforms)
+            else:
+                self._io._write_waveforms(waveforms, spiketrain, nixmt,
+                                          self._nixblock)
+        t_stop = times.max() if len(times) else None
+        metadata = nixmt.metadata
+        if t_stop is not None and t_stop > metadata["t_stop"]:
+            self._io._write_property(
+                metadata, "t_stop", t_stop * spiketrain.units
+            )
+
+    def _flush_event(self, nix_name, times, labels):
+        nixmt = self._nixblock.multi_tags[nix_name]
+        nixmt.positions.append(times)
+        # the labels of a dimension cannot be extended, and rewriting them at
+        # each flush would take a time proportional to the number of events:
+        # they are appended to a DataArray until the writer is closed
+        labelsda = NixIO._event_labels_data_array(nixmt)
+        if labelsda is None:
+            labelsda = self._nixblock.create_data_array(
+                "{}.labels".format(nix_name), "neo.event.labels",
+                dtype=nix.DataType.String, shape=(0,)
+            )
+            labelsda.append(np.array(nixmt.positions.dimensions[0].labels,
+                                     dtype=object))
+            nixmt.create_feature(labelsda, nix.LinkType.Indexed)
+        labelsda.append(np.array([label.decode() for label in labels],
+                                 dtype=object))
+
+    def close(self):
+        """
+        Write the remaining appended data to the file.
+        """
+        self.flush()
+        for nix_name in self._events:
+            nixmt = self._nixblock.multi_tags[nix_name]
+            labelsda = NixIO._event_labels_data_array(nixmt)
+            if labelsda is None:
+                continue
+            # the labels are written once, as by NixIO.write_block
+            timesda = nixmt.positions
+            timesda.delete_dimensions()
+            labeldim = timesda.append_set_dimension()
+            labeldim.labels = list(labelsda[:])
+            del nixmt.features[0]
+            del self._nixblock.data_arrays[labelsda.name]
+        self._flush_file()
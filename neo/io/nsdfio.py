@@ -20,6 +20,7 @@ from datetime import datetime
 import os
 
 try:
+    import h5py
     import nsdf
 except ImportError as err:
     HAVE_NSDF = False
@@ -29,19 +30,33 @@ else:
     NSDF_ERR = None
 
 from neo.io.baseio import BaseIO
-from neo.core import Block, Segment, AnalogSignal, ChannelIndex
+from neo.io.tools import BufferedSegmentWriter
+from neo.core import (Block, Segment, AnalogSignal, ChannelIndex, SpikeTrain,
+                      Event, Epoch)
+
+# maximum size (in bytes) of the data appended with NSDFSegmentWriter that
+# are kept in memory before being written
+WRITE_CHUNK_SIZE = 2 ** 24
 
 
 class NSDFIO(BaseIO):
     """
     Class for reading and writing files in NSDF Format.
 
-    It supports reading and writing: Block, Segment, AnalogSignal, ChannelIndex, with all relationships and metadata.
+    It supports reading and writing: Block, Segment, AnalogSignal, SpikeTrain, Event, Epoch,
+    ChannelIndex, with all relationships and metadata.
+
+    Spike, event and epoch times are stored in the NSDF event layout (one 1D dataset per
+    object, under /data/event), their labels and waveforms in datasets of their model
+    component.
+
+    Segments can also be written incrementally, while they are being recorded, with
+    :meth:`open_segment`.
     """
     is_readable = True
     is_writable = True
 
-    supported_objects = [Block, Segment, AnalogSignal, ChannelIndex]
+    supported_objects = [Block, Segment, AnalogSignal, SpikeTrain, Event, Epoch, ChannelIndex]
 
     readable_objects = [Block, Segment]
     writeable_objects = [Block, Segment]
@@ -155,14 +170,45 @@ class NSDFIO(BaseIO):
         if single_segment:
             self._clean_nsdfio_annotations(segment)
 
+    def open_segment(self, segment, flush_interval=None, flush_size=WRITE_CHUNK_SIZE):
+        """
+        Write a Segment to the file and return a :class:`NSDFSegmentWriter`
+        which adds data objects to it and appends data to them while they are being recorded
+
+        :param segment: Segment to be written, usually without data objects
+        :param flush_interval: Maximum time (in seconds) during which appended data are kept
+                               in memory (optional)
+        :param flush_size: Maximum size (in bytes) of the appended data kept in memory
+        :return: A :class:`NSDFSegmentWriter`
+        """
+        if not isinstance(segment, Segment):
+            raise ValueError("Must provide a Segment to write.")
+
+        writer = self._init_writing()
+        neo_model, blocks_model, segments_model = self._prepare_model_tree(writer)
+        model = nsdf.ModelComponent('0', uid=uuid1().hex, parent=segments_model)
+        self._write_container_metadata(segment, model)
+        self._write_model_component(model, writer)
+        children_models = self._write_segment_children(model, segment, writer)
+        self._clean_nsdfio_annotations(segment)
+        return NSDFSegmentWriter(self, writer, children_models,
+                                 flush_interval=flush_interval, flush_size=flush_size)
+
     def _write_segment_children(self, model, segment, writer):
-        analogsignals_model = nsdf.ModelComponent(
-            name='analogsignals', uid=uuid1().hex, parent=model)
-        self._write_model_component(analogsignals_model, writer)
-        name_pattern = self._name_pattern(len(segment.analogsignals))
-        for i, signal in enumerate(segment.analogsignals):
-            self.write_analogsignal(signal=signal, name=name_pattern.format(i),
-                                    parent=analogsignals_model, writer=writer)
+        children_models = {}
+        for container, write in (('analogsignals', self.write_analogsignal),
+                                 ('spiketrains', self.write_spiketrain),
+                                 ('events', self.write_event),
+                                 ('epochs', self.write_epoch)):
+            children_model = nsdf.ModelComponent(
+                name=container, uid=uuid1().hex, parent=model)
+            self._write_model_component(children_model, writer)
+            children = getattr(segment, container)
+            name_pattern = self._name_pattern(len(children))
+            for i, child in enumerate(children):
+                write(child, name_pattern.format(i), writer=writer, parent=children_model)
+            children_models[container] = children_model
+        return children_models
 
     def write_analogsignal(self, signal, name, writer, parent):
         """
@@ -194,6 +240,79 @@ class NSDFIO(BaseIO):
         for channel_model in channels:
             self._write_model_component(channel_model, writer)
 
+    def write_spiketrain(self, spiketrain, name, writer, parent):
+        """
+        Write a SpikeTrain to the file
+
+        :param spiketrain: SpikeTrain to be written
+        :param name: Name for spiketrain representation in NSDF model tree
+        :param writer: NSDFWriter instance
+        :param parent: NSDF ModelComponent which will be the parent of spiketrain NSDF
+                       representation
+        """
+        model = self._create_event_model(spiketrain, name, parent)
+        self._write_quantity_attribute(model, 't_start', spiketrain.t_start)
+        self._write_quantity_attribute(model, 't_stop', spiketrain.t_stop)
+        if spiketrain.sampling_rate is not None:
+            self._write_quantity_attribute(model, 'sampling_rate', spiketrain.sampling_rate)
+        if spiketrain.left_sweep is not None:
+            self._write_quantity_attribute(model, 'left_sweep', spiketrain.left_sweep)
+        self._write_event_model(model, spiketrain, writer)
+        if spiketrain.waveforms is not None:
+            self._append_array(model.hdfgroup, 'waveforms', spiketrain.waveforms.magnitude,
+                               units=spiketrain.waveforms.units)
+
+    def write_event(self, event, name, writer, parent):
+        """
+        Write an Event to the file
+
+        :param event: Event to be written
+        :param name: Name for event representation in NSDF model tree
+        :param writer: NSDFWriter instance
+        :param parent: NSDF ModelComponent which will be the parent of event NSDF representation
+        """
+        model = self._create_event_model(event, name, parent)
+        self._write_event_model(model, event, writer)
+        self._append_array(model.hdfgroup, 'labels', event.labels)
+
+    def write_epoch(self, epoch, name, writer, parent):
+        """
+        Write an Epoch to the file
+
+        :param epoch: Epoch to be written
+        :param name: Name for epoch representation in NSDF model tree
+        :param writer: NSDFWriter instance
+        :param parent: NSDF ModelComponent which will be the parent of epoch NSDF representation
+        """
+        model = self._create_event_model(epoch, name, parent)
+        self._write_event_model(model, epoch, writer)
+        self._write_event_data(model.uid, 'durations', epoch.durations, writer)
+        self._append_array(model.hdfgroup, 'labels', epoch.labels)
+
+    def _create_event_model(self, obj, name, parent):
+        uid = uuid1().hex
+        model = nsdf.ModelComponent(name, uid=uid, parent=parent)
+        self._write_basic_metadata(model, obj)
+        obj.annotations['nsdfio_uid'] = uid
+        return model
+
+    def _write_event_model(self, model, obj, writer):
+        # the model component is written first, so that the event data can be
+        # linked to it
+        self._write_model_component(model, writer)
+        self._write_event_data(model.uid, 'times', obj.times, writer)
+
+    def _write_event_data(self, uid, variable, times, writer):
+        try:
+            source_ds = writer.mapping['event'][uid][variable]
+        except KeyError:
+            source_ds = writer.add_event_ds_1d(uid, variable, [uid])
+        # times of generated or concatenated objects may be stored as objects
+        dtype = times.dtype if times.dtype.kind in 'iuf' else np.float64
+        dataobj = nsdf.EventData(variable, unit=str(times.dimensionality), dtype=dtype)
+        dataobj.put_data(uid, times.magnitude.astype(dtype))
+        writer.add_event_1d(source_ds, dataobj)
+
     def write_channelindex(self, channelindex, name, writer, parent):
         """
         Write a ChannelIndex to the file
@@ -285,7 +404,7 @@ class NSDFIO(BaseIO):
 
     def _write_annotations(self, model, object):
         if object.annotations is not None:
-            model.attrs['annotations'] = pickle.dumps(object.annotations)
+            model.attrs['annotations'] = np.void(pickle.dumps(object.annotations))
 
     def _write_signal_data(self, model, channels, r_signal, signal, source_ds, writer):
         dataobj = nsdf.UniformData('signal', unit=str(signal.units.dimensionality))
@@ -324,10 +443,42 @@ class NSDFIO(BaseIO):
         if channelindex.coordinates is not None:
             self._write_array(group, 'coordinates', channelindex.coordinates)
 
+    def _write_quantity_attribute(self, model, name, quantity):
+        model.attrs[name] = float(quantity.magnitude)
+        model.attrs[name + '_unit'] = str(quantity.dimensionality)
+
+    def _append_array(self, group, name, array, units=None):
+        """
+        Append `array` to the resizable dataset `name` of `group` along its first axis,
+        creating the dataset if needed. Strings are stored with a variable length.
+        """
+        array = np.asarray(array)
+        if array.dtype.kind in 'SU':
+            array = np.array([label.encode('utf-8') if isinstance(label, str) else label
+                              for label in array.tolist()], dtype=object)
+            dtype = h5py.special_dtype(vlen=bytes)
+        else:
+            dtype = array.dtype
+        if name in group:
+            dataset = group[name]
+            old_length = dataset.shape[0]
+            dataset.resize(old_length + len(array), axis=0)
+            dataset[old_length:] = array
+            return
+        dataset = group.create_dataset(name, shape=array.shape, dtype=dtype,
+                                       maxshape=(None,) + array.shape[1:])
+        if len(array):
+            dataset[...] = array
+        if units is not None:
+            dataset.attrs['dimensionality'] = str(units.dimensionality)
+
     def _write_array(self, group, name, array):
         if isinstance(array, pq.Quantity):
             group.create_dataset(name, data=array.magnitude)
             group[name].attrs['dimensionality'] = str(array.dimensionality)
+        elif np.asarray(array).dtype.kind == 'U':
+            # HDF5 has no unicode arrays, these are read back as bytes
+            group.create_dataset(name, data=np.char.encode(array, 'utf-8'))
         else:
             group.create_dataset(name, data=array)
 
@@ -409,6 +560,16 @@ class NSDFIO(BaseIO):
     def _read_segment_children(self, group, reader, segment):
         for child in group['analogsignals/'].values():
             segment.analogsignals.append(self.read_analogsignal(group=child, reader=reader))
+        # files written by older versions of this IO have no spike trains, events or epochs
+        if 'spiketrains' in group:
+            for child in group['spiketrains/'].values():
+                segment.spiketrains.append(self.read_spiketrain(group=child, reader=reader))
+        if 'events' in group:
+            for child in group['events/'].values():
+                segment.events.append(self.read_event(group=child, reader=reader))
+        if 'epochs' in group:
+            for child in group['epochs/'].values():
+                segment.epochs.append(self.read_epoch(group=child, reader=reader))
 
     def read_analogsignal(self, lazy=False, group=None, reader=None):
         """
@@ -437,6 +598,77 @@ class NSDFIO(BaseIO):
         self.objects_dict[uid] = signal
         return signal
 
+    def read_spiketrain(self, lazy=False, group=None, reader=None):
+        """
+        Read a SpikeTrain from the file (must be child of a Segment)
+
+        :param lazy: Enables lazy reading
+        :param group: HDF5 Group representing the spiketrain in NSDF model tree
+        :param reader: NSDFReader instance
+        :return: Read SpikeTrain
+        """
+        assert not lazy, 'Do not support lazy'
+
+        attrs = group.attrs
+        times = self._read_event_data(attrs['uid'], 'times', reader)
+        kwargs = {}
+        for name in ('sampling_rate', 'left_sweep'):
+            if attrs.get(name) is not None:
+                kwargs[name] = self._read_quantity_attribute(attrs, name)
+        spiketrain = SpikeTrain(times, t_start=self._read_quantity_attribute(attrs, 't_start'),
+                                t_stop=self._read_quantity_attribute(attrs, 't_stop'),
+                                waveforms=self._read_array(group, 'waveforms'), **kwargs)
+
+        self._read_basic_metadata(attrs, spiketrain)
+        return spiketrain
+
+    def read_event(self, lazy=False, group=None, reader=None):
+        """
+        Read an Event from the file (must be child of a Segment)
+
+        :param lazy: Enables lazy reading
+        :param group: HDF5 Group representing the event in NSDF model tree
+        :param reader: NSDFReader instance
+        :return: Read Event
+        """
+        assert not lazy, 'Do not support lazy'
+
+        attrs = group.attrs
+        event = Event(self._read_event_data(attrs['uid'], 'times', reader),
+                      labels=self._read_labels(group))
+
+        self._read_basic_metadata(attrs, event)
+        return event
+
+    def read_epoch(self, lazy=False, group=None, reader=None):
+        """
+        Read an Epoch from the file (must be child of a Segment)
+
+        :param lazy: Enables lazy reading
+        :param group: HDF5 Group representing the epoch in NSDF model tree
+        :param reader: NSDFReader instance
+        :return: Read Epoch
+        """
+        assert not lazy, 'Do not support lazy'
+
+        attrs = group.attrs
+        epoch = Epoch(self._read_event_data(attrs['uid'], 'times', reader),
+                      durations=self._read_event_data(attrs['uid'], 'durations', reader),
+                      labels=self._read_labels(group))
+
+        self._read_basic_metadata(attrs, epoch)
+        return epoch
+
+    def _read_event_data(self, uid, variable, reader):
+        dataobj = reader.get_event_data(uid, variable)
+        return pq.Quantity(dataobj.get_data(uid), dataobj.unit)
+
+    def _read_quantity_attribute(self, attrs, name):
+        return pq.Quantity(attrs[name], attrs[name + '_unit'])
+
+    def _read_labels(self, group):
+        return np.array(group['labels'][()].tolist(), dtype='S')
+
     def read_channelindex(self, lazy=False, group=None, reader=None):
         """
         Read a ChannelIndex from the file (must be child of a Block)
@@ -474,7 +706,7 @@ class NSDFIO(BaseIO):
         if group is None:
             path = self.modeltree_path + name + 's/'
             if len(reader.model[path].values()) > 0:
-                group = reader.model[path].values()[0]
+                group = list(reader.model[path].values())[0]
 
         return group, reader
 
@@ -502,11 +734,11 @@ class NSDFIO(BaseIO):
 
     def _read_annotations(self, attrs, object):
         if attrs.get('annotations') is not None:
-            object.annotations = pickle.loads(attrs['annotations'])
+            object.annotations = pickle.loads(attrs['annotations'].tostring())
 
     def _read_index_attribute(self, attrs, object):
         if attrs.get('index') is not None:
-            object.index = attrs['index']
+            object.index = int(attrs['index'])
 
     def _create_analogsignal(self, data_group, group, t_start, uid, reader):
         # for lazy
@@ -547,3 +779,144 @@ class NSDFIO(BaseIO):
         if group[name].attrs.get('dimensionality') is not None:
             return pq.Quantity(array, group[name].attrs['dimensionality'])
         return array
+
+
+class NSDFSegmentWriter(BufferedSegmentWriter):
+    """
+    Writes the data of a Segment to an NSDF file incrementally, for instance
+    while they are being acquired. Created with :meth:`NSDFIO.open_segment`.
+
+    AnalogSignals, SpikeTrains, Events and Epochs are first added, usually
+    without data. They provide the metadata (units, sampling rate, names,
+    annotations...) of the objects in the file. Their data are then appended
+    in chunks::
+
+        >>> writer = NSDFIO('recording.h5').open_segment(Segment(name='trial'))
+        >>> probe = writer.add_analogsignal(
+        ...     AnalogSignal(np.empty((0, 384)), units='uV',
+        ...                  sampling_rate=30 * pq.kHz))
+        >>> for chunk in acquisition:
+        ...     writer.append_analogsignal(probe, chunk)
+        >>> writer.close()
+
+    The appended data are buffered as described in
+    :class:`neo.io.tools.BufferedSegmentWriter`.
+    """
+
+    key_annotation = 'nsdfio_uid'
+
+    # names of the objects in the model tree; they are listed in the order of
+    # their names when the file is read
+    name_pattern = '{:06d}'
+
+    def __init__(self, nsdfio, writer, children_models, flush_interval=None,
+                 flush_size=WRITE_CHUNK_SIZE):
+        BufferedSegmentWriter.__init__(self, flush_interval, flush_size)
+        self._io = nsdfio
+        self._writer = writer
+        # the HDF5 file written by the NSDFWriter
+        self._file = writer.data.file
+        self._children_models = children_models
+        self._counts = dict((container, len(model.children))
+                            for container, model in children_models.items())
+        self._objects = []
+
+    def _add(self, obj, container, write):
+        name = self.name_pattern.format(self._counts[container])
+        self._counts[container] += 1
+        write(obj, name, writer=self._writer, parent=self._children_models[container])
+        self._objects.append(obj)
+        return self._register(obj)
+
+    def add_analogsignal(self, signal):
+        """
+        Add an AnalogSignal to the Segment. Its data, usually empty, are
+        written to the file, and more samples can then be appended with
+        :meth:`append_analogsignal`.
+        """
+        return self._add(signal, 'analogsignals', self._io.write_analogsignal)
+
+    def add_spiketrain(self, spiketrain):
+        """
+        Add a SpikeTrain to the Segment. Spikes can then be appended with
+        :meth:`append_spiketrain`.
+        """
+        return self._add(spiketrain, 'spiketrains', self._io.write_spiketrain)
+
+    def add_event(self, event):
+        """
+        Add an Event to the Segment. Events can then be appended with
+        :meth:`append_event`.
+        """
+        return self._add(event, 'events', self._io.write_event)
+
+    def add_epoch(self, epoch):
+        """
+        Add an Epoch to the Segment. Epochs can then be appended with
+        :meth:`append_epoch`.
+        """
+        return self._add(epoch, 'epochs', self._io.write_epoch)
+
+    def append_epoch(self, epoch, times, durations, labels=None):
+        """
+        Append epochs to an Epoch added with :meth:`add_epoch`.
+
+        :param epoch: The Epoch returned by :meth:`add_epoch`
+        :param times: The start times of the epochs
+        :param durations: The durations of the epochs
+        :param labels: The labels of the epochs (default: empty labels)
+        """
+        times = self._magnitude(times, epoch.units)
+        durations = self._magnitude(durations, epoch.durations.units)
+        self._append(epoch, (times, durations, self._labels(labels, times)))
+
+    def _write_chunks(self, uid, obj, arrays):
+        if isinstance(obj, AnalogSignal):
+            self._flush_analogsignal(uid, obj, *arrays)
+        else:
+            self._flush_event(uid, obj, *arrays)
+
+    def _flush_file(self):
+        self._file.flush()
+
+    def _flush_analogsignal(self, uid, signal, data):
+        source_ds = self._writer.mapping['uniform'][uid]
+        dataobj = nsdf.UniformData('signal', unit=str(signal.units.dimensionality))
+        dataobj.dtype = signal.dtype
+        for channel_uid, channel_data in zip(source_ds, data.T):
+            dataobj.put_data(channel_uid, channel_data)
+        self._writer.add_uniform_data(source_ds, dataobj)
+
+    def _flush_event(self, uid, obj, times, *arrays):
+        group = self._find_model_group(uid, obj)
+        self._io._write_event_data(uid, 'times', times * obj.units, self._writer)
+        if isinstance(obj, SpikeTrain):
+            if arrays:
+                self._io._append_array(group, 'waveforms', arrays[0],
+                                       units=obj.waveforms.units)
+            t_stop = (times.max() if len(times) else -np.inf) * obj.units
+            if t_stop > self._io._read_quantity_attribute(group.attrs, 't_stop'):
+                self._io._write_quantity_attribute(group, 't_stop', t_stop)
+        elif isinstance(obj, Epoch):
+            durations, labels = arrays
+            self._io._write_event_data(uid, 'durations', durations * obj.durations.units,
+                                       self._writer)
+            self._io._append_array(group, 'labels', labels)
+        else:
+            self._io._append_array(group, 'labels', arrays[0])
+
+    def _find_model_group(self, uid, obj):
+        container = self._children_models[obj.__class__.__name__.lower() + 's']
+        for child in container.children.values():
+            if child.uid == uid:
+                return child.hdfgroup
+        raise KeyError(uid)
+
+    def close(self):
+        """
+        Write the remaining appended data to the file and close it.
+        """
+        self.flush()
+        self._file.close()
+        for obj in self._objects:
+            self._io._clean_nsdfio_annotations(obj)
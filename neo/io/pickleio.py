@@ -11,15 +11,28 @@ Supported: Read/Write
 Authors: Andrew Davison
 """
 
+import numpy as np
+
 try:
     import cPickle as pickle  # Python 2
 except ImportError:
     import pickle  # Python 3
+if pickle.HIGHEST_PROTOCOL < 5:
+    try:
+        import pickle5 as pickle  # backport of protocol 5 for Python < 3.8
+    except ImportError:
+        pass
+HAVE_PICKLE_PROTOCOL_5 = pickle.HIGHEST_PROTOCOL >= 5
 
 from neo.io.baseio import BaseIO
 from neo.core import (Block, Segment,
                       AnalogSignal, SpikeTrain)
 
+# buffers smaller than this are kept in the pickle file itself
+MIN_OUT_OF_BAND_SIZE = 4096
+# offsets of the buffers in the side-car file are aligned to this size
+BUFFER_ALIGNMENT = 64
+
 
 class PickleIO(BaseIO):
     """
@@ -28,6 +41,15 @@ class PickleIO(BaseIO):
     Note that files in this format may not be readable if using a different version
     of Neo to that used to create the file. It should therefore not be used for
     long-term storage, but rather for intermediate results in a pipeline.
+
+    If `memmap` is True, pickle protocol 5 is used and the large data arrays
+    are written out-of-band to a side-car file (the filename with
+    ".buffers" appended) instead of inside the pickle. When reading such a
+    file, the side-car file is memory-mapped and the data arrays of the
+    returned objects are views onto it, so no data is read until it is
+    accessed. The side-car file is opened in copy-on-write mode: changes
+    to the arrays are not written back to it.
+    Reading detects this layout automatically.
     """
     is_readable = True
     is_writable = True
@@ -41,12 +63,62 @@ class PickleIO(BaseIO):
     name = "Python pickle file"
     extensions = ['pkl', 'pickle']
 
+    def __init__(self, filename=None, memmap=False, **kargs):
+        BaseIO.__init__(self, filename=filename, **kargs)
+        if memmap and not HAVE_PICKLE_PROTOCOL_5:
+            raise ImportError("memmap mode requires pickle protocol 5 "
+                              "(Python >= 3.8 or the pickle5 package)")
+        self.memmap = memmap
+
+    @property
+    def buffer_filename(self):
+        return self.filename + '.buffers'
+
     def read_block(self, lazy=False):
         assert not lazy, 'Do not support lazy'
         with open(self.filename, "rb") as fp:
             block = pickle.load(fp)
+            if isinstance(block, dict) and 'buffers' in block:
+                # header of a file written in memmap mode
+                block = pickle.load(fp, buffers=self._map_buffers(block['buffers']))
         return block
 
     def write_block(self, block):
+        if not self.memmap:
+            with open(self.filename, "wb") as fp:
+                pickle.dump(block, fp)
+            return
+
+        buffers = []
+
+        def buffer_callback(buf):
+            if buf.raw().nbytes < MIN_OUT_OF_BAND_SIZE:
+                return True  # serialize in-band
+            buffers.append(buf)
+            return False
+
+        data = pickle.dumps(block, protocol=5, buffer_callback=buffer_callback)
+        layout = []
+        offset = 0
+        with open(self.buffer_filename, "wb") as fp:
+            for buf in buffers:
+                raw = buf.raw()
+                padding = -offset % BUFFER_ALIGNMENT
+                fp.write(b'\0' * padding)
+                offset += padding
+                fp.write(raw)
+                layout.append((offset, raw.nbytes))
+                offset += raw.nbytes
         with open(self.filename, "wb") as fp:
-            pickle.dump(block, fp)
+            pickle.dump({'buffers': layout}, fp, protocol=5)
+            fp.write(data)
+
+    def _map_buffers(self, layout):
+        """
+        Memory-map the side-car file and return the out-of-band buffers
+        described by `layout`, a list of (offset, size) pairs.
+        """
+        if not layout:
+            return []
+        mm = np.memmap(self.buffer_filename, dtype=np.uint8, mode='c')
+        return [mm[offset:offset + size] for offset, size in layout]
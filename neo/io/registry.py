@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Static registry of the neo.io classes.
+
+The class names, modules and extensions of all IOs are declared here so that
+`import neo` does not import every IO module (and their optional
+dependencies: h5py, scipy, nixio, ...). An IO module is imported the first
+time its class is accessed as an attribute of :mod:`neo.io` (or :mod:`neo`),
+by :attr:`neo.io.iolist` or by :func:`neo.io.get_io` (which only imports
+the candidates found by :mod:`neo.rawio.sniffing`).
+
+`extensions` must be kept identical to the `extensions` attribute of each
+class, this is checked by neo.test.iotest.test_registry.
+"""
+
+from __future__ import absolute_import
+
+import importlib
+import sys
+import types
+from collections import OrderedDict
+
+try:
+    from importlib.util import find_spec
+except ImportError:
+    # python 2
+    import imp
+
+    def find_spec(name):
+        try:
+            imp.find_module(name)
+        except ImportError:
+            return None
+        return True
+
+# name: (module, class name in module, extensions)
+# the order is the one of neo.io.iolist, which is the priority order of get_io()
+io_registry = OrderedDict([
+    ('AlphaOmegaIO', ('neo.io.alphaomegaio', 'AlphaOmegaIO', ['map'])),
+    ('AsciiSignalIO', ('neo.io.asciisignalio', 'AsciiSignalIO', ['txt', 'asc'])),
+    ('AsciiSpikeTrainIO', ('neo.io.asciispiketrainio', 'AsciiSpikeTrainIO', ['txt'])),
+    ('AxonIO', ('neo.io.axonio', 'AxonIO', ['abf'])),
+    ('BCI2000IO', ('neo.io.bci2000io', 'BCI2000IO', ['dat'])),
+    ('BlackrockIO', ('neo.io.blackrockio', 'BlackrockIO',
+                     ['ns1', 'ns2', 'ns3', 'ns4', 'ns5', 'ns6', 'nev'])),
+    ('BrainVisionIO', ('neo.io.brainvisionio', 'BrainVisionIO', ['vhdr'])),
+    ('BrainwareDamIO', ('neo.io.brainwaredamio', 'BrainwareDamIO', ['dam'])),
+    ('BrainwareF32IO', ('neo.io.brainwaref32io', 'BrainwareF32IO', ['f32'])),
+    ('BrainwareSrcIO', ('neo.io.brainwaresrcio', 'BrainwareSrcIO', ['src'])),
+    ('ElanIO', ('neo.io.elanio', 'ElanIO', ['eeg'])),
+    ('ElphyIO', ('neo.io.elphyio', 'ElphyIO', ['DAT'])),
+    ('ExampleIO', ('neo.io.exampleio', 'ExampleIO', ['fake'])),
+    ('IgorIO', ('neo.io.igorproio', 'IgorIO', ['ibw', 'pxp'])),
+    ('KlustaKwikIO', ('neo.io.klustakwikio', 'KlustaKwikIO', ['fet', 'clu', 'res', 'spk'])),
+    ('KwikIO', ('neo.io.kwikio', 'KwikIO', ['kwik'])),
+    ('MicromedIO', ('neo.io.micromedio', 'MicromedIO', ['trc', 'TRC'])),
+    # NixIO before NeoHdf5IO to make it the default for .h5 files
+    ('NixIO', ('neo.io.nixio', 'NixIO', ['h5', 'nix'])),
+    ('NeoHdf5IO', ('neo.io.hdf5io', 'NeoHdf5IO', ['h5'])),
+    ('NeoMatlabIO', ('neo.io.neomatlabio', 'NeoMatlabIO', ['mat'])),
+    ('NestIO', ('neo.io.nestio', 'NestIO', ['gdf', 'dat'])),
+    ('NeuralynxIO', ('neo.io.neuralynxio', 'NeuralynxIO', ['nse', 'ncs', 'nev', 'ntt'])),
+    ('NeuroExplorerIO', ('neo.io.neuroexplorerio', 'NeuroExplorerIO', ['nex'])),
+    ('NeuroScopeIO', ('neo.io.neuroscopeio', 'NeuroScopeIO', ['xml', 'dat'])),
+    # the module depends on the neuroshare library, see import_io_class()
+    ('NeuroshareIO', (None, None, [])),
+    ('NSDFIO', ('neo.io.nsdfio', 'NSDFIO', ['h5'])),
+    ('PickleIO', ('neo.io.pickleio', 'PickleIO', ['pkl', 'pickle'])),
+    ('PlexonIO', ('neo.io.plexonio', 'PlexonIO', ['plx'])),
+    ('PyNNNumpyIO', ('neo.io.pynnio', 'PyNNNumpyIO', ['npz'])),
+    ('PyNNTextIO', ('neo.io.pynnio', 'PyNNTextIO', ['v', 'ras', 'gsyn'])),
+    ('RawBinarySignalIO', ('neo.io.rawbinarysignalio', 'RawBinarySignalIO', ['raw', '*'])),
+    ('Spike2IO', ('neo.io.spike2io', 'Spike2IO', ['smr'])),
+    ('StimfitIO', ('neo.io.stimfitio', 'StimfitIO', ['abf', 'dat', 'axgx', 'axgd', 'cfs'])),
+    ('TdtIO', ('neo.io.tdtio', 'TdtIO', [])),
+    ('WinEdrIO', ('neo.io.winedrio', 'WinEdrIO', ['EDR', 'edr'])),
+    ('WinWcpIO', ('neo.io.winwcpio', 'WinWcpIO', ['wcp'])),
+])
+
+# available in neo.io but not in neo.io.iolist
+other_io_registry = OrderedDict([
+    ('OldBlackrockIO', ('neo.io.blackrockio_v4', 'BlackrockIO',
+                        ['ns1', 'ns2', 'ns3', 'ns4', 'ns5', 'ns6', 'nev', 'sif', 'ccf'])),
+    ('OldNeuralynxIO', ('neo.io.neuralynxio_v1', 'NeuralynxIO', ['nse', 'ncs', 'nev', 'ntt'])),
+])
+
+io_names = list(io_registry.keys())
+all_io_names = io_names + list(other_io_registry.keys())
+
+
+def _neuroshare_module():
+    # if the neuroshare library is present, use the neuroshareapiio to load
+    # neuroshare files, otherwise use the neurosharectypesio
+    if find_spec('neuroshare') is None:
+        return 'neo.io.neurosharectypesio', 'NeurosharectypesIO'
+    return 'neo.io.neuroshareapiio', 'NeuroshareapiIO'
+
+
+def import_io_class(name):
+    """
+    Import the module of the IO `name` (a key of io_registry or
+    other_io_registry) and return the class.
+    """
+    if name in io_registry:
+        module_name, class_name, _ = io_registry[name]
+    else:
+        module_name, class_name, _ = other_io_registry[name]
+    if module_name is None:
+        module_name, class_name = _neuroshare_module()
+    try:
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)
+    except AttributeError as err:
+        # neo.io would take an AttributeError for a missing attribute and
+        # hide the cause behind "cannot import name"
+        exc = ImportError("cannot import {} from {}: {}".format(
+            class_name, module_name, err))
+        exc.__cause__ = err
+        raise exc
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module type whose missing attributes are computed by the function
+    `_lazy_getattr` of the module and then cached in the module.
+    """
+
+    def __getattr__(self, name):
+        lazy_getattr = self.__dict__.get('_lazy_getattr')
+        if lazy_getattr is None or name.startswith('__'):
+            raise AttributeError("module '{}' has no attribute '{}'".format(
+                self.__name__, name))
+        value = lazy_getattr(name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) | set(self.__dict__.get('__all__', [])))
+
+
+def make_lazy(module_name):
+    """
+    Turn the module `module_name` into a LazyModule. The module must define
+    `_lazy_getattr(name)`, that returns the value or raises AttributeError,
+    and `__all__`.
+
+    Changing the class of a module needs python >= 3.5; with older versions
+    all the names of `__all__` are resolved now.
+    """
+    module = sys.modules[module_name]
+    try:
+        module.__class__ = LazyModule
+    except TypeError:
+        for name in module.__all__:
+            if name not in module.__dict__:
+                setattr(module, name, module._lazy_getattr(name))
@@ -6,8 +6,12 @@ Tools for IO coder:
 """
 
 import collections
+import os
+import time
+import warnings
 
 import numpy as np
+import quantities as pq
 
 from neo.core import (AnalogSignal, Block,
                       Epoch, Event,
@@ -79,6 +83,195 @@ from neo.core import (AnalogSignal, Block,
 #        return D.items()  # Python 3
 
 
+def parse_text_values(text, dtype, filename):
+    """
+    Parse all the whitespace-separated numbers of a text into a 1D array of
+    type `dtype`, raising a ValueError if part of the text is not a number
+    of this type.
+    """
+    with warnings.catch_warnings():
+        # depending on its version, numpy warns or not when it cannot parse
+        # the text to its end, but it always stops at the first bad token
+        warnings.simplefilter('ignore', DeprecationWarning)
+        values = np.fromstring(text, dtype=dtype, sep=' ')
+    if values.size != len(text.split()):
+        raise ValueError("Could not parse the content of %s" % filename)
+    return values
+
+
+def cached_array(filename, build, cache=True, cache_filename=None,
+                 mmap_mode=None):
+    """
+    Return the array built from a file by `build()`, using a binary cache of
+    it: `cache_filename` (default: `filename` + '.npy').
+
+    The cache is loaded (with `mmap_mode`, see numpy.load) if it is more
+    recent than the file, otherwise the array is built and saved to the
+    cache. A cache that cannot be read is rebuilt, and a cache that cannot
+    be written (read-only directory, full disk...) only raises a warning.
+    If `cache` is False, the array is just built.
+    """
+    if not cache:
+        return build()
+    if cache_filename is None:
+        cache_filename = filename + '.npy'
+    if (os.path.isfile(cache_filename) and
+            os.path.getmtime(cache_filename) >= os.path.getmtime(filename)):
+        try:
+            return np.load(cache_filename, mmap_mode=mmap_mode)
+        except (IOError, OSError, ValueError):
+            pass
+    data = build()
+    try:
+        np.save(cache_filename, data)
+    except (IOError, OSError) as err:
+        warnings.warn("Could not write the cache file %s: %s" % (cache_filename, err))
+        # do not leave a partly written cache
+        if os.path.isfile(cache_filename):
+            try:
+                os.remove(cache_filename)
+            except (IOError, OSError):
+                pass
+    return data
+
+
+class BufferedSegmentWriter(object):
+    """
+    Base class of the writers that append the data of a Segment to a file
+    incrementally (see :class:`neo.io.nixio.NixSegmentWriter` and
+    :class:`neo.io.nsdfio.NSDFSegmentWriter`).
+
+    Appended data are kept in memory until ``flush_size`` bytes have been
+    appended or ``flush_interval`` seconds have passed since they were last
+    written, so memory use stays bounded however long the recording is.
+
+    Subclasses call :meth:`_register` for each object they add to the file,
+    and implement :meth:`_write_chunks`, which writes the data appended to
+    one object, and :meth:`_flush_file`.
+    """
+
+    # annotation holding the key of an object in the file
+    key_annotation = None
+
+    def __init__(self, flush_interval=None, flush_size=None):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        # appended data not written yet, per key
+        self._pending = dict()
+        self._pending_size = 0
+        self._last_flush = time.time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _register(self, obj):
+        self._pending[obj.annotations[self.key_annotation]] = list()
+        return obj
+
+    def append_analogsignal(self, anasig, data):
+        """
+        Append samples to an AnalogSignal added with
+        :meth:`add_analogsignal`.
+
+        :param anasig: The AnalogSignal returned by :meth:`add_analogsignal`
+        :param data: A (time x channel) array of samples. If it is not a
+                     Quantity, it must be in the units of the signal.
+        """
+        data = self._magnitude(data, anasig.units)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        self._append(anasig, (data,))
+
+    def append_spiketrain(self, spiketrain, times, waveforms=None):
+        """
+        Append spikes to a SpikeTrain added with :meth:`add_spiketrain`.
+        The ``t_stop`` of the SpikeTrain in the file is extended if spikes
+        occur after it.
+
+        :param spiketrain: The SpikeTrain returned by :meth:`add_spiketrain`
+        :param times: The times of the spikes
+        :param waveforms: The (spike x channel x time) waveforms of the
+                          spikes. Required if the SpikeTrain was added with
+                          (empty) waveforms, not allowed otherwise.
+        """
+        times = self._magnitude(times, spiketrain.units)
+        if spiketrain.waveforms is None:
+            if waveforms is not None:
+                raise ValueError("Waveforms can only be appended to a "
+                                 "SpikeTrain added with (empty) waveforms")
+            self._append(spiketrain, (times,))
+        else:
+            waveforms = self._magnitude(waveforms, spiketrain.waveforms.units)
+            self._append(spiketrain, (times, waveforms))
+
+    def append_event(self, event, times, labels=None):
+        """
+        Append events to an Event added with :meth:`add_event`.
+
+        :param event: The Event returned by :meth:`add_event`
+        :param times: The times of the events
+        :param labels: The labels of the events (default: empty labels)
+        """
+        times = self._magnitude(times, event.units)
+        self._append(event, (times, self._labels(labels, times)))
+
+    @staticmethod
+    def _magnitude(data, units):
+        if isinstance(data, pq.Quantity):
+            return data.rescale(units).magnitude
+        return np.asarray(data)
+
+    @staticmethod
+    def _labels(labels, times):
+        if labels is None:
+            labels = [""] * len(times)
+        return np.asarray(labels, dtype="S")
+
+    def _append(self, obj, chunk):
+        self._pending[obj.annotations[self.key_annotation]].append((obj, chunk))
+        self._pending_size += sum(arr.nbytes for arr in chunk)
+        if (self._pending_size >= self.flush_size or
+                (self.flush_interval is not None and
+                 time.time() - self._last_flush >= self.flush_interval)):
+            self.flush()
+
+    def flush(self):
+        """
+        Write all the appended data to the file.
+        """
+        for key, chunks in self._pending.items():
+            if not chunks:
+                continue
+            obj = chunks[0][0]
+            arrays = list(np.concatenate(arrs)
+                          for arrs in zip(*(chunk for _, chunk in chunks)))
+            self._write_chunks(key, obj, arrays)
+            del chunks[:]
+        self._pending_size = 0
+        self._last_flush = time.time()
+        self._flush_file()
+
+    def _write_chunks(self, key, obj, arrays):
+        """
+        Write to the file the ``arrays`` appended to ``obj`` since the last
+        flush, concatenated (the arguments of the append method after the
+        object, as arrays).
+        """
+        raise NotImplementedError()
+
+    def _flush_file(self):
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Write the remaining appended data to the file.
+        """
+        self.flush()
+
+
 class LazyList(collections.MutableSequence):
     """ An enhanced list that can load its members on demand. Behaves exactly
     like a regular list for members that are Neo objects. Each item should
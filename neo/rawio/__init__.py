@@ -11,10 +11,14 @@ Classes:
 
 """
 
+from neo.rawio.alphaomegarawio import AlphaOmegaRawIO
 from neo.rawio.axonrawio import AxonRawIO
 from neo.rawio.blackrockrawio import BlackrockRawIO
 from neo.rawio.brainvisionrawio import BrainVisionRawIO
+from neo.rawio.brainwaredamrawio import BrainwareDamRawIO
+from neo.rawio.brainwaref32rawio import BrainwareF32RawIO
 from neo.rawio.elanrawio import ElanRawIO
+from neo.rawio.elphyrawio import ElphyRawIO
 from neo.rawio.micromedrawio import MicromedRawIO
 from neo.rawio.neuralynxrawio import NeuralynxRawIO
 from neo.rawio.neuroexplorerrawio import NeuroExplorerRawIO
@@ -26,11 +30,17 @@ from neo.rawio.tdtrawio import TdtRawIO
 from neo.rawio.winedrrawio import WinEdrRawIO
 from neo.rawio.winwcprawio import WinWcpRawIO
 
+from neo.rawio.sniffing import FormatIndex
+
 rawiolist = [
+    AlphaOmegaRawIO,
     AxonRawIO,
     BlackrockRawIO,
     BrainVisionRawIO,
+    BrainwareDamRawIO,
+    BrainwareF32RawIO,
     ElanRawIO,
+    ElphyRawIO,
     MicromedRawIO,
     NeuralynxRawIO,
     NeuroExplorerRawIO,
@@ -43,21 +53,28 @@ rawiolist = [
     WinWcpRawIO,
 ]
 
-import os
+_rawio_by_name = dict((rawio.__name__, rawio) for rawio in rawiolist)
+_format_index = FormatIndex((rawio.__name__, rawio.extensions) for rawio in rawiolist)
+
+
+def get_rawio_candidates(filename_or_dirname):
+    """
+    Return a list of (neo.rawio class, confidence) that could read
+    `filename_or_dirname`, best first. The guess is based on the extension
+    and on the first bytes of the file, see neo.rawio.sniffing.
+    """
+    return [(_rawio_by_name[name], confidence)
+            for name, confidence in _format_index.rank(filename_or_dirname)]
 
 
 def get_rawio_class(filename_or_dirname):
     """
-    Return a neo.rawio class guess from file extention.
+    Return a neo.rawio class guess from file extention and content, None
+    if there is no candidate or several candidates with the same confidence.
     """
-    _, ext = os.path.splitext(filename_or_dirname)
-    ext = ext[1:]
-    possibles = []
-    for rawio in rawiolist:
-        if any(ext.lower() == ext2.lower() for ext2 in rawio.extensions):
-            possibles.append(rawio)
-
-    if len(possibles) == 1:
-        return possibles[0]
+    possibles = get_rawio_candidates(filename_or_dirname)
+
+    if len(possibles) == 1 or (len(possibles) > 1 and possibles[0][1] > possibles[1][1]):
+        return possibles[0][0]
     else:
         return None
@@ -0,0 +1,689 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading data from Alpha Omega .map files.
+
+This class is an experimental reader with important limitations.
+See the source code for details of the limitations.
+The code of this reader is of alpha quality and received very limited testing.
+
+This code is written from the incomplete file specifications available in:
+
+[1] AlphaMap Data Acquisition System User's Manual Version 10.1.1
+Section 5 APPENDIX B: ALPHAMAP FILE STRUCTURE, pages 120-140
+Edited by ALPHA OMEGA Home Office: P.O. Box 810, Nazareth Illit 17105, Israel
+http://www.alphaomega-eng.com/
+
+and from the source code of a C software for conversion of .map files to
+.eeg elan software files :
+
+[2] alphamap2eeg 1.0, 12/03/03, Anne CHEYLUS - CNRS ISC UMR 5015
+
+A .map file is a chain of blocks, each one starting with its length. The
+chain is walked once to build a table of the data blocks (file offset,
+number of samples, channel and time stamp of each block) with numpy. This
+table can be kept in the rawio cache (use_cache=True), so that the file is
+not walked again. Signals are read from a memmap: the blocks overlapping
+the requested samples are found by binary search in the cumulated number of
+samples of the blocks of each channel.
+
+Supported : Read
+
+Author: sgarcia, Florent Jaillet
+
+"""
+
+# NOTE: For some specific types of comments, the following convention is used:
+# "TODO:" Desirable future evolution
+# "WARNING:" Information about code that is based on broken or missing
+# specifications and that might be wrong
+
+
+# Main limitations of this reader:
+# - The reader is only able to load data stored in data blocks of type 5
+#   (data block for one channel). In particular it means that it doesn't
+#   support signals stored in blocks of type 7 (data block for multiple
+#   channels).
+#   For more details on these data blocks types, see 5.4.1 and 5.4.2 p 127 in
+#   [1].
+# - Rather than supporting all the neo objects types that could be extracted
+#   from the file, all read data are returned in AnalogSignal objects, even for
+#   digital channels or channels containing spiking informations.
+# - Digital channels are not converted to events or events array as they
+#   should.
+# - Many data or metadata that are avalaible in the file and that could be
+#   represented in some way in the neo model are not extracted. In particular
+#   scaling of the data and extraction of the units of the signals are not
+#   supported.
+#
+# These limitations are mainly due to the following reasons:
+# - Incomplete, unclear and in some places innacurate specifications of the
+#   format in [1].
+# - Lack of test files containing all the types of data blocks of interest
+#   (in particular no file with type 7 data block for multiple channels where
+#   available when writing this code).
+# - Lack of knowledge of the Alphamap software and the associated data models.
+# - Lack of time (especially as the specifications are incomplete, a lot of
+#   reverse engineering and testing is required, which makes the development of
+#   this IO very painful and long).
+
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+import datetime
+import struct
+
+# NOTE: in the following, the word "block" is used in the sense used in
+# the alpha-omega specifications (ie a data chunk in the file), rather
+# than in the sense of the usual Block object in neo
+
+# table of the data blocks of type 5 (data block for one channel)
+_data_block_dtype = [
+    ('offset', 'int64'),  # position of the first sample in the file
+    ('count', 'int64'),  # number of samples
+    ('channel', 'int16'),  # m_numChannel
+    ('timestamp', 'int32'),  # index of the first sample
+]
+
+
+class AlphaOmegaRawIO(BaseRawIO):
+    """
+    Class for reading data from Alpha Omega .map files (experimental)
+
+    Usage:
+        >>> import neo.rawio
+        >>> r = neo.rawio.AlphaOmegaRawIO(filename='File_AlphaOmega_1.map')
+        >>> r.parse_header()
+        >>> print(r)
+        >>> raw_chunk = r.get_analogsignal_chunk(block_index=0, seg_index=0,
+                            i_start=0, i_stop=1024,  channel_indexes=[0])
+        >>> float_chunk = r.rescale_signal_raw_to_float(raw_chunk, dtype='float64',
+                            channel_indexes=[0])
+    """
+    name = 'AlphaOmega'
+    description = 'Alpha Omega .map files (experimental)'
+    extensions = ['map']
+    rawmode = 'one-file'
+
+    def __init__(self, filename='', **kargs):
+        self.filename = filename
+        BaseRawIO.__init__(self, **kargs)
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        # only one memmap for all channels
+        self._memmap = np.memmap(self.filename, dtype='uint8', mode='r')
+
+        block_positions = None
+        if self.use_cache:
+            block_positions = self._cache.get('block_positions')
+            data_blocks = self._cache.get('data_blocks')
+        if block_positions is None:
+            block_positions, data_blocks = self._build_block_table()
+            if self.use_cache:
+                self.add_in_cache(block_positions=block_positions,
+                                  data_blocks=data_blocks)
+
+        # headers of all the blocks except the data blocks
+        file_header = None
+        channel_headers = []
+        for pos in block_positions:
+            type_block = chr(self._memmap[pos + 2])
+            if type_block == 'h':
+                file_header = read_header(self._memmap, pos + 4, TypeH_Header)[0]
+            elif type_block == '2':
+                channel_headers.append(read_channel_header(self._memmap, pos + 4))
+
+        # blocks of each channel, in the order of the file
+        # WARNING: blocks are supposed to be contiguous and sorted in time.
+        # I don't know if it's always the case. Maybe we should use the time
+        # stamp of each data block to choose where to put the read data.
+        order = np.argsort(data_blocks['channel'], kind='mergesort')
+        sorted_channels = data_blocks['channel'][order]
+
+        self._channel_blocks = []
+        self._channel_sample_starts = []
+        sig_channels = []
+        channel_types = []
+        group_ids = {}
+        for header in channel_headers:
+            num_chan = header['m_numChannel']
+            first, last = np.searchsorted(sorted_channels, [num_chan, num_chan + 1])
+            blocks = data_blocks[order[first:last]]
+            if blocks['count'].sum() == 0:
+                # no data available for this channel
+                continue
+            sample_starts = np.zeros(blocks.size + 1, dtype='int64')
+            np.cumsum(blocks['count'], out=sample_starts[1:])
+            self._channel_blocks.append(blocks)
+            self._channel_sample_starts.append(sample_starts)
+
+            # sample rate is given in kHz
+            sampling_rate = header['m_SampleRate'] * 1000.
+            # channels with the same length and time of first sample can be
+            # read together
+            key = (sampling_rate, sample_starts[-1], blocks['timestamp'][0])
+            group_id = group_ids.setdefault(key, len(group_ids))
+            sig_channels.append((header['m_Name'], num_chan, sampling_rate, 'int16',
+                                 '', 1., 0., group_id))
+            channel_types.append(header['type_subblock'])
+
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # No spikes
+        unit_channels = []
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [1]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        for c, channel_type in enumerate(channel_types):
+            self._raw_annotate('signals', chan_index=c,
+                               channel_name=sig_channels['name'][c],
+                               channel_type=channel_type)
+        if file_header is not None:  # this should always be true
+            rec_datetime = datetime.datetime(
+                file_header['m_date_year'],
+                file_header['m_date_month'],
+                file_header['m_date_day'],
+                file_header['m_time_hour'],
+                file_header['m_time_minute'],
+                file_header['m_time_second'],
+                10000 * file_header['m_time_hsecond'])
+            # the 10000 is here to convert m_time_hsecond from centisecond
+            # to microsecond
+            version = file_header['m_version']
+            for obj_name in ('blocks', 'segments'):
+                self._raw_annotate(obj_name, rec_datetime=rec_datetime,
+                                   alphamap_version=version)
+
+    def _build_block_table(self):
+        """
+        Walk the chain of blocks of the file.
+
+        Return the positions of all the blocks except the data blocks of
+        type 5, and the table of these data blocks.
+        """
+        buf = self._memmap
+
+        # every block starts with its length, so the blocks can only be
+        # found one after the other. Only this length is read here.
+        positions = []
+        pos = 0
+        end = buf.size - 4
+        while pos <= end:
+            m_length, = struct.unpack_from('<H', buf, pos)
+            if m_length == 0:
+                self.logger.warning('Empty block at position {}, the end of '
+                                    'the file is ignored'.format(pos))
+                break
+            positions.append(pos)
+            pos += m_length
+        positions = np.array(positions, dtype='int64')
+
+        is_data = buf[positions + 2] == ord('5')
+        data_positions = positions[is_data]
+
+        data_blocks = np.zeros(data_positions.size, dtype=_data_block_dtype)
+        # for information about type 5 data block, see [1]
+        # -6 corresponds to the header of block 5, and the -2 take into
+        # account the fact that last 2 values are not available as the 4
+        # corresponding bytes are coding the time stamp of the beginning
+        # of the block
+        m_length = gather(buf, data_positions, '<u2')
+        data_blocks['count'] = np.maximum((m_length.astype('int64') - 6) // 2 - 2, 0)
+        data_blocks['offset'] = data_positions + 6
+        data_blocks['channel'] = gather(buf, data_positions + 4, '<i2')
+        has_timestamp = m_length >= 10
+        data_blocks['timestamp'][has_timestamp] = gather(
+            buf, data_blocks['offset'][has_timestamp] + 2 * data_blocks['count'][has_timestamp],
+            '<i4')
+
+        return positions[~is_data], data_blocks
+
+    def _segment_t_start(self, block_index, seg_index):
+        nb_channel = self.header['signal_channels'].size
+        if nb_channel == 0:
+            return 0.
+        return min(self._get_signal_t_start(block_index, seg_index, [c])
+                   for c in range(nb_channel))
+
+    def _segment_t_stop(self, block_index, seg_index):
+        sig_channels = self.header['signal_channels']
+        if sig_channels.size == 0:
+            return 0.
+        return max(self._get_signal_t_start(block_index, seg_index, [c]) +
+                   self._channel_sample_starts[c][-1] / sig_channels['sampling_rate'][c]
+                   for c in range(sig_channels.size))
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        c = self._first_channel(channel_indexes)
+        return int(self._channel_sample_starts[c][-1])
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        c = self._first_channel(channel_indexes)
+        sampling_rate = self.header['signal_channels']['sampling_rate'][c]
+        return float(self._channel_blocks[c]['timestamp'][0] / sampling_rate)
+
+    def _first_channel(self, channel_indexes):
+        # all the channels of a group share size and t_start
+        if channel_indexes is None:
+            return 0
+        return np.arange(self.header['signal_channels'].size)[channel_indexes][0]
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+        channel_indexes = np.arange(self.header['signal_channels'].size)[channel_indexes]
+
+        size = self._get_signal_size(block_index, seg_index, channel_indexes)
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = size
+
+        raw_signals = np.empty((i_stop - i_start, len(channel_indexes)), dtype='int16')
+        for i, c in enumerate(channel_indexes):
+            blocks = self._channel_blocks[c]
+            sample_starts = self._channel_sample_starts[c]
+            # blocks containing samples i_start to i_stop
+            first = np.searchsorted(sample_starts, i_start, side='right') - 1
+            last = np.searchsorted(sample_starts, i_stop, side='left')
+            for b in range(first, last):
+                b_start = max(i_start, sample_starts[b])
+                b_stop = min(i_stop, sample_starts[b + 1])
+                offset = blocks['offset'][b] + 2 * (b_start - sample_starts[b])
+                raw_signals[b_start - i_start:b_stop - i_start, i] = \
+                    self._memmap[offset:offset + 2 * (b_stop - b_start)].view('<i2')
+        return raw_signals
+
+
+def gather(buf, offsets, dtype):
+    """
+    Read one value of type dtype at each of the offsets of buf (an uint8
+    array).
+    """
+    dtype = np.dtype(dtype)
+    indexes = offsets[:, None] + np.arange(dtype.itemsize)
+    return buf[indexes].view(dtype)[:, 0]
+
+
+def read_header(buf, offset, description):
+    """
+    Read the fields listed in description from buf, starting at offset.
+
+    Return a dict of the fields and the offset of the end of the fields.
+    Reading stops at the end of buf.
+    """
+    d = {}
+    for key, fmt in description:
+        fmt = '<' + fmt  # insures use of standard sizes
+        try:
+            val = list(struct.unpack_from(fmt, buf, offset))
+        except struct.error:
+            break
+        offset += struct.calcsize(fmt)
+        for i, ival in enumerate(val):
+            if isinstance(ival, bytes):
+                val[i] = ival.split(b'\x00', 1)[0].decode('latin-1')
+        if len(val) == 1:
+            val = val[0]
+        d[key] = val
+    return d, offset
+
+
+def read_channel_header(buf, offset):
+    """
+    Read the header of a block of type 2 (channel definition).
+    """
+    header, offset = read_header(buf, offset, Type2_DefBlocksChannels)
+
+    # The beginning of the block of type '2' is identical for
+    # all types of channels, but the following part depends on
+    # the type of channel. So we need a special case here.
+
+    # WARNING: How to check the type of channel is not
+    # described in the documentation. So here I use what is
+    # proposed in the C code [2].
+    # According to this C code, it seems that the 'm_isAnalog'
+    # is used to distinguished analog and digital channels, and
+    # 'm_Mode' encodes the type of analog channel:
+    # 0 for continuous, 1 for level, 2 for external trigger.
+    # But in some files, I found channels that seemed to be
+    # continuous channels with 'm_Modes' = 128 or 192. So I
+    # decided to consider every channel with 'm_Modes'
+    # different from 1 or 2 as continuous. I also couldn't
+    # check that values of 1 and 2 are really for level and
+    # external trigger as I had no test files containing data
+    # of this types.
+
+    type_subblock = 'unknown_channel_type(m_Mode=' \
+                    + str(header['m_Mode']) + ')'
+    description = Type2_SubBlockUnknownChannels
+    header['m_Name'] = 'unknown_name'
+    if header['m_isAnalog'] == 0:
+        # digital channel
+        type_subblock = 'digital'
+        description = Type2_SubBlockDigitalChannels
+    elif header['m_isAnalog'] == 1:
+        # analog channel
+        if header['m_Mode'] == 1:
+            # level channel
+            type_subblock = 'level'
+            description = Type2_SubBlockLevelChannels
+        elif header['m_Mode'] == 2:
+            # external trigger channel
+            type_subblock = 'external_trigger'
+            description = Type2_SubBlockExtTriggerChannels
+        else:
+            # continuous channel
+            type_subblock = 'continuous(Mode' \
+                            + str(header['m_Mode']) + ')'
+            description = Type2_SubBlockContinuousChannels
+
+    header.update(read_header(buf, offset, description)[0])
+    header['type_subblock'] = type_subblock
+    return header
+
+
+"""
+Information for special types in [1]:
+
+_dostime_t type definition:
+struct dos_time_t
+{
+ unsigned char hour; /* hours (0-23)*/
+ unsigned char minute; /* minutes (0-59)*/
+ unsigned char second; /* seconds (0-59) */
+ unsigned char hsecond; /* seconds/ 100 (0-99)*/
+}
+
+_dosdate_t type definition:
+struct _dosdate_t
+{
+ unsigned char day;       /* day of month( 1-31) */
+ unsigned char month;     /* month (1-12) */
+ unsigned int year;       /* year (1980-2099) */
+ unsigned char dayofweek; /* day of week (0 = Sunday) */
+}
+
+WINDOWPLACEMENT16 type definition (according to WINE source code):
+typedef struct
+{
+    UINT16   length;
+    UINT16   flags;
+    UINT16   showCmd;
+    POINT16  ptMinPosition;
+    POINT16  ptMaxPosition;
+    RECT16   rcNormalPosition;
+} WINDOWPLACEMENT16,*LPNONCLIENTMETRICS16;
+
+"""
+
+max_string_len = '32s'  # maximal length of variable length strings in the file
+# WARNING: I don't know what is the real value here. According to [1] p 139
+# it seems that it could be 20. Some tests would be needed to check this.
+
+# WARNING: A cleaner way to handle strings reading is suitable. Currently I
+# read a buffer of max_string_len bytes and look for the C "end of string"
+# character ('\x00'). It would be better either to read characters until
+# reaching '\x00' or to read the exact number of characters needed, if the
+# length of a string can be deduced from the lentgh of the block and the number
+# of bytes already read (it seems possible, at least for certain block types).
+
+# WARNING: Some test files contains data blocks of type 'b' and they are not
+# described in the documentation.
+
+# The name of the keys in the folowing dicts are chosen to match as closely as
+# possible the names in document [1]
+
+TypeH_Header = [
+    ('m_nextBlock', 'l'),
+    ('m_version', 'h'),
+    ('m_time_hour', 'B'),
+    ('m_time_minute', 'B'),
+    ('m_time_second', 'B'),
+    ('m_time_hsecond', 'B'),
+    ('m_date_day', 'B'),
+    ('m_date_month', 'B'),
+    ('m_date_year', 'H'),
+    ('m_date_dayofweek', 'B'),
+    ('blank', 'x'),  # one byte blank because of the 2 bytes alignement
+    ('m_MinimumTime', 'd'),
+    ('m_MaximumTime', 'd')]
+
+Type0_SetBoards = [
+    ('m_nextBlock', 'l'),
+    ('m_BoardCount', 'h'),
+    ('m_GroupCount', 'h'),
+    ('m_placeMainWindow', 'x')]  # WARNING: unknown type ('x' is wrong)
+
+Type1_Boards = [  # WARNING: needs to be checked
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_countChannel', 'h'),
+    ('m_countAnIn', 'h'),
+    ('m_countAnOut', 'h'),
+    ('m_countDigIn', 'h'),
+    ('m_countDigOut', 'h'),
+    ('m_TrigCount', 'h'),  # not defined in 5.3.3 but appears in 5.5.1 and
+    # seems to really exist in files
+    # WARNING: check why 'm_TrigCount is not in the C code [2]
+    ('m_Amplitude', 'f'),
+    ('m_cSampleRate', 'f'),  # sample rate seems to be given in kHz
+    ('m_Duration', 'f'),
+    ('m_nPreTrigmSec', 'f'),
+    ('m_nPostTrigmSec', 'f'),
+    ('m_TrgMode', 'h'),
+    ('m_LevelValue', 'h'),  # after this line, 5.3.3 is wrong,
+    # check example in 5.5.1 for the right fields
+    # WARNING: check why the following part is not corrected in the C code [2]
+    ('m_nSamples', 'h'),
+    ('m_fRMS', 'f'),
+    ('m_ScaleFactor', 'f'),
+    ('m_DapTime', 'f'),
+    ('m_nameBoard', max_string_len)]
+# ('m_DiscMaxValue','h'), # WARNING: should this exist?
+# ('m_DiscMinValue','h') # WARNING: should this exist?
+
+Type2_DefBlocksChannels = [
+    # common parameters for all types of channels
+    ('m_nextBlock', 'l'),
+    ('m_isAnalog', 'h'),
+    ('m_isInput', 'h'),
+    ('m_numChannel', 'h'),
+    ('m_numColor', 'h'),
+    ('m_Mode', 'h')]
+
+Type2_SubBlockContinuousChannels = [
+    # continuous channels parameters
+    ('blank', '2x'),  # WARNING: this is not in the specs but it seems needed
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f'),
+    ('m_ContBlkSize', 'h'),
+    ('m_ModeSpike', 'h'),  # WARNING: the C code [2] uses usigned short here
+    ('m_Duration', 'f'),
+    ('m_bAutoScale', 'h'),
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockLevelChannels = [  # WARNING: untested
+    # level channels parameters
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f'),
+    ('m_nSpikeCount', 'h'),
+    ('m_ModeSpike', 'h'),
+    ('m_nPreTrigmSec', 'f'),
+    ('m_nPostTrigmSec', 'f'),
+    ('m_LevelValue', 'h'),
+    ('m_TrgMode', 'h'),
+    ('m_YesRms', 'h'),
+    ('m_bAutoScale', 'h'),
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockExtTriggerChannels = [  # WARNING: untested
+    # external trigger channels parameters
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f'),
+    ('m_nSpikeCount', 'h'),
+    ('m_ModeSpike', 'h'),
+    ('m_nPreTrigmSec', 'f'),
+    ('m_nPostTrigmSec', 'f'),
+    ('m_TriggerNumber', 'h'),
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockDigitalChannels = [
+    # digital channels parameters
+    ('m_SampleRate', 'f'),
+    ('m_SaveTrigger', 'h'),
+    ('m_Duration', 'f'),
+    ('m_PreviousStatus', 'h'),  # WARNING: check difference with C code here
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockUnknownChannels = [
+    # WARNING: We have a mode that doesn't appear in our spec, so we don't
+    # know what are the fields.
+    # It seems that for non-digital channels the beginning is
+    # similar to continuous channels. Let's hope we're right...
+    ('blank', '2x'),
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f')]
+# there are probably other fields after...
+
+Type6_DefBlockTrigger = [  # WARNING: untested
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_countChannel', 'h'),
+    ('m_StateChannels', 'i'),
+    ('m_numChannel1', 'h'),
+    ('m_numChannel2', 'h'),
+    ('m_numChannel3', 'h'),
+    ('m_numChannel4', 'h'),
+    ('m_numChannel5', 'h'),
+    ('m_numChannel6', 'h'),
+    ('m_numChannel7', 'h'),
+    ('m_numChannel8', 'h'),
+    ('m_Name', 'c')]
+
+Type3_DefBlockGroup = [  # WARNING: untested
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_Z_Order', 'h'),
+    ('m_countSubGroups', 'h'),
+    ('m_placeGroupWindow', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_NetLoc', 'h'),
+    ('m_locatMax', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_nameGroup', 'c')]
+
+Type4_DefBlockSubgroup = [  # WARNING: untested
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_TypeOverlap', 'h'),
+    ('m_Z_Order', 'h'),
+    ('m_countChannel', 'h'),
+    ('m_NetLoc', 'h'),
+    ('m_location', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_bIsMaximized', 'h'),
+    ('m_numChannel1', 'h'),
+    ('m_numChannel2', 'h'),
+    ('m_numChannel3', 'h'),
+    ('m_numChannel4', 'h'),
+    ('m_numChannel5', 'h'),
+    ('m_numChannel6', 'h'),
+    ('m_numChannel7', 'h'),
+    ('m_numChannel8', 'h'),
+    ('m_Name', 'c')]
+
+Type5_DataBlockOneChannel = [
+    ('m_numChannel', 'h')]
+# WARNING: 'm_numChannel' (called 'm_Number' in 5.4.1 of [1]) is supposed
+# to be uint according to 5.4.1 but it seems to be a short in the files
+# (or should it be ushort ?)
+
+# WARNING: In 5.1.1 page 121 of [1], they say "Note: 5 is used for demo
+# purposes, 7 is used for real data", but looking at some real datafiles,
+# it seems that block of type 5 are also used for real data...
+
+Type7_DataBlockMultipleChannels = [  # WARNING: unfinished
+    ('m_lenHead', 'h'),  # WARNING: unknown true type
+    ('FINT', 'h')]
+# WARNING: there should be data after...
+
+TypeP_DefBlockPeriStimHist = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_Rows', 'i'),
+    ('m_DurationSecPre', 'f'),
+    ('m_Bins', 'i'),
+    ('m_NoTrigger', 'h')]
+
+TypeF_DefBlockFRTachogram = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_AutoManualScale', 'i'),
+    ('m_Max', 'i')]
+
+TypeR_DefBlockRaster = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_Rows', 'i'),
+    ('m_NoTrigger', 'h')]
+
+TypeI_DefBlockISIHist = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_Bins', 'i'),
+    ('m_TypeScale', 'i')]
+
+Type8_MarkerBlock = [  # WARNING: untested
+    ('m_Number_Channel', 'h'),
+    ('m_Time', 'l')]  # WARNING: check what's the right type here.
+# It seems that the size of time_t type depends on the system typedef,
+# I put long here but I couldn't check if it is the right type
+
+Type9_ScaleBlock = [  # WARNING: untested
+    ('m_Number_Channel', 'h'),
+    ('m_Scale', 'f')]
+
+Type_Unknown = []
+
+dict_header_type = {
+    'h': TypeH_Header,
+    '0': Type0_SetBoards,
+    '1': Type1_Boards,
+    '2': Type2_DefBlocksChannels,
+    '6': Type6_DefBlockTrigger,
+    '3': Type3_DefBlockGroup,
+    '4': Type4_DefBlockSubgroup,
+    '5': Type5_DataBlockOneChannel,
+    '7': Type7_DataBlockMultipleChannels,
+    'P': TypeP_DefBlockPeriStimHist,
+    'F': TypeF_DefBlockFRTachogram,
+    'R': TypeR_DefBlockRaster,
+    'I': TypeI_DefBlockISIHist,
+    '8': Type8_MarkerBlock,
+    '9': Type9_ScaleBlock
+}
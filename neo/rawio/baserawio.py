@@ -38,15 +38,27 @@ by some IOs to avoid very long parse_header(). The idea is that some variable
 or vector can be store somewhere (near the fiel, /tmp, any path)
 
 
+BaseRawIO also has an opt-in instrumentation of its public methods: after
+reader.enable_stats(), reader.stats (a RawIOStats) counts calls, wall time,
+bytes and samples returned by parse_header(), get_analogsignal_chunk(), ...
+A RawIO can report sub-phases of its private methods with
+`with self._stats_phase('name'):`. Each call is also logged to reader.logger
+at DEBUG level. When stats are disabled (the default) the cost is a single
+attribute check per call.
+
+
 """
 
 # from __future__ import unicode_literals, print_function, division, absolute_import
 from __future__ import print_function, division, absolute_import
 
+import functools
 import logging
 import numpy as np
 import os
 import sys
+import time
+from collections import OrderedDict
 
 from neo import logging_handler
 
@@ -57,6 +69,8 @@ try:
 except ImportError:
     HAVE_JOBLIB = False
 
+timer = getattr(time, 'perf_counter', time.time)
+
 possible_raw_modes = ['one-file', 'multi-file', 'one-dir', ]  # 'multi-dir', 'url', 'other'
 
 error_header = 'Header is not read yet, do parse_header() first'
@@ -92,6 +106,121 @@ _event_channel_dtype = [
 ]
 
 
+def _result_size(result):
+    """
+    Return (bytes, samples) of what a public method returns: a numpy array or
+    a tuple of arrays (samples are counted in the first one).
+    """
+    if isinstance(result, np.ndarray):
+        return result.nbytes, result.size
+    if isinstance(result, tuple):
+        arrays = [r for r in result if isinstance(r, np.ndarray)]
+        if len(arrays) > 0:
+            return sum(a.nbytes for a in arrays), arrays[0].size
+    return 0, 0
+
+
+class RawIOStats(object):
+    """
+    Per method (or sub-phase) statistics of a RawIO: number of calls, total
+    wall time in seconds, bytes and samples returned.
+
+    `records` is an OrderedDict {name: {'count', 'time', 'bytes', 'samples'}}
+    filled in the order of the first call.
+    """
+
+    def __init__(self):
+        self.records = OrderedDict()
+
+    def add(self, name, duration, nbytes=0, nb_samples=0):
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = {'count': 0, 'time': 0., 'bytes': 0, 'samples': 0}
+        record['count'] += 1
+        record['time'] += duration
+        record['bytes'] += nbytes
+        record['samples'] += nb_samples
+
+    def phase(self, name):
+        """Context manager that records the time spent in its block as `name`."""
+        return _StatsPhase(self, name)
+
+    def reset(self):
+        self.records.clear()
+
+    def as_dict(self):
+        """Return a copy of the records, for instance to be dumped as JSON."""
+        return OrderedDict((name, dict(record)) for name, record in self.records.items())
+
+    def __repr__(self):
+        txt = '{:<40} {:>8} {:>10} {:>14} {:>14}\n'.format(
+            'name', 'count', 'time (s)', 'bytes', 'samples')
+        for name, r in self.records.items():
+            txt += '{:<40} {:>8} {:>10.4f} {:>14} {:>14}\n'.format(
+                name, r['count'], r['time'], r['bytes'], r['samples'])
+        return txt
+
+
+class _StatsPhase(object):
+    """
+    Records the duration of a `with` block. Readers can set `nbytes` and
+    `nb_samples` on it inside the block.
+    """
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.nbytes = 0
+        self.nb_samples = 0
+
+    def __enter__(self):
+        self.t0 = timer()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add(self.name, timer() - self.t0, self.nbytes, self.nb_samples)
+        return False
+
+
+class _NoStatsPhase(object):
+    """Does nothing, used by _stats_phase() when stats are disabled."""
+    nbytes = 0
+    nb_samples = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_no_stats_phase = _NoStatsPhase()
+
+
+def instrumented(method):
+    """
+    Decorator for the public methods of BaseRawIO: when stats are enabled,
+    record the call in self.stats and log it at DEBUG level.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kargs):
+        if self.stats is None:
+            return method(self, *args, **kargs)
+        t0 = timer()
+        result = method(self, *args, **kargs)
+        duration = timer() - t0
+        nbytes, nb_samples = _result_size(result)
+        self.stats.add(name, duration, nbytes, nb_samples)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('{} {:0.6f} s {} bytes {} samples'.format(
+                name, duration, nbytes, nb_samples))
+        return result
+
+    return wrapper
+
+
 class BaseRawIO(object):
     """
     Generic class to handle.
@@ -104,6 +233,11 @@ class BaseRawIO(object):
 
     rawmode = None  # one key in possible_raw_modes
 
+    # set to True to enable stats in all new instances (for instance in batch jobs)
+    collect_stats = False
+    # RawIOStats when enabled, None otherwise
+    stats = None
+
     def __init__(self, use_cache=False, cache_path='same_as_resource', **kargs):
         """
 
@@ -132,8 +266,12 @@ class BaseRawIO(object):
         else:
             self._cache = None
 
+        if self.collect_stats:
+            self.enable_stats()
+
         self.header = None
 
+    @instrumented
     def parse_header(self):
         """
         This must parse the file header to get all stuff for fast later one.
@@ -473,6 +611,7 @@ class BaseRawIO(object):
         sr = self.header['signal_channels'][chan_index0]['sampling_rate']
         return float(sr)
 
+    @instrumented
     def get_analogsignal_chunk(self, block_index=0, seg_index=0, i_start=None, i_stop=None,
                                channel_indexes=None, channel_names=None, channel_ids=None):
         """
@@ -487,6 +626,7 @@ class BaseRawIO(object):
 
         return raw_chunk
 
+    @instrumented
     def rescale_signal_raw_to_float(self, raw_signal, dtype='float32',
                                     channel_indexes=None, channel_names=None, channel_ids=None):
 
@@ -507,9 +647,11 @@ class BaseRawIO(object):
         return float_signal
 
     # spiketrain and unit zone
+    @instrumented
     def spike_count(self, block_index=0, seg_index=0, unit_index=0):
         return self._spike_count(block_index, seg_index, unit_index)
 
+    @instrumented
     def get_spike_timestamps(self, block_index=0, seg_index=0, unit_index=0,
                              t_start=None, t_stop=None):
         """
@@ -523,6 +665,7 @@ class BaseRawIO(object):
         timestamp = self._get_spike_timestamps(block_index, seg_index, unit_index, t_start, t_stop)
         return timestamp
 
+    @instrumented
     def rescale_spike_timestamp(self, spike_timestamps, dtype='float64'):
         """
         Rescale spike timestamps to second
@@ -530,11 +673,13 @@ class BaseRawIO(object):
         return self._rescale_spike_timestamp(spike_timestamps, dtype)
 
     # spiketrain waveform zone
+    @instrumented
     def get_spike_raw_waveforms(self, block_index=0, seg_index=0, unit_index=0,
                                 t_start=None, t_stop=None):
         wf = self._get_spike_raw_waveforms(block_index, seg_index, unit_index, t_start, t_stop)
         return wf
 
+    @instrumented
     def rescale_waveforms_to_float(self, raw_waveforms, dtype='float32', unit_index=0):
         wf_gain = self.header['unit_channels']['wf_gain'][unit_index]
         wf_offset = self.header['unit_channels']['wf_offset'][unit_index]
@@ -549,9 +694,11 @@ class BaseRawIO(object):
         return float_waveforms
 
     # event and epoch zone
+    @instrumented
     def event_count(self, block_index=0, seg_index=0, event_channel_index=0):
         return self._event_count(block_index, seg_index, event_channel_index)
 
+    @instrumented
     def get_event_timestamps(self, block_index=0, seg_index=0, event_channel_index=0,
                              t_start=None, t_stop=None):
         """
@@ -571,18 +718,46 @@ class BaseRawIO(object):
             block_index, seg_index, event_channel_index, t_start, t_stop)
         return timestamp, durations, labels
 
+    @instrumented
     def rescale_event_timestamp(self, event_timestamps, dtype='float64'):
         """
         Rescale event timestamps to s
         """
         return self._rescale_event_timestamp(event_timestamps, dtype)
 
+    @instrumented
     def rescale_epoch_duration(self, raw_duration, dtype='float64'):
         """
         Rescale epoch raw duration to s
         """
         return self._rescale_epoch_duration(raw_duration, dtype)
 
+    def enable_stats(self):
+        """
+        Start to record stats of the public methods in self.stats.
+        """
+        if self.stats is None:
+            self.stats = RawIOStats()
+        return self.stats
+
+    def disable_stats(self):
+        self.stats = None
+
+    def log_stats(self, level=logging.INFO):
+        """Log a summary of self.stats"""
+        if self.stats is not None:
+            self.logger.log(level, '{}: {}\n{}'.format(
+                self.__class__.__name__, self.source_name(), self.stats))
+
+    def _stats_phase(self, name):
+        """
+        Context manager to be used by RawIO to report the time of a sub-phase
+        of a method, for instance `with self._stats_phase('parse_header.data_blocks'):`.
+        """
+        if self.stats is None:
+            return _no_stats_phase
+        return self.stats.phase(name)
+
     def setup_cache(self, cache_path, **init_kargs):
         if self.rawmode in ('one-file', 'multi-file'):
             ressource_name = self.filename
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading from Brainware DAM files
+
+DAM files are binary files for holding raw data.  They are broken up into
+sequence of Segments, each containing a single raw trace and parameters.
+
+The headers of the Segments are read once into a table of offsets (which
+can be stored in the rawio cache), the traces are then read as slices of a
+memmap of the file.
+
+The DAM file does NOT contain a sampling rate, nor can it be reliably
+calculated from any of the parameters.  The sampling rate is set to 1 Hz,
+but this is arbitrary.
+
+Brainware was developed by Dr. Jan Schnupp and is availabe from
+Tucker Davis Technologies, Inc.
+http://www.tdt.com/downloads.htm
+
+Neither Dr. Jan Schnupp nor Tucker Davis Technologies, Inc. had any part in the
+development of this code
+
+The code is implemented with the permission of Dr. Jan Schnupp
+
+Author: Todd Jennings
+"""
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+import struct
+
+# table of the Segments of a DAM file
+_dam_segment_dtype = [
+    ('t_start', 'float64'),  # start time, in days
+    ('index', 'int16'),  # index of the stimulus parameters
+    ('signal_offset', 'int64'),  # position of the trace in the file
+    ('numpts', 'int64'),  # length of the trace
+]
+
+
+class BrainwareDamRawIO(BaseRawIO):
+    """
+    Class for reading Brainware raw data files with the extension '.dam'.
+
+    Each Segment of the file is a Segment of the only Block, with one int16
+    signal channel in mV.  The stimulus parameters are in the annotations of
+    the Segments, as well as the index of the stimulus ('stim_index').
+
+    Usage:
+        >>> import neo.rawio
+        >>> r = neo.rawio.BrainwareDamRawIO(filename='multi_500ms_mulitrep_ch1.dam')
+        >>> r.parse_header()
+        >>> print(r)
+        >>> raw_chunk = r.get_analogsignal_chunk(block_index=0, seg_index=3)
+    """
+    extensions = ['dam']
+    rawmode = 'one-file'
+
+    def __init__(self, filename='', **kargs):
+        self.filename = filename
+        BaseRawIO.__init__(self, **kargs)
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        self._memmap = np.memmap(self.filename, dtype='uint8', mode='r')
+
+        segments = None
+        if self.use_cache:
+            segments = self._cache.get('segments')
+            params = self._cache.get('params')
+        if segments is None:
+            segments, params = self._read_segment_headers()
+            if self.use_cache:
+                self.add_in_cache(segments=segments, params=params)
+        self._segments = segments
+        self._params = params
+
+        sig_channels = [('Chan1', 1, 1., 'int16', 'mV', 1., 0., 0)]
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # No spikes
+        unit_channels = []
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [segments.size]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        for seg_index in range(segments.size):
+            self._raw_annotate('segments', seg_index=seg_index,
+                               stim_index=int(segments['index'][seg_index]),
+                               **params[seg_index])
+
+    def _read_segment_headers(self):
+        """
+        Read the headers of all the Segments, skipping over their traces.
+
+        Return the table of the Segments and the list of their stimulus
+        parameters.
+        """
+        buf = self._memmap
+        size = buf.size
+
+        segments = []
+        params = []
+        pos = 0
+        # if there are no more Segments, stop
+        while pos + 8 <= size:
+            # float64 -- start time of the AnalogSignal
+            # int16 -- index of the stimulus parameters
+            # int16 -- number of stimulus parameters
+            t_start, seg_index, numelements = struct.unpack_from('<dhh', buf, pos)
+            pos += 12
+
+            # read the name strings for the stimulus parameters
+            paramnames = []
+            for _ in range(numelements):
+                # unit8 -- the number of characters in the string
+                numchars = int(buf[pos])
+                # char * numchars -- a single name string
+                name = buf[pos + 1:pos + 1 + numchars]
+                # exclude invalid characters
+                paramnames.append(name[name >= 32].tostring().decode('latin-1'))
+                pos += 1 + numchars
+
+            # float32 * numelements -- the values for the stimulus parameters
+            paramvalues = buf[pos:pos + 4 * numelements].view('<f4').astype('float32')
+            pos += 4 * numelements
+            params.append(dict(zip(paramnames, paramvalues)))
+
+            # int32 -- the number elements in the AnalogSignal
+            numpts, = struct.unpack_from('<i', buf, pos)
+            pos += 4
+
+            # int16 * numpts -- the AnalogSignal itself
+            # a truncated last trace is read up to the end of the file
+            numpts = max(min(numpts, (size - pos) // 2), 0)
+            segments.append((t_start, seg_index, pos, numpts))
+            pos += 2 * numpts
+
+        segments = np.array(segments, dtype=_dam_segment_dtype)
+        return segments, params
+
+    def _segment_t_start(self, block_index, seg_index):
+        return self._get_signal_t_start(block_index, seg_index, None)
+
+    def _segment_t_stop(self, block_index, seg_index):
+        # the sampling rate is 1 Hz
+        return (self._get_signal_t_start(block_index, seg_index, None) +
+                float(self._segments['numpts'][seg_index]))
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        return int(self._segments['numpts'][seg_index])
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        # t_start is in days
+        return float(self._segments['t_start'][seg_index]) * 86400.
+
+    def get_segment_signal(self, seg_index):
+        """
+        Return the whole int16 trace of a Segment, as a memmap view.
+        """
+        offset = self._segments['signal_offset'][seg_index]
+        numpts = self._segments['numpts'][seg_index]
+        return self._memmap[offset:offset + 2 * numpts].view('<i2')
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+        signal = self.get_segment_signal(seg_index)[i_start:i_stop, None]
+        return signal[:, channel_indexes]
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading from Brainware F32 files
+
+F32 files are simplified binary files for holding spike data.  The file is
+a single stream of float32 values: -2 starts the description of a stimulus
+condition (length of a repetition and values of the stimulus parameters), -1
+starts a new Segment and any other value is the time of a spike in ms.
+
+The markers are located with numpy in one pass, which gives a table of the
+runs of spike times of each Segment.  The spike times are read as slices of
+a memmap of the file.
+
+Each F32 file only holds a single Block.
+
+Brainware was developed by Dr. Jan Schnupp and is availabe from
+Tucker Davis Technologies, Inc.
+http://www.tdt.com/downloads.htm
+
+Neither Dr. Jan Schnupp nor Tucker Davis Technologies, Inc. had any part in the
+development of this code
+
+The code is implemented with the permission of Dr. Jan Schnupp
+
+Author: Todd Jennings
+"""
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+# runs of consecutive spike times in the file
+_f32_run_dtype = [
+    ('segment', 'int64'),
+    ('start', 'int64'),
+    ('stop', 'int64'),
+]
+
+
+class BrainwareF32RawIO(BaseRawIO):
+    """
+    Class for reading Brainware Spike ReCord files with the extension '.f32'
+
+    Each Segment of the file has a single SpikeTrain, without waveforms.
+    The stimulus parameters are in the annotations of the Segments, with
+    arbitrary names ('Param0', 'Param1', ...).
+
+    Usage:
+        >>> import neo.rawio
+        >>> r = neo.rawio.BrainwareF32RawIO(filename='multi_500ms_mulitrep_ch1.f32')
+        >>> r.parse_header()
+        >>> print(r)
+        >>> spike_timestamp = r.get_spike_timestamps(block_index=0, seg_index=2,
+                                                     unit_index=0)
+        >>> spike_times = r.rescale_spike_timestamp(spike_timestamp, 'float64')
+    """
+    extensions = ['f32']
+    rawmode = 'one-file'
+
+    def __init__(self, filename='', **kargs):
+        self.filename = filename
+        BaseRawIO.__init__(self, **kargs)
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        self._memmap = np.memmap(self.filename, dtype='<f4', mode='r')
+        self._runs, self._t_stops, self._params = self._scan_markers()
+
+        sig_channels = []
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # one unit without waveforms
+        unit_channels = [('unit0', '0', '', 1., 0., 0, 0.)]
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [len(self._t_stops)]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        for seg_index, params in enumerate(self._params):
+            self._raw_annotate('segments', seg_index=seg_index, **params)
+
+    def _scan_markers(self):
+        """
+        Find the conditions and Segments of the file.
+
+        Return the table of the runs of spike times, and the t_stop (in ms)
+        and stimulus parameters of each Segment.
+        """
+        data = self._memmap
+        candidates = np.flatnonzero((data == -1) | (data == -2))
+
+        runs = []
+        t_stops = []
+        seg_params = []
+        t_stop = None
+        params = None
+        seg_index = -1
+        pos = 0  # start of the current run of spike times
+        for ind in candidates:
+            if ind < pos:
+                # a parameter of a condition
+                continue
+            if seg_index >= 0 and ind > pos:
+                runs.append((seg_index, pos, ind))
+            if data[ind] == -2:
+                # float32 -- SpikeTrain length in ms
+                # float32 -- number of stimulus parameters
+                # [float32] * numelements -- stimulus parameter values
+                t_stop = float(data[ind + 1])
+                numelements = int(data[ind + 2])
+                paramvals = data[ind + 3:ind + 3 + numelements].tolist()
+                paramnames = ['Param%s' % i for i in range(len(paramvals))]
+                params = dict(zip(paramnames, paramvals))
+                pos = ind + 3 + max(numelements, 0)
+                if seg_index >= 0:
+                    # the length of a SpikeTrain is the one of the last
+                    # condition before its end
+                    t_stops[seg_index] = t_stop
+            else:
+                seg_index += 1
+                t_stops.append(t_stop)
+                seg_params.append(params)
+                pos = ind + 1
+        if seg_index >= 0 and pos < data.size:
+            runs.append((seg_index, pos, data.size))
+
+        runs = np.array(runs, dtype=_f32_run_dtype)
+        return runs, t_stops, seg_params
+
+    def _segment_t_start(self, block_index, seg_index):
+        return 0.
+
+    def _segment_t_stop(self, block_index, seg_index):
+        return self._t_stops[seg_index] / 1000.
+
+    def _get_spike_times(self, seg_index):
+        runs = self._runs[self._runs['segment'] == seg_index]
+        if runs.size == 1:
+            return self._memmap[runs['start'][0]:runs['stop'][0]]
+        return np.concatenate([self._memmap[start:stop]
+                               for start, stop in zip(runs['start'], runs['stop'])] +
+                              [np.array([], dtype='<f4')])
+
+    def _spike_count(self, block_index, seg_index, unit_index):
+        runs = self._runs[self._runs['segment'] == seg_index]
+        return int(np.sum(runs['stop'] - runs['start']))
+
+    def _get_spike_timestamps(self, block_index, seg_index, unit_index, t_start, t_stop):
+        spike_timestamps = self._get_spike_times(seg_index)
+        if t_start is not None or t_stop is not None:
+            # timestamps are in ms
+            keep = np.ones(spike_timestamps.size, dtype=bool)
+            if t_start is not None:
+                keep &= spike_timestamps >= t_start * 1000.
+            if t_stop is not None:
+                keep &= spike_timestamps <= t_stop * 1000.
+            spike_timestamps = spike_timestamps[keep]
+        return spike_timestamps
+
+    def _rescale_spike_timestamp(self, spike_timestamps, dtype):
+        spike_times = spike_timestamps.astype(dtype)
+        spike_times /= 1000.
+        return spike_times
+
+    def _get_spike_raw_waveforms(self, block_index, seg_index, unit_index, t_start, t_stop):
+        return None
+
+    def _event_count(self, block_index, seg_index, event_channel_index):
+        return 0
@@ -87,19 +87,21 @@ class PlexonRawIO(BaseRawIO):
                      4: {c: [] for c in eventHeaders['Channel']},
                      5: {c: [] for c in slowChannelHeaders['Channel']},
                      }
-        data = self._memmap = np.memmap(self.filename, dtype='u1', offset=0, mode='r')
-        pos = offset4
-        while pos < data.size:
-            bl_header = data[pos:pos + 16].view(DataBlockHeader)[0]
-            length = bl_header['NumberOfWaveforms'] * bl_header['NumberOfWordsInWaveform'] * 2 + 16
-            bl_type = int(bl_header['Type'])
-            chan_id = int(bl_header['Channel'])
-            block_headers[bl_type][chan_id].append(bl_header)
-            block_pos[bl_type][chan_id].append(pos)
-            pos += length
-
-        self._last_timestamps = bl_header['UpperByteOf5ByteTimestamp'] * \
-                                2 ** 32 + bl_header['TimeStamp']
+        with self._stats_phase('parse_header.walk_data_blocks'):
+            data = self._memmap = np.memmap(self.filename, dtype='u1', offset=0, mode='r')
+            pos = offset4
+            while pos < data.size:
+                bl_header = data[pos:pos + 16].view(DataBlockHeader)[0]
+                length = (bl_header['NumberOfWaveforms'] *
+                          bl_header['NumberOfWordsInWaveform'] * 2 + 16)
+                bl_type = int(bl_header['Type'])
+                chan_id = int(bl_header['Channel'])
+                block_headers[bl_type][chan_id].append(bl_header)
+                block_pos[bl_type][chan_id].append(pos)
+                pos += length
+
+            self._last_timestamps = (bl_header['UpperByteOf5ByteTimestamp'] * 2 ** 32 +
+                                     bl_header['TimeStamp'])
 
         # ... and finalize them in self._data_blocks
         # for a faster acces depending on type (1, 4, 5)
@@ -119,8 +121,8 @@ class PlexonRawIO(BaseRawIO):
                 bl_header = np.array(block_headers[bl_type][chan_id], dtype=DataBlockHeader)
                 bl_pos = np.array(block_pos[bl_type][chan_id], dtype='int64')
 
-                timestamps = bl_header['UpperByteOf5ByteTimestamp'] * \
-                             2 ** 32 + bl_header['TimeStamp']
+                timestamps = (bl_header['UpperByteOf5ByteTimestamp'] * 2 ** 32 +
+                              bl_header['TimeStamp'])
 
                 n1 = bl_header['NumberOfWaveforms']
                 n2 = bl_header['NumberOfWordsInWaveform']
@@ -273,7 +275,7 @@ class PlexonRawIO(BaseRawIO):
             data_blocks = self._data_blocks[5][chan_id]
 
             # loop over data blocks and get chunks
-            bl0 = np.searchsorted(data_blocks['cumsum'], i_start, side='left')
+            bl0 = np.searchsorted(data_blocks['cumsum'], i_start, side='right') - 1
             bl1 = np.searchsorted(data_blocks['cumsum'], i_stop, side='left')
             ind = 0
             for bl in range(bl0, bl1):
@@ -284,7 +286,8 @@ class PlexonRawIO(BaseRawIO):
                     # right border
                     # be carfull that bl could be both bl0 and bl1!!
                     border = data.size - (i_stop - data_blocks[bl]['cumsum'])
-                    data = data[:-border]
+                    if border > 0:
+                        data = data[:-border]
                 if bl == bl0:
                     # left border
                     border = i_start - data_blocks[bl]['cumsum']
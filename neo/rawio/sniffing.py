@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Guess the format of a file (or a directory) from its extension and from the
+first bytes of its content.
+
+:class:`FormatIndex` is built once from the classes names and extensions of
+neo.io (see :mod:`neo.io.registry`) or neo.rawio, and ranks the candidates
+for a path by confidence:
+  * SIGNATURE: the extension is known and the content has the signature of
+    the format (magic bytes, text header, ...)
+  * CONTENT_ONLY: the extension is not known by the format but the content
+    has its signature
+  * EXTENSION: only the extension is known, the format has no sniffer or
+    the file can not be read (for instance a file to be written)
+  * MISMATCH: the extension is known but the content is not the one of the
+    format
+
+Only the first HEADER_SIZE bytes of a file are read, a directory is only
+listed. Candidates with the same confidence keep the order of iolist
+(or rawiolist), extensions with the same case first.
+
+The sniffers are keyed by format name, the class name without the 'IO' or
+'RawIO' suffix, so they are shared by neo.io and neo.rawio classes.
+"""
+
+from __future__ import absolute_import
+
+import os
+
+HEADER_SIZE = 4096
+
+SIGNATURE = 1.
+CONTENT_ONLY = 0.75
+EXTENSION = 0.5
+MISMATCH = 0.
+
+HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+
+
+def read_header(filename, size=HEADER_SIZE):
+    """
+    Return the first `size` bytes of a file, None if it can not be read.
+    """
+    if not os.path.isfile(filename):
+        return None
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(size)
+    except (IOError, OSError):
+        return None
+
+
+def format_name(class_name):
+    """'PlexonIO' or 'PlexonRawIO' > 'Plexon'"""
+    for suffix in ('RawIO', 'IO'):
+        if class_name.endswith(suffix):
+            return class_name[:-len(suffix)]
+    return class_name
+
+
+def _startswith(*signatures):
+    def sniffer(header, filename):
+        return header.startswith(signatures)
+
+    return sniffer
+
+
+def _contains(signature, size):
+    def sniffer(header, filename):
+        return signature in header[:size]
+
+    return sniffer
+
+
+def _is_hdf5(header):
+    # the superblock can be after a user block of 512, 1024, 2048... bytes
+    offset = 0
+    while offset + len(HDF5_SIGNATURE) <= len(header):
+        if header[offset:offset + len(HDF5_SIGNATURE)] == HDF5_SIGNATURE:
+            return True
+        offset = 512 if offset == 0 else offset * 2
+    return False
+
+
+# markers found in the first bytes of HDF5 files written by each format
+hdf5_markers = {
+    'Nix': (b'nix', b'created_at'),
+    'NeoHdf5': (b'PYTABLES_FORMAT_VERSION',),
+    'NSDF': (b'nsdf_version',),
+    'Kwik': (b'kwik_version',),
+}
+
+
+def _hdf5_sniffer(name):
+    def sniffer(header, filename):
+        if not _is_hdf5(header):
+            return False
+        if all(marker in header for marker in hdf5_markers[name]):
+            return True
+        for other, markers in hdf5_markers.items():
+            if other != name and all(marker in header for marker in markers):
+                return False
+        # attributes can be further in the file
+        return None
+
+    return sniffer
+
+
+def _sniff_neuroscope(header, filename):
+    base, ext = os.path.splitext(filename)
+    if ext == '.xml':
+        return b'<parameters' in header
+    # the .dat file goes with a .xml
+    return os.path.isfile(base + '.xml')
+
+
+def _sniff_pickle(header, filename):
+    # protocol >= 2 starts with PROTO, older ones can not be recognized
+    if header[:1] == b'\x80' and header[1:2] in (b'\x02', b'\x03', b'\x04', b'\x05'):
+        return True
+    return None
+
+
+# {format name: function(header, filename)} returning True if the header has
+# the signature of the format, False if it has not and None if it can not tell
+file_sniffers = {
+    'Axon': _startswith(b'ABF ', b'ABF2'),
+    'BCI2000': _startswith(b'HeaderLen=', b'BCI2000V='),
+    'Blackrock': _startswith(b'NEURALSG', b'NEURALCD', b'NEURALEV'),
+    'BrainVision': _contains(b'Data Exchange Header File', 64),
+    'Elphy': lambda header, filename: header[1:].startswith((b'DAC2', b'ACQUIS1')),
+    'Micromed': _contains(b'MICROMED', 32),
+    'Neuralynx': _startswith(b'########'),
+    'NeuroExplorer': _startswith(b'NEX1'),
+    'NeoMatlab': _startswith(b'MATLAB'),
+    'NeuroScope': _sniff_neuroscope,
+    'Pickle': _sniff_pickle,
+    'Plexon': _startswith(b'PLEX'),
+    'Spike2': lambda header, filename: header[2:9] == b'(C) CED',
+}
+for _name in hdf5_markers:
+    file_sniffers[_name] = _hdf5_sniffer(_name)
+
+# the signature of these formats is too weak (or not in the header) to guess
+# them without the extension
+extension_required = ['NeuroScope', 'Pickle']
+
+neuralynx_extensions = ['ncs', 'nse', 'nev', 'ntt']
+tdt_block_extensions = {'.tbk', '.tdx', '.tev', '.tsq'}
+
+
+def _sniff_neuralynx_dir(dirname, filenames):
+    for filename in filenames:
+        if os.path.splitext(filename)[1][1:] in neuralynx_extensions:
+            header = read_header(os.path.join(dirname, filename), size=8)
+            if header is not None and header.startswith(b'########'):
+                return True
+    return False
+
+
+def _sniff_tdt_dir(dirname, filenames):
+    # a tank contains blocks, directories with all the tdt_block_extensions
+    for filename in filenames:
+        path = os.path.join(dirname, filename)
+        if os.path.isdir(path):
+            exts = set(os.path.splitext(f)[1].lower() for f in os.listdir(path))
+            if exts >= tdt_block_extensions:
+                return True
+    return False
+
+
+# {format name: function(dirname, filenames)} for 'one-dir' formats
+dir_sniffers = {
+    'Neuralynx': _sniff_neuralynx_dir,
+    'Tdt': _sniff_tdt_dir,
+}
+
+
+class FormatIndex(object):
+    """
+    Index of the extensions of a list of classes, to rank the classes that
+    can read a path.
+
+    items: list of (class name, extensions) in priority order.
+    """
+
+    def __init__(self, items):
+        self.names = []
+        self.extensions = {}
+        self.by_extension = {}
+        for name, extensions in items:
+            self.names.append(name)
+            self.extensions[name] = list(extensions)
+            for ext in extensions:
+                names = self.by_extension.setdefault(ext.lower(), [])
+                if name not in names:
+                    names.append(name)
+        self.order = {name: i for i, name in enumerate(self.names)}
+
+    def rank(self, path):
+        """
+        Return a list of (class name, confidence) for `path`, a file or a
+        directory, best candidates first.
+        """
+        if os.path.isdir(path):
+            filenames = os.listdir(path)
+            return [(name, SIGNATURE) for name in self.names
+                    if format_name(name) in dir_sniffers and
+                    dir_sniffers[format_name(name)](path, filenames)]
+
+        ext = os.path.splitext(path)[1][1:]
+        header = read_header(path)
+        candidates = []
+        for name in self.by_extension.get(ext.lower(), []):
+            confidence = EXTENSION
+            sniffer = file_sniffers.get(format_name(name))
+            if header is not None and sniffer is not None:
+                found = sniffer(header, path)
+                if found is True:
+                    confidence = SIGNATURE
+                elif found is False:
+                    confidence = MISMATCH
+            candidates.append((name, confidence, ext in self.extensions[name]))
+
+        if header is not None:
+            known = [c[0] for c in candidates]
+            for name in self.names:
+                fmt = format_name(name)
+                if name in known or fmt not in file_sniffers or fmt in extension_required:
+                    continue
+                if file_sniffers[fmt](header, path) is True:
+                    candidates.append((name, CONTENT_ONLY, False))
+
+        candidates.sort(key=lambda c: (-c[1], not c[2], self.order[c[0]]))
+        return [(name, confidence) for name, confidence, _ in candidates]
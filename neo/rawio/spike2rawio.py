@@ -95,22 +95,23 @@ class Spike2RawIO(BaseRawIO):
         self._memmap = np.memmap(self.filename, dtype='u1', offset=0, mode='r')
         self._all_data_blocks = {}
         self._by_seg_data_blocks = {}
-        for chan_id, chan_info in enumerate(self._channel_infos):
-            data_blocks = []
-            ind = chan_info['firstblock']
-            for b in range(chan_info['blocks']):
-                block_info = self._memmap[ind:ind + 20].view(blockHeaderDesciption)[0]
-                data_blocks.append((ind, block_info['items'], 0,
-                                    block_info['start_time'], block_info['end_time']))
-                ind = block_info['succ_block']
-
-            data_blocks = np.array(data_blocks, dtype=[(
-                'pos', 'int32'), ('size', 'int32'), ('cumsum', 'int32'),
-                ('start_time', 'int32'), ('end_time', 'int32')])
-            data_blocks['pos'] += 20  # 20 is ths header size
-
-            self._all_data_blocks[chan_id] = data_blocks
-            self._by_seg_data_blocks[chan_id] = []
+        with self._stats_phase('parse_header.walk_data_blocks'):
+            for chan_id, chan_info in enumerate(self._channel_infos):
+                data_blocks = []
+                ind = chan_info['firstblock']
+                for b in range(chan_info['blocks']):
+                    block_info = self._memmap[ind:ind + 20].view(blockHeaderDesciption)[0]
+                    data_blocks.append((ind, block_info['items'], 0,
+                                        block_info['start_time'], block_info['end_time']))
+                    ind = block_info['succ_block']
+
+                data_blocks = np.array(data_blocks, dtype=[(
+                    'pos', 'int32'), ('size', 'int32'), ('cumsum', 'int32'),
+                    ('start_time', 'int32'), ('end_time', 'int32')])
+                data_blocks['pos'] += 20  # 20 is ths header size
+
+                self._all_data_blocks[chan_id] = data_blocks
+                self._by_seg_data_blocks[chan_id] = []
 
         # For all signal channel detect gaps between data block (pause in rec) so new Segment.
         # then check that all channel have the same gaps.
@@ -350,7 +351,7 @@ class Spike2RawIO(BaseRawIO):
             data_blocks = self._by_seg_data_blocks[chan_id][seg_index]
 
             # loop over data blocks and get chunks
-            bl0 = np.searchsorted(data_blocks['cumsum'], i_start, side='left')
+            bl0 = np.searchsorted(data_blocks['cumsum'], i_start, side='right') - 1
             bl1 = np.searchsorted(data_blocks['cumsum'], i_stop, side='left')
             ind = 0
             for bl in range(bl0, bl1):
@@ -326,7 +326,7 @@ class TdtRawIO(BaseRawIO):
                 ind1 = ind0 + chunk_nb_bytes
                 data = data_buf[ind0:ind1].view(dt)
 
-                if bl == bl1 - 1:
+                if bl == bl1 - 1 and i_stop % sample_per_chunk != 0:
                     # right border
                     # be careful that bl could be both bl0 and bl1!!
                     border = data.size - (i_stop % sample_per_chunk)
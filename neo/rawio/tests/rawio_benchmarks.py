@@ -0,0 +1,524 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the hot paths of neo.rawio and of the neo.io classes built on
+top of them (BaseFromRaw).
+
+For each reader the following metrics are measured on the synthetic files
+of :mod:`neo.rawio.tests.synthetic_files`:
+  * cold and warm `parse_header` time
+  * signal chunk reading speed (MSPS) for several chunk sizes and channel counts
+  * spike timestamps and waveforms retrieval
+  * event retrieval
+  * `read_block` end-to-end time of the neo.io class
+  * peak memory of `parse_header` and `read_block`
+  * time of `import neo` in a new interpreter, alone and with one or all IOs
+
+Results are stored in a JSON file and can be compared with a baseline file
+so that regressions in readers are caught::
+
+    python -m neo.rawio.tests.rawio_benchmarks --size 200M --output new.json \\
+        --baseline old.json
+
+The exit status is 1 when a metric is worse than the baseline by more than
+the tolerance.
+
+Metric names follow a convention that gives the direction of each metric:
+  * '_s' suffix: a duration in seconds, lower is better
+  * '_msps' suffix: a speed in mega samples per second, higher is better
+  * '_mb' suffix: a memory peak in MB, lower is better
+
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import tracemalloc
+    HAVE_TRACEMALLOC = True
+except ImportError:
+    HAVE_TRACEMALLOC = False
+
+import neo
+import neo.io
+import neo.rawio
+from neo.rawio.tests.synthetic_files import generate_corpus, duration_for_size, writers
+
+timer = getattr(time, 'perf_counter', time.time)
+
+default_chunk_sizes = (1024, 16384, 262144)
+# None means all channels of the group
+default_channel_counts = (1, None)
+
+metric_directions = OrderedDict([
+    ('_s', 1),  # lower is better
+    ('_msps', -1),  # higher is better
+    ('_mb', 1),  # lower is better
+])
+
+
+def metric_direction(metric):
+    """
+    Return 1 if a lower value is better for `metric` and -1 if a higher
+    value is better.
+    """
+    for suffix, direction in metric_directions.items():
+        if metric.endswith(suffix):
+            return direction
+    raise ValueError('Unknown metric kind for {}'.format(metric))
+
+
+def best_time(func, repeat=3):
+    """
+    Call `func` `repeat` times and return the best duration and the result
+    of the last call.
+    """
+    durations = []
+    for _ in range(repeat):
+        t0 = timer()
+        result = func()
+        durations.append(timer() - t0)
+    return min(durations), result
+
+
+def peak_memory(func):
+    """
+    Return the peak of memory allocated by python and numpy during
+    `func()` in MB, or None when tracemalloc is not available.
+    """
+    if not HAVE_TRACEMALLOC:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2. ** 20
+
+
+def benchmark_parse_header(rawioclass, kargs, repeat=3):
+    """
+    Time `parse_header` of a new reader. The first parse of a file in the
+    process is the cold time (file system cache and caches of the rawio
+    are not warmed up by this function, the caller is in charge of that),
+    the best of the next ones is the warm time.
+
+    Return the metrics and a parsed reader.
+    """
+    def parse():
+        reader = rawioclass(**kargs)
+        reader.parse_header()
+        return reader
+
+    cold, _ = best_time(parse, repeat=1)
+    warm, reader = best_time(parse, repeat=repeat)
+    metrics = OrderedDict()
+    metrics['parse_header_cold_s'] = cold
+    metrics['parse_header_warm_s'] = warm
+    metrics['parse_header_peak_mb'] = peak_memory(parse)
+    return metrics, reader
+
+
+def _iter_signal_groups(reader):
+    if reader._several_channel_groups:
+        channel_indexes_list = reader.get_group_channel_indexes()
+    else:
+        channel_indexes_list = [np.arange(reader.signal_channels_count())]
+    for channel_indexes in channel_indexes_list:
+        if len(channel_indexes) > 0:
+            yield channel_indexes
+
+
+def read_signal_chunks(reader, channel_indexes, chunk_size, max_samples=None):
+    """
+    Read all signals of `channel_indexes` chunk by chunk in every segment.
+    Return the number of samples read per channel.
+    """
+    nb_samples = 0
+    for block_index in range(reader.block_count()):
+        for seg_index in range(reader.segment_count(block_index)):
+            sig_size = reader.get_signal_size(block_index, seg_index, channel_indexes)
+            if max_samples is not None:
+                sig_size = min(sig_size, max_samples)
+            for i_start in range(0, sig_size, chunk_size):
+                i_stop = min(i_start + chunk_size, sig_size)
+                raw_chunk = reader.get_analogsignal_chunk(block_index=block_index,
+                                                          seg_index=seg_index,
+                                                          i_start=i_start, i_stop=i_stop,
+                                                          channel_indexes=channel_indexes)
+                nb_samples += raw_chunk.shape[0]
+    return nb_samples
+
+
+def benchmark_read_signals(reader, chunk_sizes=default_chunk_sizes,
+                           channel_counts=default_channel_counts, repeat=1,
+                           max_samples=None):
+    """
+    Measure the speed of `get_analogsignal_chunk` in MSPS (mega samples
+    per second, all channels included) for the biggest signal group of the
+    reader with several chunk sizes and numbers of channels.
+    """
+    metrics = OrderedDict()
+    groups = list(_iter_signal_groups(reader))
+    if len(groups) == 0:
+        return metrics
+    # the biggest group gives the most representative speed
+    group = max(groups, key=len)
+
+    nb_channels = []
+    for count in channel_counts:
+        nb_chan = len(group) if count is None else min(count, len(group))
+        if nb_chan not in nb_channels:
+            nb_channels.append(nb_chan)
+
+    for chunk_size in chunk_sizes:
+        for nb_chan in nb_channels:
+            channel_indexes = group[:nb_chan]
+            duration, nb_samples = best_time(
+                lambda: read_signal_chunks(reader, channel_indexes, chunk_size,
+                                           max_samples=max_samples),
+                repeat=repeat)
+            name = 'read_signals_chunk{}_chan{}_msps'.format(chunk_size, nb_chan)
+            metrics[name] = nb_samples * nb_chan / duration / 1e6
+    return metrics
+
+
+def read_all_spikes(reader, load_waveforms=False):
+    """
+    Read and rescale the spike timestamps (and optionally the waveforms)
+    of all units in all segments. Return the number of spikes.
+    """
+    nb_spike = 0
+    for block_index in range(reader.block_count()):
+        for seg_index in range(reader.segment_count(block_index)):
+            for unit_index in range(reader.unit_channels_count()):
+                timestamps = reader.get_spike_timestamps(block_index=block_index,
+                                                         seg_index=seg_index,
+                                                         unit_index=unit_index)
+                reader.rescale_spike_timestamp(timestamps, dtype='float64')
+                nb_spike += timestamps.size
+                if load_waveforms:
+                    raw_waveforms = reader.get_spike_raw_waveforms(block_index=block_index,
+                                                                   seg_index=seg_index,
+                                                                   unit_index=unit_index)
+                    if raw_waveforms is not None:
+                        reader.rescale_waveforms_to_float(raw_waveforms, dtype='float32',
+                                                          unit_index=unit_index)
+    return nb_spike
+
+
+def read_all_events(reader):
+    """
+    Read and rescale the timestamps, durations and labels of all event
+    channels in all segments. Return the number of events.
+    """
+    nb_event = 0
+    for block_index in range(reader.block_count()):
+        for seg_index in range(reader.segment_count(block_index)):
+            for ev_chan in range(reader.event_channels_count()):
+                timestamps, durations, labels = reader.get_event_timestamps(
+                    block_index=block_index, seg_index=seg_index,
+                    event_channel_index=ev_chan)
+                reader.rescale_event_timestamp(timestamps, dtype='float64')
+                if durations is not None:
+                    reader.rescale_epoch_duration(durations, dtype='float64')
+                nb_event += timestamps.size
+    return nb_event
+
+
+def benchmark_read_spikes(reader, repeat=3):
+    """
+    Time the retrieval of all spike timestamps, with and without waveforms.
+    """
+    metrics = OrderedDict()
+    if reader.unit_channels_count() == 0:
+        return metrics
+    metrics['read_spike_times_s'], _ = best_time(lambda: read_all_spikes(reader),
+                                                 repeat=repeat)
+    metrics['read_spike_waveforms_s'], _ = best_time(
+        lambda: read_all_spikes(reader, load_waveforms=True), repeat=repeat)
+    return metrics
+
+
+def benchmark_read_events(reader, repeat=3):
+    """
+    Time the retrieval of all events and epochs.
+    """
+    metrics = OrderedDict()
+    if reader.event_channels_count() == 0:
+        return metrics
+    metrics['read_events_s'], _ = best_time(lambda: read_all_events(reader), repeat=repeat)
+    return metrics
+
+
+def benchmark_read_block(ioclass, kargs, repeat=1, lazy=False):
+    """
+    Time `read_block` of a neo.io class, including the parsing of the
+    header, and measure its memory peak.
+    """
+    def read_block():
+        io = ioclass(**kargs)
+        return io.read_block(lazy=lazy, load_waveforms=True)
+
+    metrics = OrderedDict()
+    metrics['read_block_s'], _ = best_time(read_block, repeat=repeat)
+    metrics['read_block_peak_mb'] = peak_memory(read_block)
+    return metrics
+
+
+def io_class_for_rawio(rawioclass):
+    """
+    Return the neo.io class built on top of a rawio class, None if there
+    is none.
+    """
+    ioclass = getattr(neo.io, rawioclass.__name__.replace('RawIO', 'IO'), None)
+    if ioclass is not None and issubclass(ioclass, rawioclass):
+        return ioclass
+    return None
+
+
+def benchmark_reader(rawioclass, kargs, chunk_sizes=default_chunk_sizes,
+                     channel_counts=default_channel_counts, repeat=3,
+                     read_block=True, lazy=False, max_samples=None):
+    """
+    Run all benchmarks for one rawio class and its neo.io class.
+
+    Return an OrderedDict {metric name: value}.
+    """
+    metrics = OrderedDict()
+    header_metrics, reader = benchmark_parse_header(rawioclass, kargs, repeat=repeat)
+    metrics.update(header_metrics)
+    metrics.update(benchmark_read_signals(reader, chunk_sizes=chunk_sizes,
+                                          channel_counts=channel_counts,
+                                          max_samples=max_samples))
+    metrics.update(benchmark_read_spikes(reader, repeat=repeat))
+    metrics.update(benchmark_read_events(reader, repeat=repeat))
+    del reader
+
+    ioclass = io_class_for_rawio(rawioclass)
+    if read_block and ioclass is not None:
+        metrics.update(benchmark_read_block(ioclass, kargs, lazy=lazy))
+    return metrics
+
+
+# statements timed by benchmark_import in a new interpreter after `import neo`
+import_statements = OrderedDict([
+    ('import_neo_s', ''),
+    ('import_neo_one_io_s', 'neo.io.PlexonIO'),
+    ('import_neo_all_io_s', 'neo.io.iolist'),
+])
+
+
+def benchmark_import(repeat=5):
+    """
+    Time `import neo` (plus the statements of `import_statements`) in a new
+    python interpreter, which is what short scripts and worker processes pay
+    at each start.
+    """
+    # the interpreter must import this neo
+    env = dict(os.environ)
+    neo_path = os.path.dirname(os.path.dirname(os.path.abspath(neo.__file__)))
+    if env.get('PYTHONPATH'):
+        neo_path = os.pathsep.join([neo_path, env['PYTHONPATH']])
+    env['PYTHONPATH'] = neo_path
+
+    metrics = OrderedDict()
+    for metric, statement in import_statements.items():
+        code = ('import time\n'
+                't0 = time.time()\n'
+                'import neo\n'
+                '{}\n'
+                'print(time.time() - t0)\n').format(statement)
+        durations = []
+        for _ in range(repeat):
+            out = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', code], env=env)
+            durations.append(float(out.decode().strip().split()[-1]))
+        metrics[metric] = min(durations)
+    return metrics
+
+
+def environment_info():
+    """
+    Description of the machine and of the versions, stored with the results.
+    """
+    info = OrderedDict()
+    info['date'] = datetime.datetime.now().isoformat()
+    info['neo'] = neo.__version__
+    info['numpy'] = np.__version__
+    info['python'] = platform.python_version()
+    info['platform'] = platform.platform()
+    info['machine'] = platform.machine()
+    return info
+
+
+def run_benchmarks(dirname, rawio_names=None, recording_params=None, import_repeat=5,
+                   **benchmark_params):
+    """
+    Write the synthetic corpus in `dirname` and run `benchmark_reader` on
+    each format.
+
+    rawio_names: list of rawio class names, all formats by default.
+    recording_params: given to :class:`SyntheticRecording`.
+    import_repeat: number of interpreters started by `benchmark_import`, 0 to skip it.
+    benchmark_params: given to `benchmark_reader`.
+
+    Return a dict with 'environment', 'recording' and 'results' keys, where
+    'results' is {rawio class name: {metric name: value}}, plus
+    {'import': {metric name: value}} for `benchmark_import`.
+    """
+    if recording_params is None:
+        recording_params = {}
+    corpus = generate_corpus(dirname, rawio_names=rawio_names, **recording_params)
+
+    results = OrderedDict()
+    for name, kargs in corpus.items():
+        rawioclass = getattr(neo.rawio, name)
+        results[name] = benchmark_reader(rawioclass, kargs, **benchmark_params)
+    if import_repeat > 0:
+        results['import'] = benchmark_import(repeat=import_repeat)
+
+    doc = OrderedDict()
+    doc['environment'] = environment_info()
+    doc['recording'] = recording_params
+    doc['results'] = results
+    return doc
+
+
+def save_results(doc, filename):
+    with open(filename, 'w') as f:
+        json.dump(doc, f, indent=2)
+
+
+def load_results(filename):
+    with open(filename, 'r') as f:
+        return json.load(f, object_pairs_hook=OrderedDict)
+
+
+def compare_results(results, baseline):
+    """
+    Compare two 'results' dicts of `run_benchmarks`.
+
+    Return a list of (rawio name, metric, baseline value, new value, ratio)
+    for every metric present in both, where ratio > 1 means worse than the
+    baseline whatever the direction of the metric.
+
+    A metric is a regression when ratio > 1 + tolerance; see
+    `find_regressions`.
+    """
+    comparison = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric, value in metrics.items():
+            old = baseline[name].get(metric)
+            if value is None or old is None or value <= 0 or old <= 0:
+                continue
+            if metric_direction(metric) > 0:
+                ratio = value / old
+            else:
+                ratio = old / value
+            comparison.append((name, metric, old, value, ratio))
+    return comparison
+
+
+def find_regressions(results, baseline, tolerance=0.25):
+    """
+    Metrics of `compare_results` worse than the baseline by more than
+    `tolerance`.
+    """
+    return [c for c in compare_results(results, baseline) if c[4] > 1 + tolerance]
+
+
+def format_comparison(comparison, tolerance=0.25):
+    header = ('reader', 'metric', 'baseline', 'new', 'ratio')
+    lines = ['{:<24} {:<36} {:>12} {:>12} {:>8}'.format(*header)]
+    for name, metric, old, value, ratio in comparison:
+        flag = ' REGRESSION' if ratio > 1 + tolerance else ''
+        lines.append('{:<24} {:<36} {:>12.4g} {:>12.4g} {:>8.2f}{}'.format(
+            name, metric, old, value, ratio, flag))
+    return '\n'.join(lines)
+
+
+def format_results(results):
+    lines = []
+    for name, metrics in results.items():
+        lines.append(name)
+        for metric, value in metrics.items():
+            if value is not None:
+                lines.append('    {:<36} {:>12.4g}'.format(metric, value))
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    import argparse
+    from neo.rawio.tests.synthetic_files import _parse_size
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--dirname', help='where to write the synthetic files, '
+                                          'a temporary directory by default')
+    parser.add_argument('--formats', nargs='*', choices=list(writers.keys()),
+                        help='rawio class names, all formats by default')
+    parser.add_argument('--nb-channel', type=int, default=16)
+    parser.add_argument('--sampling-rate', type=float, default=30000.)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--duration', type=float, default=60., help='in seconds')
+    group.add_argument('--size', help='size of the signals, for instance 500M or 2G')
+    parser.add_argument('--chunk-sizes', type=int, nargs='*', default=default_chunk_sizes)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--import-repeat', type=int, default=5,
+                        help='number of interpreters started to time import neo, 0 to skip')
+    parser.add_argument('--no-read-block', action='store_true',
+                        help='skip read_block, which loads all the file in memory')
+    parser.add_argument('--output', help='JSON file to store the results')
+    parser.add_argument('--baseline', help='JSON file of previous results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative degradation allowed before reporting a regression')
+    args = parser.parse_args(args)
+
+    duration = args.duration
+    if args.size is not None:
+        duration = duration_for_size(_parse_size(args.size), args.nb_channel,
+                                     args.sampling_rate)
+    recording_params = dict(nb_channel=args.nb_channel, sampling_rate=args.sampling_rate,
+                            duration=duration)
+
+    dirname = args.dirname
+    if dirname is None:
+        dirname = tempfile.mkdtemp()
+    doc = run_benchmarks(dirname, rawio_names=args.formats,
+                         recording_params=recording_params,
+                         import_repeat=args.import_repeat,
+                         chunk_sizes=args.chunk_sizes, repeat=args.repeat,
+                         read_block=not args.no_read_block)
+    if args.dirname is None:
+        import shutil
+        shutil.rmtree(dirname)
+
+    print(format_results(doc['results']))
+    if args.output is not None:
+        save_results(doc, args.output)
+
+    if args.baseline is not None:
+        baseline = load_results(args.baseline)
+        comparison = compare_results(doc['results'], baseline['results'])
+        print(format_comparison(comparison, tolerance=args.tolerance))
+        if find_regressions(doc['results'], baseline['results'], tolerance=args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
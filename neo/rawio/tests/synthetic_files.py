@@ -0,0 +1,1038 @@
+# -*- coding: utf-8 -*-
+"""
+Writers of synthetic files in some of the formats read by neo.rawio.
+
+The test files of the rawio test suite are downloaded from GIN and are
+small. For benchmarking, files with a known content and an arbitrary size
+are more useful: they can be generated offline, reproducibly, as large as
+needed.
+
+All the writers take a :class:`SyntheticRecording`, which describes a
+multi-channel extracellular recording: Gaussian noise on every channel,
+units firing as Poisson processes (with a refractory period) whose spike
+waveforms are added to the signals, and a regular TTL-like event channel.
+The recording is generated chunk by chunk, so multi-GB files are written
+with a small memory footprint.
+
+Each writer returns the keyword arguments to give to the matching rawio
+class::
+
+    >>> from neo.rawio import PlexonRawIO
+    >>> from neo.rawio.tests.synthetic_files import (SyntheticRecording,
+    ...                                              write_plexon_file)
+    >>> recording = SyntheticRecording(nb_channel=32, duration=600.)
+    >>> kargs = write_plexon_file('/tmp/synthetic.plx', recording)
+    >>> reader = PlexonRawIO(**kargs)
+
+:func:`generate_corpus` writes the same recording in all formats. It can
+also be used from the command line::
+
+    python -m neo.rawio.tests.synthetic_files /tmp/corpus --size 2G
+
+Limitations of the formats:
+  * Blackrock needs a sampling rate dividing 30 kHz.
+  * Plexon needs an integer sampling rate.
+  * Spike2 files are limited to 2 GiB (32-bit block pointers).
+  * Axon (ABF1) supports at most 16 channels and 2**31 samples in total,
+    and the files are written without tags.
+
+"""
+
+# needed for python 3 compatibility
+from __future__ import print_function, division, absolute_import
+
+import datetime
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from neo.rawio.axonrawio import headerDescriptionV1
+from neo.rawio.neuralynxrawio import (ncs_dtype, nev_dtype, BLOCK_SIZE as NLX_BLOCK_SIZE,
+                                      HEADER_SIZE as NLX_HEADER_SIZE)
+from neo.rawio.plexonrawio import (GlobalHeader, DspChannelHeader, EventChannelHeader,
+                                   SlowChannelHeader, DataBlockHeader)
+from neo.rawio.spike2rawio import (headerDescription, channelHeaderDesciption1,
+                                   blockHeaderDesciption)
+from neo.rawio.tdtrawio import (tsq_dtype, EVTYPE_UNKNOWN, EVTYPE_STRON, EVTYPE_STREAM,
+                                EVTYPE_SNIP, EVTYPE_MARK, EVMARK_STARTBLOCK, EVMARK_STOPBLOCK)
+
+# gain of the int16 signals, as for an Intan amplifier
+UV_PER_BIT = 0.195
+
+# date of all the recordings
+REC_DATETIME = datetime.datetime(2018, 1, 1, 12, 0, 0)
+
+
+class SyntheticRecording(object):
+    """
+    Deterministic synthetic extracellular recording.
+
+    Parameters:
+        nb_channel: number of signal channels
+        duration: duration in seconds, rounded down to a multiple
+            of 512 samples
+        sampling_rate: sampling rate of the signals and of the waveforms
+        spike_rate: mean firing rate of each unit, in Hz
+        nb_unit: number of units on each channel
+        event_rate: rate of the TTL events, in Hz
+        seed: seed of the random generators. Two recordings with the same
+            parameters have exactly the same content.
+
+    The ground truth is available in the attributes:
+        nb_sample: number of samples of each signal
+        spikes: structured array of all spikes with fields 'index' (sample
+            index of the waveform trough), 'channel' and 'unit', sorted by index
+        events: structured array of all events with fields 'index' and
+            'label'
+        templates: int16 array of shape (nb_channel, nb_unit, waveform_size)
+    """
+
+    # signals are generated by chunk of this number of samples.
+    # It is a multiple of the record sizes of Neuralynx (512) and TDT (256).
+    chunk_size = 2 ** 16
+    waveform_size = 32
+    waveform_left_sweep = 8
+    refractory_period = 0.003  # s
+    noise_level = 20.
+    nb_event_label = 4
+
+    def __init__(self, nb_channel=16, duration=10., sampling_rate=30000.,
+                 spike_rate=10., nb_unit=2, event_rate=1., seed=0):
+        self.nb_channel = nb_channel
+        self.sampling_rate = float(sampling_rate)
+        self.spike_rate = spike_rate
+        self.nb_unit = nb_unit
+        self.event_rate = event_rate
+        self.seed = seed
+
+        self.nb_sample = int(duration * self.sampling_rate) // 512 * 512
+        self.duration = self.nb_sample / self.sampling_rate
+
+        rng = np.random.RandomState(seed)
+
+        # noise is picked in this bank at a random position for each chunk
+        # and channel: much faster than drawing new random numbers
+        self._noise_bank = rng.normal(0., self.noise_level,
+                                      size=2 * self.chunk_size).astype('int16')
+
+        # waveforms: a trough followed by a slower positive bump
+        t = np.arange(self.waveform_size) - self.waveform_left_sweep
+        shape = -np.exp(-(t / 2.) ** 2) + .35 * np.exp(-((t - 6.) / 4.) ** 2)
+        amplitudes = rng.uniform(150., 400., size=(nb_channel, nb_unit))
+        self.templates = (amplitudes[:, :, None] * shape).astype('int16')
+
+        self.spikes = self._make_spikes(rng)
+
+        period = self.sampling_rate / event_rate
+        nb_event = int(self.nb_sample / period)
+        self.events = np.zeros(nb_event, dtype=[('index', 'int64'), ('label', 'int32')])
+        self.events['index'] = ((np.arange(nb_event) + .5) * period).astype('int64')
+        self.events['label'] = np.arange(nb_event) % self.nb_event_label + 1
+
+    def _make_spikes(self, rng):
+        refractory = self.refractory_period * self.sampling_rate
+        mean_isi = self.sampling_rate / self.spike_rate
+        assert mean_isi > refractory, 'spike_rate is too high'
+        wf_size = self.waveform_size
+        left = self.waveform_left_sweep
+
+        spikes = []
+        for c in range(self.nb_channel):
+            for u in range(self.nb_unit):
+                times = []
+                last = 0.
+                while last < self.nb_sample:
+                    isi = refractory + rng.exponential(mean_isi - refractory,
+                                                       size=int(self.nb_sample / mean_isi) + 10)
+                    times.append(last + np.cumsum(isi))
+                    last = times[-1][-1]
+                index = np.concatenate(times).astype('int64')
+                # waveforms must be in the signal and not across two chunks
+                first = index - left
+                last = first + wf_size - 1
+                keep = (first >= 0) & (last < self.nb_sample) & \
+                       (first // self.chunk_size == last // self.chunk_size)
+                index = index[keep]
+                unit_spikes = np.zeros(index.size, dtype=[('index', 'int64'),
+                                                          ('channel', 'int32'),
+                                                          ('unit', 'int32')])
+                unit_spikes['index'] = index
+                unit_spikes['channel'] = c
+                unit_spikes['unit'] = u
+                spikes.append(unit_spikes)
+        spikes = np.concatenate(spikes)
+        order = np.argsort(spikes['index'], kind='mergesort')
+        return spikes[order]
+
+    @property
+    def nbytes(self):
+        """Size of the int16 signals, in bytes."""
+        return self.nb_sample * self.nb_channel * 2
+
+    def iter_chunks(self):
+        """
+        Iterate over the recording by chunks of at most `chunk_size` samples.
+
+        Yield (i_start, sigs, spikes, waveforms, events) with:
+            i_start: index of the first sample of the chunk
+            sigs: int16 array (nb_sample_in_chunk, nb_channel)
+            spikes: the spikes of the chunk
+            waveforms: int16 array (nb_spike_in_chunk, waveform_size),
+                cut in sigs
+            events: the events of the chunk
+        """
+        left = self.waveform_left_sweep
+        spike_bounds = np.searchsorted(self.spikes['index'] - left,
+                                       np.arange(0, self.nb_sample + self.chunk_size,
+                                                 self.chunk_size))
+        event_bounds = np.searchsorted(self.events['index'],
+                                       np.arange(0, self.nb_sample + self.chunk_size,
+                                                 self.chunk_size))
+
+        for k, i_start in enumerate(range(0, self.nb_sample, self.chunk_size)):
+            i_stop = min(i_start + self.chunk_size, self.nb_sample)
+            n = i_stop - i_start
+
+            rng = np.random.RandomState([self.seed, k])
+            offsets = rng.randint(0, self.chunk_size, size=self.nb_channel)
+            sigs = np.empty((n, self.nb_channel), dtype='int16')
+            for c in range(self.nb_channel):
+                sigs[:, c] = self._noise_bank[offsets[c]:offsets[c] + n]
+
+            spikes = self.spikes[spike_bounds[k]:spike_bounds[k + 1]]
+            rows = (spikes['index'] - left - i_start)[:, None] + \
+                np.arange(self.waveform_size)[None, :]
+            cols = np.repeat(spikes['channel'][:, None], self.waveform_size, axis=1)
+            np.add.at(sigs, (rows, cols), self.templates[spikes['channel'], spikes['unit']])
+            waveforms = sigs[rows, cols]
+
+            events = self.events[event_bounds[k]:event_bounds[k + 1]]
+
+            yield i_start, sigs, spikes, waveforms, events
+
+
+def duration_for_size(nbytes, nb_channel=16, sampling_rate=30000.):
+    """
+    Duration giving `nbytes` of int16 signals, which is about the size of
+    the files.
+    """
+    return nbytes / (2. * nb_channel * sampling_rate)
+
+
+def write_raw_binary_file(filename, recording):
+    """
+    Write the signals as interleaved int16.
+    """
+    with open(filename, 'wb') as f:
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            f.write(sigs.tobytes())
+
+    return dict(filename=filename, dtype='int16', sampling_rate=recording.sampling_rate,
+                nb_channel=recording.nb_channel, signal_gain=UV_PER_BIT)
+
+
+def write_neuroscope_files(filename, recording):
+    """
+    Write `filename`.dat and `filename`.xml, channels being grouped by four.
+    """
+    filename = filename.replace('.xml', '').replace('.dat', '')
+    write_raw_binary_file(filename + '.dat', recording)
+
+    groups = []
+    for c0 in range(0, recording.nb_channel, 4):
+        channels = ''.join('    <channel skip="0">{}</channel>\n'.format(c)
+                           for c in range(c0, min(c0 + 4, recording.nb_channel)))
+        groups.append('   <group>\n{}   </group>\n'.format(channels))
+
+    # the gain of neuroscope is voltageRange / 2**16 / amplification
+    amplification = 1000.
+    voltage_range = UV_PER_BIT * 1e-6 * 2 ** 16 * amplification
+    xml = ('<?xml version="1.0"?>\n'
+           '<parameters creator="neo" version="1.0">\n'
+           ' <acquisitionSystem>\n'
+           '  <nBits>16</nBits>\n'
+           '  <nChannels>{}</nChannels>\n'
+           '  <samplingRate>{}</samplingRate>\n'
+           '  <voltageRange>{}</voltageRange>\n'
+           '  <amplification>{}</amplification>\n'
+           '  <offset>0</offset>\n'
+           ' </acquisitionSystem>\n'
+           ' <anatomicalDescription>\n'
+           '  <channelGroups>\n'
+           '{}'
+           '  </channelGroups>\n'
+           ' </anatomicalDescription>\n'
+           '</parameters>\n').format(recording.nb_channel, recording.sampling_rate,
+                                     voltage_range, amplification, ''.join(groups))
+    with open(filename + '.xml', 'w') as f:
+        f.write(xml)
+
+    return dict(filename=filename + '.xml')
+
+
+def write_plexon_file(filename, recording, signal_block_size=4096):
+    """
+    Write a .plx file (version 106) with one slow channel and one DSP
+    channel by signal channel, and a 'Strobed' event channel.
+
+    Data blocks are written in time order: a block of `signal_block_size`
+    samples per channel, then one block per spike or event.
+    """
+    sampling_rate = int(recording.sampling_rate)
+    assert sampling_rate == recording.sampling_rate, \
+        'Plexon needs an integer sampling rate'
+    nb_channel = recording.nb_channel
+    wf_size = recording.waveform_size
+
+    global_header = np.zeros(1, dtype=GlobalHeader)
+    gh = global_header[0]
+    gh['MagicNumber'] = 0x58454c50  # PLEX
+    gh['Version'] = 106
+    gh['Comment'] = b'synthetic recording'
+    gh['ADFrequency'] = sampling_rate
+    gh['NumDSPChannels'] = nb_channel
+    gh['NumEventChannels'] = 1
+    gh['NumSlowChannels'] = nb_channel
+    gh['NumPointsWave'] = wf_size
+    gh['NumPointsPreThr'] = recording.waveform_left_sweep
+    for k in ('Year', 'Month', 'Day', 'Hour', 'Minute', 'Second'):
+        gh[k] = getattr(REC_DATETIME, k.lower())
+    gh['WaveformFreq'] = sampling_rate
+    gh['LastTimestamp'] = recording.nb_sample
+    gh['Trodalness'] = 1
+    gh['DataTrodalness'] = 1
+    gh['BitsPerSpikeSample'] = 16
+    gh['BitsPerSlowSample'] = 16
+    # the gain of plexon is MaxMagnitudeMV / (.5 * 2**Bits * Gain * PreAmpGain)
+    gh['SpikeMaxMagnitudeMV'] = 5000
+    gh['SlowMaxMagnitudeMV'] = 5000
+    gh['SpikePreAmpGain'] = 1000
+    gh['AcquiringSoftware'] = b'neo'
+    gain = int(round(5000. / (.5 * 2 ** 16 * UV_PER_BIT)))
+
+    dsp_headers = np.zeros(nb_channel, dtype=DspChannelHeader)
+    event_headers = np.zeros(1, dtype=EventChannelHeader)
+    slow_headers = np.zeros(nb_channel, dtype=SlowChannelHeader)
+    for c in range(nb_channel):
+        dsp_headers[c]['Name'] = 'sig{:03d}'.format(c + 1).encode('ascii')
+        dsp_headers[c]['SIGName'] = dsp_headers[c]['Name']
+        dsp_headers[c]['Channel'] = c + 1
+        dsp_headers[c]['SIG'] = c + 1
+        dsp_headers[c]['Gain'] = gain
+        dsp_headers[c]['NUnits'] = recording.nb_unit
+        dsp_headers[c]['ChanId'] = c + 1
+
+        slow_headers[c]['Name'] = 'AD{:02d}'.format(c + 1).encode('ascii')
+        slow_headers[c]['Channel'] = c
+        slow_headers[c]['ADFreq'] = sampling_rate
+        slow_headers[c]['Gain'] = gain
+        slow_headers[c]['Enabled'] = 1
+        slow_headers[c]['PreampGain'] = 1000
+        slow_headers[c]['SpikeChannel'] = c + 1
+        slow_headers[c]['ChanId'] = c
+    event_headers[0]['Name'] = b'Strobed'
+    event_headers[0]['Channel'] = 257
+    event_headers[0]['ChanId'] = 257
+
+    spike_block_dtype = np.dtype(DataBlockHeader + [('waveform', 'int16', (wf_size,))])
+    event_block_dtype = np.dtype(DataBlockHeader)
+
+    def timestamps_fields(blocks, timestamps):
+        blocks['UpperByteOf5ByteTimestamp'] = timestamps >> 32
+        blocks['TimeStamp'] = (timestamps & 0xFFFFFFFF).astype('uint32').view('int32')
+
+    with open(filename, 'wb') as f:
+        for header in (global_header, dsp_headers, event_headers, slow_headers):
+            f.write(header.tobytes())
+
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            # signals
+            n = sigs.shape[0]
+            block_starts = np.arange(0, n, signal_block_size)
+            sig_blocks = np.zeros((block_starts.size, nb_channel), dtype=event_block_dtype)
+            sig_blocks['Type'] = 5
+            timestamps_fields(sig_blocks, (i_start + block_starts[:, None]) * np.ones(
+                nb_channel, dtype='int64'))
+            sig_blocks['Channel'] = slow_headers['Channel']
+            sig_blocks['NumberOfWaveforms'] = 1
+            sig_blocks['NumberOfWordsInWaveform'] = np.minimum(
+                n - block_starts, signal_block_size)[:, None]
+
+            # spikes
+            spike_blocks = np.zeros(spikes.size, dtype=spike_block_dtype)
+            spike_blocks['Type'] = 1
+            timestamps_fields(spike_blocks, spikes['index'])
+            spike_blocks['Channel'] = spikes['channel'] + 1
+            spike_blocks['Unit'] = spikes['unit'] + 1
+            spike_blocks['NumberOfWaveforms'] = 1
+            spike_blocks['NumberOfWordsInWaveform'] = wf_size
+            spike_blocks['waveform'] = waveforms
+
+            # events
+            event_blocks = np.zeros(events.size, dtype=event_block_dtype)
+            event_blocks['Type'] = 4
+            timestamps_fields(event_blocks, events['index'])
+            event_blocks['Channel'] = 257
+            event_blocks['Unit'] = events['label']
+
+            # merge in time order
+            items = []
+            for b, bl_start in enumerate(block_starts):
+                bl_sigs = sigs[bl_start:bl_start + signal_block_size]
+                for c in range(nb_channel):
+                    items.append((i_start + bl_start, 0, sig_blocks[b, c].tobytes() +
+                                  bl_sigs[:, c].tobytes()))
+            for i in range(spikes.size):
+                items.append((spikes['index'][i], 1, spike_blocks[i].tobytes()))
+            for i in range(events.size):
+                items.append((events['index'][i], 2, event_blocks[i].tobytes()))
+            items.sort(key=lambda item: item[:2])
+            f.write(b''.join(item[2] for item in items))
+
+    return dict(filename=filename)
+
+
+def write_blackrock_files(filename, recording):
+    """
+    Write `filename`.ns5 (continuous signals) and `filename`.nev (spikes and
+    digital events) with the file specification 2.3.
+    """
+    assert 30000. % recording.sampling_rate == 0, \
+        'Blackrock needs a sampling rate dividing 30 kHz'
+    period = int(30000. / recording.sampling_rate)
+    nb_channel = recording.nb_channel
+    wf_size = recording.waveform_size
+
+    # both files use the same range: +-8191uV for +-32764
+    max_digital = 32764
+    max_analog = int(round(max_digital * UV_PER_BIT))
+    digitization_factor = int(round(1000. * max_analog / max_digital))  # nV/bit
+
+    date = np.zeros(1, dtype=[(k, 'uint16') for k in ('year', 'month', 'weekday', 'day',
+                                                      'hour', 'minute', 'second',
+                                                      'millisecond')])
+    for k in ('year', 'month', 'day', 'hour', 'minute', 'second'):
+        date[k] = getattr(REC_DATETIME, k)
+    date['weekday'] = REC_DATETIME.isoweekday() % 7
+
+    # nsx
+    nsx_basic_dtype = np.dtype([
+        ('file_id', 'S8'), ('ver_major', 'uint8'), ('ver_minor', 'uint8'),
+        ('bytes_in_headers', 'uint32'), ('label', 'S16'), ('comment', 'S256'),
+        ('period', 'uint32'), ('timestamp_resolution', 'uint32'),
+        ('date', date.dtype), ('channel_count', 'uint32')])
+    nsx_ext_dtype = np.dtype([
+        ('type', 'S2'), ('electrode_id', 'uint16'), ('electrode_label', 'S16'),
+        ('physical_connector', 'uint8'), ('connector_pin', 'uint8'),
+        ('min_digital_val', 'int16'), ('max_digital_val', 'int16'),
+        ('min_analog_val', 'int16'), ('max_analog_val', 'int16'),
+        ('units', 'S16'),
+        ('hi_freq_corner', 'uint32'), ('hi_freq_order', 'uint32'), ('hi_freq_type', 'uint16'),
+        ('lo_freq_corner', 'uint32'), ('lo_freq_order', 'uint32'), ('lo_freq_type', 'uint16')])
+    nsx_data_header_dtype = np.dtype([
+        ('header', 'uint8'), ('timestamp', 'uint32'), ('nb_data_points', 'uint32')])
+
+    nsx_basic = np.zeros(1, dtype=nsx_basic_dtype)
+    nsx_basic['file_id'] = b'NEURALCD'
+    nsx_basic['ver_major'] = 2
+    nsx_basic['ver_minor'] = 3
+    nsx_basic['bytes_in_headers'] = nsx_basic_dtype.itemsize + nsx_ext_dtype.itemsize * nb_channel
+    nsx_basic['label'] = '{:g} kS/s'.format(recording.sampling_rate / 1000.).encode('ascii')
+    nsx_basic['comment'] = b'synthetic recording'
+    nsx_basic['period'] = period
+    nsx_basic['timestamp_resolution'] = 30000
+    nsx_basic['date'] = date
+    nsx_basic['channel_count'] = nb_channel
+
+    nsx_ext = np.zeros(nb_channel, dtype=nsx_ext_dtype)
+    nsx_ext['type'] = b'CC'
+    nsx_ext['electrode_id'] = np.arange(nb_channel) + 1
+    nsx_ext['electrode_label'] = ['chan{}'.format(c + 1).encode('ascii')
+                                  for c in range(nb_channel)]
+    nsx_ext['physical_connector'] = np.arange(nb_channel) // 32 + 1
+    nsx_ext['connector_pin'] = np.arange(nb_channel) % 32 + 1
+    nsx_ext['min_digital_val'] = -max_digital
+    nsx_ext['max_digital_val'] = max_digital
+    nsx_ext['min_analog_val'] = -max_analog
+    nsx_ext['max_analog_val'] = max_analog
+    nsx_ext['units'] = b'uV'
+    # 0.3 Hz - 7.5 kHz butterworth, in mHz
+    nsx_ext['hi_freq_corner'] = 300
+    nsx_ext['hi_freq_order'] = 1
+    nsx_ext['hi_freq_type'] = 1
+    nsx_ext['lo_freq_corner'] = 7500000
+    nsx_ext['lo_freq_order'] = 3
+    nsx_ext['lo_freq_type'] = 1
+
+    nsx_data_header = np.zeros(1, dtype=nsx_data_header_dtype)
+    nsx_data_header['header'] = 1
+    nsx_data_header['nb_data_points'] = recording.nb_sample
+
+    # nev
+    packet_size = 8 + 2 * wf_size
+    nev_basic_dtype = np.dtype([
+        ('file_type_id', 'S8'), ('ver_major', 'uint8'), ('ver_minor', 'uint8'),
+        ('additionnal_flags', 'uint16'), ('bytes_in_headers', 'uint32'),
+        ('bytes_in_data_packets', 'uint32'), ('timestamp_resolution', 'uint32'),
+        ('sample_resolution', 'uint32'), ('date', date.dtype),
+        ('application_to_create_file', 'S32'), ('comment_field', 'S256'),
+        ('nb_ext_headers', 'uint32')])
+    neuevwav_dtype = np.dtype([
+        ('packet_id', 'S8'), ('electrode_id', 'uint16'), ('physical_connector', 'uint8'),
+        ('connector_pin', 'uint8'), ('digitization_factor', 'uint16'),
+        ('energy_threshold', 'uint16'), ('hi_threshold', 'int16'), ('lo_threshold', 'int16'),
+        ('nb_sorted_units', 'uint8'), ('bytes_per_waveform', 'uint8'),
+        ('spike_width', 'uint16'), ('unused', 'S8')])
+    neuevlbl_dtype = np.dtype([
+        ('packet_id', 'S8'), ('electrode_id', 'uint16'), ('label', 'S16'), ('unused', 'S6')])
+    neuevflt_dtype = np.dtype([
+        ('packet_id', 'S8'), ('electrode_id', 'uint16'),
+        ('hi_freq_corner', 'uint32'), ('hi_freq_order', 'uint32'), ('hi_freq_type', 'uint16'),
+        ('lo_freq_corner', 'uint32'), ('lo_freq_order', 'uint32'), ('lo_freq_type', 'uint16'),
+        ('unused', 'S2')])
+    spike_packet_dtype = np.dtype([
+        ('timestamp', 'uint32'), ('packet_id', 'uint16'), ('unit_class_nb', 'uint8'),
+        ('reserved', 'uint8'), ('waveform', 'int16', (wf_size,))])
+    event_packet_dtype = np.dtype([
+        ('timestamp', 'uint32'), ('packet_id', 'uint16'), ('packet_insertion_reason', 'uint8'),
+        ('reserved', 'uint8'), ('digital_input', 'uint16'),
+        ('unused', 'S{}'.format(packet_size - 10))])
+
+    neuevwav = np.zeros(nb_channel, dtype=neuevwav_dtype)
+    neuevwav['packet_id'] = b'NEUEVWAV'
+    neuevwav['electrode_id'] = nsx_ext['electrode_id']
+    neuevwav['physical_connector'] = nsx_ext['physical_connector']
+    neuevwav['connector_pin'] = nsx_ext['connector_pin']
+    neuevwav['digitization_factor'] = digitization_factor
+    neuevwav['lo_threshold'] = -int(4 * recording.noise_level)
+    neuevwav['nb_sorted_units'] = recording.nb_unit
+    neuevwav['bytes_per_waveform'] = 2
+    neuevwav['spike_width'] = wf_size
+    neuevlbl = np.zeros(nb_channel, dtype=neuevlbl_dtype)
+    neuevlbl['packet_id'] = b'NEUEVLBL'
+    neuevlbl['electrode_id'] = nsx_ext['electrode_id']
+    neuevlbl['label'] = nsx_ext['electrode_label']
+    neuevflt = np.zeros(nb_channel, dtype=neuevflt_dtype)
+    neuevflt['packet_id'] = b'NEUEVFLT'
+    neuevflt['electrode_id'] = nsx_ext['electrode_id']
+    for k in ('hi_freq_corner', 'hi_freq_order', 'hi_freq_type',
+              'lo_freq_corner', 'lo_freq_order', 'lo_freq_type'):
+        neuevflt[k] = nsx_ext[k]
+
+    nev_basic = np.zeros(1, dtype=nev_basic_dtype)
+    nev_basic['file_type_id'] = b'NEURALEV'
+    nev_basic['ver_major'] = 2
+    nev_basic['ver_minor'] = 3
+    nev_basic['additionnal_flags'] = 1  # all waveforms are int16
+    nev_basic['bytes_in_headers'] = nev_basic_dtype.itemsize + 32 * 3 * nb_channel
+    nev_basic['bytes_in_data_packets'] = packet_size
+    nev_basic['timestamp_resolution'] = 30000
+    nev_basic['sample_resolution'] = 30000
+    nev_basic['date'] = date
+    nev_basic['application_to_create_file'] = b'neo'
+    nev_basic['comment_field'] = b'synthetic recording'
+    nev_basic['nb_ext_headers'] = 3 * nb_channel
+
+    with open(filename + '.ns5', 'wb') as nsx_file, open(filename + '.nev', 'wb') as nev_file:
+        for header in (nsx_basic, nsx_ext, nsx_data_header):
+            nsx_file.write(header.tobytes())
+        for header in (nev_basic, neuevwav, neuevlbl, neuevflt):
+            nev_file.write(header.tobytes())
+
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            nsx_file.write(sigs.tobytes())
+
+            spike_packets = np.zeros(spikes.size, dtype=spike_packet_dtype)
+            spike_packets['timestamp'] = spikes['index'] * period
+            spike_packets['packet_id'] = spikes['channel'] + 1
+            spike_packets['unit_class_nb'] = spikes['unit'] + 1
+            spike_packets['waveform'] = waveforms
+
+            event_packets = np.zeros(events.size, dtype=event_packet_dtype)
+            event_packets['timestamp'] = events['index'] * period
+            event_packets['packet_insertion_reason'] = 1  # digital input
+            event_packets['digital_input'] = events['label']
+
+            # packets are sorted by time
+            packets = np.concatenate([spike_packets.view('u1').reshape(-1, packet_size),
+                                      event_packets.view('u1').reshape(-1, packet_size)])
+            timestamps = np.concatenate([spike_packets['timestamp'],
+                                         event_packets['timestamp']])
+            order = np.argsort(timestamps, kind='mergesort')
+            nev_file.write(packets[order].tobytes())
+
+    return dict(filename=filename)
+
+
+def _neuralynx_header(filename, recording, entries):
+    """
+    The 16 kB text header of Neuralynx files, as written by Cheetah 5.6.3.
+    """
+    def time_str(dt):
+        return '{}/{}/{}  (h:m:s.ms) {}:{}:{}.{}'.format(
+            dt.month, dt.day, dt.year, dt.hour, dt.minute, dt.second, dt.microsecond // 1000)
+
+    closed = REC_DATETIME + datetime.timedelta(seconds=recording.duration)
+    lines = [
+        '######## Neuralynx Data File Header',
+        '## File Name C:\\CheetahData\\{}'.format(os.path.basename(filename)),
+        '## Time Opened (m/d/y): {}'.format(time_str(REC_DATETIME)),
+        '## Time Closed (m/d/y): {}'.format(time_str(closed)),
+        '',
+        '-CheetahRev 5.6.3',
+    ]
+    lines += ['-{} {}'.format(k, v) for k, v in entries.items()]
+    header = '\r\n'.join(lines).encode('latin-1') + b'\r\n'
+    return header.ljust(NLX_HEADER_SIZE, b'\x00')
+
+
+def write_neuralynx_dir(dirname, recording):
+    """
+    Write a Neuralynx directory: one CSC*.ncs (signal) and one SE*.nse
+    (spikes, with 'Peak' and 'Valley' features) file per channel, and
+    Events.nev.
+    """
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+    nb_channel = recording.nb_channel
+    sr = recording.sampling_rate
+    wf_size = recording.waveform_size
+
+    nse_dtype = np.dtype([('timestamp', 'uint64'), ('channel_id', 'uint32'),
+                          ('unit_id', 'uint32'), ('features', 'int32', (2,)),
+                          ('samples', 'int16', (wf_size,))])
+    common_entries = OrderedDict([
+        ('SamplingFrequency', '{:g}'.format(sr)),
+        ('ADMaxValue', '32767'),
+        ('ADBitVolts', '{:.10f}'.format(UV_PER_BIT * 1e-6)),
+        ('InputRange', '{:d}'.format(int(32767 * UV_PER_BIT))),
+        ('InputInverted', 'False'),
+    ])
+
+    ncs_files, nse_files = [], []
+    for c in range(nb_channel):
+        entries = OrderedDict([('FileType', 'CSC'),
+                               ('RecordSize', '{}'.format(np.dtype(ncs_dtype).itemsize)),
+                               ('AcqEntName', 'CSC{}'.format(c + 1)),
+                               ('ADChannel', '{}'.format(c))])
+        entries.update(common_entries)
+        filename = os.path.join(dirname, 'CSC{}.ncs'.format(c + 1))
+        f = open(filename, 'wb')
+        f.write(_neuralynx_header(filename, recording, entries))
+        ncs_files.append(f)
+
+        entries = OrderedDict([('FileType', 'Spike'),
+                               ('RecordSize', '{}'.format(nse_dtype.itemsize)),
+                               ('AcqEntName', 'SE{}'.format(c + 1)),
+                               ('ADChannel', '{}'.format(c)),
+                               ('WaveformLength', '{}'.format(wf_size)),
+                               ('AlignmentPt', '{}'.format(recording.waveform_left_sweep)),
+                               ('Feature Peak 0', '0 0 0 1.000000 -1'),
+                               ('Feature Valley 1', '1 0 0 1.000000 -1')])
+        entries.update(common_entries)
+        filename = os.path.join(dirname, 'SE{}.nse'.format(c + 1))
+        f = open(filename, 'wb')
+        f.write(_neuralynx_header(filename, recording, entries))
+        nse_files.append(f)
+
+    entries = OrderedDict([('FileType', 'Event'),
+                           ('RecordSize', '{}'.format(np.dtype(nev_dtype).itemsize))])
+    filename = os.path.join(dirname, 'Events.nev')
+    nev_file = open(filename, 'wb')
+    nev_file.write(_neuralynx_header(filename, recording, entries))
+
+    try:
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            nb_record = sigs.shape[0] // NLX_BLOCK_SIZE
+            records = np.zeros(nb_record, dtype=ncs_dtype)
+            block_starts = i_start + np.arange(nb_record) * NLX_BLOCK_SIZE
+            records['timestamp'] = np.round(block_starts * 1e6 / sr).astype('uint64')
+            records['sample_rate'] = int(sr)
+            records['nb_valid'] = NLX_BLOCK_SIZE
+            for c in range(nb_channel):
+                records['channel_id'] = c
+                records['samples'] = sigs[:, c].reshape(nb_record, NLX_BLOCK_SIZE)
+                ncs_files[c].write(records.tobytes())
+
+            for c in range(nb_channel):
+                mask = spikes['channel'] == c
+                spike_records = np.zeros(np.sum(mask), dtype=nse_dtype)
+                spike_records['timestamp'] = np.round(spikes['index'][mask] * 1e6 / sr)
+                spike_records['channel_id'] = c
+                spike_records['unit_id'] = spikes['unit'][mask] + 1
+                spike_records['features'][:, 0] = waveforms[mask].max(axis=1)
+                spike_records['features'][:, 1] = waveforms[mask].min(axis=1)
+                spike_records['samples'] = waveforms[mask]
+                nse_files[c].write(spike_records.tobytes())
+
+            event_records = np.zeros(events.size, dtype=nev_dtype)
+            event_records['system_id'] = 1
+            event_records['data_size'] = 2
+            event_records['timestamp'] = np.round(events['index'] * 1e6 / sr)
+            event_records['event_id'] = 11
+            event_records['ttl_input'] = events['label']
+            event_records['event_string'] = [
+                'TTL Input on AcqSystem1_0 board 0 port 0 value (0x{:04X}).'.format(
+                    label).encode('ascii') for label in events['label']]
+            nev_file.write(event_records.tobytes())
+    finally:
+        for f in ncs_files + nse_files + [nev_file]:
+            f.close()
+
+    return dict(dirname=dirname)
+
+
+def _pascal_string(s, size):
+    """Spike2 strings: first byte is the length."""
+    s = s.encode('ascii')[:size - 1]
+    return struct.pack('B', len(s)) + s
+
+
+def write_spike2_file(filename, recording, adc_block_size=16384):
+    """
+    Write a .smr file (version 6) with one Adc channel and one AdcMark
+    (spikes and waveforms) channel by signal channel and an EventRise
+    channel. One tick is one sample.
+
+    Spike2 block pointers are 32-bit: the file must be smaller than 2 GiB.
+    """
+    nb_channel = recording.nb_channel
+    wf_size = recording.waveform_size
+    # channels: Adc, then AdcMark, then event
+    nb_smr_chan = 2 * nb_channel + 1
+    first_data = 512 + 140 * nb_smr_chan
+    scale = UV_PER_BIT * 6553.6
+
+    block_header_dtype = np.dtype(blockHeaderDesciption)
+    spike_dtype = np.dtype([('tick', 'i4'), ('marker', 'i4'), ('waveform', 'int16', (wf_size,))])
+
+    # positions of the blocks of each channel, to chain them at the end
+    block_pos = [[] for _ in range(nb_smr_chan)]
+    last_tick = 0
+
+    with open(filename, 'w+b') as f:
+        f.write(b'\x00' * first_data)
+
+        def write_block(chan, start_time, end_time, items, data):
+            pos = f.tell()
+            if pos + block_header_dtype.itemsize + len(data) >= 2 ** 31:
+                raise ValueError('Spike2 files are limited to 2 GiB')
+            header = np.zeros(1, dtype=block_header_dtype)
+            header['start_time'] = start_time
+            header['end_time'] = end_time
+            header['channel_num'] = chan + 1
+            header['items'] = items
+            f.write(header.tobytes())
+            f.write(data)
+            block_pos[chan].append(pos)
+
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            n = sigs.shape[0]
+            for bl_start in range(0, n, adc_block_size):
+                bl_sigs = sigs[bl_start:bl_start + adc_block_size]
+                start = i_start + bl_start
+                for c in range(nb_channel):
+                    write_block(c, start, start + bl_sigs.shape[0] - 1,
+                                bl_sigs.shape[0], bl_sigs[:, c].tobytes())
+
+            for c in range(nb_channel):
+                mask = spikes['channel'] == c
+                if not np.any(mask):
+                    continue
+                data = np.zeros(np.sum(mask), dtype=spike_dtype)
+                data['tick'] = spikes['index'][mask]
+                data['marker'] = spikes['unit'][mask] + 1
+                data['waveform'] = waveforms[mask]
+                write_block(nb_channel + c, data['tick'][0], data['tick'][-1],
+                            data.size, data.tobytes())
+
+            if events.size > 0:
+                data = events['index'].astype('i4')
+                write_block(2 * nb_channel, data[0], data[-1], data.size, data.tobytes())
+            last_tick = i_start + n - 1
+
+        # global header
+        header = np.zeros(1, dtype=headerDescription)
+        header['system_id'] = 6
+        header['copyright'] = b'(C) CED 87'
+        header['creator'] = b'neo'
+        header['us_per_time'] = 1
+        header['time_per_adc'] = 1
+        header['first_data'] = first_data
+        header['channels'] = nb_smr_chan
+        header['chan_size'] = 140
+        header['max_ftime'] = last_tick
+        header['dtime_base'] = 1. / recording.sampling_rate
+        header['datetime_year'] = REC_DATETIME.year
+        header['comment1'] = _pascal_string('synthetic recording', 80)
+        f.seek(0)
+        f.write(header.tobytes())
+
+        # channel headers
+        for chan in range(nb_smr_chan):
+            chan_header = np.zeros(1, dtype=channelHeaderDesciption1)
+            positions = block_pos[chan]
+            chan_header['firstblock'] = positions[0] if positions else -1
+            chan_header['lastblock'] = positions[-1] if positions else -1
+            chan_header['blocks'] = len(positions)
+            chan_header['max_chan_time'] = last_tick
+            chan_header['l_chan_dvd'] = 1
+            chan_header['ideal_rate'] = recording.sampling_rate
+            if chan < nb_channel:
+                kind, title = 1, 'Ch{}'.format(chan + 1)
+                chan_header['max_data'] = adc_block_size
+                chan_header['phy_chan'] = chan
+            elif chan < 2 * nb_channel:
+                kind, title = 6, 'nw-{}'.format(chan - nb_channel + 1)
+                chan_header['n_extra'] = wf_size * 2
+                chan_header['pre_trig'] = recording.waveform_left_sweep
+                chan_header['phy_chan'] = chan - nb_channel
+            else:
+                kind, title = 3, 'TTL'
+                chan_header['phy_chan'] = -1
+            chan_header['kind'] = kind
+            chan_header['title'] = _pascal_string(title, 10)
+            f.seek(512 + 140 * chan)
+            f.write(chan_header.tobytes())
+            if kind in (1, 6):
+                f.write(struct.pack('<ff6sh', scale, 0., _pascal_string('uV', 6), 1))
+
+            # chain the blocks
+            for b, pos in enumerate(positions):
+                pred = positions[b - 1] if b > 0 else -1
+                succ = positions[b + 1] if b < len(positions) - 1 else -1
+                f.seek(pos)
+                f.write(struct.pack('<ii', pred, succ))
+
+    return dict(filename=filename)
+
+
+def write_axon_file(filename, recording):
+    """
+    Write a gap-free .abf file in the ABF1 format.
+    """
+    nb_channel = recording.nb_channel
+    assert nb_channel <= 16, 'ABF1 supports at most 16 channels'
+    assert recording.nb_sample * nb_channel < 2 ** 31, 'too many samples for ABF1'
+
+    data_section_block = 12  # the header takes 6144 bytes
+    values = {
+        'fFileSignature': b'ABF ',
+        'fFileVersionNumber': 1.83,
+        'nOperationMode': 3,  # gap-free
+        'lActualAcqLength': recording.nb_sample * nb_channel,
+        'lActualEpisodes': 1,
+        'lFileStartTime': REC_DATETIME.hour * 3600 + REC_DATETIME.minute * 60 +
+        REC_DATETIME.second,
+        'lDataSectionPtr': data_section_block,
+        'nDataFormat': 0,  # int16
+        'nADCNumChannels': nb_channel,
+        'fADCSampleInterval': 1e6 / recording.sampling_rate / nb_channel,
+        'lNumSamplesPerEpisode': 8192,
+        'lEpisodesPerRun': 1,
+        'fADCRange': 10.,
+        'lADCResolution': 32768,
+        'nADCPtoLChannelMap': list(range(16)),
+        'nADCSamplingSeq': list(range(nb_channel)) + [-1] * (16 - nb_channel),
+        'sADCChannelName': ['IN {}'.format(c).ljust(10).encode('ascii') for c in range(16)],
+        'sADCUnits': [b'uV'.ljust(8)] * 16,
+        'fADCProgrammableGain': [1.] * 16,
+        # gain of the reader is fADCRange / fInstrumentScaleFactor / lADCResolution
+        'fInstrumentScaleFactor': [10. / 32768 / UV_PER_BIT] * 16,
+        'fSignalGain': [1.] * 16,
+        'fTelegraphAdditGain': [1.] * 16,
+    }
+    header = bytearray(data_section_block * 512)
+    for key, offset, fmt in headerDescriptionV1:
+        if key in values:
+            value = values[key]
+            if not isinstance(value, list):
+                value = [value]
+            struct.pack_into(fmt, header, offset, *value)
+
+    with open(filename, 'wb') as f:
+        f.write(header)
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            f.write(sigs.tobytes())
+
+    return dict(filename=filename)
+
+
+def write_tdt_tank(dirname, recording, block_name='Block-1', lfp_decimation=16):
+    """
+    Write a TDT tank with one block:
+      * a 'Wav1' stream store (float32, volts) with all channels
+      * a 'LFP1' stream store, the same signals decimated by `lfp_decimation`
+      * a 'eNe1' snippet store
+      * a 'Trig' strobe store
+    """
+    stream_points = 256
+    wf_size = recording.waveform_size
+    nb_channel = recording.nb_channel
+    sr = recording.sampling_rate
+    lfp_sr = sr / lfp_decimation
+    # timestamps are in seconds since the epoch
+    t0 = (REC_DATETIME - datetime.datetime(1970, 1, 1)).total_seconds()
+    volt_per_bit = UV_PER_BIT * 1e-6
+
+    tankname = os.path.basename(os.path.normpath(dirname))
+    block_dir = os.path.join(dirname, block_name)
+    if not os.path.exists(block_dir):
+        os.makedirs(block_dir)
+    base = os.path.join(block_dir, tankname + '_' + block_name)
+
+    stores = [
+        ('Wav1', EVTYPE_STREAM, nb_channel, stream_points, sr),
+        ('LFP1', EVTYPE_STREAM, nb_channel, stream_points, lfp_sr),
+        ('eNe1', EVTYPE_SNIP, nb_channel, wf_size, sr),
+        ('Trig', EVTYPE_STRON, 1, 0, 0.),
+    ]
+    tbk = []
+    for name, evtype, nb_chan, nb_points, freq in stores:
+        fields = [('StoreName', 'L', name), ('HeadName', 'L', name), ('Enabled', 'L', '1'),
+                  ('CircType', 'L', '0'), ('NumChan', 'L', nb_chan),
+                  ('StrobeMode', 'L', '0'), ('TankEvType', 'L', evtype),
+                  ('NumPoints', 'L', nb_points), ('DataFormat', 'L', '0'),
+                  ('SampleFreq', 'D', freq)]
+        tbk.append(''.join('NAME={};TYPE={};VALUE={};\r\n'.format(*field)
+                           for field in fields))
+    with open(base + '.Tbk', 'wb') as f:
+        f.write('[STOREHDRITEM]'.join(tbk).encode('ascii'))
+        f.write(b'[USERNOTEDELIMITER]\r\n')
+    open(base + '.tdx', 'wb').close()
+
+    def tsq_records(size, evtype, evname, channel, timestamp, offset=0, sortcode=0,
+                    nb_word=0, freq=0.):
+        records = np.zeros(size, dtype=tsq_dtype)
+        records['size'] = 10 + nb_word
+        records['evtype'] = evtype
+        records['evname'] = evname
+        records['channel'] = channel
+        records['sortcode'] = sortcode
+        records['timestamp'] = timestamp
+        records['offset'] = offset
+        records['frequency'] = freq
+        return records
+
+    def write_stream(tev, store_name, sigs, i_start, sampling_rate):
+        # one record of `stream_points` samples per channel, an incomplete
+        # record at the end is dropped
+        nb_record = sigs.shape[0] // stream_points
+        sigs = sigs[:nb_record * stream_points]
+        data = sigs.reshape(nb_record, stream_points, nb_channel).transpose(0, 2, 1)
+        offsets = tev.tell() + np.arange(nb_record * nb_channel) * stream_points * 4
+        timestamps = t0 + (i_start + np.arange(nb_record) * stream_points) / sampling_rate
+        tev.write((data * volt_per_bit).astype('float32').tobytes())
+        return tsq_records(nb_record * nb_channel, EVTYPE_STREAM, store_name,
+                           np.tile(np.arange(nb_channel) + 1, nb_record),
+                           np.repeat(timestamps, nb_channel), offsets,
+                           nb_word=stream_points, freq=sampling_rate)
+
+    with open(base + '.tev', 'wb') as tev, open(base + '.tsq', 'wb') as tsq:
+        tsq.write(tsq_records(1, EVTYPE_UNKNOWN, b'', 0, 0.).tobytes())
+        tsq.write(tsq_records(1, EVTYPE_MARK, chr(EVMARK_STARTBLOCK).encode(), 0, t0).tobytes())
+
+        for i_start, sigs, spikes, waveforms, events in recording.iter_chunks():
+            records = write_stream(tev, b'Wav1', sigs, i_start, sr)
+            lfp_records = write_stream(tev, b'LFP1', sigs[::lfp_decimation],
+                                       i_start // lfp_decimation, lfp_sr)
+
+            # snippets
+            offsets = tev.tell() + np.arange(spikes.size) * wf_size * 4
+            spike_records = tsq_records(spikes.size, EVTYPE_SNIP, b'eNe1',
+                                        spikes['channel'] + 1,
+                                        t0 + spikes['index'] / sr, offsets,
+                                        sortcode=spikes['unit'] + 1, nb_word=wf_size, freq=sr)
+            tev.write((waveforms * volt_per_bit).astype('float32').tobytes())
+
+            # strobes: the label is stored in the offset field
+            event_records = tsq_records(events.size, EVTYPE_STRON, b'Trig', 0,
+                                        t0 + events['index'] / sr, events['label'])
+
+            all_records = np.concatenate([records, lfp_records, spike_records, event_records])
+            order = np.argsort(all_records['timestamp'], kind='mergesort')
+            tsq.write(all_records[order].tobytes())
+
+        t_stop = t0 + recording.duration
+        tsq.write(tsq_records(1, EVTYPE_MARK, chr(EVMARK_STOPBLOCK).encode(), 0,
+                              t_stop).tobytes())
+
+    return dict(dirname=dirname)
+
+
+# writer, rawio class name and file name (or directory name) in a corpus
+writers = OrderedDict([
+    ('RawBinarySignalRawIO', (write_raw_binary_file, 'synthetic.raw')),
+    ('NeuroScopeRawIO', (write_neuroscope_files, 'synthetic_neuroscope')),
+    ('PlexonRawIO', (write_plexon_file, 'synthetic.plx')),
+    ('BlackrockRawIO', (write_blackrock_files, 'synthetic_blackrock')),
+    ('NeuralynxRawIO', (write_neuralynx_dir, 'synthetic_neuralynx')),
+    ('Spike2RawIO', (write_spike2_file, 'synthetic.smr')),
+    ('AxonRawIO', (write_axon_file, 'synthetic.abf')),
+    ('TdtRawIO', (write_tdt_tank, 'synthetic_tdt')),
+])
+
+
+def generate_corpus(dirname, rawio_names=None, **recording_params):
+    """
+    Write the same :class:`SyntheticRecording` in several formats in
+    `dirname`.
+
+    rawio_names: list of rawio class names (keys of `writers`), all by default.
+    recording_params: given to :class:`SyntheticRecording`.
+
+    Return an OrderedDict {rawio class name: keyword arguments of the rawio}.
+    """
+    if rawio_names is None:
+        rawio_names = list(writers.keys())
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+
+    recording = SyntheticRecording(**recording_params)
+    corpus = OrderedDict()
+    for name in rawio_names:
+        writer, path = writers[name]
+        corpus[name] = writer(os.path.join(dirname, path), recording)
+    return corpus
+
+
+def _parse_size(size):
+    units = {'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}
+    size = size.upper().rstrip('B')
+    if size[-1] in units:
+        return float(size[:-1]) * units[size[-1]]
+    return float(size)
+
+
+def main(args=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('dirname')
+    parser.add_argument('--formats', nargs='*', choices=list(writers.keys()),
+                        help='rawio class names, all formats by default')
+    parser.add_argument('--nb-channel', type=int, default=16)
+    parser.add_argument('--sampling-rate', type=float, default=30000.)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--duration', type=float, default=10., help='in seconds')
+    group.add_argument('--size', help='size of the signals, for instance 500M or 2G')
+    parser.add_argument('--spike-rate', type=float, default=10.)
+    parser.add_argument('--nb-unit', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(args)
+
+    duration = args.duration
+    if args.size is not None:
+        duration = duration_for_size(_parse_size(args.size), args.nb_channel,
+                                     args.sampling_rate)
+    corpus = generate_corpus(args.dirname, rawio_names=args.formats,
+                             nb_channel=args.nb_channel, duration=duration,
+                             sampling_rate=args.sampling_rate, spike_rate=args.spike_rate,
+                             nb_unit=args.nb_unit, seed=args.seed)
+    for name, kargs in corpus.items():
+        print(name, kargs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import unittest
+
+from neo.rawio.alphaomegarawio import AlphaOmegaRawIO
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+
+
+class TestAlphaOmegaRawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = AlphaOmegaRawIO
+    entities_to_test = ['File_AlphaOmega_1.map',
+                        'File_AlphaOmega_2.map']
+    files_to_download = entities_to_test
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the instrumentation of neo.rawio.baserawio.BaseRawIO
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from neo.rawio.baserawio import BaseRawIO, RawIOStats
+from neo.rawio.examplerawio import ExampleRawIO
+from neo.rawio.plexonrawio import PlexonRawIO
+from neo.rawio.tests.synthetic_files import SyntheticRecording, write_plexon_file
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append((record.levelno, record.getMessage()))
+
+
+class TestRawIOStats(unittest.TestCase):
+    def capture_logs(self, logger, level):
+        handler = ListHandler()
+        logger.addHandler(handler)
+        old_level = logger.level
+        logger.setLevel(level)
+
+        def restore():
+            logger.removeHandler(handler)
+            logger.setLevel(old_level)
+
+        self.addCleanup(restore)
+        return handler.messages
+
+    def test_disabled_by_default(self):
+        reader = ExampleRawIO(filename='fake1')
+        reader.parse_header()
+        reader.get_analogsignal_chunk(i_start=0, i_stop=1024)
+        self.assertIsNone(reader.stats)
+        # phases are no-ops
+        with reader._stats_phase('phase') as phase:
+            phase.nbytes = 10
+        self.assertIsNone(reader.stats)
+
+    def test_stats(self):
+        reader = ExampleRawIO(filename='fake1')
+        stats = reader.enable_stats()
+        self.assertIsInstance(stats, RawIOStats)
+        reader.parse_header()
+        nb_chan = reader.signal_channels_count()
+        for _ in range(3):
+            raw_chunk = reader.get_analogsignal_chunk(i_start=0, i_stop=1024)
+        reader.rescale_signal_raw_to_float(raw_chunk)
+        reader.get_spike_timestamps(unit_index=0)
+        reader.get_event_timestamps(event_channel_index=0)
+
+        records = stats.as_dict()
+        self.assertEqual(list(records.keys()),
+                         ['parse_header', 'get_analogsignal_chunk',
+                          'rescale_signal_raw_to_float', 'get_spike_timestamps',
+                          'get_event_timestamps'])
+        self.assertEqual(records['parse_header']['count'], 1)
+        self.assertEqual(records['parse_header']['bytes'], 0)
+        chunk = records['get_analogsignal_chunk']
+        self.assertEqual(chunk['count'], 3)
+        self.assertEqual(chunk['samples'], 3 * 1024 * nb_chan)
+        self.assertEqual(chunk['bytes'], 3 * raw_chunk.nbytes)
+        self.assertGreater(chunk['time'], 0.)
+        self.assertGreater(records['get_event_timestamps']['samples'], 0)
+        self.assertIn('get_analogsignal_chunk', repr(stats))
+
+        messages = self.capture_logs(reader.logger, logging.INFO)
+        reader.log_stats()
+        self.assertEqual(messages[0][0], logging.INFO)
+        self.assertIn('get_analogsignal_chunk', messages[0][1])
+
+        stats.reset()
+        self.assertEqual(len(stats.records), 0)
+        reader.disable_stats()
+        self.assertIsNone(reader.stats)
+
+    def test_debug_logging(self):
+        reader = ExampleRawIO(filename='fake1')
+        reader.enable_stats()
+        reader.parse_header()
+        messages = self.capture_logs(reader.logger, logging.DEBUG)
+        reader.get_analogsignal_chunk(i_start=0, i_stop=10)
+        self.assertEqual(messages[0][0], logging.DEBUG)
+        self.assertIn('get_analogsignal_chunk', messages[0][1])
+
+    def test_collect_stats(self):
+        BaseRawIO.collect_stats = True
+        try:
+            reader = ExampleRawIO(filename='fake1')
+        finally:
+            BaseRawIO.collect_stats = False
+        reader.parse_header()
+        self.assertIn('parse_header', reader.stats.records)
+        self.assertIsNone(ExampleRawIO(filename='fake1').stats)
+
+    def test_phases(self):
+        dirname = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(dirname, 'test.plx')
+            write_plexon_file(filename, SyntheticRecording(nb_channel=2, duration=1.))
+            reader = PlexonRawIO(filename=filename)
+            reader.enable_stats()
+            reader.parse_header()
+            records = reader.stats.records
+            self.assertEqual(records['parse_header.walk_data_blocks']['count'], 1)
+            self.assertLessEqual(records['parse_header.walk_data_blocks']['time'],
+                                 records['parse_header']['time'])
+            del reader
+        finally:
+            shutil.rmtree(dirname)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import unittest
+
+from neo.rawio.brainwaredamrawio import BrainwareDamRawIO
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+
+
+class TestBrainwareDamRawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = BrainwareDamRawIO
+    entities_to_test = ['block_300ms_4rep_1clust_part_ch1.dam',
+                        'interleaved_500ms_5rep_ch2.dam',
+                        'long_170s_1rep_1clust_ch2.dam',
+                        'multi_500ms_mulitrep_ch1.dam',
+                        'random_500ms_12rep_noclust_part_ch2.dam',
+                        'sequence_500ms_5rep_ch2.dam']
+    files_to_download = entities_to_test
+
+
+if __name__ == "__main__":
+    unittest.main()
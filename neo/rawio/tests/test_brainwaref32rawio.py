@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import unittest
+
+from neo.rawio.brainwaref32rawio import BrainwareF32RawIO
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+
+
+class TestBrainwareF32RawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = BrainwareF32RawIO
+    entities_to_test = ['block_300ms_4rep_1clust_part_ch1.f32',
+                        'block_500ms_5rep_empty_fullclust_ch1.f32',
+                        'block_500ms_5rep_empty_partclust_ch1.f32',
+                        'interleaved_500ms_5rep_ch2.f32',
+                        'interleaved_500ms_5rep_nospikes_ch1.f32',
+                        'multi_500ms_mulitrep_ch1.f32',
+                        'random_500ms_12rep_noclust_part_ch2.f32',
+                        'sequence_500ms_5rep_ch2.f32']
+    files_to_download = entities_to_test
+
+
+if __name__ == "__main__":
+    unittest.main()
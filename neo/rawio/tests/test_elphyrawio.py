@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import unittest
+
+from neo.rawio.elphyrawio import ElphyRawIO
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+
+
+class TestElphyRawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = ElphyRawIO
+    entities_to_test = ['ElphyExample.DAT',
+                        'ElphyExample_Mode1.dat',
+                        'ElphyExample_Mode2.dat',
+                        'ElphyExample_Mode3.dat',
+                        ]
+    files_to_download = entities_to_test
+
+
+if __name__ == "__main__":
+    unittest.main()
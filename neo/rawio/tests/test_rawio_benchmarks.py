@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the rawio benchmark suite on a tiny synthetic corpus.
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from neo.rawio.tests.rawio_benchmarks import (run_benchmarks, compare_results,
+                                              find_regressions, save_results, load_results,
+                                              metric_direction, HAVE_TRACEMALLOC)
+
+
+class TestRawIOBenchmarks(unittest.TestCase):
+    rawio_names = ['RawBinarySignalRawIO', 'PlexonRawIO']
+    recording_params = dict(nb_channel=4, duration=1., seed=1)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dirname = tempfile.mkdtemp()
+        cls.doc = run_benchmarks(cls.dirname, rawio_names=cls.rawio_names,
+                                 recording_params=cls.recording_params,
+                                 chunk_sizes=(1024, 8192), channel_counts=(1, None),
+                                 repeat=1, import_repeat=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dirname)
+
+    def test_metrics(self):
+        results = self.doc['results']
+        self.assertEqual(list(results.keys()), self.rawio_names + ['import'])
+        for name in self.rawio_names:
+            metrics = results[name]
+            for metric in ('parse_header_cold_s', 'parse_header_warm_s',
+                           'read_signals_chunk1024_chan1_msps',
+                           'read_signals_chunk8192_chan4_msps', 'read_block_s'):
+                self.assertGreater(metrics[metric], 0)
+            if HAVE_TRACEMALLOC:
+                self.assertGreater(metrics['read_block_peak_mb'], 0)
+        # only Plexon has spikes and events
+        self.assertNotIn('read_spike_times_s', results['RawBinarySignalRawIO'])
+        self.assertGreater(results['PlexonRawIO']['read_spike_waveforms_s'], 0)
+        self.assertGreater(results['PlexonRawIO']['read_events_s'], 0)
+        for metric in ('import_neo_s', 'import_neo_one_io_s', 'import_neo_all_io_s'):
+            self.assertGreater(results['import'][metric], 0)
+
+    def test_save_load(self):
+        filename = os.path.join(self.dirname, 'results.json')
+        save_results(self.doc, filename)
+        doc = load_results(filename)
+        self.assertEqual(doc['recording'], self.recording_params)
+        self.assertEqual(list(doc['results']['PlexonRawIO'].keys()),
+                         list(self.doc['results']['PlexonRawIO'].keys()))
+
+    def test_compare(self):
+        self.assertEqual(metric_direction('read_block_s'), 1)
+        self.assertEqual(metric_direction('read_signals_chunk1024_chan1_msps'), -1)
+        self.assertRaises(ValueError, metric_direction, 'read_block')
+
+        baseline = {'PlexonRawIO': {'read_block_s': 1., 'read_signals_chunk1024_chan1_msps': 100.,
+                                    'read_block_peak_mb': None}}
+        results = {'PlexonRawIO': {'read_block_s': 1.1, 'read_signals_chunk1024_chan1_msps': 50.,
+                                   'read_block_peak_mb': 10.},
+                   'AxonRawIO': {'read_block_s': 1.}}
+        comparison = compare_results(results, baseline)
+        self.assertEqual(len(comparison), 2)
+        regressions = find_regressions(results, baseline, tolerance=0.25)
+        self.assertEqual([r[1] for r in regressions], ['read_signals_chunk1024_chan1_msps'])
+        self.assertAlmostEqual(regressions[0][4], 2.)
+        self.assertEqual(find_regressions(results, baseline, tolerance=1.5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
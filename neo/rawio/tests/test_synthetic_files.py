@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the writers of synthetic files: each file is read back with its
+rawio and compared with the ground truth of the recording.
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import neo.rawio
+from neo.rawio.tests import rawio_compliance as compliance
+from neo.rawio.tests.synthetic_files import (SyntheticRecording, generate_corpus,
+                                             duration_for_size, writers, UV_PER_BIT)
+
+
+class TestSyntheticFiles(unittest.TestCase):
+    recording_params = dict(nb_channel=6, duration=3., sampling_rate=30000.,
+                            spike_rate=8., nb_unit=2, event_rate=2., seed=42)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dirname = tempfile.mkdtemp()
+        cls.corpus = generate_corpus(cls.dirname, **cls.recording_params)
+        cls.recording = SyntheticRecording(**cls.recording_params)
+        cls.sigs = np.concatenate([sigs for _, sigs, _, _, _ in cls.recording.iter_chunks()])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dirname)
+
+    def test_recording(self):
+        rec = self.recording
+        self.assertEqual(rec.nb_sample % 512, 0)
+        self.assertEqual(self.sigs.shape, (rec.nb_sample, rec.nb_channel))
+        self.assertTrue(np.all(np.diff(rec.spikes['index']) >= 0))
+        # the recording is reproducible
+        rec2 = SyntheticRecording(**self.recording_params)
+        np.testing.assert_array_equal(rec.spikes, rec2.spikes)
+        sigs2 = np.concatenate([sigs for _, sigs, _, _, _ in rec2.iter_chunks()])
+        np.testing.assert_array_equal(self.sigs, sigs2)
+        # the firing rate is about the one requested
+        rate = rec.spikes.size / rec.duration / rec.nb_channel / rec.nb_unit
+        self.assertTrue(abs(rate - rec.spike_rate) < 0.3 * rec.spike_rate)
+
+    def test_duration_for_size(self):
+        duration = duration_for_size(2 ** 20, nb_channel=8, sampling_rate=32768.)
+        rec = SyntheticRecording(nb_channel=8, duration=duration, sampling_rate=32768.)
+        self.assertEqual(rec.nbytes, 2 ** 20)
+
+    def test_read_back(self):
+        rec = self.recording
+        self.assertEqual(list(self.corpus.keys()), list(writers.keys()))
+        for name, kargs in self.corpus.items():
+            reader = getattr(neo.rawio, name)(**kargs)
+            reader.parse_header()
+
+            compliance.header_is_total(reader)
+            compliance.count_element(reader)
+            compliance.read_analogsignals(reader)
+            compliance.read_spike_times(reader)
+            compliance.read_spike_waveforms(reader)
+            compliance.read_events(reader)
+            compliance.has_annotations(reader)
+
+            # signals, across a chunk border
+            sig_channels = reader.header['signal_channels']
+            channel_indexes, = np.nonzero(np.isclose(sig_channels['sampling_rate'],
+                                                     rec.sampling_rate))
+            self.assertEqual(len(channel_indexes), rec.nb_channel, name)
+            i_start, i_stop = rec.chunk_size - 1000, rec.chunk_size + 1024
+            self.assertEqual(reader.get_signal_size(0, 0, channel_indexes=channel_indexes[:1]),
+                             rec.nb_sample, name)
+            for c in (0, rec.nb_channel - 1):
+                raw = reader.get_analogsignal_chunk(0, 0, i_start, i_stop,
+                                                    channel_indexes=[channel_indexes[c]])
+                expected = self.sigs[i_start:i_stop, c]
+                if name == 'TdtRawIO':
+                    np.testing.assert_allclose(raw[:, 0], expected * UV_PER_BIT * 1e-6,
+                                               rtol=1e-6, err_msg=name)
+                else:
+                    np.testing.assert_array_equal(raw[:, 0], expected, err_msg=name)
+
+            # spikes and events
+            if reader.unit_channels_count() > 0:
+                nb_spike = sum(reader.spike_count(0, 0, unit_index)
+                               for unit_index in range(reader.unit_channels_count()))
+                self.assertEqual(nb_spike, rec.spikes.size, name)
+            if name not in ('RawBinarySignalRawIO', 'NeuroScopeRawIO', 'AxonRawIO'):
+                nb_event = sum(reader.event_count(0, 0, ev_chan)
+                               for ev_chan in range(reader.event_channels_count()))
+                self.assertEqual(nb_event, rec.events.size, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+'''
+This module provides :class:`SharedBlock`, which moves the numeric data of
+a :class:`Block` into shared memory so that it can be handed to the workers
+of a :mod:`multiprocessing` pool without copying it into each of them.
+
+*Usage*::
+
+    >>> from multiprocessing import Pool
+    >>> from neo.sharedmemory import SharedBlock
+    >>>
+    >>> def analyse(shared):
+    ...     block = shared.get_block()  # views onto the shared memory
+    ...     return [sig.mean() for sig in block.segments[0].analogsignals]
+    >>>
+    >>> with SharedBlock(block) as shared:
+    ...     with Pool(32) as pool:
+    ...         results = pool.map(analyse, [shared] * 32)
+
+The :class:`Block` is serialized with pickle protocol 5: its metadata,
+annotations and relationships travel with the (small) :class:`SharedBlock`
+object, while the data arrays are copied once into a shared memory segment.
+Every process calling :meth:`SharedBlock.get_block` gets neo objects whose
+data are views onto that segment.
+
+Note that the data are shared, not copied: changes made to the data in one
+process are visible in all the others.
+
+Requires Python 3.8 or later (:mod:`multiprocessing.shared_memory`).
+'''
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import pickle
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    HAVE_SHARED_MEMORY = False
+else:
+    HAVE_SHARED_MEMORY = True
+
+# offsets of the buffers in the shared memory segment are aligned to this size
+BUFFER_ALIGNMENT = 64
+
+# shared memory segments attached in this process, by name. Attaching once
+# per process avoids mapping the segment again for every task, and keeps the
+# mapping alive as long as neo objects may refer to it.
+_attached = {}
+
+
+class SharedBlock(object):
+    '''
+    A :class:`Block` (or any other neo object) whose data arrays are stored
+    in a shared memory segment.
+
+    Creating a :class:`SharedBlock` copies the data into shared memory.
+    The :class:`SharedBlock` can then be pickled cheaply and sent to other
+    processes, which call :meth:`get_block` to rebuild the neo objects.
+
+    The process that created the :class:`SharedBlock` owns the shared memory
+    segment and must call :meth:`unlink` once all the workers are done, or
+    use the :class:`SharedBlock` as a context manager.
+    '''
+
+    def __init__(self, block):
+        if not HAVE_SHARED_MEMORY:
+            raise ImportError("SharedBlock requires Python 3.8 or later")
+        buffers = []
+        self._data = pickle.dumps(block, protocol=5,
+                                  buffer_callback=buffers.append)
+        raws = [buf.raw() for buf in buffers]
+        self._layout = []
+        offset = 0
+        for raw in raws:
+            offset += -offset % BUFFER_ALIGNMENT
+            self._layout.append((offset, raw.nbytes))
+            offset += raw.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for raw, (offset, size) in zip(raws, self._layout):
+            self._shm.buf[offset:offset + size] = raw
+        self.name = self._shm.name
+        _attached[self.name] = self._shm
+
+    def __getstate__(self):
+        return {'name': self.name, '_layout': self._layout,
+                '_data': self._data}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+    @property
+    def nbytes(self):
+        '''
+        Size of the shared data, in bytes.
+        '''
+        return sum(size for offset, size in self._layout)
+
+    def _attach(self):
+        '''
+        Return the shared memory segment, attaching it if this is the first
+        time it is used in this process.
+        '''
+        shm = _attached.get(self.name)
+        if shm is None:
+            # only the process that created the segment registers it with
+            # the resource tracker, which destroys it if that process dies
+            # without unlinking it
+            try:
+                shm = shared_memory.SharedMemory(name=self.name, track=False)
+            except TypeError:
+                # before Python 3.13, attaching registers the segment again
+                # with the resource tracker, which the workers of a pool share
+                # with their parent: the registration is only recorded once
+                shm = shared_memory.SharedMemory(name=self.name)
+            _attached[self.name] = shm
+        return shm
+
+    def get_block(self):
+        '''
+        Rebuild the neo objects, with data arrays that are views onto the
+        shared memory segment.
+        '''
+        shm = self._attach()
+        buffers = [shm.buf[offset:offset + size]
+                   for offset, size in self._layout]
+        return pickle.loads(self._data, buffers=buffers)
+
+    def close(self):
+        '''
+        Detach the shared memory segment from this process. Neo objects
+        returned by :meth:`get_block` in this process must not be used
+        afterwards.
+        '''
+        shm = _attached.get(self.name)
+        if shm is not None:
+            try:
+                shm.close()
+            except BufferError:
+                # neo objects still refer to the segment: it stays attached
+                # until they have been garbage collected
+                return
+            del _attached[self.name]
+
+    def unlink(self):
+        '''
+        Detach and destroy the shared memory segment. Should only be called
+        by the process that created the :class:`SharedBlock`.
+        '''
+        shm = _attached.get(self.name)
+        if shm is None:
+            shm = self._shm
+        self.close()
+        if shm is not None:
+            shm.unlink()
@@ -21,6 +21,7 @@ else:
 from numpy.testing import assert_array_equal
 from neo.core.analogsignal import AnalogSignal
 from neo.core import Segment, ChannelIndex
+from neo.core.baseneo import MergeError
 from neo.test.tools import (assert_arrays_almost_equal, assert_arrays_equal,
                             assert_neo_object_is_compliant,
                             assert_same_sub_schema)
@@ -772,6 +773,87 @@ class TestAnalogSignalArrayCombination(unittest.TestCase):
         assert_arrays_equal(mergeddata23, targdata23)
         assert_arrays_equal(mergeddata24, targdata24)
 
+    def test__merge_multiple(self):
+        signals = [AnalogSignal(np.arange(11.0 * i, 11.0 * (i + 1)).reshape((11, 1)),
+                                units="mV", sampling_rate=1 * pq.kHz,
+                                name='signal%d' % i, description='test signal')
+                   for i in range(4)]
+        for i, signal in enumerate(signals):
+            signal.channel_index = ChannelIndex(index=np.arange(1),
+                                                channel_ids=np.array([i]),
+                                                channel_names=np.array(['ch%d' % i]))
+        signals[3] = signals[3].rescale('uV')
+
+        merged = signals[0].merge(*signals[1:])
+
+        assert_neo_object_is_compliant(merged)
+        self.assertEqual(merged.shape, (11, 4))
+        self.assertEqual(merged.units, pq.mV)
+        assert_arrays_almost_equal(merged.magnitude,
+                                   np.arange(44.0).reshape((4, 11)).T, 1e-12)
+        self.assertEqual(merged.name, 'merge(signal0, signal1, signal2, signal3)')
+        self.assertEqual(merged.description, 'test signal')
+        assert_array_equal(merged.channel_index.channel_ids, np.arange(4))
+        assert_array_equal(merged.channel_index.channel_names,
+                           ['ch0', 'ch1', 'ch2', 'ch3'])
+
+    def test__merge_multiple_different_sampling_rate(self):
+        signal2 = AnalogSignal(self.data1quant, sampling_rate=1 * pq.kHz)
+        signal3 = AnalogSignal(self.data1quant, sampling_rate=2 * pq.kHz)
+        self.assertRaises(MergeError, signal2.merge, signal2, signal3)
+
+    def test__concatenate(self):
+        signal1 = AnalogSignal(np.arange(10.0).reshape((5, 2)), units="mV",
+                               sampling_rate=1 * pq.kHz, t_start=1 * pq.ms)
+        signal2 = AnalogSignal(np.arange(10.0, 16.0).reshape((3, 2)) * pq.uV * 1000,
+                               sampling_rate=1 * pq.kHz, t_start=6 * pq.ms)
+        result = signal1.concatenate(signal2)
+        assert_neo_object_is_compliant(result)
+        self.assertEqual(result.shape, (8, 2))
+        self.assertEqual(result.units, pq.mV)
+        self.assertEqual(result.t_start, 1 * pq.ms)
+        assert_arrays_almost_equal(result.magnitude,
+                                   np.arange(16.0).reshape((8, 2)), 1e-12)
+
+    def test__concatenate_with_gap(self):
+        signal1 = AnalogSignal(np.ones((5, 2), dtype=int), units="mV",
+                               sampling_rate=1 * pq.kHz)
+        signal2 = AnalogSignal(2 * np.ones((3, 2), dtype=int), units="mV",
+                               sampling_rate=1 * pq.kHz, t_start=7 * pq.ms)
+        self.assertRaises(MergeError, signal1.concatenate, signal2)
+
+        result = signal1.concatenate(signal2, padding=True)
+        self.assertEqual(result.shape, (10, 2))
+        self.assertTrue(np.isnan(result.magnitude[5:7]).all())
+        assert_array_equal(result.magnitude[7:], 2)
+
+        result = signal1.concatenate(signal2, padding=0 * pq.V)
+        self.assertEqual(result.dtype, signal1.dtype)
+        assert_array_equal(result.magnitude[:, 0],
+                           [1, 1, 1, 1, 1, 0, 0, 2, 2, 2])
+
+    def test__concatenate_into_out(self):
+        signal1 = AnalogSignal(np.ones((5, 2)), units="mV",
+                               sampling_rate=1 * pq.kHz)
+        signal2 = AnalogSignal(2 * np.ones((3, 2)), units="mV",
+                               sampling_rate=1 * pq.kHz, t_start=7 * pq.ms)
+        out = np.empty((10, 2), dtype=np.float32)
+        result = signal1.concatenate(signal2, padding=0 * pq.mV, out=out)
+        self.assertTrue(np.shares_memory(result, out))
+        self.assertEqual(result.dtype, np.float32)
+        self.assertEqual(result.t_start, 0 * pq.ms)
+        assert_array_equal(out[:, 0], [1, 1, 1, 1, 1, 0, 0, 2, 2, 2])
+
+        self.assertRaises(ValueError, signal1.concatenate, signal2,
+                          padding=True, out=np.empty((9, 2)))
+
+    def test__concatenate_overlapping(self):
+        signal1 = AnalogSignal(np.ones((5, 2)), units="mV",
+                               sampling_rate=1 * pq.kHz)
+        signal2 = AnalogSignal(np.ones((3, 2)), units="mV",
+                               sampling_rate=1 * pq.kHz, t_start=4 * pq.ms)
+        self.assertRaises(MergeError, signal1.concatenate, signal2)
+
 
 class TestAnalogSignalArrayFunctions(unittest.TestCase):
     def test__pickle(self):
@@ -12,6 +12,8 @@ from copy import deepcopy
 import unittest
 
 import numpy as np
+import quantities as pq
+from numpy.testing import assert_array_equal
 
 try:
     from IPython.lib.pretty import pretty
@@ -21,8 +23,9 @@ else:
     HAVE_IPYTHON = True
 
 from neo.core.block import Block
+from neo.core.baseneo import MergeError
 from neo.core.container import filterdata
-from neo.core import SpikeTrain, Unit, AnalogSignal
+from neo.core import SpikeTrain, Unit, AnalogSignal, Segment
 from neo.test.tools import (assert_neo_object_is_compliant,
                             assert_same_sub_schema)
 from neo.test.generate_datasets import (get_fake_value, get_fake_values,
@@ -776,6 +779,24 @@ class TestBlock(unittest.TestCase):
         blk1_copy = deepcopy(self.blk1)
         assert_same_sub_schema(blk1_copy, self.blk1)
 
+    def test__concatenate_analogsignals(self):
+        blk = Block()
+        for i in range(3):
+            seg = Segment()
+            seg.analogsignals.append(
+                AnalogSignal(np.full((10, 2), i, dtype=float), units='mV',
+                             sampling_rate=1 * pq.kHz,
+                             t_start=(i * 12) * pq.ms))
+            blk.segments.append(seg)
+
+        self.assertRaises(MergeError, blk.concatenate_analogsignals)
+        result = blk.concatenate_analogsignals(padding=True)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].shape, (34, 2))
+        self.assertEqual(result[0].t_start, 0 * pq.ms)
+        assert_array_equal(result[0].magnitude[24:, 0], 2)
+        self.assertTrue(np.isnan(result[0].magnitude[10:12]).all())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -768,6 +768,28 @@ class TestIrregularlySampledSignalCombination(unittest.TestCase):
 
         self.assertRaises(MergeError, signal1.merge, signal3)
 
+    def test__concatenate(self):
+        signal1 = IrregularlySampledSignal([0.5, 1.2, 3.0] * pq.ms,
+                                           np.arange(6.0).reshape((3, 2)),
+                                           units='mV', name='signal1')
+        signal2 = IrregularlySampledSignal([4.0, 7.5] * pq.ms,
+                                           np.arange(6.0, 10.0).reshape((2, 2)),
+                                           units='mV', name='signal1')
+        result = signal1.concatenate(signal2)
+        assert_neo_object_is_compliant(result)
+        self.assertEqual(result.name, 'signal1')
+        assert_array_equal(result.times.magnitude, [0.5, 1.2, 3.0, 4.0, 7.5])
+        assert_array_equal(result.magnitude, np.arange(10.0).reshape((5, 2)))
+
+        self.assertRaises(MergeError, signal2.concatenate, signal1)
+
+        out = np.empty((5, 2))
+        result = signal1.concatenate(signal2, out=out)
+        self.assertTrue(np.shares_memory(result, out))
+        assert_array_equal(out, np.arange(10.0).reshape((5, 2)))
+        self.assertRaises(ValueError, signal1.concatenate, signal2,
+                          out=np.empty((4, 2)))
+
 
 class TestAnalogSignalFunctions(unittest.TestCase):
     def test__pickle(self):
@@ -21,8 +21,9 @@ else:
     HAVE_IPYTHON = True
 
 from neo.core.segment import Segment
-from neo.core import (AnalogSignal, Block,
+from neo.core import (AnalogSignal, Block, IrregularlySampledSignal,
                       Epoch, ChannelIndex, SpikeTrain, Unit)
+from neo.core.baseneo import MergeError
 from neo.core.container import filterdata
 from neo.test.tools import (assert_neo_object_is_compliant,
                             assert_same_sub_schema)
@@ -779,6 +780,34 @@ class TestSegment(unittest.TestCase):
         assert_same_sub_schema(result21, [self.trains1a[0]])
         assert_same_sub_schema(result22, [self.trains1a[1]])
 
+    def test__concatenate_signals(self):
+        segs = []
+        for i in range(3):
+            seg = Segment()
+            seg.analogsignals.append(
+                AnalogSignal(np.full((10, 2), i, dtype=float), units='mV',
+                             sampling_rate=1 * pq.kHz,
+                             t_start=(i * 10) * pq.ms))
+            seg.irregularlysampledsignals.append(
+                IrregularlySampledSignal([1.0, 2.0] * pq.ms + i * 10 * pq.ms,
+                                         np.full((2, 1), i, dtype=float),
+                                         units='mV'))
+            segs.append(seg)
+
+        result = segs[0].concatenate_analogsignals(*segs[1:])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].shape, (30, 2))
+        np.testing.assert_array_equal(result[0].magnitude[:, 0],
+                                      np.repeat([0, 1, 2], 10))
+
+        result = segs[0].concatenate_irregularlysampledsignals(*segs[1:])
+        self.assertEqual(len(result), 1)
+        np.testing.assert_array_equal(result[0].times.magnitude,
+                                      [1, 2, 11, 12, 21, 22])
+
+        segs[2].analogsignals.append(segs[2].analogsignals[0].copy())
+        self.assertRaises(MergeError, segs[0].concatenate_analogsignals, *segs[1:])
+
     # to remove
     # def test_segment_take_analogsignal_by_unit(self):
     #     result1 = self.seg1.take_analogsignal_by_unit()
@@ -21,7 +21,14 @@ except ImportError as err:
 else:
     HAVE_IPYTHON = True
 
-from neo.core.spiketrain import (check_has_dimensions_time, SpikeTrain,
+try:
+    import scipy.sparse
+except ImportError:
+    HAVE_SCIPY = False
+else:
+    HAVE_SCIPY = True
+
+from neo.core.spiketrain import (check_has_dimensions_time, SpikeTrain, bin_spiketrains,
                                  _check_time_in_range, _new_spiketrain)
 from neo.core import Segment, Unit
 from neo.core.baseneo import MergeError
@@ -1250,6 +1257,40 @@ class TestMerge(unittest.TestCase):
         with self.assertRaises(MergeError):
             self.train2.merge(train3)
 
+    def test_merge_multiple(self):
+        train3 = SpikeTrain([0.2, 5.0, 9.9] * pq.ms, t_stop=10.0 * pq.ms,
+                            waveforms=self.waveforms1[:3])
+        train3.segment = self.segment
+        result = self.train1.merge(self.train2, train3)
+        assert_neo_object_is_compliant(result)
+        expected = np.sort(np.concatenate((self.train1.magnitude,
+                                           self.train2.magnitude,
+                                           train3.magnitude)))
+        assert_arrays_equal(result.magnitude, expected)
+        self.assertEqual(result.waveforms.shape, (15, 2, 2))
+        # the waveform of each spike follows its spike time
+        assert_arrays_equal(result.waveforms[1], self.waveforms1[0])
+        assert_arrays_equal(result.waveforms[2], self.waveforms1[0])
+        assert_arrays_equal(result.waveforms[-1], self.waveforms1[2])
+        self.assertTrue(result in self.segment.spiketrains)
+
+    def test_merge_multiple_annotations(self):
+        self.train1.annotate(tetrode='a', channels=[0])
+        self.train2.annotate(tetrode='a', channels=[1])
+        train3 = self.train1.duplicate_with_new_data(self.train1)
+        train3.segment = self.segment
+        train3.annotations = {'tetrode': 'b', 'channels': [2]}
+        result = self.train1.merge(self.train2, train3)
+        self.assertEqual(result.annotations['tetrode'], 'a;b')
+        self.assertEqual(result.annotations['channels'], [0, 1, 2])
+
+    def test_merge_multiple_incompatible_t_stop(self):
+        train3 = self.train1.duplicate_with_new_data(self.train1,
+                                                     t_stop=20 * pq.ms)
+        train3.segment = self.train1.segment
+        with self.assertRaises(MergeError):
+            self.train1.merge(self.train2, train3)
+
 
 class TestDuplicateWithNewData(unittest.TestCase):
     def setUp(self):
@@ -1913,5 +1954,45 @@ class TestMiscellaneous(unittest.TestCase):
         assert_array_equal(data * pq.ms, st_as_q)
 
 
+class TestBinSpiketrains(unittest.TestCase):
+    def setUp(self):
+        self.train1 = SpikeTrain([0.5, 1.5, 1.7, 9.9] * pq.ms, t_stop=10 * pq.ms)
+        self.train2 = SpikeTrain([0.0002, 0.0055] * pq.s, t_stop=0.01 * pq.s)
+        self.train3 = SpikeTrain([] * pq.ms, t_stop=10 * pq.ms)
+        self.trains = [self.train1, self.train2, self.train3]
+        self.target = np.array([[3, 0, 0, 0, 1],
+                                [1, 0, 1, 0, 0],
+                                [0, 0, 0, 0, 0]])
+
+    def test_dense(self):
+        counts = bin_spiketrains(self.trains, 2 * pq.ms)
+        self.assertIsInstance(counts, np.ndarray)
+        assert_array_equal(counts, self.target)
+
+    def test_t_start_t_stop(self):
+        counts = bin_spiketrains(self.trains, 2 * pq.ms, t_start=1 * pq.ms,
+                                 t_stop=0.006 * pq.s)
+        assert_array_equal(counts, [[2, 0, 0], [0, 0, 1], [0, 0, 0]])
+
+    def test_unsorted(self):
+        train = SpikeTrain([9.9, 0.5, 1.7, 1.5] * pq.ms, t_stop=10 * pq.ms)
+        counts = bin_spiketrains([train], 2 * pq.ms)
+        assert_array_equal(counts, self.target[:1])
+
+    @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
+    def test_sparse(self):
+        counts = bin_spiketrains(self.trains, 2 * pq.ms, sparse=True)
+        self.assertTrue(scipy.sparse.isspmatrix_csr(counts))
+        assert_array_equal(counts.toarray(), self.target)
+
+    def test_container(self):
+        seg = Segment()
+        seg.spiketrains.extend(self.trains)
+        assert_array_equal(seg.bin_spiketrains(2 * pq.ms), self.target)
+        unit = Unit()
+        unit.spiketrains.extend(self.trains[1:])
+        assert_array_equal(unit.bin_spiketrains(2 * pq.ms), self.target[1:])
+
+
 if __name__ == "__main__":
     unittest.main()
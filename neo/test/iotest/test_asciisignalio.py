@@ -6,8 +6,15 @@ Tests of neo.io.asciisignalio
 # needed for python 3 compatibility
 from __future__ import absolute_import, division
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+import quantities as pq
+
+from neo.core import AnalogSignal, Segment
 from neo.io import AsciiSignalIO
 from neo.test.iotest.common_io_test import BaseTestIO
 
@@ -21,5 +28,90 @@ class TestAsciiSignalIO(BaseTestIO, unittest.TestCase, ):
     files_to_test = files_to_download
 
 
+class TestAsciiSignalIOChunked(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'signals.txt')
+        self.segment = Segment()
+        self.segment.analogsignals.append(
+            AnalogSignal(np.random.rand(100, 1), units='V',
+                         sampling_rate=1 * pq.kHz))
+        self.segment.analogsignals.append(
+            AnalogSignal(np.random.rand(100, 2), units='V',
+                         sampling_rate=1 * pq.kHz))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_write_chunked(self):
+        AsciiSignalIO(self.filename).write_segment(
+            self.segment, delimiter=',', chunksize=7)
+        data = np.loadtxt(self.filename, delimiter=',')
+        self.assertEqual(data.shape, (100, 4))
+        np.testing.assert_allclose(data[:, 0],
+                                   self.segment.analogsignals[0].times.magnitude)
+        np.testing.assert_allclose(data[:, 2:],
+                                   self.segment.analogsignals[1].magnitude)
+
+    def test_read_chunked(self):
+        AsciiSignalIO(self.filename).write_segment(self.segment, chunksize=7)
+        io = AsciiSignalIO(self.filename)
+        ref = io.read_segment(timecolumn=0, method='homemade')
+        seg = io.read_segment(timecolumn=0, method='chunked', chunksize=13)
+        self.assertEqual(len(seg.analogsignals), 3)
+        for ref_sig, sig in zip(ref.analogsignals, seg.analogsignals):
+            self.assertEqual(sig.name, ref_sig.name)
+            self.assertEqual(sig.sampling_rate, ref_sig.sampling_rate)
+            np.testing.assert_array_equal(sig.magnitude, ref_sig.magnitude)
+
+    def test_read_chunked_usecols_memmap(self):
+        AsciiSignalIO(self.filename).write_segment(self.segment)
+        memmap_filename = os.path.join(self.tempdir, 'signals.dat')
+        seg = AsciiSignalIO(self.filename).read_segment(
+            timecolumn=0, usecols=[2], method='chunked', chunksize=10,
+            memmap_filename=memmap_filename)
+        self.assertEqual(len(seg.analogsignals), 1)
+        sig = seg.analogsignals[0]
+        self.assertEqual(sig.name, 'Column 2')
+        self.assertAlmostEqual(sig.sampling_rate.rescale('Hz').magnitude,
+                               1000., places=3)
+        np.testing.assert_allclose(
+            sig.magnitude[:, 0],
+            self.segment.analogsignals[1].magnitude[:, 0], rtol=1e-6)
+        base = sig
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        del sig, seg, base
+
+    def test_read_chunked_usecols_timecolumn(self):
+        # the time column is not the first one, and is not in usecols
+        times = 2. + np.arange(100) / 500.
+        data = np.column_stack([np.random.rand(100, 2), times])
+        np.savetxt(self.filename, data)
+        seg = AsciiSignalIO(self.filename).read_segment(
+            timecolumn=2, usecols=[1], method='chunked', chunksize=10)
+        self.assertEqual(len(seg.analogsignals), 1)
+        sig = seg.analogsignals[0]
+        self.assertEqual(sig.name, 'Column 1')
+        self.assertAlmostEqual(sig.sampling_rate.rescale('Hz').magnitude,
+                               500., places=2)
+        self.assertAlmostEqual(sig.t_start.rescale('s').magnitude, 2.)
+        np.testing.assert_allclose(sig.magnitude[:, 0], data[:, 1], rtol=1e-6)
+
+    def test_write_unequal_lengths(self):
+        self.segment.analogsignals.append(
+            AnalogSignal(np.random.rand(50, 1), units='V',
+                         sampling_rate=1 * pq.kHz))
+        io = AsciiSignalIO(self.filename)
+        self.assertRaises(ValueError, io.write_segment, self.segment)
+
+    def test_read_chunked_invalid(self):
+        with open(self.filename, 'w') as f:
+            f.write('1\t2\n\n3\t4\n5\n')
+        io = AsciiSignalIO(self.filename)
+        self.assertRaises(ValueError, io.read_segment, method='chunked')
+
+
 if __name__ == "__main__":
     unittest.main()
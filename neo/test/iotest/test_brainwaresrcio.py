@@ -319,6 +319,36 @@ class BrainwareSrcIOTestCase(BaseTestIO, unittest.TestCase):
 
             self.assertEqual(len(obj_all), len(obj_next))
 
+    def test_read_block_index(self):
+        for ioobj, path in self.iter_io_objects(return_path=True):
+            obj_all = ioobj.read_all_blocks()
+            index = ioobj.read_index()
+            blocks = index[index['kind'] == brainwaresrcio.INDEX_BLOCK]
+            self.assertEqual(len(blocks), len(obj_all))
+            try:
+                for i, block in enumerate(obj_all):
+                    assert_same_sub_schema(block, ioobj.read_block(index=i))
+            except BaseException as exc:
+                exc.args += ('from ' + os.path.basename(path),)
+                raise
+
+    def test_read_timestamp_range(self):
+        for ioobj, path in self.iter_io_objects(return_path=True):
+            obj_all = ioobj.read_all_blocks()
+            timestamps = [train.annotations['timestamp']
+                          for train in obj_all[0].list_children_by_class(SpikeTrain)
+                          if train.annotations['timestamp'] !=
+                          BrainwareSrcIO._default_datetime]
+            if not timestamps:
+                continue
+            obj_range = ioobj.read_all_blocks(
+                timestamp_range=(min(timestamps), max(timestamps)))
+            try:
+                assert_same_sub_schema(obj_all[0], obj_range[0])
+            except BaseException as exc:
+                exc.args += ('from ' + os.path.basename(path),)
+                raise
+
     def test_against_reference(self):
         for filename, refname in zip(self.files_to_test,
                                      self.files_to_compare):
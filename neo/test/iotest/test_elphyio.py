@@ -6,19 +6,13 @@ Tests of neo.io.elphyio
 # needed for python 3 compatibility
 from __future__ import division
 
-import sys
-
 import unittest
 
-try:
-    from neo.io.elphyio import ElphyIO
-except ImportError:
-    ElphyIO = None
+from neo.core import Block
+from neo.io import ElphyIO
 from neo.test.iotest.common_io_test import BaseTestIO
 
 
-# @unittest.skipIf(sys.version_info[0] > 2, "not Python 3 compatible")
-# @unittest.skip("ElphyIO not yet updated to the new API")
 class TestElphyIO(BaseTestIO, unittest.TestCase):
     ioclass = ElphyIO
     files_to_test = ['ElphyExample.DAT',
@@ -29,5 +23,12 @@ class TestElphyIO(BaseTestIO, unittest.TestCase):
     files_to_download = files_to_test
 
 
+class TestElphyIONotWritable(unittest.TestCase):
+    def test_not_writable(self):
+        self.assertFalse(ElphyIO.is_writable)
+        self.assertNotIn(Block, ElphyIO.writeable_objects)
+        self.assertNotIn('write_block', ElphyIO.__dict__)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,10 @@ Tests of neo.io.hdf5io_new
 
 """
 
+import os
+import pickle
+import shutil
+import tempfile
 import unittest
 import numpy as np
 from numpy.testing import assert_array_equal
@@ -18,6 +22,8 @@ except ImportError:
 from neo.io.hdf5io import NeoHdf5IO
 from neo.test.iotest.common_io_test import BaseTestIO
 from neo.test.iotest.tools import get_test_file_full_path
+from neo.test.tools import (assert_sub_schema_is_lazy_loaded,
+                            assert_lazy_sub_schema_can_be_loaded)
 
 
 @unittest.skipUnless(HAVE_H5PY, "requires h5py")
@@ -170,3 +176,109 @@ class ReadOldNeoHdf5IOTest(BaseTestIO, unittest.TestCase):
         self.assertEqual(id(ci2.analogsignals[0]), id(as00))
         assert_array_equal(ci2.index, np.array([1, 3]))
         assert_array_equal(ci2.channel_ids, np.array([1, 3]))
+
+
+def write_old_neohdf5_file(filename):
+    """
+    Write a small file in the layout of Neo 0.3/0.4 HDF5 files and return
+    the data of the signals it contains, by object_ref.
+    """
+    def set_attributes(node, object_ref, **attributes):
+        node.attrs['object_ref'] = object_ref
+        node.attrs['annotations'] = np.void(pickle.dumps({}, protocol=0))
+        for name, value in attributes.items():
+            node.attrs[name] = value
+
+    def create_quantity(group, name, value, units):
+        group.create_dataset(name, data=value).attrs['unit__' + units] = 1
+
+    data = {}
+    with h5py.File(filename, 'w') as f:
+        block = f.create_group('Block_0')
+        set_attributes(block, 'bl0', name='block')
+        block.create_group('recordingchannelgroups')
+        segment = block.create_group('segments').create_group('Segment_0')
+        set_attributes(segment, 'seg0', name='segment')
+        for name in ('analogsignals', 'analogsignalarrays',
+                     'irregularlysampledsignals', 'epochs', 'epocharrays',
+                     'events', 'eventarrays', 'spikes', 'spiketrains'):
+            segment.create_group(name)
+        for i in range(2):
+            node = segment['analogsignals'].create_group('AnalogSignal_%d' % i)
+            set_attributes(node, 'as%d' % i, name='signal')
+            data['as%d' % i] = np.random.rand(1000)
+            create_quantity(node, 'signal', data['as%d' % i], 'mV')
+            create_quantity(node, 'sampling_rate', 1., 'kHz')
+            create_quantity(node, 't_start', 0.5, 's')
+        node = segment['analogsignalarrays'].create_group('AnalogSignalArray_0')
+        set_attributes(node, 'asa0', name='array')
+        data['asa0'] = np.random.rand(500, 3)
+        create_quantity(node, 'signal', data['asa0'], 'mV')
+        create_quantity(node, 'sampling_rate', 100., 'Hz')
+        create_quantity(node, 't_start', 0., 's')
+        node = segment['spiketrains'].create_group('SpikeTrain_0')
+        set_attributes(node, 'st0')
+        create_quantity(node, 'times', np.arange(0.5, 10, 0.5), 's')
+        create_quantity(node, 't_start', 0., 's')
+        create_quantity(node, 't_stop', 10., 's')
+        node = segment['eventarrays'].create_group('EventArray_0')
+        set_attributes(node, 'ev0')
+        create_quantity(node, 'times', np.arange(10.), 's')
+        node.create_dataset('labels', data=np.array(['e%d' % i for i in range(10)],
+                                                    dtype='S2'))
+    return data
+
+
+@unittest.skipUnless(HAVE_H5PY, "requires h5py")
+class NeoHdf5IOLazyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'old_neo.h5')
+        self.data = write_old_neohdf5_file(self.filename)
+        self.io = NeoHdf5IO(self.filename)
+
+    def tearDown(self):
+        self.io._data.close()
+        shutil.rmtree(self.tempdir)
+
+    def test_lazy_read(self):
+        block = self.io.read_block(lazy=True)
+        assert_sub_schema_is_lazy_loaded(block)
+        assert_lazy_sub_schema_can_be_loaded(block, self.io)
+        segment = block.segments[0]
+        self.assertEqual(segment.analogsignals[0].lazy_shape, (500, 3))
+        # the single channel signals are merged
+        self.assertEqual(segment.analogsignals[1].lazy_shape, (1000, 2))
+
+    def test_load_lazy_object(self):
+        eager_segment = self.io.read_block().segments[0]
+        segment = self.io.read_block(lazy=True).segments[0]
+        for lazy, eager in zip(segment.analogsignals, eager_segment.analogsignals):
+            signal = self.io.load_lazy_object(lazy)
+            assert_array_equal(signal.magnitude, eager.magnitude)
+            self.assertEqual(signal.t_start, eager.t_start)
+            self.assertIs(signal.segment, segment)
+        spiketrain = self.io.load_lazy_object(segment.spiketrains[0])
+        assert_array_equal(spiketrain.magnitude, eager_segment.spiketrains[0].magnitude)
+
+    def test_load_time_slice(self):
+        segment = self.io.read_block(lazy=True).segments[0]
+        signal = self.io.load_lazy_object(segment.analogsignals[1],
+                                          t_start=0.6 * second, t_stop=0.7 * second,
+                                          channel_indexes=[1, 0])
+        self.assertEqual(signal.t_start, 0.6 * second)
+        assert_array_equal(signal.magnitude,
+                           np.column_stack([self.data['as1'][100:200],
+                                            self.data['as0'][100:200]]))
+        signal = self.io.load_lazy_object(segment.analogsignals[0], channel_indexes=[2])
+        assert_array_equal(signal.magnitude[:, 0], self.data['asa0'][:, 2])
+        spiketrain = self.io.load_lazy_object(segment.spiketrains[0],
+                                              t_start=2 * second, t_stop=3 * second)
+        assert_array_equal(spiketrain.magnitude, [2., 2.5, 3.])
+        self.assertEqual(spiketrain.t_stop, 10 * second)
+        event = self.io.load_lazy_object(segment.events[0],
+                                         t_start=2 * second, t_stop=3.5 * second)
+        assert_array_equal(event.labels, np.array([b'e2', b'e3']))
+        self.assertRaises(ValueError, self.io.load_lazy_object, segment.events[0],
+                          channel_indexes=[0])
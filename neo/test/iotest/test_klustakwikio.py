@@ -8,6 +8,7 @@ from __future__ import absolute_import
 
 import glob
 import os.path
+import shutil
 import sys
 import tempfile
 
@@ -19,10 +20,9 @@ import quantities as pq
 import neo
 from neo.test.iotest.common_io_test import BaseTestIO
 from neo.test.tools import assert_arrays_almost_equal
-from neo.io.klustakwikio import KlustaKwikIO, HAVE_MLAB
+from neo.io.klustakwikio import KlustaKwikIO
 
 
-@unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
 class testFilenameParser(unittest.TestCase):
     """Tests that filenames can be loaded with or without basename.
 
@@ -79,7 +79,6 @@ class testFilenameParser(unittest.TestCase):
                                                       'basename2.clu.1')))
 
 
-@unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
 class testRead(unittest.TestCase):
     """Tests that data can be read from KlustaKwik files"""
 
@@ -144,7 +143,6 @@ class testRead(unittest.TestCase):
                                                                      0.228])))
 
 
-@unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
 class testWrite(unittest.TestCase):
     def setUp(self):
         self.dirname = os.path.join(tempfile.gettempdir(),
@@ -253,7 +251,6 @@ class testWrite(unittest.TestCase):
         delete_test_session()
 
 
-@unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
 class testWriteWithFeatures(unittest.TestCase):
     def setUp(self):
         self.dirname = os.path.join(tempfile.gettempdir(),
@@ -337,7 +334,39 @@ class testWriteWithFeatures(unittest.TestCase):
         delete_test_session(self.dirname)
 
 
-@unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
+class testCache(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test1(self):
+        """Tests that files read with cache=True give the same data, from
+        the binary cache files the second time"""
+        block = neo.Block()
+        segment = neo.Segment()
+        block.segments.append(segment)
+        wff = np.array([[1.5, 2.], [3.25, 4.], [5., 6.]])
+        st1 = neo.SpikeTrain(times=[.002, .004, .006], units='s', t_stop=1.)
+        st1.annotations['cluster'] = 3
+        st1.annotations['waveform_features'] = wff
+        segment.spiketrains.append(st1)
+
+        kio = KlustaKwikIO(filename=os.path.join(self.dirname, 'base'),
+                           sampling_rate=1000., cache=True)
+        kio.write_block(block)
+        for _ in range(2):
+            train = kio.read_block().segments[0].spiketrains[0]
+            assert_arrays_almost_equal(train.times, st1.times, .00001)
+            assert_arrays_almost_equal(
+                train.annotations['waveform_features'], wff, .00001)
+            self.assertEqual(train.annotations['cluster'], 3)
+        for fn in ['.fet.0.npy', '.clu.0.npy']:
+            self.assertTrue(os.path.exists(os.path.join(self.dirname,
+                                                        'base' + fn)))
+
+
 class CommonTests(BaseTestIO, unittest.TestCase):
     ioclass = KlustaKwikIO
 
@@ -9,6 +9,9 @@ from __future__ import division
 import sys
 import unittest
 
+import numpy as np
+import quantities as pq
+
 try:
     import h5py
 
@@ -29,5 +32,128 @@ class TestKwikIO(BaseTestIO, unittest.TestCase):
                          'neo.dat']
 
 
+class TestClusterIndex(unittest.TestCase):
+    def test_cluster_index(self):
+        spike_clusters = np.array([3, 1, 3, 2, 1, 3])
+        order, offsets = kwikio._cluster_index(spike_clusters)
+        self.assertEqual(sorted(offsets), [1, 2, 3])
+        for cluster_id, (start, stop) in offsets.items():
+            np.testing.assert_array_equal(
+                order[start:stop], np.nonzero(spike_clusters == cluster_id)[0])
+
+    def test_cluster_index_empty(self):
+        order, offsets = kwikio._cluster_index(np.array([], dtype=int))
+        self.assertEqual(order.size, 0)
+        self.assertEqual(offsets, {})
+
+
+class FakeKwikModel(object):
+    """
+    Stands for a klusta.kwik.KwikModel with one channel group of 4 channels
+    and 6 spikes in 3 clusters.
+    """
+
+    def __init__(self, filename, channel_group=0):
+        self.channel_group = channel_group
+        self.channel_groups = [0]
+        self.channels = [0, 1, 2, 3]
+        self.sample_rate = 1000.
+        self.duration = 0.1
+        self.traces = np.arange(400, dtype=np.int16).reshape((100, 4))
+        self.metadata = {'raw_data_files': 'fake.dat', 'voltage_gain': 0.1}
+        self.spike_clusters = np.array([3, 1, 3, 2, 1, 3])
+        self.spike_times = np.arange(1, 7) / 100.
+        self.cluster_ids = [1, 2, 3]
+        self.cluster_metadata = {1: 'good', 2: 'noise', 3: 'good'}
+        # (spikes, samples, channels)
+        self.all_waveforms = np.arange(120, dtype=np.float32).reshape((6, 5, 4))
+
+
+class FakeKwik(object):
+    KwikModel = FakeKwikModel
+
+
+class TestKwikIOFakeModel(unittest.TestCase):
+    """
+    Tests of KwikIO that do not need klusta
+    """
+
+    def setUp(self):
+        self._have_kwik = kwikio.HAVE_KWIK
+        self._kwik = getattr(kwikio, 'kwik', None)
+        kwikio.HAVE_KWIK = True
+        kwikio.kwik = FakeKwik
+        self.io = kwikio.KwikIO('fake.kwik')
+        self.model = self.io.models[0]
+        self.scaled = self.model.traces * 0.1
+
+    def tearDown(self):
+        kwikio.HAVE_KWIK = self._have_kwik
+        if self._kwik is None:
+            del kwikio.kwik
+        else:
+            kwikio.kwik = self._kwik
+
+    def test_read_analogsignal(self):
+        ana = self.io.read_analogsignal(self.model)
+        self.assertEqual(ana.dtype, np.float64)
+        self.assertEqual(ana.units, pq.uV)
+        np.testing.assert_allclose(ana.magnitude, self.scaled)
+        ana = self.io.read_analogsignal(self.model, dtype='float32')
+        self.assertEqual(ana.dtype, np.float32)
+        np.testing.assert_allclose(ana.magnitude, self.scaled, rtol=1e-6)
+
+    def test_read_analogsignal_chunk(self):
+        ana = self.io.read_analogsignal(self.model, i_start=10, i_stop=20,
+                                        channel_indexes=[1, 3])
+        np.testing.assert_allclose(ana.magnitude, self.scaled[10:20, [1, 3]])
+        self.assertEqual(ana.t_start, 0.01 * pq.s)
+        ana = self.io.read_analogsignal(self.model, i_start=95, i_stop=200)
+        self.assertEqual(ana.shape, (5, 4))
+        ana = self.io.read_analogsignal(self.model, i_start=50, i_stop=40)
+        self.assertEqual(ana.shape, (0, 4))
+
+    def test_lazy(self):
+        seg = self.io.read_block(lazy=True, get_raw_data=True).segments[0]
+        ana = seg.analogsignals[0]
+        self.assertEqual(ana.lazy_shape, (100, 4))
+        self.assertEqual(ana.size, 0)
+        loaded = self.io.load_lazy_object(ana, t_start=0.02 * pq.s,
+                                          t_stop=0.05 * pq.s,
+                                          channel_indexes=[0, 2])
+        np.testing.assert_allclose(loaded.magnitude, self.scaled[20:50, [0, 2]])
+        self.assertIs(loaded.segment, seg)
+
+        self.assertEqual([st.lazy_shape for st in seg.spiketrains],
+                         [(2,), (1,), (3,)])
+        st = self.io.load_lazy_object(seg.spiketrains[2])
+        np.testing.assert_allclose(st.magnitude, [0.01, 0.03, 0.06])
+        self.assertEqual(st.waveforms.shape, (3, 4, 5))
+        self.assertEqual(st.annotations['cluster_id'], 3)
+        st = self.io.load_lazy_object(seg.spiketrains[2], t_start=0.02 * pq.s)
+        np.testing.assert_allclose(st.magnitude, [0.03, 0.06])
+
+    def test_waveforms_subsample(self):
+        seg = self.io.read_block(waveforms_subsample=2).segments[0]
+        for st in seg.spiketrains:
+            self.assertIsNone(st.waveforms)
+            self.assertNotIn('subsampled_waveforms', st.annotations)
+        # cluster 1 has 2 spikes, all its waveforms are read
+        waveforms, index = self.io.read_waveforms(1, self.model, subsample=2)
+        np.testing.assert_array_equal(index, [0, 1])
+        np.testing.assert_array_equal(
+            waveforms.magnitude,
+            self.model.all_waveforms[[1, 4]].swapaxes(1, 2))
+        self.assertEqual(waveforms.units, pq.uV)
+        # cluster 3 has 3 spikes, only the first and last are read
+        waveforms, index = self.io.read_waveforms(3, self.model, subsample=2)
+        np.testing.assert_array_equal(index, [0, 2])
+        np.testing.assert_array_equal(
+            waveforms.magnitude,
+            self.model.all_waveforms[[0, 5]].swapaxes(1, 2))
+        waveforms, index = self.io.read_waveforms(3, self.model)
+        np.testing.assert_array_equal(index, [0, 1, 2])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,12 +6,19 @@ Tests of neo.io.neomatlabio
 # needed for python 3 compatibility
 from __future__ import absolute_import, division
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
 import quantities as pq
-from neo import Block, Segment, SpikeTrain
+from neo import AnalogSignal, Block, Epoch, Event, Segment, SpikeTrain
 from neo.test.iotest.common_io_test import BaseTestIO
-from neo.io.neomatlabio import NeoMatlabIO, HAVE_SCIPY
+from neo.test.tools import (assert_same_sub_schema,
+                            assert_sub_schema_is_lazy_loaded,
+                            assert_lazy_sub_schema_can_be_loaded)
+from neo.io.neomatlabio import NeoMatlabIO, HAVE_SCIPY, HAVE_H5PY
 
 
 @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
@@ -41,5 +48,58 @@ class TestNeoMatlabIO(BaseTestIO, unittest.TestCase):
                          block2.segments[0].spiketrains[0])
 
 
+@unittest.skipUnless(HAVE_SCIPY and HAVE_H5PY, "requires scipy and h5py")
+class TestNeoMatlabIO73(unittest.TestCase):
+    def setUp(self):
+        self.block = Block(name='block')
+        seg = Segment('segment1', index=0)
+        self.block.segments.append(seg)
+        seg.analogsignals.append(
+            AnalogSignal(np.random.rand(100, 3), units='mV', t_start=1 * pq.s,
+                         sampling_rate=100 * pq.Hz, name='signal'))
+        seg.spiketrains.append(
+            SpikeTrain([1, 2, 3] * pq.s, t_stop=10 * pq.s))
+        seg.events.append(
+            Event([0, 10, 30] * pq.ms, labels=np.array(['a', 'bc', 'def'])))
+        seg.epochs.append(
+            Epoch([10, 20] * pq.ms, durations=[4, 10] * pq.ms,
+                  labels=np.array(['a0', 'a1'])))
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'matlabiotestfile73.mat')
+        NeoMatlabIO(self.filename).write_block(self.block, version='7.3')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_write_read(self):
+        with open(self.filename, 'rb') as f:
+            self.assertTrue(f.read(10) == b'MATLAB 7.3')
+        block = NeoMatlabIO(self.filename).read_block()
+        self.block.create_many_to_one_relationship()
+        assert_same_sub_schema(self.block, block)
+
+    def test_lazy(self):
+        io = NeoMatlabIO(self.filename)
+        block = io.read_block(lazy=True)
+        assert_sub_schema_is_lazy_loaded(block)
+        assert_lazy_sub_schema_can_be_loaded(block, io)
+        anasig = block.segments[0].analogsignals[0]
+        self.assertEqual(anasig.lazy_shape, (100, 3))
+
+    def test_load_signal_slice(self):
+        io = NeoMatlabIO(self.filename)
+        block = io.read_block(lazy=True)
+        anasig = io.load_lazy_object(block.segments[0].analogsignals[0],
+                                     t_start=1.2 * pq.s, t_stop=1.5 * pq.s,
+                                     channel_indexes=[2, 0])
+        original = self.block.segments[0].analogsignals[0]
+        np.testing.assert_array_equal(anasig.magnitude,
+                                      original.magnitude[20:50, [2, 0]])
+        self.assertAlmostEqual(anasig.t_start, 1.2 * pq.s)
+        self.assertEqual(anasig.sampling_rate, original.sampling_rate)
+        self.assertRaises(ValueError, io.load_lazy_object,
+                          block.segments[0].spiketrains[0], t_start=1 * pq.s)
+
+
 if __name__ == "__main__":
     unittest.main()
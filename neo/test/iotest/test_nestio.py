@@ -5,6 +5,9 @@ Tests of neo.io.exampleio
 
 # needed for python 3 compatibility
 from __future__ import absolute_import, division
+import os
+import shutil
+import tempfile
 import warnings
 
 import unittest
@@ -12,6 +15,7 @@ import unittest
 import quantities as pq
 import numpy as np
 
+from neo.io import nestio
 from neo.io.nestio import ColumnIO
 from neo.io.nestio import NestIO
 from neo.test.iotest.common_io_test import BaseTestIO
@@ -807,5 +811,87 @@ class TestColumnIO(BaseTestIO, unittest.TestCase):
         assert all(np.diff(result[:, 0]) >= 0)
 
 
+class TestColumnIOParsing(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'spikes-1-0.gdf')
+        self.data = np.array([[3, 2.5], [1, 0.5], [3, 1.5], [2, 4.],
+                              [1, 3.5], [3, 0.1]])
+        np.savetxt(self.filename, self.data, fmt=['%d', '%.1f'],
+                   delimiter='\t')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_chunked_parsing(self):
+        chunk_size = nestio.PARSE_CHUNK_SIZE
+        nestio.PARSE_CHUNK_SIZE = 10
+        try:
+            testIO = ColumnIO(filename=self.filename)
+        finally:
+            nestio.PARSE_CHUNK_SIZE = chunk_size
+        np.testing.assert_array_equal(testIO.data, self.data)
+
+    def test_int_then_float(self):
+        # the dtype guessed from the first line must not truncate the data
+        with open(self.filename, 'w') as f:
+            f.write('1 2\n2 3\n3 4\n4 5.5\n5 6\n')
+        testIO = ColumnIO(filename=self.filename)
+        np.testing.assert_array_equal(testIO.data,
+                                      [[1, 2], [2, 3], [3, 4], [4, 5.5], [5, 6]])
+
+    def test_unparsable(self):
+        with open(self.filename, 'w') as f:
+            f.write('1 2\n2 3\n3 x\n4 5\n')
+        self.assertRaises(ValueError, ColumnIO, filename=self.filename)
+
+    def test_cache(self):
+        testIO = ColumnIO(filename=self.filename, cache=True)
+        self.assertTrue(os.path.exists(testIO.cache_filename))
+        cachedIO = ColumnIO(filename=self.filename, cache=True)
+        self.assertIsInstance(cachedIO.data, np.memmap)
+        np.testing.assert_array_equal(cachedIO.data, self.data)
+
+    def test_cache_not_writable(self):
+        # a directory in place of the cache file can be neither read nor
+        # written, even by root
+        os.mkdir(self.filename + '.npy')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            testIO = ColumnIO(filename=self.filename, cache=True)
+        self.assertTrue(any('cache' in str(warning.message) for warning in w))
+        np.testing.assert_array_equal(testIO.data, self.data)
+
+    def test_cache_invalid(self):
+        with open(self.filename + '.npy', 'wb') as f:
+            f.write(b'\x93NUMPY truncated')
+        testIO = ColumnIO(filename=self.filename, cache=True)
+        np.testing.assert_array_equal(testIO.data, self.data)
+        cachedIO = ColumnIO(filename=self.filename, cache=True)
+        self.assertIsInstance(cachedIO.data, np.memmap)
+        np.testing.assert_array_equal(cachedIO.data, self.data)
+
+    def test_gid_index(self):
+        testIO = ColumnIO(filename=self.filename)
+        order, gids, offsets = testIO.get_gid_index(0, 1)
+        np.testing.assert_array_equal(gids, [1, 2, 3])
+        np.testing.assert_array_equal(offsets, [0, 2, 3, 6])
+        np.testing.assert_array_equal(testIO.data[order, 1],
+                                      [0.5, 3.5, 4., 0.1, 1.5, 2.5])
+        rows = testIO.get_gid_rows([3, 1, 7], 0, 1)
+        np.testing.assert_array_equal(testIO.data[rows, 1],
+                                      [0.5, 3.5, 0.1, 1.5, 2.5])
+
+    def test_read_segment(self):
+        seg = NestIO(self.filename).read_segment(gid_list=[1, 3],
+                                                 t_start=0.2 * pq.ms,
+                                                 t_stop=3. * pq.ms)
+        self.assertEqual([st.annotations['id'] for st in seg.spiketrains],
+                         [1, 3])
+        np.testing.assert_array_equal(seg.spiketrains[0].magnitude, [0.5])
+        np.testing.assert_array_equal(seg.spiketrains[1].magnitude,
+                                      [1.5, 2.5])
+
+
 if __name__ == "__main__":
     unittest.main()
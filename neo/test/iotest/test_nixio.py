@@ -13,6 +13,7 @@ Tests for NixIO
 
 import os
 import shutil
+import itertools
 from collections import Iterable
 from datetime import datetime
 
@@ -26,10 +27,12 @@ import quantities as pq
 from neo.core import (Block, Segment, ChannelIndex, AnalogSignal,
                       IrregularlySampledSignal, Unit, SpikeTrain, Event, Epoch)
 from neo.test.iotest.common_io_test import BaseTestIO
+from neo.io import nixio
 from neo.io.nixio import NixIO, create_quantity, units_to_string, neover
 
 try:
     import nixio as nix
+    import h5py
 
     HAVE_NIX = True
 except ImportError:
@@ -730,6 +733,119 @@ class NixIOWriteTest(NixIOTest):
         )
         self.write_and_compare([block, anotherblock])
 
+    def test_signals_matrix_write(self):
+        block = Block()
+        seg = Segment()
+        block.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 16), pq.mV),
+                            sampling_rate=pq.Quantity(10, "kHz"),
+                            t_start=3 * pq.s)
+        seg.analogsignals.append(asig)
+        irsig = IrregularlySampledSignal(
+            signal=np.random.random((20, 3)),
+            times=self.rquant(20, pq.ms, True),
+            units=pq.A
+        )
+        seg.irregularlysampledsignals.append(irsig)
+
+        filename = os.path.join(self.tempdir, "matrix.nix")
+        chunk_size = nixio.WRITE_CHUNK_SIZE
+        nixio.WRITE_CHUNK_SIZE = asig[:7].nbytes  # several appends
+        try:
+            with NixIO(filename, "ow", signal_layout="matrix",
+                       compression=True) as iofile:
+                iofile.write_block(block)
+        finally:
+            nixio.WRITE_CHUNK_SIZE = chunk_size
+
+        nixfile = nix.File.open(filename, nix.FileMode.ReadOnly,
+                                backend="h5py")
+        das = [da for da in nixfile.blocks[0].data_arrays
+               if da.type == "neo.analogsignal"]
+        self.assertEqual(len(das), 1)
+        self.assertEqual(das[0].shape, (100, 16))
+        nixfile.close()
+        self.assertEqual(
+            list(self.dataset_compression(filename, "neo.analogsignal").values()),
+            ["gzip"]
+        )
+
+        with NixIO(filename, "ro") as iofile:
+            rseg = iofile.read_block().segments[0]
+        np.testing.assert_array_equal(rseg.analogsignals[0].magnitude,
+                                      asig.magnitude)
+        self.assertEqual(rseg.analogsignals[0].t_start, 3 * pq.s)
+        np.testing.assert_array_equal(
+            rseg.irregularlysampledsignals[0].magnitude, irsig.magnitude
+        )
+        np.testing.assert_array_equal(
+            rseg.irregularlysampledsignals[0].times, irsig.times
+        )
+
+        with NixIO(filename, "ro") as iofile:
+            lazysig = iofile.read_block(lazy=True).segments[0].analogsignals[0]
+            self.assertEqual(lazysig.lazy_shape, (100, 16))
+            rsig = iofile.load_lazy_object(lazysig, t_start=3.001 * pq.s,
+                                           t_stop=3.005 * pq.s,
+                                           channel_indexes=[0, 5])
+        np.testing.assert_array_equal(rsig.magnitude,
+                                      asig.magnitude[10:50, [0, 5]])
+
+    @staticmethod
+    def dataset_compression(filename, nix_type):
+        """
+        Return the compression filter of the HDF5 datasets of the DataArrays
+        of type nix_type, by DataArray name.
+        """
+        compression = dict()
+
+        def visit(name, obj):
+            if isinstance(obj, h5py.Dataset) and name.endswith("/data"):
+                attrs = obj.parent.attrs
+                da_type = attrs.get("type")
+                if isinstance(da_type, bytes):
+                    da_type = da_type.decode()
+                if da_type == nix_type:
+                    compression[obj.parent.name] = obj.compression
+
+        with h5py.File(filename, "r") as h5file:
+            h5file.visititems(visit)
+        return compression
+
+    def test_signal_compression(self):
+        block = Block()
+        seg = Segment()
+        block.segments.append(seg)
+        seg.analogsignals.append(
+            AnalogSignal(signal=self.rquant((100, 3), pq.mV),
+                         sampling_rate=pq.Quantity(10, "kHz"))
+        )
+        seg.spiketrains.append(
+            SpikeTrain(times=np.arange(10) * pq.ms, t_stop=1 * pq.s,
+                       waveforms=self.rquant((10, 3, 8), pq.uV))
+        )
+
+        layouts = ("channels", "matrix")
+        # None is the default, which compresses the data
+        for layout, compression in itertools.product(layouts, (None, False, True)):
+            filename = os.path.join(self.tempdir, "compression.nix")
+            with NixIO(filename, "ow", signal_layout=layout,
+                       compression=compression) as iofile:
+                iofile.write_block(block)
+            expected = None if compression is False else "gzip"
+            for nix_type in ("neo.analogsignal", "neo.waveforms",
+                             "neo.spiketrain.times"):
+                filters = self.dataset_compression(filename, nix_type)
+                self.assertTrue(filters)
+                self.assertEqual(set(filters.values()), {expected},
+                                 (layout, compression, nix_type))
+            with NixIO(filename, "ro") as iofile:
+                rseg = iofile.read_block().segments[0]
+            np.testing.assert_array_almost_equal(
+                rseg.analogsignals[0].magnitude,
+                seg.analogsignals[0].magnitude
+            )
+
     def test_signals_compound_units(self):
         block = Block()
         seg = Segment()
@@ -824,6 +940,33 @@ class NixIOWriteTest(NixIOTest):
         spiketrain.left_sweep = pq.Quantity(-10, "ms")
         self.write_and_compare([block])
 
+    def test_waveforms_chunked_write(self):
+        block = Block()
+        seg = Segment()
+        block.segments.append(seg)
+        waveforms = self.rquant((50, 4, 16), pq.uV)
+        seg.spiketrains.append(
+            SpikeTrain(times=np.arange(50) * pq.ms, t_stop=1 * pq.s,
+                       waveforms=waveforms)
+        )
+
+        filename = os.path.join(self.tempdir, "waveforms.nix")
+        chunk_size = nixio.WRITE_CHUNK_SIZE
+        nixio.WRITE_CHUNK_SIZE = waveforms[:7].nbytes  # several appends
+        try:
+            with NixIO(filename, "ow", compression=True) as iofile:
+                iofile.write_block(block)
+        finally:
+            nixio.WRITE_CHUNK_SIZE = chunk_size
+        self.assertEqual(
+            list(self.dataset_compression(filename, "neo.waveforms").values()),
+            ["gzip"]
+        )
+
+        with NixIO(filename, "ro") as iofile:
+            rst = iofile.read_block().segments[0].spiketrains[0]
+        np.testing.assert_array_equal(rst.waveforms, waveforms)
+
     def test_metadata_structure_write(self):
         neoblk = self.create_all_annotated()
         self.io.write_block(neoblk)
@@ -1111,6 +1254,237 @@ class NixIOReadTest(NixIOTest):
             self.assertEqual(neoblock.annotations["nix_name"], nixblock.name)
 
 
+@unittest.skipUnless(HAVE_NIX, "Requires NIX")
+class NixIOLazyReadTest(NixIOTest):
+    def setUp(self):
+        self.tempdir = mkdtemp(prefix="nixiotest")
+        self.filename = os.path.join(self.tempdir, "testnixio.nix")
+        block = Block()
+        seg = Segment()
+        block.segments.append(seg)
+        self.asig = AnalogSignal(signal=self.rquant((100, 4), pq.mV),
+                                 sampling_rate=1 * pq.kHz,
+                                 t_start=10 * pq.ms)
+        seg.analogsignals.append(self.asig)
+        self.irsig = IrregularlySampledSignal(
+            times=np.cumsum(np.random.random(30)) * pq.s,
+            signal=self.rquant((30, 3), pq.nA)
+        )
+        seg.irregularlysampledsignals.append(self.irsig)
+        self.st = SpikeTrain(times=[3, 4.5, 7, 12, 20] * pq.s,
+                             t_stop=30 * pq.s,
+                             waveforms=self.rquant((5, 2, 8), pq.mV),
+                             sampling_period=1 * pq.ms)
+        seg.spiketrains.append(self.st)
+        self.event = Event(times=[1, 5, 9] * pq.s,
+                           labels=np.array(["a", "b", "c"], dtype="S"))
+        seg.events.append(self.event)
+        self.epoch = Epoch(times=[2, 6] * pq.s, durations=[1, 2] * pq.s,
+                           labels=np.array(["x", "y"], dtype="S"))
+        seg.epochs.append(self.epoch)
+        with NixIO(self.filename, "ow") as iofile:
+            iofile.write_block(block)
+        self.io = NixIO(self.filename, "ro")
+
+    def tearDown(self):
+        self.io.close()
+        shutil.rmtree(self.tempdir)
+
+    def test_lazy_read(self):
+        seg = self.io.read_block(lazy=True).segments[0]
+        asig = seg.analogsignals[0]
+        self.assertEqual(asig.size, 0)
+        self.assertEqual(asig.lazy_shape, (100, 4))
+        self.assertEqual(asig.t_start, 10 * pq.ms)
+        self.assertEqual(asig.sampling_rate, 1 * pq.kHz)
+        self.assertEqual(seg.irregularlysampledsignals[0].lazy_shape,
+                         (30, 3))
+        self.assertEqual(seg.spiketrains[0].size, 0)
+        self.assertEqual(seg.spiketrains[0].lazy_shape, (5,))
+        self.assertEqual(seg.events[0].lazy_shape, (3,))
+        self.assertEqual(seg.epochs[0].lazy_shape, (2,))
+
+    def test_load_lazy_object(self):
+        seg = self.io.read_block(lazy=True).segments[0]
+        asig = self.io.load_lazy_object(seg.analogsignals[0])
+        np.testing.assert_array_equal(asig.magnitude, self.asig.magnitude)
+        self.assertFalse(hasattr(asig, "lazy_shape"))
+        self.assertIs(asig.segment, seg)
+        irsig = self.io.load_lazy_object(seg.irregularlysampledsignals[0])
+        np.testing.assert_array_equal(irsig.magnitude,
+                                      self.irsig.magnitude)
+        np.testing.assert_array_equal(irsig.times, self.irsig.times)
+        st = self.io.load_lazy_object(seg.spiketrains[0])
+        np.testing.assert_array_equal(st.times, self.st.times)
+        np.testing.assert_array_equal(st.waveforms, self.st.waveforms)
+        event = self.io.load_lazy_object(seg.events[0])
+        np.testing.assert_array_equal(event.labels, self.event.labels)
+        epoch = self.io.load_lazy_object(seg.epochs[0])
+        np.testing.assert_array_equal(epoch.durations, self.epoch.durations)
+
+    def test_load_time_slice(self):
+        seg = self.io.read_block(lazy=True).segments[0]
+        asig = self.io.load_lazy_object(seg.analogsignals[0],
+                                        t_start=30 * pq.ms,
+                                        t_stop=50 * pq.ms,
+                                        channel_indexes=[1, 3])
+        expected = self.asig.time_slice(30 * pq.ms, 50 * pq.ms)
+        np.testing.assert_array_equal(asig.magnitude,
+                                      expected.magnitude[:, [1, 3]])
+        self.assertEqual(asig.t_start, expected.t_start)
+
+        t_start, t_stop = self.irsig.times[5], self.irsig.times[20]
+        irsig = self.io.load_lazy_object(seg.irregularlysampledsignals[0],
+                                         t_start=t_start, t_stop=t_stop)
+        np.testing.assert_array_equal(irsig.magnitude,
+                                      self.irsig.magnitude[5:21])
+
+        st = self.io.load_lazy_object(seg.spiketrains[0],
+                                      t_start=4 * pq.s, t_stop=15 * pq.s)
+        np.testing.assert_array_equal(st.magnitude, [4.5, 7, 12])
+        np.testing.assert_array_equal(st.waveforms,
+                                      self.st.waveforms[1:4])
+        self.assertEqual(st.t_start, 4 * pq.s)
+        self.assertEqual(st.t_stop, 15 * pq.s)
+
+        event = self.io.load_lazy_object(seg.events[0], t_start=4 * pq.s)
+        np.testing.assert_array_equal(event.labels, self.event.labels[1:])
+
+        epoch = self.io.load_lazy_object(seg.epochs[0], t_stop=5 * pq.s)
+        np.testing.assert_array_equal(epoch.times, self.epoch.times[:1])
+        np.testing.assert_array_equal(epoch.durations,
+                                      self.epoch.durations[:1])
+        np.testing.assert_array_equal(epoch.labels, self.epoch.labels[:1])
+
+        self.assertRaises(ValueError, self.io.load_lazy_object,
+                          seg.analogsignals[0], t_stop=1 * pq.s)
+
+    def test_positions_window(self):
+        class Positions(object):
+            """A sorted DataArray that counts the values read."""
+            unit = "s"
+
+            def __init__(self, values):
+                self.values = values
+                self.reads = 0
+
+            def __len__(self):
+                return len(self.values)
+
+            def __getitem__(self, index):
+                self.reads += 1
+                return self.values[index]
+
+        values = np.sort(np.random.uniform(0, 100, 1000))
+        values[500:510] = values[500]
+        positions = Positions(values)
+        times = pq.Quantity(values, "s")
+        windows = [(None, None), (values[500] * pq.s, values[500] * pq.s),
+                   (20 * pq.s, 50000 * pq.ms), (-1 * pq.s, 1000 * pq.s),
+                   (200 * pq.s, None), (None, -1 * pq.s), (60 * pq.s, 40 * pq.s)]
+        for t_start, t_stop in windows:
+            positions.reads = 0
+            self.assertEqual(NixIO._positions_window(positions, t_start, t_stop),
+                             NixIO._time_window(times, t_start, t_stop))
+            self.assertLessEqual(positions.reads, 2 * 11)
+
+
+@unittest.skipUnless(HAVE_NIX, "Requires NIX")
+class NixSegmentWriterTest(NixIOTest):
+    def setUp(self):
+        self.tempdir = mkdtemp(prefix="nixiotest")
+        self.filename = os.path.join(self.tempdir, "testnixio.nix")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def stream(self, signal_layout):
+        data = self.rquant((100, 3), pq.mV).magnitude
+        times = np.sort(np.random.uniform(0, 10, 20)) * pq.s
+        waveforms = self.rquant((20, 2, 5), pq.uV)
+        with NixIO(self.filename, "ow",
+                   signal_layout=signal_layout) as iofile:
+            block = Block(name="stream")
+            writer = iofile.open_segment(Segment(name="trial"), block,
+                                         flush_size=data[:30].nbytes)
+            asig = writer.add_analogsignal(
+                AnalogSignal(np.empty((0, 3)), units="mV",
+                             sampling_rate=10 * pq.Hz, name="sig")
+            )
+            st = writer.add_spiketrain(
+                SpikeTrain([], units="s", t_stop=5 * pq.s,
+                           waveforms=np.empty((0, 2, 5)) * pq.uV,
+                           sampling_period=1 * pq.ms)
+            )
+            event = writer.add_event(Event([] * pq.s))
+            for idx in range(0, 100, 10):
+                writer.append_analogsignal(asig, data[idx:idx + 10])
+                if idx < 20:
+                    # spike times in another unit are rescaled
+                    writer.append_spiketrain(st,
+                                             times[idx:idx + 10].rescale("ms"),
+                                             waveforms[idx:idx + 10])
+            nixdas = [da for da in iofile.nix_file.blocks[0].data_arrays
+                      if da.type == "neo.analogsignal"]
+            # data are written when more than flush_size bytes are pending
+            self.assertLess(nixdas[0].shape[0], 100)
+            writer.append_event(event, [1, 2] * pq.s, ["a", "b"])
+            writer.append_event(event, [3] * pq.s)
+            writer.close()
+
+        with NixIO(self.filename, "ro") as iofile:
+            seg = iofile.read_block().segments[0]
+        self.assertEqual(seg.name, "trial")
+        np.testing.assert_array_equal(seg.analogsignals[0].magnitude, data)
+        self.assertEqual(seg.analogsignals[0].name, "sig")
+        np.testing.assert_array_almost_equal(seg.spiketrains[0].magnitude,
+                                             times.magnitude)
+        np.testing.assert_array_equal(seg.spiketrains[0].waveforms,
+                                      waveforms)
+        self.assertAlmostEqual(seg.spiketrains[0].t_stop.magnitude,
+                               times.max().magnitude)
+        np.testing.assert_array_equal(seg.events[0].times, [1, 2, 3] * pq.s)
+        np.testing.assert_array_equal(seg.events[0].labels,
+                                      np.array(["a", "b", ""], dtype="S"))
+
+    def test_stream_channels(self):
+        self.stream("channels")
+
+    def test_stream_matrix(self):
+        self.stream("matrix")
+
+    def test_many_event_flushes(self):
+        nflushes = 500
+        labels = ["label{}".format(idx) for idx in range(nflushes)]
+        with NixIO(self.filename, "ow") as iofile:
+            writer = iofile.open_segment(Segment(), Block(), flush_size=1)
+            event = writer.add_event(Event([0] * pq.s, labels=["start"]))
+            for idx, label in enumerate(labels):
+                # each append is flushed
+                writer.append_event(event, [idx + 1] * pq.s, [label])
+            nixmt = iofile.nix_file.blocks[0].multi_tags[
+                event.annotations["nix_name"]]
+            # the labels are appended, the dimension is not rewritten
+            self.assertEqual(len(nixmt.positions.dimensions[0].labels), 1)
+            self.assertEqual(nixmt.features[0].data.shape, (nflushes + 1,))
+            np.testing.assert_array_equal(
+                NixIO._event_labels(nixmt),
+                np.array(["start"] + labels, dtype="S")
+            )
+            writer.close()
+            nixblock = iofile.nix_file.blocks[0]
+            self.assertEqual(len(nixblock.multi_tags[0].features), 0)
+            self.assertFalse([da for da in nixblock.data_arrays
+                              if da.type == "neo.event.labels"])
+
+        with NixIO(self.filename, "ro") as iofile:
+            revent = iofile.read_block().segments[0].events[0]
+        np.testing.assert_array_equal(revent.times,
+                                      np.arange(nflushes + 1) * pq.s)
+        np.testing.assert_array_equal(revent.labels,
+                                      np.array(["start"] + labels, dtype="S"))
+
+
 @unittest.skipUnless(HAVE_NIX, "Requires NIX")
 class NixIOContextTests(NixIOTest):
     def setUp(self):
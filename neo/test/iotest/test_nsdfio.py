@@ -10,12 +10,14 @@ import numpy as np
 import quantities as pq
 from datetime import datetime
 import os
+import shutil
+import tempfile
 
 import unittest
 
 from neo.io.nsdfio import HAVE_NSDF, NSDFIO
 from neo.test.iotest.common_io_test import BaseTestIO
-from neo.core import AnalogSignal, Segment, Block, ChannelIndex
+from neo.core import AnalogSignal, SpikeTrain, Event, Epoch, Segment, Block, ChannelIndex
 from neo.test.tools import assert_same_attributes, assert_same_annotations, \
     assert_neo_object_is_compliant
 
@@ -95,6 +97,10 @@ class NSDFIOTest(unittest.TestCase):
                 segment, name='Signal #{}'.format(i * 3 + 1)))
             segment.analogsignals.append(self.create_analogsignal3(
                 segment, name='Signal #{}'.format(i * 3 + 2)))
+        segment.spiketrains.append(self.create_spiketrain(segment))
+        segment.spiketrains.append(self.create_spiketrain2(segment))
+        segment.events.append(self.create_event(segment))
+        segment.epochs.append(self.create_epoch(segment))
 
     def create_analogsignal(self, parent=None, name='AnalogSignal1'):
         signal = AnalogSignal([[1.0, 2.5], [2.2, 3.1], [3.2, 4.4]], units='mV',
@@ -124,6 +130,44 @@ class NSDFIOTest(unittest.TestCase):
 
         return signal
 
+    def create_spiketrain(self, parent=None, name='SpikeTrain1'):
+        spiketrain = SpikeTrain([0.5, 1.2, 3.3], units='s', t_start=0.1 * pq.s,
+                                t_stop=4 * pq.s, sampling_rate=10 * pq.kHz,
+                                left_sweep=0.2 * pq.ms,
+                                waveforms=np.arange(3 * 2 * 4.).reshape(3, 2, 4) * pq.uV)
+
+        spiketrain.segment = parent
+        self._assign_basic_attributes(spiketrain, name=name)
+        self._assign_annotations(spiketrain)
+
+        return spiketrain
+
+    def create_spiketrain2(self, parent=None, name='SpikeTrain2'):
+        spiketrain = SpikeTrain([12, 30, 41], units='ms', t_stop=50 * pq.ms)
+
+        spiketrain.segment = parent
+
+        return spiketrain
+
+    def create_event(self, parent=None, name='Event'):
+        event = Event([1.5, 2.5, 7.2] * pq.s,
+                      labels=np.array([b'start', b'reward', b'stop'], dtype='S'))
+
+        event.segment = parent
+        self._assign_basic_attributes(event, name=name)
+        self._assign_annotations(event)
+
+        return event
+
+    def create_epoch(self, parent=None, name='Epoch'):
+        epoch = Epoch([10, 250] * pq.ms, durations=[100, 40] * pq.ms,
+                      labels=np.array([b'trial 1', b'trial 2'], dtype='S'))
+
+        epoch.segment = parent
+        self._assign_basic_attributes(epoch, name=name)
+
+        return epoch
+
     def create_channelindex(self, parent=None, name='ChannelIndex', analogsignals=None):
         channels_num = min([signal.shape[1] for signal in analogsignals])
 
@@ -221,6 +265,12 @@ class NSDFIOTestWriteThenRead(NSDFIOTest):
         assert len(segment1.analogsignals) == len(segment2.analogsignals)
         for signal1, signal2 in zip(segment1.analogsignals, segment2.analogsignals):
             self.compare_analogsignals(signal1, signal2, lazy=lazy)
+        for container in ('spiketrains', 'events', 'epochs'):
+            children1 = getattr(segment1, container)
+            children2 = getattr(segment2, container)
+            assert len(children1) == len(children2)
+            for child1, child2 in zip(children1, children2):
+                self._compare_objects(child1, child2)
 
     def compare_analogsignals(self, signal1, signal2, lazy=False):
         if not lazy:
@@ -239,5 +289,65 @@ class NSDFIOTestWriteThenRead(NSDFIOTest):
         assert_same_annotations(object1, object2)
 
 
+@unittest.skipUnless(HAVE_NSDF, "Requires NSDF")
+class NSDFSegmentWriterTest(unittest.TestCase):
+    """
+    Tests of the incremental writing of Segments with NSDFIO.open_segment
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'nsdfio_stream.h5')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_append(self):
+        io = NSDFIO(self.filename)
+        with io.open_segment(Segment(name='recording'), flush_size=100) as writer:
+            signal = writer.add_analogsignal(
+                AnalogSignal(np.empty((0, 2)), units='mV', sampling_rate=1 * pq.kHz,
+                             name='probe'))
+            spiketrain = writer.add_spiketrain(
+                SpikeTrain([] * pq.ms, t_stop=1 * pq.ms,
+                           waveforms=np.empty((0, 1, 3)) * pq.uV))
+            event = writer.add_event(Event([] * pq.s, labels=np.array([], dtype='S')))
+            epoch = writer.add_epoch(Epoch([] * pq.s, durations=[] * pq.s,
+                                           labels=np.array([], dtype='S')))
+            for i in range(5):
+                writer.append_analogsignal(signal, np.full((10, 2), i, dtype=float))
+                writer.append_spiketrain(spiketrain, [10. * i + 1] * pq.ms,
+                                         waveforms=np.full((1, 1, 3), i) * pq.uV)
+                writer.append_event(event, [i] * pq.s, labels=['event {}'.format(i)])
+                writer.append_epoch(epoch, [i] * pq.s, [500] * pq.ms)
+            self.assertRaises(ValueError, writer.append_spiketrain,
+                              writer.add_spiketrain(SpikeTrain([] * pq.s, t_stop=1 * pq.s)),
+                              [0.5] * pq.s, waveforms=np.zeros((1, 1, 3)))
+
+        segment = NSDFIO(self.filename).read_segment()
+        self.assertEqual(segment.name, 'recording')
+
+        signal = segment.analogsignals[0]
+        self.assertEqual(signal.name, 'probe')
+        self.assertEqual(signal.shape, (50, 2))
+        np.testing.assert_array_equal(signal.magnitude[:, 0], np.repeat(np.arange(5.), 10))
+
+        spiketrain = segment.spiketrains[0]
+        np.testing.assert_array_equal(spiketrain.rescale('ms').magnitude,
+                                      np.arange(5) * 10. + 1)
+        self.assertEqual(spiketrain.t_stop, 41 * pq.ms)
+        self.assertEqual(spiketrain.waveforms.shape, (5, 1, 3))
+        np.testing.assert_array_equal(spiketrain.waveforms.magnitude[:, 0, 0], np.arange(5))
+
+        event = segment.events[0]
+        np.testing.assert_array_equal(event.times.magnitude, np.arange(5))
+        self.assertEqual(event.labels[4], b'event 4')
+
+        epoch = segment.epochs[0]
+        np.testing.assert_array_equal(epoch.times.magnitude, np.arange(5))
+        np.testing.assert_array_equal(epoch.durations.rescale('s').magnitude, [0.5] * 5)
+        self.assertEqual(len(segment.spiketrains[1]), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,7 @@ import quantities as pq
 from neo.core import Block, Segment, AnalogSignal, SpikeTrain, Unit, Epoch, Event, ChannelIndex, \
     IrregularlySampledSignal
 from neo.io import PickleIO
+from neo.io.pickleio import HAVE_PICKLE_PROTOCOL_5, pickle
 from numpy.testing import assert_array_equal
 from neo.test.tools import assert_arrays_equal, assert_file_contents_equal
 from neo.test.iotest.common_io_test import BaseTestIO
@@ -112,6 +113,81 @@ class TestPickleIO(unittest.TestCase):
         self.assertIsInstance(r_seg.irregularlysampledsignals[0].segment, Segment)
         os.remove('blk.pkl')
 
+    @unittest.skipUnless(HAVE_PICKLE_PROTOCOL_5, "requires pickle protocol 5")
+    def test__write_read_memmap(self):
+        signal = AnalogSignal(np.arange(20000.0).reshape((10000, 2)), units='mV',
+                              sampling_rate=1 * pq.kHz, name='sig')
+        train = SpikeTrain(np.arange(1000.0) * pq.ms, t_stop=1 * pq.s,
+                           waveforms=np.ones((1000, 1, 4)) * pq.uV)
+        event = Event(np.arange(0, 30, 10) * pq.s,
+                      labels=np.array(['trig0', 'trig1', 'trig2'], dtype='S'))
+        blk = Block()
+        seg = Segment()
+        seg.analogsignals.append(signal)
+        seg.spiketrains.append(train)
+        seg.events.append(event)
+        blk.segments.append(seg)
+        blk.create_many_to_one_relationship()
+
+        writer = PickleIO(filename="blk.pkl", memmap=True)
+        writer.write_block(blk)
+        # only the metadata is stored in the pickle file itself
+        self.assertLess(os.path.getsize("blk.pkl"), signal.nbytes)
+        self.assertGreaterEqual(os.path.getsize("blk.pkl.buffers"),
+                                signal.nbytes + train.nbytes)
+
+        r_blk = PickleIO(filename="blk.pkl").read_block()
+        r_seg = r_blk.segments[0]
+        r_signal = r_seg.analogsignals[0]
+        # the data are views onto the memory-mapped side-car file
+        base = r_signal
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        assert_arrays_equal(r_signal.magnitude, signal.magnitude)
+        self.assertEqual(r_signal.name, 'sig')
+        self.assertEqual(r_signal.sampling_rate, signal.sampling_rate)
+        self.assertIs(r_signal.segment, r_seg)
+        assert_arrays_equal(r_seg.spiketrains[0].magnitude, train.magnitude)
+        assert_arrays_equal(r_seg.events[0].labels, event.labels)
+        del r_blk, r_seg, r_signal
+        os.remove('blk.pkl')
+        os.remove('blk.pkl.buffers')
+
+    @unittest.skipUnless(HAVE_PICKLE_PROTOCOL_5, "requires pickle protocol 5")
+    def test__out_of_band_buffers(self):
+        train = SpikeTrain(np.arange(1000.0) * pq.ms, t_stop=1 * pq.s,
+                           waveforms=np.ones((1000, 1, 4)) * pq.uV)
+        epoch = Epoch(np.arange(1000.0) * pq.s, durations=np.ones(1000) * pq.ms,
+                      labels=np.array(['a'] * 1000, dtype='S'))
+        for obj, arrays in ((train, (train, train.waveforms)),
+                            (epoch, (epoch, epoch.durations, epoch.labels))):
+            buffers = []
+            data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+            self.assertEqual(len(buffers), len(arrays))
+            self.assertEqual(sorted(buf.raw().nbytes for buf in buffers),
+                             sorted(arr.nbytes for arr in arrays))
+            # the arrays are not copied in the pickle itself
+            self.assertLess(len(data), min(arr.nbytes for arr in arrays))
+
+        r_train = pickle.loads(pickle.dumps(train, protocol=5))
+        assert_arrays_equal(r_train.waveforms, train.waveforms)
+        self.assertEqual(r_train.waveforms.units, pq.uV)
+        r_epoch = pickle.loads(pickle.dumps(epoch, protocol=5))
+        assert_arrays_equal(r_epoch.durations, epoch.durations)
+        self.assertEqual(r_epoch.durations.units, pq.ms)
+
+        # the unpickled objects are views onto the out-of-band buffers
+        event = Event(np.arange(1000.0) * pq.s, labels=np.array(['a'] * 1000, dtype='S'))
+        for obj in (train, epoch, event):
+            buffers = []
+            data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+            r_obj = pickle.loads(data, buffers=buffers)
+            self.assertIs(type(r_obj), type(obj))
+            self.assertEqual(r_obj.units, obj.units)
+            assert_arrays_equal(r_obj, obj)
+            self.assertTrue(np.shares_memory(r_obj, obj))
+
 
 if __name__ == '__main__':
     unittest.main()
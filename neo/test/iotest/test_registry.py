@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the neo.io.registry module and of the lazy import of neo.io
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import subprocess
+import sys
+import unittest
+
+import neo
+import neo.io
+from neo.io.registry import io_registry, other_io_registry, io_names, import_io_class
+
+
+class TestIORegistry(unittest.TestCase):
+    def test_extensions_match_classes(self):
+        for registry in (io_registry, other_io_registry):
+            for name, (_, _, extensions) in registry.items():
+                ioclass = import_io_class(name)
+                self.assertEqual(list(ioclass.extensions), extensions,
+                                 'extensions of {} are not up to date'.format(name))
+
+    def test_iolist(self):
+        self.assertEqual(len(neo.io.iolist), len(io_names))
+        for name, ioclass in zip(io_names, neo.io.iolist):
+            self.assertIs(ioclass, getattr(neo.io, name))
+            self.assertIs(ioclass, getattr(neo, name))
+        self.assertIs(neo.iolist, neo.io.iolist)
+
+    def test_get_io(self):
+        self.assertRaises(IOError, neo.io.get_io, 'file.unknown')
+
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, neo.io, 'UnknownIO')
+        self.assertRaises(AttributeError, getattr, neo, 'UnknownIO')
+        self.assertIn('PlexonIO', dir(neo.io))
+
+    def test_attribute_error_on_import(self):
+        other_io_registry['BrokenIO'] = ('neo.io.registry', 'BrokenIO', [])
+        try:
+            with self.assertRaises(ImportError) as cm:
+                getattr(neo.io, 'BrokenIO')
+            self.assertIsInstance(cm.exception.__cause__, AttributeError)
+        finally:
+            del other_io_registry['BrokenIO']
+
+    @unittest.skipIf(sys.version_info < (3, 5), 'modules are lazy with python >= 3.5')
+    def test_lazy_import(self):
+        code = ('import sys\n'
+                'import neo\n'
+                'assert "neo.io.nixio" not in sys.modules\n'
+                'assert "neo.io.plexonio" not in sys.modules\n'
+                'neo.io.PlexonIO\n'
+                'assert "neo.io.plexonio" in sys.modules\n'
+                'assert "neo.io.nixio" not in sys.modules\n')
+        subprocess.check_call([sys.executable, '-W', 'ignore', '-c', code])
+
+
+if __name__ == "__main__":
+    unittest.main()
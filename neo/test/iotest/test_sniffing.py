@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the neo.rawio.sniffing module, through neo.io.get_io and
+neo.rawio.get_rawio_class
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import neo.io
+import neo.rawio
+from neo.rawio.sniffing import (FormatIndex, format_name, SIGNATURE, CONTENT_ONLY, EXTENSION,
+                                MISMATCH, HDF5_SIGNATURE)
+from neo.rawio.tests.synthetic_files import generate_corpus
+
+
+class TestFormatIndex(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def write(self, filename, content):
+        filename = os.path.join(self.dirname, filename)
+        with open(filename, 'wb') as f:
+            f.write(content)
+        return filename
+
+    def test_format_name(self):
+        self.assertEqual(format_name('PlexonIO'), 'Plexon')
+        self.assertEqual(format_name('PlexonRawIO'), 'Plexon')
+
+    def test_extension_index(self):
+        index = FormatIndex([('AIO', ['nev', 'ns5']), ('BIO', ['NEV']), ('CIO', ['dat'])])
+        self.assertEqual(index.by_extension['nev'], ['AIO', 'BIO'])
+        # the file does not exist: extension only, same case first
+        self.assertEqual(index.rank('file.NEV'), [('BIO', EXTENSION), ('AIO', EXTENSION)])
+        self.assertEqual(index.rank('file.unknown'), [])
+
+    def test_nev(self):
+        index = neo.io._format_index
+        blackrock = self.write('a.nev', b'NEURALEV' + b'\x00' * 100)
+        self.assertEqual(index.rank(blackrock)[:2],
+                         [('BlackrockIO', SIGNATURE), ('NeuralynxIO', MISMATCH)])
+        neuralynx = self.write('b.nev', b'######## Neuralynx Data File Header\r\n')
+        self.assertEqual(index.rank(neuralynx)[:2],
+                         [('NeuralynxIO', SIGNATURE), ('BlackrockIO', MISMATCH)])
+
+    def test_h5(self):
+        index = neo.io._format_index
+        nsdf = self.write('a.h5', HDF5_SIGNATURE + b'\x00' * 100 + b'nsdf_version')
+        ranked = index.rank(nsdf)
+        self.assertEqual(ranked[0], ('NSDFIO', SIGNATURE))
+        self.assertEqual(set(c for _, c in ranked[1:]), set([MISMATCH]))
+        unknown = self.write('b.h5', HDF5_SIGNATURE + b'\x00' * 100)
+        self.assertEqual([name for name, _ in index.rank(unknown)],
+                         ['NixIO', 'NeoHdf5IO', 'NSDFIO'])
+        not_hdf5 = self.write('c.h5', b'\x00' * 100)
+        self.assertEqual(set(c for _, c in index.rank(not_hdf5)), set([MISMATCH]))
+
+    def test_content_only(self):
+        plexon = self.write('a.bin', b'PLEX' + b'\x00' * 100)
+        self.assertEqual(neo.io._format_index.rank(plexon), [('PlexonIO', CONTENT_ONLY)])
+        # weak signatures need the extension
+        pkl = self.write('a.bin2', pickle.dumps([1], protocol=2))
+        self.assertEqual(neo.io._format_index.rank(pkl), [])
+        pkl = self.write('a.pkl', pickle.dumps([1], protocol=2))
+        self.assertEqual(neo.io._format_index.rank(pkl), [('PickleIO', SIGNATURE)])
+
+
+class TestGuessFromSyntheticFiles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dirname = tempfile.mkdtemp()
+        cls.corpus = generate_corpus(cls.dirname, nb_channel=2, duration=3., event_rate=2.)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dirname)
+
+    def path(self, kargs):
+        return kargs.get('filename', kargs.get('dirname'))
+
+    def test_get_rawio_class(self):
+        for name, kargs in self.corpus.items():
+            path = self.path(kargs)
+            if name == 'BlackrockRawIO':
+                # the base name of the files
+                path += '.ns5'
+            if name == 'RawBinarySignalRawIO':
+                # '.raw' has no signature, it is found from the extension
+                self.assertIs(neo.rawio.get_rawio_class(path), neo.rawio.RawBinarySignalRawIO)
+                continue
+            candidates = neo.rawio.get_rawio_candidates(path)
+            self.assertIs(candidates[0][0], getattr(neo.rawio, name))
+            self.assertEqual(candidates[0][1], SIGNATURE)
+            self.assertIs(neo.rawio.get_rawio_class(path), getattr(neo.rawio, name))
+
+    def test_blackrock_nev(self):
+        nev = self.path(self.corpus['BlackrockRawIO']) + '.nev'
+        self.assertIs(neo.rawio.get_rawio_class(nev), neo.rawio.BlackrockRawIO)
+        self.assertIs(neo.io.get_io_candidates(nev)[0][0], neo.io.BlackrockIO)
+
+    def test_neuroscope_dat(self):
+        dat = self.path(self.corpus['NeuroScopeRawIO']).replace('.xml', '.dat')
+        candidates = neo.io.get_io_candidates(dat)
+        self.assertIs(candidates[0][0], neo.io.NeuroScopeIO)
+        self.assertEqual(candidates[0][1], SIGNATURE)
+        # BCI2000IO has a text header
+        self.assertIn((neo.io.BCI2000IO, MISMATCH), candidates)
+        io = neo.io.get_io(dat)
+        self.assertIsInstance(io, neo.io.NeuroScopeIO)
+
+    def test_get_io_directory(self):
+        io = neo.io.get_io(self.path(self.corpus['TdtRawIO']))
+        self.assertIsInstance(io, neo.io.TdtIO)
+        io = neo.io.get_io(self.path(self.corpus['NeuralynxRawIO']))
+        self.assertIsInstance(io, neo.io.NeuralynxIO)
+
+    def test_get_io_new_file(self):
+        # no content to sniff: first IO in iolist order as before
+        filename = os.path.join(self.dirname, 'new.plx')
+        self.assertEqual(neo.io.get_io_candidates(filename), [(neo.io.PlexonIO, EXTENSION)])
+        self.assertRaises(IOError, neo.io.get_io, os.path.join(self.dirname, 'new.unknown'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the neo.sharedmemory module
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from multiprocessing import Pool
+
+import numpy as np
+import quantities as pq
+
+import neo
+from neo.core import Block, Segment, ChannelIndex, Unit, AnalogSignal, SpikeTrain, Epoch
+from neo.sharedmemory import SharedBlock, HAVE_SHARED_MEMORY
+from neo.test.tools import assert_arrays_equal, assert_same_sub_schema
+
+
+def _sum_signals(shared):
+    block = shared.get_block()
+    return [float(sig.magnitude.sum()) for sig in block.segments[0].analogsignals]
+
+
+def _scale_first_signal(shared):
+    block = shared.get_block()
+    block.segments[0].analogsignals[0][:] *= 2
+
+
+def _scale_waveforms_and_durations(shared):
+    seg = shared.get_block().segments[0]
+    seg.spiketrains[0].waveforms[:] *= 2
+    seg.epochs[0].durations[:] *= 2
+
+
+def make_block():
+    blk = Block(name='block')
+    seg = Segment(name='seg')
+    chx = ChannelIndex(index=np.arange(4), name='probe')
+    unit = Unit(name='unit')
+    blk.segments.append(seg)
+    blk.channel_indexes.append(chx)
+    chx.units.append(unit)
+    for i in range(2):
+        sig = AnalogSignal(np.arange(4000.0).reshape((1000, 4)) + i,
+                           units='mV', sampling_rate=1 * pq.kHz, trial=i)
+        seg.analogsignals.append(sig)
+        chx.analogsignals.append(sig)
+    train = SpikeTrain(np.arange(100.0) * pq.ms, t_stop=1 * pq.s,
+                       waveforms=np.arange(1600.0).reshape((100, 4, 4)) * pq.uV)
+    seg.spiketrains.append(train)
+    unit.spiketrains.append(train)
+    epoch = Epoch(np.arange(100.0) * pq.s, durations=np.ones(100) * pq.ms,
+                  labels=np.array(['trial'] * 100, dtype='S'))
+    seg.epochs.append(epoch)
+    blk.create_many_to_one_relationship()
+    return blk
+
+
+@unittest.skipUnless(HAVE_SHARED_MEMORY, "requires Python 3.8 or later")
+class TestSharedBlock(unittest.TestCase):
+    def setUp(self):
+        self.block = make_block()
+        self.shared = SharedBlock(self.block)
+
+    def tearDown(self):
+        self.shared.unlink()
+
+    def test__get_block(self):
+        block = self.shared.get_block()
+        assert_same_sub_schema(block, self.block)
+        seg = block.segments[0]
+        sig = seg.analogsignals[0]
+        self.assertEqual(sig.annotations, {'trial': 0})
+        self.assertIs(sig.segment, seg)
+        self.assertIs(sig.channel_index, block.channel_indexes[0])
+        self.assertIs(seg.spiketrains[0].unit, block.channel_indexes[0].units[0])
+        self.assertFalse(sig.flags.owndata)
+
+    def test__shares_memory(self):
+        seg = self.shared.get_block().segments[0]
+        shm = np.frombuffer(self.shared._attach().buf, dtype=np.uint8)
+        train, epoch = seg.spiketrains[0], seg.epochs[0]
+        for arr in (seg.analogsignals[0], train, train.waveforms,
+                    epoch, epoch.durations, epoch.labels):
+            self.assertTrue(np.shares_memory(arr, shm))
+        assert_arrays_equal(train.waveforms, self.block.segments[0].spiketrains[0].waveforms)
+        self.assertEqual(train.waveforms.units, pq.uV)
+        assert_arrays_equal(epoch.durations, self.block.segments[0].epochs[0].durations)
+        self.assertEqual(epoch.durations.units, pq.ms)
+        del shm, seg, train, epoch
+
+    def test__pickled_size(self):
+        seg = self.block.segments[0]
+        data_size = (sum(sig.nbytes for sig in seg.analogsignals) +
+                     seg.spiketrains[0].waveforms.nbytes + seg.epochs[0].durations.nbytes)
+        self.assertGreaterEqual(self.shared.nbytes, data_size)
+        self.assertLess(len(pickle.dumps(self.shared)), data_size / 10)
+
+    def test__pool(self):
+        pool = Pool(2)
+        try:
+            sums = pool.map(_sum_signals, [self.shared] * 4)
+            self.assertEqual(sums, [[float(sig.magnitude.sum()) for sig in
+                                     self.block.segments[0].analogsignals]] * 4)
+            # the workers and this process see the same memory
+            pool.apply(_scale_first_signal, (self.shared,))
+            pool.apply(_scale_waveforms_and_durations, (self.shared,))
+        finally:
+            pool.close()
+            pool.join()
+        seg = self.shared.get_block().segments[0]
+        orig = self.block.segments[0]
+        assert_arrays_equal(seg.analogsignals[0].magnitude,
+                            2 * orig.analogsignals[0].magnitude)
+        assert_arrays_equal(seg.spiketrains[0].waveforms.magnitude,
+                            2 * orig.spiketrains[0].waveforms.magnitude)
+        assert_arrays_equal(seg.epochs[0].durations.magnitude,
+                            2 * orig.epochs[0].durations.magnitude)
+
+    def test__spawn_pool(self):
+        # the resource tracker runs in another process and only reports
+        # errors on stderr, so the pool is run in a separate interpreter
+        script = '''if True:
+            import multiprocessing
+            from neo.sharedmemory import SharedBlock
+            from neo.test.test_sharedmemory import make_block, _sum_signals
+            if __name__ == "__main__":
+                with SharedBlock(make_block()) as shared:
+                    pool = multiprocessing.get_context("spawn").Pool(2)
+                    try:
+                        print(pool.map(_sum_signals, [shared] * 4))
+                    finally:
+                        pool.close()
+                        pool.join()
+            '''
+        proc = subprocess.Popen([sys.executable, '-c', script],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True,
+                                cwd=os.path.dirname(os.path.dirname(neo.__file__)))
+        out, err = proc.communicate()
+        self.assertEqual(proc.returncode, 0, err)
+        # errors and leaks reported by the resource tracker
+        self.assertNotIn('Traceback', err)
+        self.assertNotIn('leaked', err)
+        sums = [float(sig.magnitude.sum()) for sig in self.block.segments[0].analogsignals]
+        self.assertEqual(out.strip(), str([sums] * 4))
+
+
+if __name__ == "__main__":
+    unittest.main()